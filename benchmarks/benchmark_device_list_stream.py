@@ -0,0 +1,87 @@
+"""
+Benchmark of the streaming device list on '/devices' responses.
+
+Compares decoding the whole buffered response (with the default codec) with streaming it
+device by device through JsonArrayStreamer, with and without a field projection: total time,
+time to the first device and peak memory, the response arriving in 16 KiB chunks.
+
+Usage:
+    python3 -m benchmarks.benchmark_device_list_stream
+"""
+
+import json
+import time
+import tracemalloc
+
+from sonoff_ewelink_cube_client_api.utils.jsonCodec import get_codec
+from sonoff_ewelink_cube_client_api.utils.jsonStream import JsonArrayStreamer, compile_fields, project_fields
+
+from .benchmark_helpers import make_device_list, measure
+
+DEVICE_COUNTS = (100, 500, 2000)
+CHUNK_SIZE = 16384
+REPEAT = 20
+FIELDS = compile_fields(('serial_number', 'online'))
+
+
+def buffered(body, codec):
+    """Buffer the whole response, then decode it."""
+    buffer = bytearray()
+    for start in range(0, len(body), CHUNK_SIZE):
+        buffer += body[start:start + CHUNK_SIZE]
+    return [(device['serial_number'], device['online']) for device in codec.loads(bytes(buffer))['data']['device_list']]
+
+
+def streamed(body, fields=None):
+    """Stream the response device by device."""
+    streamer = JsonArrayStreamer('device_list')
+    devices = []
+    for start in range(0, len(body), CHUNK_SIZE):
+        for device in streamer.feed(body[start:start + CHUNK_SIZE]):
+            devices.append(device if fields is None else project_fields(device, fields))
+    streamer.finish()
+    return devices
+
+
+def first_device(body):
+    """Time in µs to the first streamed device."""
+    started = time.perf_counter()
+    streamer = JsonArrayStreamer('device_list')
+    for start in range(0, len(body), CHUNK_SIZE):
+        if streamer.feed(body[start:start + CHUNK_SIZE]):
+            break
+    return (time.perf_counter() - started) * 1e6
+
+
+def peak_memory(func):
+    """Peak memory in KiB allocated by a call."""
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak / 1024
+
+
+def main():
+    """
+    The main function of the benchmark.
+    """
+    codec = get_codec()
+    print(f"codec: {codec.name}")
+    print(f"{'devices':>8} {'bytes':>9} {'mode':>10} {'total µs':>10} {'first µs':>10} {'peak KiB':>9}")
+
+    for count in DEVICE_COUNTS:
+        body = json.dumps(make_device_list(count)).encode()
+        modes = (
+            ('buffered', lambda body=body: buffered(body, codec), None),
+            ('streamed', lambda body=body: streamed(body), first_device(body)),
+            ('projected', lambda body=body: streamed(body, FIELDS), first_device(body)),
+        )
+        for name, func, first in modes:
+            total = measure(func, REPEAT)
+            first = total if first is None else first
+            print(f"{count:>8} {len(body):>9} {name:>10} {total:>10.1f} {first:>10.1f} {peak_memory(func):>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Benchmark of the queries of the device registry.
+
+Finds the online lights with a color temperature in one room, by scanning the device list
+and with the indexes of DeviceRegistry: the registry intersects the devices of the room with
+the online ones and tests the capabilities as bitsets, in a time following the result size.
+
+Then applies state updates to the registry, in memory only and with a DeviceStore: the store
+only stages the changes, written later in one transaction, so it adds little to each update.
+
+Usage:
+    python3 -m benchmarks.benchmark_device_registry
+"""
+
+import asyncio
+import functools
+import os
+import tempfile
+
+from sonoff_ewelink_cube_client_api.ts.enum.ESseEvent import ESseEvent
+from sonoff_ewelink_cube_client_api.ts.interface.IDeviceEvent import IDeviceEvent
+from sonoff_ewelink_cube_client_api.utils.deviceRegistry import DeviceRegistry
+from sonoff_ewelink_cube_client_api.utils.deviceStore import DeviceStore
+
+from .benchmark_helpers import make_device_list, measure
+
+DEVICE_COUNTS = (100, 1000, 10000)
+REPEAT = 200
+UPDATE_COUNT = 10000
+
+
+def scan(devices):
+    """Find the devices by checking every device."""
+    return [
+        device for device in devices
+        if device['display_category'] == 'light' and device['online'] and device['tags'].get('room') == 'room-3'
+        and any(capability['capability'] == 'color-temperature' for capability in device['capabilities'])
+    ]
+
+
+def query(registry):
+    """Find the devices with the registry."""
+    return registry.query(category='light', online=True, tag='room=room-3', capabilities=['color-temperature'])
+
+
+def apply(registry, events):
+    """Apply the events to the registry."""
+    for event in events:
+        registry.apply(event)
+
+
+def make_events(devices):
+    """Make state updates of the devices."""
+    events = []
+    for index in range(UPDATE_COUNT):
+        serial_number = devices[index % len(devices)]['serial_number']
+        events.append(IDeviceEvent(ESseEvent.UPDATE_DEVICE_STATE, serial_number, {
+            'endpoint': {'serial_number': serial_number}, 'payload': {'brightness': {'brightness': index % 100}}
+        }))
+    return events
+
+
+def main():
+    """Run the benchmark."""
+    print('Online lights with a color temperature in one room')
+    for count in DEVICE_COUNTS:
+        devices = make_device_list(count)['data']['device_list']
+        registry = DeviceRegistry()
+        registry.load(devices)
+        assert len(scan(devices)) == len(query(registry))
+
+        scanned = measure(functools.partial(scan, devices), REPEAT)
+        queried = measure(functools.partial(query, registry), REPEAT)
+        print(f'  {count:>6} devices  {len(query(registry)):>4} found  scan {scanned:>9.2f} µs  '
+              f'registry {queried:>8.2f} µs')
+
+    print(f'{UPDATE_COUNT} state updates of 1000 devices')
+    devices = make_device_list(1000)['data']['device_list']
+    events = make_events(devices)
+    registry = DeviceRegistry()
+    registry.load(devices)
+    in_memory = measure(functools.partial(apply, registry, events), 1) / UPDATE_COUNT
+    with tempfile.TemporaryDirectory() as directory:
+        store = DeviceStore(os.path.join(directory, 'devices.db'), batch_size=UPDATE_COUNT)
+        registry = DeviceRegistry(store)
+        registry.load(devices)
+        store.flush()
+        stored = measure(functools.partial(apply, registry, events), 1) / UPDATE_COUNT
+        written = measure(store.flush, 1)
+        asyncio.run(store.close())
+    print(f'  in memory {in_memory:.2f} µs/update  with store {stored:.2f} µs/update  '
+          f'then {written / 1000:.1f} ms to write the 1000 changed devices')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+"""
+Helper functions for benchmarks.
+"""
+
+import time
+
+from typing import Any, Callable, Dict, List
+
+
+def make_device(index: int) -> Dict[str, Any]:
+    """
+    Make a synthetic Zigbee sub-device, shaped like an item of the '/devices' device list.
+
+    Args:
+        index (int): Index of the device.
+
+    Returns:
+        Dict[str, Any]: The device.
+    """
+    return {
+        "serial_number": f"00124b00{index:08x}",
+        "third_serial_number": None,
+        "name": f"Light {index}",
+        "manufacturer": "SONOFF",
+        "model": "ZBMINI-L2",
+        "firmware_version": "1.0.8",
+        "display_category": "light",
+        "capabilities": [
+            {"capability": "power", "permission": "readWrite"},
+            {"capability": "brightness", "permission": "readWrite"},
+            {"capability": "color-temperature", "permission": "readWrite"},
+            {"capability": "rssi", "permission": "read"},
+        ],
+        "protocal": "zigbee",
+        "state": {
+            "power": {"powerState": "on" if index % 2 else "off"},
+            "brightness": {"brightness": index % 100},
+            "color-temperature": {"colorTemperature": index % 100},
+            "rssi": {"rssi": -60 - index % 30},
+        },
+        "tags": {"room": f"room-{index % 12}"},
+        "online": index % 7 != 0,
+    }
+
+
+def make_device_list(count: int) -> Dict[str, Any]:
+    """
+    Make a synthetic '/devices' response.
+
+    Args:
+        count (int): Number of devices.
+
+    Returns:
+        Dict[str, Any]: The response.
+    """
+    devices: List[Dict[str, Any]] = [make_device(index) for index in range(count)]
+    return {"error": 0, "data": {"device_list": devices}, "message": "success"}
+
+
+def measure(func: Callable[[], Any], repeat: int) -> float:
+    """
+    Measure the average run time of a function.
+
+    Args:
+        func (Callable[[], Any]): The function to run.
+        repeat (int): Number of runs.
+
+    Returns:
+        float: Average run time in microseconds.
+    """
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1e6
@@ -0,0 +1,42 @@
+"""
+Benchmark of the JSON codecs on '/devices' responses.
+
+Compares the former response path (bytes decoded to str, then json.loads) with the
+installed codecs decoding straight from the response bytes.
+
+Usage:
+    python3 -m benchmarks.benchmark_json_codec
+"""
+
+import json
+
+from sonoff_ewelink_cube_client_api.utils.jsonCodec import CODECS
+
+from .benchmark_helpers import make_device_list, measure
+
+DEVICE_COUNTS = (10, 100, 500)
+REPEAT = 200
+
+
+def main():
+    """
+    The main function of the benchmark.
+    """
+    print(f"{'devices':>8} {'bytes':>9} {'codec':>10} {'loads µs':>10} {'dumps µs':>10} {'saved/call':>11}")
+
+    for count in DEVICE_COUNTS:
+        document = make_device_list(count)
+        body = json.dumps(document).encode()
+
+        baseline = measure(lambda body=body: json.loads(body.decode()), REPEAT)
+        print(f"{count:>8} {len(body):>9} {'text+json':>10} {baseline:>10.1f} {'':>10} {'':>11}")
+
+        for name, codec_class in CODECS.items():
+            codec = codec_class()
+            loads = measure(lambda codec=codec, body=body: codec.loads(body), REPEAT)
+            dumps = measure(lambda codec=codec, document=document: codec.dumps(document), REPEAT)
+            print(f"{count:>8} {len(body):>9} {name:>10} {loads:>10.1f} {dumps:>10.1f} {baseline - loads:>9.1f}µs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+Benchmark of the sharded SSE dispatcher with handlers waiting on I/O.
+
+Dispatches device state events to a handler awaiting 2 ms (a database write, an HTTP call)
+through SseDispatcher with 16 workers: the events of a device are handled in order, the
+devices concurrently, so the throughput grows with the number of devices sending events.
+
+Usage:
+    python3 -m benchmarks.benchmark_sse_dispatcher
+"""
+
+import asyncio
+import time
+
+from sonoff_ewelink_cube_client_api.ts.enum.ESseEvent import ESseEvent
+from sonoff_ewelink_cube_client_api.utils.sseDispatcher import SseDispatcher
+
+EVENT_COUNT = 400
+DEVICE_COUNTS = (1, 2, 4, 8, 16)
+WORKERS = 16
+HANDLER_SECONDS = 0.002
+
+
+async def dispatch(device_count):
+    """Dispatch the events of some devices, and get the events handled per second."""
+    last = {}
+
+    async def handler(data):
+        serial_number = data['endpoint']['serial_number']
+        await asyncio.sleep(HANDLER_SECONDS)
+        assert last.get(serial_number, -1) < data['payload']['index']
+        last[serial_number] = data['payload']['index']
+
+    dispatcher = SseDispatcher(workers=WORKERS, max_queue=EVENT_COUNT)
+    started = time.perf_counter()
+    for index in range(EVENT_COUNT):
+        data = {'endpoint': {'serial_number': f'sn{index % device_count}'}, 'payload': {'index': index}}
+        await dispatcher.put(ESseEvent.UPDATE_DEVICE_STATE.value, data, handler)
+    await dispatcher.join()
+    seconds = time.perf_counter() - started
+    await dispatcher.close()
+    return EVENT_COUNT / seconds
+
+
+def main():
+    """Run the benchmark."""
+    print(f'{EVENT_COUNT} events, handler awaiting {HANDLER_SECONDS * 1000:.0f} ms, {WORKERS} workers')
+    for device_count in DEVICE_COUNTS:
+        rate = asyncio.run(dispatch(device_count))
+        print(f'  {device_count:>3} devices {rate:>10,.0f} events/s')
+
+
+if __name__ == '__main__':
+    main()
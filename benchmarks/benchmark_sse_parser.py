@@ -0,0 +1,153 @@
+"""
+Benchmark of the SSE parser on a synthetic high-rate stream of device state events.
+
+Compares the former parsing of the SSE stream (the aiohttp response read line by line, each
+line decoded to str and stripped) with SseParser working on the raw chunks of the response:
+events parsed per second, the stream arriving in chunks of 4 KiB with a heartbeat comment every
+100 events. The parsing alone, without the aiohttp line reader, is measured as well.
+
+Usage:
+    python3 -m benchmarks.benchmark_sse_parser
+"""
+
+import asyncio
+import json
+import time
+
+import aiohttp
+
+from sonoff_ewelink_cube_client_api.utils.sseParser import SseParser
+
+from .benchmark_helpers import measure
+
+EVENT_COUNT = 10000
+CHUNK_SIZE = 4096
+REPEAT = 10
+
+
+def make_stream(count):
+    """Make a stream of device state events."""
+    lines = []
+    for index in range(count):
+        if index % 100 == 0:
+            lines.append(b': heartbeat\n\n')
+        data = json.dumps({
+            'endpoint': {'serial_number': f'00124b00{index % 500:08x}'},
+            'payload': {
+                'power': {'powerState': 'on' if index % 2 else 'off'},
+                'brightness': {'brightness': index % 100},
+            },
+        })
+        lines.append(f'event: device#v1#updateDeviceState\nid: {index}\ndata: {data}\n\n'.encode())
+    return b''.join(lines)
+
+
+def split(body):
+    """Split a stream into chunks."""
+    return [body[start:start + CHUNK_SIZE] for start in range(0, len(body), CHUNK_SIZE)]
+
+
+def parse_line(line, event_name, events):
+    """Parse a line the former way, and get the pending event name."""
+    event = line.decode().strip()
+    if event.startswith("event:"):
+        return event[6:].strip()
+    if event.startswith("data:") and event_name:
+        event_data = event[5:]
+        if event_data.strip() != "":
+            events.append((event_name, event_data))
+            return None
+    return event_name
+
+
+def line_based(chunks):
+    """Parse the stream the former way, from lines split in memory."""
+    events = []
+    buffer = b''
+    event_name = None
+    for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b'\n')
+        for line in lines:
+            event_name = parse_line(line, event_name, events)
+    return events
+
+
+def byte_based(chunks):
+    """Parse the stream with SseParser."""
+    parser = SseParser()
+    events = []
+    for chunk in chunks:
+        for message in parser.feed(chunk):
+            events.append((message.event, message.data))
+    return events
+
+
+class Protocol:
+    """Stand-in of the connection protocol of a response stream, its flow control does nothing."""
+    _reading_paused = False
+    connected = True
+
+    def pause_reading(self, **_kwargs):
+        """Pause the connection."""
+
+    def resume_reading(self, **_kwargs):
+        """Resume the connection."""
+
+
+async def read_stream(chunks, reader_based):
+    """Feed the chunks to an aiohttp response stream as they would arrive, and parse it, in seconds."""
+    reader = aiohttp.StreamReader(Protocol(), 2 ** 16, loop=asyncio.get_running_loop())
+
+    async def receive():
+        for chunk in chunks:
+            reader.feed_data(chunk)
+            await asyncio.sleep(0)
+        reader.feed_eof()
+
+    started = time.perf_counter()
+    task = asyncio.ensure_future(receive())
+    events = await reader_based(reader)
+    await task
+    assert len(events) == EVENT_COUNT
+    return time.perf_counter() - started
+
+
+async def read_lines(reader):
+    """Read the response line by line, the former way."""
+    events = []
+    event_name = None
+    async for line in reader:
+        event_name = parse_line(line, event_name, events)
+    return events
+
+
+async def read_chunks(reader):
+    """Read the raw chunks of the response with SseParser."""
+    parser = SseParser()
+    events = []
+    async for chunk in reader.iter_any():
+        for message in parser.feed(chunk):
+            events.append((message.event, message.data))
+    return events
+
+
+def main():
+    """Run the benchmark."""
+    chunks = split(make_stream(EVENT_COUNT))
+    assert len(line_based(chunks)) == len(byte_based(chunks)) == EVENT_COUNT
+
+    print(f'{EVENT_COUNT} events, {sum(map(len, chunks)) // 1024} KiB in {CHUNK_SIZE // 1024} KiB chunks')
+    print('aiohttp response stream')
+    for name, reader_based in (('lines (str)', read_lines), ('SseParser (bytes)', read_chunks)):
+        seconds = min(asyncio.run(read_stream(chunks, reader_based)) for _ in range(REPEAT))
+        print(f'  {name:<20} {EVENT_COUNT / seconds:>12,.0f} events/s')
+
+    print('parsing only')
+    for name, func in (('lines (str)', line_based), ('SseParser (bytes)', byte_based)):
+        seconds = measure(lambda func=func: func(chunks), REPEAT) / 1e6
+        print(f'  {name:<20} {EVENT_COUNT / seconds:>12,.0f} events/s')
+
+
+if __name__ == '__main__':
+    main()
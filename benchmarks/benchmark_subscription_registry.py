@@ -0,0 +1,73 @@
+"""
+Benchmark of the routing of SSE events to many subscribers.
+
+Each subscriber listens to the state updates of one device. Compares checking every
+subscription against the event (a list of listeners) with SubscriptionRegistry, whose
+index finds the subscriptions of the device directly: the registry routes an event in the
+same time whatever the number of subscriptions.
+
+Usage:
+    python3 -m benchmarks.benchmark_subscription_registry
+"""
+
+import functools
+
+from sonoff_ewelink_cube_client_api.ts.enum.ESseEvent import ESseEvent
+from sonoff_ewelink_cube_client_api.ts.interface.IDeviceEvent import IDeviceEvent
+from sonoff_ewelink_cube_client_api.utils.subscriptionRegistry import SubscriptionRegistry
+
+from .benchmark_helpers import make_device, measure
+
+SUBSCRIPTION_COUNTS = (10, 100, 1000, 10000)
+EVENT_COUNT = 1000
+REPEAT = 5
+STATE = ESseEvent.UPDATE_DEVICE_STATE.value
+
+
+async def handler(_data):
+    """Handle nothing."""
+
+
+def make_events(count, device_count):
+    """Make state updates of the devices."""
+    events = []
+    for index in range(count):
+        serial_number = make_device(index % device_count)['serial_number']
+        events.append(IDeviceEvent(ESseEvent.UPDATE_DEVICE_STATE, serial_number, {
+            'endpoint': {'serial_number': serial_number}, 'payload': {'power': {'powerState': 'on'}}
+        }))
+    return events
+
+
+def scan(events, listeners):
+    """Route the events by checking every listener."""
+    for event in events:
+        assert len([listener for event_name, devices, listener in listeners
+                    if event_name == STATE and event.serial_number in devices]) == 1
+
+
+def route(events, registry):
+    """Route the events with the registry."""
+    for event in events:
+        assert len(registry.match(event)) == 1
+
+
+def main():
+    """Run the benchmark."""
+    print(f'{EVENT_COUNT} state updates, one subscriber per device')
+    for count in SUBSCRIPTION_COUNTS:
+        registry = SubscriptionRegistry()
+        listeners = []
+        for index in range(count):
+            serial_number = make_device(index)['serial_number']
+            registry.subscribe(handler, types=[STATE], devices=[serial_number])
+            listeners.append((STATE, frozenset([serial_number]), handler))
+        events = make_events(EVENT_COUNT, count)
+
+        scanned = measure(functools.partial(scan, events, listeners), REPEAT) / EVENT_COUNT
+        routed = measure(functools.partial(route, events, registry), REPEAT) / EVENT_COUNT
+        print(f'  {count:>6} subscriptions  scan {scanned:>9.2f} µs/event  registry {routed:>6.2f} µs/event')
+
+
+if __name__ == '__main__':
+    main()
@@ -109,7 +109,7 @@ async def main():
 
     finally:
         # Cancel all tasks and gather them
-        sse.unmount_sse_func()
+        await sse.unmount_sse_func()
 
 
 if __name__ == "__main__":
@@ -48,4 +48,8 @@ setup(
         "aiohttp>=3.0.0",
         "asyncio>=3.4.3"
     ],
+    extras_require={
+        "orjson": ["orjson>=3.0.0"],
+        "ujson": ["ujson>=5.0.0"],
+    },
 )
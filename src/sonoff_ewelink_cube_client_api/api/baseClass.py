@@ -9,14 +9,35 @@ Classes:
 Usage:
     from .baseClass import BaseClass
 """
+#pylint: disable-msg=too-many-instance-attributes
 
-from typing import Dict, Any
+from typing import Any, AsyncIterator, BinaryIO, Callable, Dict, List, Optional, Union
+
+import os
 
 import logging
 
+from ..errors import ResponseError
 from ..ts.enum.EMethod import EMethod
 from ..ts.enum.EPath import EPath
+from ..ts.enum.EResponse import EResponseErrorCode
+from ..ts.interface.IDeviceEvent import IDeviceEvent
+from ..ts.interface.IDownloadStats import IDownloadStats
 from ..ts.interface.IResponse import IResponse
+from ..ts.interface.ITransportConfig import ITransportConfig
+from ..utils.circuitBreaker import CircuitBreaker
+from ..utils.concurrencyLimiter import AdaptiveConcurrencyLimiter
+from ..utils.deadline import Deadline, default_timeout
+from ..utils.deviceRegistry import DEVICE_EVENTS, DeviceRegistry
+from ..utils.deviceStore import DeviceStore
+from ..utils.httpTransport import HttpTransport
+from ..utils.jsonCodec import JsonCodec, get_codec
+from ..utils.reconnectPolicy import ReconnectPolicy
+from ..utils.responseCache import ResponseCache
+from ..utils.retryPolicy import RetryPolicy
+from ..utils.singleFlight import SingleFlight
+from ..utils.sseDispatcher import SseDispatcher
+from ..utils.subscriptionRegistry import Subscription, SubscriptionRegistry
 
 from .baseClassBridge import BaseClassBridge
 from .baseClassDevice import BaseClassDevice
@@ -30,6 +51,11 @@ class BaseClass(BaseClassBridge, BaseClassDevice, BaseClassHardware, BaseClassSs
     """
     Represents the BaseClass API.
 
+    The 'timeout' of a request method is a time budget in seconds or a Deadline shared by several
+    calls, covering the queueing and the retries of the request. Without it, the request gets the
+    default of its endpoint, from 'timeouts' (utils/deadline.DEFAULT_TIMEOUTS by default). The
+    'timeout' of getBridgeAT stays in milliseconds, for the whole wait for the link button.
+
     Inherits:
         BaseClassSse: Base class for APIs that support Server-Sent Events (SSE).
 
@@ -37,18 +63,55 @@ class BaseClass(BaseClassBridge, BaseClassDevice, BaseClassHardware, BaseClassSs
         ip (str): IP address of the device.
         at (str): Access token for the gateway.
         debug (bool): Debug mode flag.
+        transport (HttpTransport): Pooled HTTP transport of the gateway.
+        limiter (AdaptiveConcurrencyLimiter): Adaptive limit of the concurrent requests, None disables it.
+        retry_policy (RetryPolicy): Retries the transient failures of the requests, None disables it.
+        circuit_breaker (CircuitBreaker): Fails the requests fast while the gateway is down, None disables it.
+        single_flight (SingleFlight): Coalesces concurrent identical GET requests, None disables it.
+        sse_dispatcher (SseDispatcher): Runs the SSE event handlers apart from the stream reader, None disables it.
+        sse_reconnect (ReconnectPolicy): Delays and statistics of the SSE reconnections, None waits at least a second.
+        sse_subscriptions (SubscriptionRegistry): Subscriptions to the SSE events, indexed for routing.
+        response_cache (Optional[ResponseCache]): Caches the responses of the read endpoints, None disables it.
+        codec (JsonCodec): JSON codec of the request bodies, responses and SSE payloads.
+        device_registry (Optional[DeviceRegistry]): Mirror of the devices, created by mirrorDevices, or with the
+            stored devices when there is a device store.
+        device_store (Optional[DeviceStore]): Persistent store of the device registry, None disables it.
 
     Methods:
-        __init__(ip: str, at: str = '', debug: bool = False): Initializes the BaseClass object.
+        __init__(ip: str, at: str = '', debug: bool = False, transport_config: ITransportConfig = None,
+                 response_cache: ResponseCache = None, device_store: DeviceStore = None): Initializes the BaseClass
+            object.
         setIp(ip: str): Sets the IP address of the device.
         getIp() -> str: Gets the IP address of the device.
         setAT(at: str): Sets the access token for the gateway.
         getAt() -> str: Gets the access token for the gateway.
-        sendCommandToDevice(deviceId: str, command: Dict[str, Any]) -> Dict[str, Any]: Sends a command to a device.
-        getDebugLog() -> Dict[str, Any]: Gets the debug log interface.
+        sendCommandToDevice(deviceId: str, command: Dict[str, Any], timeout=None) -> Dict[str, Any]:
+            Sends a command to a device.
+        getDebugLog(serial_number, params, timeout=None) -> Dict[str, Any]: Gets the debug log interface.
+        streamDebugLog(serial_number, params, timeout=None) -> AsyncIterator[bytes]: Streams a debug log file.
+        downloadDebugLog(serial_number, destination, params, timeout=None) -> IDownloadStats: Downloads a debug
+            log file.
+        mirrorDevices(timeout=None) -> DeviceRegistry: Loads the device mirror, kept up to date by the SSE events,
+            starting the SSE stream if needed and missing none of the events sent meanwhile.
+        reconcileDevices(timeout=None) -> List[IDeviceEvent]: Brings the device mirror up to date with the gateway,
+            publishing the differences as device events.
+        close(): Closes the SSE session and dispatcher, the probes of the circuit breaker, the pooled HTTP
+            transport and the device store.
+
+    Usage:
+        async with IHostClass(ip='ihost.local', at=access_token) as api:
+            await api.getDeviceList()
     """
 
-    def __init__(self, ip: str, at: str = '', debug: bool = False):
+    def __init__(
+            self,
+            ip: str,
+            at: str = '',
+            debug: bool = False,
+            transport_config: Optional[ITransportConfig] = None,
+            response_cache: Optional[ResponseCache] = None,
+            device_store: Optional[DeviceStore] = None
+    ):
         """
         Initializes the BaseClass object.
 
@@ -56,11 +119,65 @@ class BaseClass(BaseClassBridge, BaseClassDevice, BaseClassHardware, BaseClassSs
             ip (str): IP address of the device.
             at (str): Access token for the gateway.
             debug (bool): Debug mode flag.
+            transport_config (Optional[ITransportConfig]): Tuning options of the HTTP transport.
+            response_cache (Optional[ResponseCache]): Opt-in cache of the read endpoints (default: disabled).
+            device_store (Optional[DeviceStore]): Opt-in persistent store of the device registry, closed with the
+                API (default: disabled).
         """
         super().__init__()
         self.ip: str = ip
         self.at: str = at
         self.debug: bool = debug
+        self.transport: HttpTransport = HttpTransport(transport_config)
+        self.limiter: AdaptiveConcurrencyLimiter = AdaptiveConcurrencyLimiter(
+            initial_window=min(4, self.transport.config.limit),
+            max_window=self.transport.config.limit
+        )
+        self.retry_policy: RetryPolicy = RetryPolicy()
+        self.circuit_breaker: CircuitBreaker = CircuitBreaker(name=ip, probe=self._probeBridge)
+        self.single_flight: SingleFlight = SingleFlight()
+        self.sse_dispatcher: SseDispatcher = SseDispatcher()
+        self.sse_reconnect: ReconnectPolicy = ReconnectPolicy()
+        self.sse_subscriptions: SubscriptionRegistry = SubscriptionRegistry()
+        self.response_cache: Optional[ResponseCache] = response_cache
+        self.codec: JsonCodec = get_codec()
+        self.device_store: Optional[DeviceStore] = device_store
+        self.device_registry: Optional[DeviceRegistry] = DeviceRegistry(device_store) if device_store else None
+        self._device_subscription: Optional[Subscription] = None
+        # The events buffered for each mirrorDevices call loading the device list
+        self._device_backlogs: List[List[IDeviceEvent]] = []
+
+    async def __aenter__(self) -> 'BaseClass':
+        """
+        Enters the async context of the API.
+
+        Returns:
+            BaseClass: The API object.
+        """
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        """
+        Leaves the async context of the API and closes its connections.
+
+        Args:
+            exc_type: Type of the raised exception, if any.
+            exc_value: The raised exception, if any.
+            traceback: Traceback of the raised exception, if any.
+        """
+        await self.close()
+
+    async def close(self) -> None:
+        """
+        Closes the SSE session and dispatcher, the probes of the circuit breaker, the pooled HTTP transport
+        and the device store, writing its staged changes.
+        """
+        await super().close()
+        if self.circuit_breaker is not None:
+            await self.circuit_breaker.close()
+        await self.transport.close()
+        if self.device_store is not None:
+            await self.device_store.close()
 
     def setIp(self, ip: str):
         """
@@ -98,13 +215,19 @@ class BaseClass(BaseClassBridge, BaseClassDevice, BaseClassHardware, BaseClassSs
         """
         return self.at
 
-    async def sendCommandToDevice(self, deviceId: str, command: Dict[str, Any]) -> IResponse:
+    async def sendCommandToDevice(
+            self,
+            deviceId: str,
+            command: Dict[str, Any],
+            timeout: Union[None, float, Deadline] = None
+    ) -> IResponse:
         """
         Updates specific device information or state.
 
         Args:
             deviceId (str): ID of the device to send the command to.
             command (Dict[str, Any]): Command to be sent to the device.
+            timeout (Union[None, float, Deadline]): Seconds or deadline (default: 5 seconds).
 
         Returns:
             IResponse: IResponse object containing the response data.
@@ -112,18 +235,238 @@ class BaseClass(BaseClassBridge, BaseClassDevice, BaseClassHardware, BaseClassSs
         return await self.httpRequest(
             path=EPath.DEVICE.value,
             method=EMethod.PUT,
-            params={'deviceId': deviceId, 'command': command}
+            params={'deviceId': deviceId, 'command': command},
+            timeout=timeout
         )
 
-    async def getDebugLog(self, serial_number, params) -> IResponse:
+    async def getDebugLog(self, serial_number, params, timeout: Union[None, float, Deadline] = None) -> IResponse:
         """
         Gets the debug log interface.
 
+        Args:
+            serial_number (str): Serial number of the device.
+            params (Dict[str, Any]): Parameters of the debug log request.
+            timeout (Union[None, float, Deadline]): Seconds or deadline (default: 60 seconds).
+
         Returns:
             Dict[str, Any]: Dictionary containing the response data.
         """
         return await self.httpRequest(
             path=f'{EPath.DEBUG_LOG.value}/{serial_number}',
             method=EMethod.GET,
-            params=params
+            params=params,
+            timeout=timeout
         )
+
+    def streamDebugLog(
+            self,
+            serial_number: str,
+            params: Dict[str, Any],
+            chunk_size: int = 65536,
+            stats: Optional[IDownloadStats] = None,
+            timeout: Union[None, float, Deadline] = None
+    ) -> AsyncIterator[bytes]:
+        """
+        Streams a debug log file chunk by chunk, without buffering it in memory.
+
+        Args:
+            serial_number (str): Serial number of the device.
+            params (Dict[str, Any]): Parameters of the debug log request.
+            chunk_size (int): Maximum size of a chunk in bytes (default: 65536).
+            stats (Optional[IDownloadStats]): Updated with the received bytes and throughput (default: None).
+            timeout (Union[None, float, Deadline]): Seconds or deadline (default: 60 seconds for the whole transfer).
+
+        Returns:
+            AsyncIterator[bytes]: The chunks of the debug log file.
+        """
+        return self.httpStream(
+            path=f'{EPath.DEBUG_LOG.value}/{serial_number}',
+            params=params,
+            chunk_size=chunk_size,
+            stats=stats,
+            timeout=timeout
+        )
+
+    async def downloadDebugLog(
+            self,
+            serial_number: str,
+            destination: Union[str, os.PathLike, int, BinaryIO],
+            params: Dict[str, Any],
+            progress: Optional[Callable[[IDownloadStats], None]] = None,
+            timeout: Union[None, float, Deadline] = None
+    ) -> IDownloadStats:
+        """
+        Downloads a debug log file to a file path, file descriptor or binary file object.
+
+        Args:
+            serial_number (str): Serial number of the device.
+            destination (Union[str, os.PathLike, int, BinaryIO]): Where to write the debug log file.
+            params (Dict[str, Any]): Parameters of the debug log request.
+            progress (Optional[Callable[[IDownloadStats], None]]): Called after each written chunk (default: None).
+            timeout (Union[None, float, Deadline]): Seconds or deadline (default: 60 seconds for the whole transfer).
+
+        Returns:
+            IDownloadStats: The received bytes and throughput of the download.
+        """
+        return await self.httpDownload(
+            path=f'{EPath.DEBUG_LOG.value}/{serial_number}',
+            destination=destination,
+            params=params,
+            progress=progress,
+            timeout=timeout
+        )
+
+    async def mirrorDevices(self, timeout: Union[None, float, Deadline] = None) -> DeviceRegistry:
+        """
+        Loads the device list into the device registry, which the device events keep up to date.
+
+        The first call subscribes 'device_registry' to the device events, creating it if needed.
+        The SSE stream is started if not running, and the device list is requested
+        once it is connected: the events received while the list is loading are buffered, then
+        replayed on top of it, so none is lost or applied out of order. Replaying the events the
+        list already includes is harmless, each one setting the values it carries. Overlapping
+        calls each buffer the events received during their own device list.
+
+        The device list replaces the devices of a registry which never got one. A registry already
+        holding devices, from a previous call or from the device store at start-up, usable at once, gets
+        the device list as a diff: only the devices changed meanwhile get a new version and a
+        write to the store. The device list is always requested anew, neither served by the
+        response cache nor shared with a request sent before the stream was connected.
+
+        Args:
+            timeout (Union[None, float, Deadline]): Time budget in seconds or deadline of the SSE connection
+                and the device list (default: None, the default of the device list).
+
+        Returns:
+            DeviceRegistry: The device registry.
+
+        Raises:
+            ValueError: If the SSE stream cannot be started, without IP address or access token.
+            ResponseError: If the gateway answered with an error code.
+            DeadlineExceededError: If the SSE stream is not connected or the device list not loaded in time.
+        """
+        deadline = Deadline.resolve(timeout, default_timeout(EMethod.GET, EPath.DEVICE.value, self.timeouts))
+        if self.device_registry is None:
+            self.device_registry = DeviceRegistry(self.device_store)
+        if self._device_subscription is None:
+            self._device_subscription = self.subscribe(self._mirrorDeviceEvent, types=DEVICE_EVENTS, typed=True)
+
+        backlog: List[IDeviceEvent] = []
+        self._device_backlogs.append(backlog)
+        try:
+            if self.sse_task is None or self.sse_task.done():
+                started = await self.init_sse()
+                if started is not True:
+                    reason = started.get('msg') if isinstance(started, dict) else 'init_sse failed'
+                    raise ValueError(f'SSE stream not started: {reason}')
+            await deadline.run(self.wait_sse_open())
+
+            devices = await self._fetchDeviceList(deadline)
+            if self.device_registry.loaded:
+                for event in self.device_registry.diff(devices):
+                    self._applyDeviceEvent(event)
+            else:
+                self.device_registry.load(devices)
+            if self.sse_subscriptions is not None:
+                self.sse_subscriptions.learn_devices(devices)
+            _LOGGER.debug(f'Replaying {len(backlog)} device events received while loading the device list')
+            for event in backlog:
+                self._applyDeviceEvent(event)
+        finally:
+            self._device_backlogs = [pending for pending in self._device_backlogs if pending is not backlog]
+        return self.device_registry
+
+    async def reconcileDevices(self, timeout: Union[None, float, Deadline] = None) -> List[IDeviceEvent]:
+        """
+        Brings the device registry up to date with the device list of the gateway.
+
+        The device list is compared with the registry, and what changed is published as device
+        events, routed to the registry and to every subscriber like the events of the stream:
+        the consumers get the changes only, not the whole device list. It runs after each
+        reconnection of the SSE stream, catching up with the events missed while disconnected.
+        A registry which never got a device list, e.g. after a failed mirrorDevices, loads it
+        instead of publishing every device as added. As for mirrorDevices, the device list is
+        always requested anew.
+
+        Args:
+            timeout (Union[None, float, Deadline]): Time budget in seconds or deadline of the device list
+                (default: None, the default of the endpoint).
+
+        Returns:
+            List[IDeviceEvent]: The published events, none if the registry was up to date, loaded or is not
+                mirrored.
+
+        Raises:
+            ResponseError: If the gateway answered with an error code.
+        """
+        if self._device_subscription is None:
+            return []
+
+        deadline = Deadline.resolve(timeout, default_timeout(EMethod.GET, EPath.DEVICE.value, self.timeouts))
+        devices = await self._fetchDeviceList(deadline)
+        if not self.device_registry.loaded:
+            self.device_registry.load(devices)
+            if self.sse_subscriptions is not None:
+                self.sse_subscriptions.learn_devices(devices)
+            return []
+
+        events = self.device_registry.diff(devices)
+        _LOGGER.debug(f'Device registry reconciled with {len(events)} events')
+        for event in events:
+            await self.publish_event(event)
+        return events
+
+    async def _fetchDeviceList(self, deadline: Deadline) -> List[Dict[str, Any]]:
+        """
+        Requests the device list, bypassing the response cache and the requests in flight.
+
+        Args:
+            deadline (Deadline): Deadline of the request.
+
+        Returns:
+            List[Dict[str, Any]]: The devices.
+
+        Raises:
+            ResponseError: If the gateway answered with an error code.
+        """
+        url, headers = self._buildRequest(EPath.DEVICE.value, True, None)
+        default = default_timeout(EMethod.GET, EPath.DEVICE.value, self.timeouts)
+        response = await deadline.run(self._retryRequest(url, EMethod.GET, None, headers, deadline, default))
+        if response.error != EResponseErrorCode.ERROR_SUCCESS.value:
+            raise ResponseError(response)
+        return (response.data or {}).get('device_list') or []
+
+    async def _resync_after_reconnect(self) -> None:
+        """
+        Reconciles the device registry, if any, with the device list after a reconnection of the SSE stream.
+        """
+        if self._device_subscription is None:
+            return
+        try:
+            await self.reconcileDevices()
+        except Exception as error:  # pylint: disable=broad-except
+            _LOGGER.warning(f'Device registry not reconciled after reconnecting: {error!r}')
+
+    async def _mirrorDeviceEvent(self, event: IDeviceEvent) -> None:
+        """
+        Applies a device event to the device registry, or buffers it for each call loading the device list.
+
+        Args:
+            event (IDeviceEvent): The event.
+        """
+        if not self._device_backlogs:
+            self._applyDeviceEvent(event)
+        for backlog in self._device_backlogs:
+            backlog.append(event)
+
+    def _applyDeviceEvent(self, event: IDeviceEvent) -> None:
+        """
+        Applies a device event to the device registry.
+
+        Args:
+            event (IDeviceEvent): The event.
+        """
+        try:
+            self.device_registry.apply(event)
+        except ValueError as error:
+            _LOGGER.warning(f'Invalid device event {event.type}: {error}')
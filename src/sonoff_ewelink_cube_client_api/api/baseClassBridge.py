@@ -10,7 +10,7 @@ Usage:
     from .baseClassBridge import BaseClassBridge
 """
 
-from typing import Any, Awaitable, Dict, Tuple
+from typing import Any, Awaitable, Dict, Tuple, Union
 
 import logging
 
@@ -19,7 +19,9 @@ import asyncio
 from ..config import Store
 from ..ts.enum.EMethod import EMethod
 from ..ts.enum.EPath import EPath
+from ..ts.enum.EResponse import EResponseErrorCode
 from ..ts.interface.IResponse import IResponse
+from ..utils.deadline import Deadline, default_timeout
 from ..utils.httpUtils import httpUtils
 
 from ..errors import AccessTokenRequestError, AccessTokenUnauthorized
@@ -33,12 +35,13 @@ class BaseClassBridge(Store, httpUtils):
 
     Attributes:
         interval (int): Interval for event subscription.
-        timeout (int): Timeout for getting the bridge access token.
+        timeout (int): Timeout in milliseconds for getting the bridge access token.
 
     Methods:
         getBridgeAT(timeout: int = 120000, interval: int = 2000) -> Dict[str, Any]: Gets the bridge access token.
-        getBridgeInfo() -> Dict[str, Any]: Gets the gateway information.
-        updateBridgeConfig(volume: int) -> Dict[str, Any]: Updates the gateway configuration.
+        getBridgeInfo(timeout=None) -> Dict[str, Any]: Gets the gateway information.
+        getBridgeRuntime(timeout=None) -> Dict[str, Any]: Gets the gateway running state.
+        updateBridgeConfig(volume: int, timeout=None) -> Dict[str, Any]: Updates the gateway configuration.
     """
     interval = None
     timeout = None
@@ -47,6 +50,9 @@ class BaseClassBridge(Store, httpUtils):
         """
         Gets the bridge access token.
 
+        Unlike the other request methods, its timeout is in milliseconds: it covers the wait for the
+        link button, and is the deadline of every request sent meanwhile.
+
         Args:
             timeout (int): Timeout in milliseconds (default: 120000).
             interval (int): Interval between attempts in milliseconds (default: 2000).
@@ -54,6 +60,8 @@ class BaseClassBridge(Store, httpUtils):
         Returns:
             Dict[str, Any]: Dictionary containing the response data.
         """
+        deadline = Deadline(timeout / 1000)
+
         async def verifyAccessToken() -> bool:
             """
             Verify the access token with an endpoint check.
@@ -61,6 +69,7 @@ class BaseClassBridge(Store, httpUtils):
             resp = await self.httpRequest(
                 path=EPath.DEVICE.value,
                 method=EMethod.GET,
+                timeout=deadline,
             )
 
             if not resp['error']:
@@ -78,7 +87,8 @@ class BaseClassBridge(Store, httpUtils):
             resp = await self.httpRequest(
                 path=EPath.BRIDGE_TOKEN.value,
                 method=EMethod.GET,
-                isNeedAT=False
+                isNeedAT=False,
+                timeout=deadline,
             )
 
             # Waiting...
@@ -110,27 +120,61 @@ class BaseClassBridge(Store, httpUtils):
                 await asyncio.sleep(interval / 1000)
 
         # Get access token and validate
-        return await asyncio.wait_for(asyncio.gather(getBridgeATHandler(), intervalFunc()), timeout / 1000)
+        return await deadline.run(asyncio.gather(getBridgeATHandler(), intervalFunc()))
 
-    async def getBridgeInfo(self) -> IResponse:
+    async def getBridgeInfo(self, timeout: Union[None, float, Deadline] = None) -> IResponse:
         """
         Gets the gateway information.
 
+        Args:
+            timeout (Union[None, float, Deadline]): Seconds or deadline (default: 5 seconds).
+
         Returns:
             Dict[str, Any]: Dictionary containing the response data.
         """
         return await self.httpRequest(
            path=EPath.BRIDGE.value,
            method=EMethod.GET,
-           isNeedAT=False
+           isNeedAT=False,
+           timeout=timeout
+        )
+
+    async def _probeBridge(self) -> bool:
+        """
+        Probes the gateway with the getBridgeInfo request, bypassing the cache, the retries
+        and the circuit breaker of the gateway.
+
+        Returns:
+            bool: True if the gateway answered successfully.
+        """
+        url, headers = self._buildRequest(EPath.BRIDGE.value, False, None)
+        deadline = Deadline(default_timeout(EMethod.GET, EPath.BRIDGE.value, self.timeouts), endpoint_default=True)
+        response = await deadline.run(self._transmitRequest(url, EMethod.GET, None, headers, deadline))
+        return response.error == EResponseErrorCode.ERROR_SUCCESS.value
+
+    async def getBridgeRuntime(self, timeout: Union[None, float, Deadline] = None) -> IResponse:
+        """
+        Gets the gateway running state (RAM and CPU usage, power up time).
+
+        Args:
+            timeout (Union[None, float, Deadline]): Seconds or deadline (default: 5 seconds).
+
+        Returns:
+            Dict[str, Any]: Dictionary containing the response data.
+        """
+        return await self.httpRequest(
+            path=EPath.BRIDGE_RUNTIME.value,
+            method=EMethod.GET,
+            timeout=timeout
         )
 
-    async def updateBridgeConfig(self, volume: int) -> IResponse:
+    async def updateBridgeConfig(self, volume: int, timeout: Union[None, float, Deadline] = None) -> IResponse:
         """
         Updates the gateway configuration.
 
         Args:
             volume (int): System Volume value to be updated. [0-100]
+            timeout (Union[None, float, Deadline]): Seconds or deadline (default: 5 seconds).
 
         Returns:
             Dict[str, Any]: Dictionary containing the response data.
@@ -138,5 +182,6 @@ class BaseClassBridge(Store, httpUtils):
         return await self.httpRequest(
             path=EPath.BRIDGE_CONFIG.value,
             method=EMethod.PUT,
-            params={'volume': volume}
+            params={'volume': volume},
+            timeout=timeout
         )
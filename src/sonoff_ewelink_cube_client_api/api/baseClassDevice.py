@@ -10,12 +10,13 @@ Usage:
     from .baseClassDevice import BaseClassDevice
 """
 
-from typing import Dict, Any, Union
+from typing import Any, AsyncIterator, Dict, Iterable, Optional, Union
 
 from ..ts.enum.EMethod import EMethod
 from ..ts.enum.EPath import EPath
 from ..ts.interface.IResponse import IResponse
 from ..ts.interface.api.IDevicesDiscoveryRequest import IDevicesDiscoveryRequest
+from ..utils.deadline import Deadline
 from ..utils.httpUtils import httpUtils
 
 
@@ -24,24 +25,31 @@ class BaseClassDevice(httpUtils):
     Represents the BaseClassDevice API.
 
     Methods:
-        discoverySubDevices(params: Dict[str, Any]) -> Dict[str, Any]:
+        discoverySubDevices(params: Dict[str, Any], timeout=None) -> Dict[str, Any]:
             Searches for sub-devices.
-        manualAddSubDevice(params: Dict[str, Any]) -> Dict[str, Any]:
+        manualAddSubDevice(params: Dict[str, Any], timeout=None) -> Dict[str, Any]:
             Manually adds a sub-device.
-        getDeviceList() -> Dict[str, Any]:
+        getDeviceList(timeout=None) -> Dict[str, Any]:
             Gets the device list.
-        updateDeviceState(serial_number: str, updateParams: Dict[str, Any]) -> Dict[str, Any]:
+        iterDeviceList(fields: Optional[Iterable[str]] = None, timeout=None) -> AsyncIterator[Dict[str, Any]]:
+            Streams the device list device by device.
+        updateDeviceState(serial_number: str, updateParams: Dict[str, Any], timeout=None) -> Dict[str, Any]:
             Updates the status of a specified device.
-        deleteDevice(serial_number: str) -> Dict[str, Any]:
+        deleteDevice(serial_number: str, timeout=None) -> Dict[str, Any]:
             Deletes a device.
     """
 
-    async def discoverySubDevices(self, params: Union[IDevicesDiscoveryRequest, Dict[str, Any]]) -> IResponse:
+    async def discoverySubDevices(
+            self,
+            params: Union[IDevicesDiscoveryRequest, Dict[str, Any]],
+            timeout: Union[None, float, Deadline] = None
+    ) -> IResponse:
         """
         Searches for sub-devices.
 
         Args:
             params (Dict[str, Any]): Parameters for the request.
+            timeout (Union[None, float, Deadline]): Seconds or deadline (default: 10 seconds).
 
         Returns:
             IResponse: IResponse object containing the response data.
@@ -55,15 +63,21 @@ class BaseClassDevice(httpUtils):
         return await self.httpRequest(
             path=EPath.DEVICE_DISCOVERY.value,
             method=EMethod.PUT,
-            params=params
+            params=params,
+            timeout=timeout
         )
 
-    async def manualAddSubDevice(self, params: Dict[str, Any]) -> IResponse:
+    async def manualAddSubDevice(
+            self,
+            params: Dict[str, Any],
+            timeout: Union[None, float, Deadline] = None
+    ) -> IResponse:
         """
         Manually adds a sub-device (currently only supports adding RTSP cameras and ESP32 cameras).
 
         Args:
             params (Dict[str, Any]): Parameters for the request.
+            timeout (Union[None, float, Deadline]): Seconds or deadline (default: 30 seconds).
 
         Returns:
             IResponse: IResponse object containing the response data.
@@ -71,28 +85,69 @@ class BaseClassDevice(httpUtils):
         return await self.httpRequest(
             path=EPath.DEVICE.value,
             method=EMethod.POST,
-            params=params
+            params=params,
+            timeout=timeout
         )
 
-    async def getDeviceList(self) -> IResponse:
+    async def getDeviceList(self, timeout: Union[None, float, Deadline] = None) -> IResponse:
         """
         Gets the device list.
 
+        Args:
+            timeout (Union[None, float, Deadline]): Seconds or deadline (default: 15 seconds).
+
         Returns:
             IResponse: IResponse object containing the response data.
         """
         return await self.httpRequest(
             path=EPath.DEVICE.value,
             method=EMethod.GET,
+            timeout=timeout
         )
 
-    async def updateDeviceState(self, serial_number: str, updateParams: Dict[str, Any]) -> IResponse:
+    async def iterDeviceList(
+            self,
+            fields: Optional[Iterable[str]] = None,
+            timeout: Union[None, float, Deadline] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Streams the device list, yielding each device as soon as it is received.
+
+        Unlike getDeviceList, the response is neither buffered nor decoded as a whole,
+        so large gateways use memory for one device at a time.
+
+        Args:
+            fields (Optional[Iterable[str]]): Fields kept in each device, nested fields are separated by dots,
+                e.g. ('serial_number', 'online', 'state.power') (default: None, every field).
+            timeout (Union[None, float, Deadline]): Seconds or deadline (default: 15 seconds for the whole transfer).
+
+        Yields:
+            Dict[str, Any]: The next device.
+
+        Raises:
+            ResponseError: If the gateway answered with an error code.
+        """
+        async for device in self.httpStreamArray(
+            path=EPath.DEVICE.value,
+            key='device_list',
+            fields=fields,
+            timeout=timeout
+        ):
+            yield device
+
+    async def updateDeviceState(
+            self,
+            serial_number: str,
+            updateParams: Dict[str, Any],
+            timeout: Union[None, float, Deadline] = None
+    ) -> IResponse:
         """
         Updates the information or status of a specified device.
 
         Args:
             serial_number (str): Serial number of the device.
             updateParams (Dict[str, Any]): Parameters for updating the device.
+            timeout (Union[None, float, Deadline]): Seconds or deadline (default: 5 seconds).
 
         Returns:
             IResponse: IResponse object containing the response data.
@@ -100,20 +155,23 @@ class BaseClassDevice(httpUtils):
         return await self.httpRequest(
             path=f"{EPath.DEVICE.value}/{serial_number}",
             method=EMethod.PUT,
-            params=updateParams
+            params=updateParams,
+            timeout=timeout
         )
 
-    async def deleteDevice(self, serial_number: str) -> IResponse:
+    async def deleteDevice(self, serial_number: str, timeout: Union[None, float, Deadline] = None) -> IResponse:
         """
         Deletes a device.
 
         Args:
             serial_number (str): Serial number of the device to be deleted.
+            timeout (Union[None, float, Deadline]): Seconds or deadline (default: 10 seconds).
 
         Returns:
             IResponse: IResponse object containing the response data.
         """
         return await self.httpRequest(
             path=f"{EPath.DEVICE.value}/{serial_number}",
-            method=EMethod.DELETE
+            method=EMethod.DELETE,
+            timeout=timeout
         )
@@ -17,6 +17,7 @@ from ..ts.enum.EMethod import EMethod
 from ..ts.enum.EPath import EPath
 from ..ts.interface.api.IHardware import IBeepObject, ISoundObject
 from ..ts.interface.IResponse import IResponse
+from ..utils.deadline import Deadline
 from ..utils.httpUtils import httpUtils
 
 
@@ -25,29 +26,35 @@ class BaseClassHardware(httpUtils):
     Represents the BaseClassHardware API.
 
     Methods:
-        rebootBridge() -> Dict[str, Any]: Reboots the gateway.
+        rebootBridge(timeout=None) -> Dict[str, Any]: Reboots the gateway.
         setSpeaker(volume: int) -> Dict[str, Any]: Controls the speaker.
     """
 
     async def rebootBridge(
-            self
+            self,
+            timeout: Union[None, float, Deadline] = None
     ) -> IResponse:
         """
         Reboot the gateway.
 
+        Args:
+            timeout (Union[None, float, Deadline]): Seconds or deadline (default: 30 seconds).
+
         Returns:
             IResponse: IResponse object containing the response data.
         """
         return await self.httpRequest(
             path=EPath.HARDWARE_REBOOT.value,
             method=EMethod.POST,
+            timeout=timeout
         )
 
     async def controlSpeaker(
             self,
             play_type: Union[ESpeakerTypes, str],
             sound: Optional[ISoundObject] = None,
-            beep: Optional[IBeepObject] = None
+            beep: Optional[IBeepObject] = None,
+            timeout: Union[None, float, Deadline] = None
     ) -> IResponse:
         """
         Controls the speaker.
@@ -56,6 +63,7 @@ class BaseClassHardware(httpUtils):
             play_type (Union[ESpeakerTypes, str]): Specifies the playback type as ESpeakerTypes value or string.
             sound (Optional[ISoundObject]): The sound object to play. Required if the play_type is 'PLAY_SOUND'.
             beep (Optional[IBeepObject]): The beep object to play. Required if the play_type is 'PLAY_BEEP'.
+            timeout (Union[None, float, Deadline]): Seconds or deadline (default: 3 seconds).
 
         Returns:
             IResponse: IResponse object containing the response data.
@@ -85,5 +93,6 @@ class BaseClassHardware(httpUtils):
         return await self.httpRequest(
             path=EPath.HARDWARE_SPEAKER.value,
             method=EMethod.POST,
-            params=params
+            params=params,
+            timeout=timeout
         )
@@ -7,33 +7,87 @@ Classes:
     BaseClassSse: Represents a base class for SSE connections.
 """
 #pylint: disable-msg=broad-exception-caught
+#pylint: disable-msg=too-many-instance-attributes
 
-from typing import Dict, Any, Optional, Callable
+from typing import AsyncIterator, Dict, Any, Iterable, List, Optional, Callable, Union
 
+import functools
 import logging
-import json
 import asyncio
 import aiohttp
 
 from ..config import Store
+from ..errors import SseIdleTimeoutError
+from ..ts.enum.ECapability import ECapability
+from ..ts.enum.ECategory import ECategory
+from ..ts.enum.EOverflowPolicy import EOverflowPolicy
 from ..ts.enum.EPath import EPath
+from ..ts.enum.ESseEvent import ESseEvent
+from ..ts.interface.IDeviceEvent import IDeviceEvent
 from ..ts.interface.ISseEvent import ISseEvent
+from ..utils.eventStream import EventStream
+from ..utils.eventThrottle import EventThrottle
+from ..utils.httpTransport import HttpTransport
+from ..utils.idleWatchdog import IdleWatchdog
+from ..utils.jsonCodec import JsonCodec, StdlibJsonCodec
+from ..utils.reconnectPolicy import ReconnectPolicy
+from ..utils.responseCache import ResponseCache
+from ..utils.sseDispatcher import SseDispatcher
+from ..utils.sseParser import SseParser
+from ..utils.sseUtils import get_raw_serial_numbers, get_serial_number
+from ..utils.subscriptionRegistry import Subscription, SubscriptionRegistry
 
 _LOGGER = logging.getLogger(__name__)
 
+_EVENT_TYPES = {event.value: event for event in ESseEvent}
+
+# Listeners of the connection, apart from the subscriptions to the events
+_CONNECTION_LISTENERS = ('onopen', 'onerror', 'onreconnect')
+
+# Seconds before a reconnection without reconnect policy, at least
+_RECONNECT_DELAY = 1.0
+
 
 class BaseClassSse(Store):
     """
     Represents a base class for SSE connections.
+
+    The SSE stream uses the dedicated SSE pool of the gateway transport, apart from the REST pool.
+    Its raw bytes are parsed incrementally by an SseParser, which keeps the last event ID across connections.
+    The event handlers run in the workers of the SSE dispatcher, apart from the reading of the stream;
+    without dispatcher, they are awaited in turn by the reader. A single task supervises the stream,
+    reconnecting it with the delays of the reconnect policy and calling the 'onreconnect' listener with
+    the seconds spent disconnected. When the 'sse_idle_timeout' of the transport is set, a stream
+    receiving nothing for that long, not even a heartbeat, is dropped and reconnected; TCP keepalive
+    on the SSE sockets catches the dead links of a silent stream as well.
+    Device events invalidate or update the matching entries of the response cache, if any.
+    The events are routed by the subscription registry, so any number of handlers may subscribe to
+    an event type, filtered by device, category or capability. They can also be consumed by async
+    iteration of 'events', each consumer with its own bounded buffer.
     """
 
     event_listeners = None
+    event_streams: List[EventStream] = None
+    sse_subscriptions: SubscriptionRegistry = None
     session = None
+    sse_task = None
+    sse_open: asyncio.Event = None
+    # Connections of the stream since init_sse, the later ones are reconnections
+    sse_connections: int = 0
+    sse_parser: SseParser = None
+    sse_dispatcher: SseDispatcher = None
+    sse_reconnect: ReconnectPolicy = None
+    transport: HttpTransport = None
+    response_cache: ResponseCache = None
+    codec: JsonCodec = StdlibJsonCodec()
 
     async def init_sse(self, session: aiohttp.ClientSession = None):
         """
         Initialize SSE connection.
 
+        Args:
+            session (aiohttp.ClientSession): Session for the SSE stream (default: SSE session of the transport).
+
         Returns:
             Optional dictionary containing the response data.
         """
@@ -50,18 +104,25 @@ class BaseClassSse(Store):
         _LOGGER.debug('Initialize SSE session.')
 
         # Set session
-        self.session = session if session is not None else aiohttp.ClientSession()
+        self.session = session if session is not None else self.transport.get_sse_session()
 
         # Set SSE event listeners
         self.event_listeners = {}
+        self.sse_parser = SseParser()
+        self.sse_open = asyncio.Event()
+        self.sse_connections = 0
+        if self.sse_dispatcher is not None and self.sse_dispatcher.on_error is None:
+            self.sse_dispatcher.on_error = self.handle_handler_error
 
         # Create SSE connection URL
         url = f"http://{self.ip}{EPath.ROOT.value}{EPath.SSE.value}?access_token={self.at}"
         _LOGGER.debug(f'SSE Init: {url}')
 
         try:
-            # Start SSE connection in a separate task
-            asyncio.create_task(self.handle_sse(url))
+            # Start SSE connection in a separate task, replacing the previous one
+            if self.sse_task is not None:
+                self.sse_task.cancel()
+            self.sse_task = asyncio.create_task(self.handle_sse(url))
             return True
         except Exception as error:
             # Handle exception in case of error
@@ -72,65 +133,391 @@ class BaseClassSse(Store):
 
     async def handle_sse(self, url: str) -> None:
         """
-        Handle SSE connection.
+        Handle SSE connection: supervises the stream, reconnecting it until the SSE session is closed.
+
+        The delay before a reconnection follows the reconnect policy, honouring the 'retry' field of
+        the server; without policy, it is that field, but at least one second. The stream resumes
+        with the Last-Event-ID header when the server sent event IDs.
 
         Args:
             url (str): The SSE connection URL.
         """
         while True:
             try:
-                if 'onopen' in self.event_listeners:
-                    await self.event_listeners["onopen"]()
-                else:
-                    _LOGGER.debug('Connected to SSE server.')
-
-                async with self.session.get(url) as response:
-                    event_name = None
-                    async for line in response.content:
-                        event = line.decode().strip()
-                        if event.startswith("event:"):
-                            event_name = event[6:].strip()
-                        elif event.startswith("data:") and event_name:
-                            event_data = event[5:]
-                            if event_data.strip() != "":
-                                await self.handle_event(event_name, event_data)
-                                event_name = None
-
-            except asyncio.TimeoutError:
-                if 'onerror' in self.event_listeners:
-                    _LOGGER.debug('SSE time-out error, reconnecting.')
-                    await self.event_listeners["onerror"](asyncio.TimeoutError)
-                else:
-                    _LOGGER.warning('SSE time-out error, reconnecting.')
-                await self.close()
-                await self.init_sse()
-
+                await self.read_sse(url)
+                error = None
+            except asyncio.TimeoutError as e:
+                _LOGGER.debug('SSE time-out error, reconnecting.')
+                error = e
             except Exception as e:
-                if 'onerror' in self.event_listeners:
-                    await self.event_listeners["onerror"](e)
-                else:
-                    _LOGGER.error(f'SSE connection error: {e}')
+                error = e
+
+            if self.sse_reconnect is not None:
+                self.sse_reconnect.disconnected()
+            if error is not None:
+                await self.handle_sse_error(error)
+
+            retry = self.sse_parser.retry
+            if self.sse_reconnect is not None:
+                delay = self.sse_reconnect.delay(retry)
+            else:
+                delay = max(_RECONNECT_DELAY, retry / 1000 if retry is not None else 0)
+            _LOGGER.debug(f'SSE reconnecting in {delay:.2f}s.')
+            await asyncio.sleep(delay)
+
+    async def read_sse(self, url: str) -> None:
+        """
+        Connects the SSE stream and reads it until the connection ends.
+
+        Every connection after the first one catches up with the events missed meanwhile, whatever
+        the reconnect policy; the 'onreconnect' listener is called with the downtime measured by the policy.
 
-    async def handle_event(self, event_name: str, event_data: any) -> None:
+        Args:
+            url (str): The SSE connection URL.
+        """
+        headers = {}
+        if self.sse_parser.last_event_id:
+            headers['Last-Event-ID'] = self.sse_parser.last_event_id
+
+        async with self.session.get(url, headers=headers) as response:
+            response.raise_for_status()
+            if self.transport is not None:
+                self.transport.configure_sse_socket(response)
+            downtime = self.sse_reconnect.connected() if self.sse_reconnect is not None else None
+            reconnected = self.sse_connections > 0
+            self.sse_connections += 1
+
+            # Events may have been missed while disconnected
+            if self.response_cache is not None:
+                self.response_cache.invalidate(EPath.DEVICE.value)
+
+            if 'onopen' in self.event_listeners:
+                await self.event_listeners["onopen"]()
+            else:
+                _LOGGER.debug('Connected to SSE server.')
+            if reconnected:
+                await self._resync_after_reconnect()
+            if downtime is not None and 'onreconnect' in self.event_listeners:
+                await self.event_listeners["onreconnect"](downtime)
+
+            self.sse_open.set()
+            try:
+                await self._read_stream(response)
+            finally:
+                self.sse_open.clear()
+                self.sse_parser.reset()
+
+    async def _resync_after_reconnect(self) -> None:
+        """
+        Catches up with the events missed while the SSE stream was disconnected, before the stream is read.
+
+        The reader waits for it, so the events received meanwhile are handled after it, in order.
+        Nothing is kept in sync here.
+        """
+
+    async def wait_sse_open(self) -> None:
+        """
+        Waits until the SSE stream is connected, at once if it already is.
+
+        The events sent from then on reach the subscriptions, so a state read afterwards misses
+        none of its later changes.
+
+        Raises:
+            RuntimeError: If the SSE connection was not initialized (init_sse).
+        """
+        if self.sse_open is None:
+            raise RuntimeError("SSE connection not initialized.")
+        await self.sse_open.wait()
+
+    async def _read_stream(self, response: aiohttp.ClientResponse) -> None:
+        """
+        Reads the SSE stream until it ends, under the idle watchdog when the transport sets one.
+
+        Args:
+            response (aiohttp.ClientResponse): The response of the SSE stream.
+
+        Raises:
+            SseIdleTimeoutError: If the stream received nothing for the idle timeout.
+        """
+        idle_timeout = self.transport.config.sse_idle_timeout if self.transport is not None else None
+        if not idle_timeout:
+            await self._read_chunks(response)
+            return
+
+        watchdog = IdleWatchdog(idle_timeout, response.close)
+        watchdog.start()
+        try:
+            await self._read_chunks(response, watchdog)
+        except Exception as error:
+            if watchdog.expired:
+                raise SseIdleTimeoutError(idle_timeout) from error
+            raise
+        finally:
+            watchdog.stop()
+
+        if watchdog.expired:
+            raise SseIdleTimeoutError(idle_timeout)
+
+    async def _read_chunks(self, response: aiohttp.ClientResponse, watchdog: Optional[IdleWatchdog] = None) -> None:
+        """
+        Reads the SSE stream until it ends, handling its events.
+
+        Args:
+            response (aiohttp.ClientResponse): The response of the SSE stream.
+            watchdog (Optional[IdleWatchdog]): The idle watchdog, suspended while the events are handled
+                (default: None).
+        """
+        async for chunk in response.content.iter_any():
+            if watchdog is not None:
+                watchdog.suspend()
+            for message in self.sse_parser.feed(chunk):
+                if message.data and not message.data.isspace():
+                    await self.handle_event(message.event, message.data, message.id)
+            if watchdog is not None:
+                watchdog.touch()
+
+    async def handle_sse_error(self, error: BaseException) -> None:
+        """
+        Handle an error of the SSE connection.
+
+        Args:
+            error (BaseException): The error.
+        """
+        if 'onerror' not in self.event_listeners:
+            _LOGGER.warning(f'SSE connection error, reconnecting: {error!r}')
+            return
+        try:
+            await self.event_listeners["onerror"](error)
+        except Exception as e:
+            _LOGGER.error(f'SSE error handler failed: {e!r}')
+
+    async def handle_event(self, event_name: str, event_data: Union[bytes, str],
+                           event_id: Optional[str] = None) -> None:
         """
         Handle SSE event.
 
         Args:
             event_name (str): The name of the SSE event.
-            event_data (any): The data associated with the SSE event.
+            event_data (Union[bytes, str]): The JSON data associated with the SSE event.
+            event_id (Optional[str]): The last event ID of the stream (default: None).
         """
+        if isinstance(event_data, str):
+            event_data = event_data.encode()
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug(f'Event detected: {event_name}, Data: {event_data!r}')
+
+        # Most events can be routed from their name and raw serial numbers, without decoding them
+        serial_numbers = get_raw_serial_numbers(event_data)
+        cache = self.response_cache
+        subscriptions = self.sse_subscriptions
+        if cache is None or not cache.wants(event_name):
+            if subscriptions is None or not subscriptions.wants(event_name, serial_numbers):
+                return
+
+        event = IDeviceEvent(_EVENT_TYPES.get(event_name, event_name), None, id=event_id,
+                             raw=event_data, loads=self.codec.loads)
         try:
-            data = json.loads(event_data)
-            _LOGGER.debug(f'Event detected: {event_name}, Data: {data}')
-            if event_name and event_name in self.event_listeners:
-                _LOGGER.debug(f'Event callback: {event_name}, Data: {data}')
-                handler = self.event_listeners[event_name]
-                await handler(data)
-
-        except json.JSONDecodeError as error:
+            if serial_numbers is not None and len(serial_numbers) <= 1:
+                event.serial_number = serial_numbers[0] if serial_numbers else None
+            else:
+                event.serial_number = get_serial_number(event.data)
+            matches = self._match_event(event)
+        except ValueError as error:
             _LOGGER.debug(f'Event error: {error}')
             if 'onerror' in self.event_listeners:
                 await self.event_listeners["onerror"](error)
+            return
+
+        await self._deliver_matches(event, matches)
+
+    async def publish_event(self, event: IDeviceEvent) -> None:
+        """
+        Routes an event made by the client, e.g. a synthetic device update, as if received from the SSE stream.
+
+        Args:
+            event (IDeviceEvent): The event, with its serial number and decoded data.
+        """
+        await self._deliver_matches(event, self._match_event(event))
+
+    async def _deliver_matches(self, event: IDeviceEvent, matches: List[Subscription]) -> None:
+        """
+        Delivers an event to its subscriptions, through their throttle if any.
+
+        Args:
+            event (IDeviceEvent): The event.
+            matches (List[Subscription]): The subscriptions of the event.
+        """
+        for subscription in matches:
+            if subscription.throttle is not None:
+                await subscription.throttle.push(event)
+            else:
+                await self._deliver_event(subscription, event)
+
+    async def _deliver_event(self, subscription: Subscription, event: IDeviceEvent) -> None:
+        """
+        Delivers an event to a subscription: typed handlers are awaited with the event, the others get its
+        decoded data through the SSE dispatcher, if any.
+
+        Args:
+            subscription (Subscription): The subscription.
+            event (IDeviceEvent): The event.
+        """
+        if subscription.typed:
+            await subscription.handler(event)
+        elif self.sse_dispatcher is not None:
+            await self.sse_dispatcher.put(str(event.type), event.data, subscription.handler)
+        else:
+            await subscription.handler(event.data)
+
+    def _match_event(self, event: IDeviceEvent) -> List[Subscription]:
+        """
+        Finds the subscriptions of an event, invalidating or updating the cached responses it changes.
+
+        The data of the event is decoded when needed: for the subscriptions filtering by capability
+        and for the handlers which take it decoded.
+
+        Args:
+            event (IDeviceEvent): The event, with its serial number.
+
+        Returns:
+            List[Subscription]: The subscriptions of the event.
+
+        Raises:
+            ValueError: If the data of the event is needed and is not valid JSON.
+        """
+        if self.response_cache is not None:
+            self.response_cache.invalidate_device_event(str(event.type), event.serial_number)
+            self.response_cache.patch_device_event(event)
+        if self.sse_subscriptions is None:
+            return []
+
+        self.sse_subscriptions.observe(event)
+        matches = self.sse_subscriptions.match(event)
+        if not all(subscription.typed and subscription.throttle is None for subscription in matches):
+            event.decode()
+        return matches
+
+    def subscribe(
+        self,
+        handler: Callable,
+        types: Optional[Iterable[Union[ESseEvent, str]]] = None,
+        devices: Optional[Iterable[str]] = None,
+        categories: Optional[Iterable[Union[ECategory, str]]] = None,
+        capabilities: Optional[Iterable[Union[ECapability, str]]] = None,
+        typed: bool = False,
+        throttle: Optional[EventThrottle] = None,
+    ) -> Subscription:
+        """
+        Subscribes a handler to the SSE events, along with the other subscribers.
+
+        The categories and capabilities of a device are known once it was added or updated, or
+        once the device list was given to 'sse_subscriptions.learn_devices'. The capabilities of
+        a state update are those it changes.
+
+        A typed handler takes IDeviceEvent objects, which decode their data only when it is read,
+        and is awaited by the SSE reader in the order of the stream rather than by the dispatcher.
+        A throttle merges the state updates of each device before they reach the handler.
+
+        Args:
+            handler (Callable): The handler, called with the decoded data of the events.
+            types (Optional[Iterable[Union[ESseEvent, str]]]): Event types to receive (default: None, all).
+            devices (Optional[Iterable[str]]): Serial numbers of the devices to receive (default: None, all).
+            categories (Optional[Iterable[Union[ECategory, str]]]): Display categories to receive (default: None,
+                all).
+            capabilities (Optional[Iterable[Union[ECapability, str]]]): Capabilities to receive (default: None,
+                all).
+            typed (bool): Whether the handler takes IDeviceEvent objects (default: False).
+            throttle (Optional[EventThrottle]): Conflates the state updates of the handler, e.g.
+                EventThrottle(window=0.5) (default: None).
+
+        Returns:
+            Subscription: The subscription, to unsubscribe it.
+        """
+        if self.sse_subscriptions is None:
+            self.sse_subscriptions = SubscriptionRegistry()
+        subscription = self.sse_subscriptions.subscribe(handler, types, devices, categories, capabilities, typed,
+                                                        throttle)
+        if throttle is not None:
+            throttle.deliver = functools.partial(self._deliver_event, subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> bool:
+        """
+        Removes a subscription to the SSE events.
+
+        Args:
+            subscription (Subscription): The subscription.
+
+        Returns:
+            bool: True if the subscription was registered.
+        """
+        if subscription.throttle is not None:
+            subscription.throttle.close()
+        return self.sse_subscriptions is not None and self.sse_subscriptions.unsubscribe(subscription)
+
+    async def events(
+        self,
+        types: Optional[Iterable[Union[ESseEvent, str]]] = None,
+        devices: Optional[Iterable[str]] = None,
+        categories: Optional[Iterable[Union[ECategory, str]]] = None,
+        capabilities: Optional[Iterable[Union[ECapability, str]]] = None,
+        max_buffer: int = 100,
+        overflow: EOverflowPolicy = EOverflowPolicy.BLOCK,
+        throttle: Optional[EventThrottle] = None,
+    ) -> AsyncIterator[IDeviceEvent]:
+        """
+        Iterates over the device events of the SSE stream.
+
+        The consumer is subscribed when the iteration starts and unsubscribed when it stops; the
+        iteration ends when the API is closed. The events are buffered for the consumer, up to
+        'max_buffer': by default, a full buffer makes the SSE reader wait for the consumer.
+
+        Args:
+            types (Optional[Iterable[Union[ESseEvent, str]]]): Event types to receive (default: None, all).
+            devices (Optional[Iterable[str]]): Serial numbers of the devices to receive (default: None, all).
+            categories (Optional[Iterable[Union[ECategory, str]]]): Display categories to receive (default: None,
+                all).
+            capabilities (Optional[Iterable[Union[ECapability, str]]]): Capabilities to receive (default: None,
+                all).
+            max_buffer (int): Maximum number of buffered events (default: 100).
+            overflow (EOverflowPolicy): What happens to an event when the buffer is full (default: BLOCK).
+            throttle (Optional[EventThrottle]): Conflates the state updates before they are buffered
+                (default: None).
+
+        Yields:
+            IDeviceEvent: The events, in the order of the stream.
+
+        Usage:
+            async for event in api.events(types=[ESseEvent.UPDATE_DEVICE_STATE]):
+                print(event.serial_number, event.payload)
+        """
+        stream = EventStream(max_buffer=max_buffer, overflow=overflow)
+        subscription = self.subscribe(stream.put, types, devices, categories, capabilities, typed=True,
+                                      throttle=throttle)
+        if self.event_streams is None:
+            self.event_streams = []
+        self.event_streams.append(stream)
+        try:
+            while True:
+                event = await stream.get()
+                if event is None:
+                    return
+                yield event
+        finally:
+            stream.close()
+            self.unsubscribe(subscription)
+            if stream in self.event_streams:
+                self.event_streams.remove(stream)
+
+    async def handle_handler_error(self, error: BaseException) -> None:
+        """
+        Handle an error or a timeout of an event handler run by the SSE dispatcher.
+
+        Args:
+            error (BaseException): The error.
+        """
+        if self.event_listeners and 'onerror' in self.event_listeners:
+            await self.event_listeners["onerror"](error)
 
     def mount_sse_func(self, handler: ISseEvent) -> Optional[Dict[str, Any]]:
         """
@@ -147,62 +534,102 @@ class BaseClassSse(Store):
             return {'error': 1000, 'msg': 'must invoke initSSE first', 'data': {}}
 
         if hasattr(handler, 'onopen') and callable(handler.onopen):
-            self.event_listeners.onOpen = handler.onopen
+            self.register_event_listener('onopen', handler.onopen)
 
         if hasattr(handler, 'onerror') and callable(handler.onerror):
-            self.event_listeners.onError = handler.onerror
+            self.register_event_listener('onerror', handler.onerror)
 
         if hasattr(handler, 'onAddDevice') and callable(handler.onAddDevice):
-            self.register_event_listener('device#v1#addDevice', handler.onAddDevice)
+            self.register_event_listener(ESseEvent.ADD_DEVICE.value, handler.onAddDevice)
 
         if hasattr(handler, 'onUpdateDeviceState') and callable(handler.onUpdateDeviceState):
-            self.register_event_listener('device#v1#updateDeviceState', handler.onUpdateDeviceState)
+            self.register_event_listener(ESseEvent.UPDATE_DEVICE_STATE.value, handler.onUpdateDeviceState)
 
-        if hasattr(handler, 'updateDeviceInfo') and callable(handler.updateDeviceInfo):
-            self.register_event_listener('device#v1#updateDeviceInfo', handler.onUpdateDeviceInfo)
+        if hasattr(handler, 'onUpdateDeviceInfo') and callable(handler.onUpdateDeviceInfo):
+            self.register_event_listener(ESseEvent.UPDATE_DEVICE_INFO.value, handler.onUpdateDeviceInfo)
 
         if hasattr(handler, 'onUpdateDeviceOnline') and callable(handler.onUpdateDeviceOnline):
-            self.register_event_listener('device#v1#updateDeviceOnline', handler.onUpdateDeviceOnline)
+            self.register_event_listener(ESseEvent.UPDATE_DEVICE_ONLINE.value, handler.onUpdateDeviceOnline)
 
         if hasattr(handler, 'onDeleteDevice') and callable(handler.onDeleteDevice):
-            self.register_event_listener('device#v1#deleteDevice', handler.onDeleteDevice)
+            self.register_event_listener(ESseEvent.DELETE_DEVICE.value, handler.onDeleteDevice)
 
         return None
 
-    def unmount_sse_func(self) -> None:
+    async def unmount_sse_func(self) -> None:
         """
-        Unmount SSE function.
+        Unmount SSE function and close the SSE connection.
+
+        It is a coroutine, to be awaited: the SSE task is only stopped once it returns. It only
+        closes the SSE connection, the REST requests keep working until close is called.
         """
         if self.event_listeners:
-            self.remove_event_listener('device#v1#addDevice')
-            self.remove_event_listener('device#v1#updateDeviceState')
-            self.remove_event_listener('device#v1#updateDeviceInfo')
-            self.remove_event_listener('device#v1#updateDeviceOnline')
-            self.remove_event_listener('device#v1#deleteDevice')
-            self.close()
+            self.remove_event_listener('onopen')
+            self.remove_event_listener('onerror')
+            self.remove_event_listener(ESseEvent.ADD_DEVICE.value)
+            self.remove_event_listener(ESseEvent.UPDATE_DEVICE_STATE.value)
+            self.remove_event_listener(ESseEvent.UPDATE_DEVICE_INFO.value)
+            self.remove_event_listener(ESseEvent.UPDATE_DEVICE_ONLINE.value)
+            self.remove_event_listener(ESseEvent.DELETE_DEVICE.value)
+            await self._closeSse()
 
     def register_event_listener(self, event_type: str, handler: Callable) -> None:
         """
         Registers an event listener for the specified event type.
 
+        The 'onopen', 'onerror' and 'onreconnect' listeners of the connection replace the previous
+        one; the listeners of an SSE event are subscribed along with the other listeners of the event.
+
         Args:
             event_type (str): The type of the event.
             handler (Callable): The handler function to be called when the event occurs.
         """
-        self.event_listeners[event_type] = handler
+        if event_type in _CONNECTION_LISTENERS:
+            self.event_listeners[event_type] = handler
+        else:
+            self.subscribe(handler, types=[event_type])
 
-    def remove_event_listener(self, event_type: str) -> None:
+    def remove_event_listener(self, event_type: str, handler: Optional[Callable] = None) -> None:
         """
-        Removes the event listener for the specified event type.
+        Removes the event listeners for the specified event type.
 
         Args:
             event_type (str): The type of the event.
+            handler (Optional[Callable]): The listener to remove (default: None, every listener of the event type).
         """
-        if event_type in self.event_listeners:
-            del self.event_listeners[event_type]
+        if event_type in _CONNECTION_LISTENERS:
+            if event_type in self.event_listeners:
+                del self.event_listeners[event_type]
+        elif self.sse_subscriptions is not None:
+            self.sse_subscriptions.remove(event_type, handler)
 
     async def close(self) -> None:
         """
         Closes the SSE session connection and releases any associated resources.
         """
-        await self.session.close()
+        await self._closeSse()
+
+    async def _closeSse(self) -> None:
+        """
+        Stops the SSE task and dispatcher, the event streams and throttles, and closes the SSE session.
+        """
+        sse_task, self.sse_task = self.sse_task, None
+        if sse_task is not None and sse_task is not asyncio.current_task():
+            sse_task.cancel()
+            try:
+                await sse_task
+            except asyncio.CancelledError:
+                pass
+
+        if self.sse_dispatcher is not None:
+            await self.sse_dispatcher.close()
+
+        for stream in self.event_streams or ():
+            stream.close()
+        for subscription in self.sse_subscriptions or ():
+            if subscription.throttle is not None:
+                subscription.throttle.close()
+
+        session, self.session = self.session, None
+        if session is not None and not session.closed:
+            await session.close()
@@ -10,6 +10,8 @@ Usage:
     from .ihostClass import IHostClass
 """
 
+from typing import Any
+
 from .baseClass import BaseClass
 
 
@@ -21,10 +23,10 @@ class IHostClass(BaseClass):
         BaseClass: Base class for the API.
 
     Methods:
-        __init__(ip: str, at: str = None, debug: bool = False): Initializes the IHostClass object.
+        __init__(ip: str, at: str = None, debug: bool = False, **options): Initializes the IHostClass object.
     """
 
-    def __init__(self, ip: str, at: str = None, debug: bool = False):
+    def __init__(self, ip: str, at: str = None, debug: bool = False, **options: Any):
         """
         Initializes the IHostClass object.
 
@@ -32,6 +34,7 @@ class IHostClass(BaseClass):
             ip (str): The IP address of the host.
             at (str): The access token.
             debug (bool): Whether to enable debug mode.
+            **options (Any): The options of BaseClass: transport_config, response_cache and device_store.
 
         """
-        super().__init__(ip=ip, at=at, debug=debug)
+        super().__init__(ip=ip, at=at, debug=debug, **options)
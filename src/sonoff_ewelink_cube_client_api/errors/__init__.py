@@ -2,6 +2,8 @@
 Module for defining custom exceptions related to API access and responses.
 """
 
+import asyncio
+
 class AccessTokenRequestError(Exception):
     """
     Exception raised for errors that occur during access token requests.
@@ -12,3 +14,86 @@ class AccessTokenUnauthorized(Exception):
     """
     Exception raised when an access token is unauthorized.
     """
+
+
+class ResponseError(Exception):
+    """
+    Exception raised when the gateway answers a request with an error response.
+
+    Attributes:
+        response (IResponse): The error response.
+    """
+
+    def __init__(self, response):
+        """
+        Initialize a new ResponseError instance.
+
+        Args:
+            response (IResponse): The error response.
+        """
+        super().__init__(f"Error {response.error}: {response.message}")
+        self.response = response
+
+
+class CircuitOpenError(Exception):
+    """
+    Exception raised when a request fails fast because the circuit breaker of the gateway is open.
+
+    Attributes:
+        name (str): Name of the circuit breaker, the address of the gateway.
+        retry_after (float): Seconds until the next probe of the gateway.
+    """
+
+    def __init__(self, name: str, retry_after: float):
+        """
+        Initialize a new CircuitOpenError instance.
+
+        Args:
+            name (str): Name of the circuit breaker, the address of the gateway.
+            retry_after (float): Seconds until the next probe of the gateway.
+        """
+        super().__init__(f"Circuit open for gateway {name}, retry after {retry_after:.1f}s")
+        self.name = name
+        self.retry_after = retry_after
+
+
+class DeadlineExceededError(asyncio.TimeoutError):
+    """
+    Exception raised when a request does not complete before its deadline.
+
+    It is an asyncio.TimeoutError, so the existing timeout handlers keep catching it.
+
+    Attributes:
+        timeout (float): The time budget of the request in seconds.
+    """
+
+    def __init__(self, timeout: float):
+        """
+        Initialize a new DeadlineExceededError instance.
+
+        Args:
+            timeout (float): The time budget of the request in seconds.
+        """
+        super().__init__(f"Deadline of {timeout:.3f}s exceeded")
+        self.timeout = timeout
+
+
+class SseIdleTimeoutError(asyncio.TimeoutError):
+    """
+    Exception raised when the SSE stream receives nothing, not even a heartbeat, for its idle timeout.
+
+    It is an asyncio.TimeoutError, so the SSE supervisor reconnects the stream as for any time-out.
+
+    Attributes:
+        timeout (float): The idle timeout of the stream in seconds.
+    """
+
+    def __init__(self, timeout: float):
+        """
+        Initialize a new SseIdleTimeoutError instance.
+
+        Args:
+            timeout (float): The idle timeout of the stream in seconds.
+        """
+        super().__init__(f"SSE stream idle for {timeout:.1f}s")
+        self.timeout = timeout
@@ -0,0 +1,24 @@
+"""
+Enumeration: ECircuitState
+
+This enumeration defines the states of the circuit breaker of a gateway.
+
+Enumerations:
+    ECircuitState: Represents the circuit breaker states.
+"""
+
+from . import BaseEnum
+
+
+class ECircuitState(BaseEnum):
+    """
+    Represents the circuit breaker states.
+
+    Enumerations:
+        CLOSED: The gateway is healthy, requests are sent.
+        OPEN: The gateway is down, requests fail fast.
+        HALF_OPEN: The gateway is being probed, requests fail fast until it answers.
+    """
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
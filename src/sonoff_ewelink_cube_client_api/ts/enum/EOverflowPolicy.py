@@ -0,0 +1,24 @@
+"""
+Enumeration: EOverflowPolicy
+
+This enumeration defines what the SSE dispatcher does with an event when its queue is full.
+
+Enumerations:
+    EOverflowPolicy: Represents the overflow policies of the SSE dispatcher.
+"""
+
+from . import BaseEnum
+
+
+class EOverflowPolicy(BaseEnum):
+    """
+    Represents the overflow policies of the SSE dispatcher.
+
+    Enumerations:
+        BLOCK: The reader waits for room in the queue, slowing down the SSE stream.
+        DROP_OLDEST: The oldest queued event is dropped to make room.
+        CONFLATE: An update of a device is merged into its update still queued, the reader waits otherwise.
+    """
+    BLOCK = "block"
+    DROP_OLDEST = "drop_oldest"
+    CONFLATE = "conflate"
@@ -0,0 +1,28 @@
+"""
+Enumeration: ESseEvent
+
+This enumeration defines the Server-Sent Events (SSE) sent by the gateway.
+
+Enumerations:
+    ESseEvent: Represents the SSE event names.
+"""
+
+from . import BaseEnum
+
+
+class ESseEvent(BaseEnum):
+    """
+    Represents the SSE event names.
+
+    Enumerations:
+        ADD_DEVICE: A device was added.
+        UPDATE_DEVICE_STATE: The state of a device changed.
+        UPDATE_DEVICE_INFO: The information (name, capabilities, tags) of a device changed.
+        UPDATE_DEVICE_ONLINE: The online status of a device changed.
+        DELETE_DEVICE: A device was deleted.
+    """
+    ADD_DEVICE = "device#v1#addDevice"
+    UPDATE_DEVICE_STATE = "device#v1#updateDeviceState"
+    UPDATE_DEVICE_INFO = "device#v1#updateDeviceInfo"
+    UPDATE_DEVICE_ONLINE = "device#v1#updateDeviceOnline"
+    DELETE_DEVICE = "device#v1#deleteDevice"
@@ -0,0 +1,125 @@
+"""
+Interface module: IDeviceEvent
+
+This module defines the IDeviceEvent class.
+
+Classes:
+    IDeviceEvent: Represents a device event of the SSE stream, as yielded by the event streams.
+"""
+#pylint: disable-msg=too-few-public-methods
+#pylint: disable-msg=too-many-instance-attributes
+
+from typing import Any, Callable, Dict, Optional, Union
+
+from ..enum.ESseEvent import ESseEvent
+
+
+class IDeviceEvent:
+    """
+    Represents a device event of the SSE stream, as yielded by the event streams.
+
+    Unlike the other interfaces, it has slots and no attribute dictionary: one is created for
+    every event of the stream, and shared by all the consumers of the event. An event made from
+    the raw JSON data of the stream decodes it when 'data' is first read, once for all consumers.
+
+    Attributes:
+        type (Union[ESseEvent, str]): The event type, its name for the events unknown to ESseEvent.
+        serial_number (Optional[str]): The serial number of the device, None if the event has none.
+        data (Any): The decoded data of the event, reading it raises ValueError if the raw data is not valid JSON.
+        id (Optional[str]): The last event ID of the stream when the event was received.
+        collapsed (int): Number of events merged into this one by a throttle.
+        reconciled (bool): Whether the event was made from a device list, its payload holding the whole
+            value of each changed capability or field, None for the removed ones.
+    """
+
+    __slots__ = ('type', 'serial_number', 'id', 'collapsed', 'reconciled', '_data', '_raw', '_loads')
+
+    def __init__(
+        self,
+        type: Union[ESseEvent, str],  # pylint: disable=redefined-builtin
+        serial_number: Optional[str],
+        data: Any = None,
+        id: Optional[str] = None,  # pylint: disable=redefined-builtin
+        raw: Optional[bytes] = None,
+        loads: Optional[Callable[[bytes], Any]] = None,
+        collapsed: int = 0,
+        reconciled: bool = False,
+    ):
+        """
+        Initialize a new IDeviceEvent instance.
+
+        Args:
+            type (Union[ESseEvent, str]): The event type.
+            serial_number (Optional[str]): The serial number of the device.
+            data (Any): The decoded data of the event (default: None).
+            id (Optional[str]): The last event ID of the stream (default: None).
+            raw (Optional[bytes]): The JSON data of the event, decoded on demand instead of data (default: None).
+            loads (Optional[Callable[[bytes], Any]]): Decodes the raw data, e.g. the 'loads' of a codec
+                (default: None).
+            collapsed (int): Number of events merged into this one (default: 0).
+            reconciled (bool): Whether the event was made from a device list (default: False).
+        """
+        self.type = type
+        self.serial_number = serial_number
+        self.id = id
+        self.collapsed = collapsed
+        self.reconciled = reconciled
+        self._data = data
+        self._raw = raw
+        self._loads = loads
+
+    @property
+    def data(self) -> Any:
+        """
+        The decoded data of the event, decoded from the raw data on first access.
+
+        Returns:
+            Any: The decoded data.
+        """
+        return self.decode()
+
+    def decode(self) -> Any:
+        """
+        Decodes the raw data of the event, if not done yet.
+
+        Returns:
+            Any: The decoded data.
+
+        Raises:
+            ValueError: If the raw data is not valid JSON.
+        """
+        if self._raw is not None:
+            self._data = self._loads(self._raw)
+            self._raw = self._loads = None
+        return self._data
+
+    @property
+    def decoded(self) -> bool:
+        """
+        Whether the data of the event is decoded.
+
+        Returns:
+            bool: False while the raw data was not decoded.
+        """
+        return self._raw is None
+
+    @property
+    def payload(self) -> Dict[str, Any]:
+        """
+        The payload of the event: the changed state or information, or the added device.
+
+        Returns:
+            Dict[str, Any]: The payload, empty if the event has none.
+        """
+        payload = self.data.get('payload') if isinstance(self.data, dict) else None
+        return payload if isinstance(payload, dict) else {}
+
+    def __repr__(self) -> str:
+        """
+        Returns a string representation of the event.
+
+        Returns:
+            str: The type and serial number of the event.
+        """
+        name = self.type.name if isinstance(self.type, ESseEvent) else self.type
+        return f'IDeviceEvent({name}, {self.serial_number})'
@@ -0,0 +1,80 @@
+"""
+Interface module: IDownloadStats
+
+This module defines the IDownloadStats class.
+
+Classes:
+    IDownloadStats: Represents the progress and throughput of a streamed download.
+"""
+
+import time
+
+from . import BaseInterface
+
+
+class IDownloadStats(BaseInterface):
+    """
+    Represents the progress and throughput of a streamed download.
+
+    Attributes:
+        bytes (int): Number of bytes received.
+        chunks (int): Number of chunks received.
+        started_at (float): Monotonic time of the start of the download.
+        finished_at (float): Monotonic time of the end of the download, None while in progress.
+    """
+
+    def __init__(self):
+        """
+        Initialize a new IDownloadStats instance.
+        """
+        self.bytes = 0
+        self.chunks = 0
+        self.started_at = time.monotonic()
+        self.finished_at = None
+
+    def add(self, size: int) -> None:
+        """
+        Records a received chunk.
+
+        Args:
+            size (int): Size of the chunk in bytes.
+        """
+        self.bytes += size
+        self.chunks += 1
+
+    def finish(self) -> None:
+        """
+        Records the end of the download.
+        """
+        self.finished_at = time.monotonic()
+
+    @property
+    def seconds(self) -> float:
+        """
+        Duration of the download so far.
+
+        Returns:
+            float: Elapsed seconds.
+        """
+        end = self.finished_at if self.finished_at is not None else time.monotonic()
+        return end - self.started_at
+
+    @property
+    def bytes_per_second(self) -> float:
+        """
+        Average throughput of the download.
+
+        Returns:
+            float: Bytes received per second.
+        """
+        seconds = self.seconds
+        return self.bytes / seconds if seconds > 0 else 0.0
+
+    def __str__(self) -> str:
+        """
+        Returns a string representation of the IDownloadStats object.
+
+        Returns:
+            str: The string representation of the IDownloadStats object.
+        """
+        return f'{self.bytes} bytes in {self.seconds:.3f}s ({self.bytes_per_second:.0f} B/s)'
@@ -0,0 +1,37 @@
+"""
+Interface module: ISseMessage
+
+This module defines the ISseMessage class.
+
+Classes:
+    ISseMessage: Represents a message dispatched by the SSE stream.
+"""
+#pylint: disable-msg=too-few-public-methods
+
+from typing import Optional
+
+from . import BaseInterface
+
+
+class ISseMessage(BaseInterface):
+    """
+    Represents a message dispatched by the SSE stream.
+
+    Attributes:
+        event (str): The event name, 'message' when the event has no 'event' field.
+        data (bytes): The data of the event, its 'data' lines joined by line feeds.
+        id (Optional[str]): The last event ID of the stream when the event was dispatched.
+    """
+
+    def __init__(self, event: str, data: bytes, id: Optional[str] = None):  # pylint: disable=redefined-builtin
+        """
+        Initialize a new ISseMessage instance.
+
+        Args:
+            event (str): The event name.
+            data (bytes): The data of the event.
+            id (Optional[str]): The last event ID of the stream (default: None).
+        """
+        self.event = event
+        self.data = data
+        self.id = id
@@ -0,0 +1,99 @@
+"""
+Interface module: ITransportConfig
+
+This module defines the ITransportConfig class.
+
+Classes:
+    ITransportConfig: Represents the tuning options of the HTTP transport of a gateway.
+"""
+#pylint: disable-msg=too-few-public-methods
+#pylint: disable-msg=too-many-arguments
+#pylint: disable-msg=too-many-instance-attributes
+#pylint: disable-msg=too-many-locals
+
+from typing import Optional
+
+
+class ITransportConfig:
+    """
+    Represents the tuning options of the HTTP transport of a gateway.
+
+    The REST calls and the SSE stream use separate connection pools, so the long-lived
+    SSE connection and its reconnects never take a slot of the REST pool.
+
+    Attributes:
+        limit (int): Maximum number of simultaneous REST connections to the gateway.
+        keepalive_timeout (float): Seconds an idle connection is kept open for reuse.
+        use_dns_cache (bool): Cache resolved host names (e.g. 'ihost.local').
+        ttl_dns_cache (Optional[int]): Seconds a resolved host name is cached, None caches forever.
+        conn_timeout (float): Seconds allowed to get a pooled REST connection or establish a new one.
+        read_timeout (float): Seconds allowed between two reads of a REST response.
+        sse_limit (int): Maximum number of simultaneous SSE connections to the gateway.
+        sse_conn_timeout (float): Seconds allowed to establish the SSE connection.
+        sse_read_timeout (Optional[float]): Seconds allowed between two reads of the SSE stream, None waits forever.
+        sse_idle_timeout (Optional[float]): Seconds without any byte of the SSE stream, heartbeats included,
+            before the connection is dropped and reconnected, None disables the watchdog.
+        sse_keepalive (bool): Enable TCP keepalive on the SSE sockets, so a dead link is detected by the kernel.
+        sse_keepalive_idle (int): Idle seconds of an SSE socket before the first keepalive probe.
+        sse_keepalive_interval (int): Seconds between two keepalive probes.
+        sse_keepalive_count (int): Unanswered keepalive probes before the SSE connection is reset.
+    """
+
+    def __init__(
+        self,
+        limit: int = 10,
+        keepalive_timeout: float = 30,
+        use_dns_cache: bool = True,
+        ttl_dns_cache: Optional[int] = 300,
+        conn_timeout: float = 10,
+        read_timeout: float = 10,
+        sse_limit: int = 2,
+        sse_conn_timeout: float = 10,
+        sse_read_timeout: Optional[float] = None,
+        sse_idle_timeout: Optional[float] = None,
+        sse_keepalive: bool = True,
+        sse_keepalive_idle: int = 5,
+        sse_keepalive_interval: int = 2,
+        sse_keepalive_count: int = 3,
+    ):
+        """
+        Initialize a new ITransportConfig instance.
+
+        Args:
+            limit (int): Maximum number of simultaneous REST connections (default: 10).
+            keepalive_timeout (float): Idle keep-alive time of a connection in seconds (default: 30).
+            use_dns_cache (bool): Cache resolved host names (default: True).
+            ttl_dns_cache (Optional[int]): DNS cache lifetime in seconds (default: 300).
+            conn_timeout (float): REST connection timeout in seconds (default: 10).
+            read_timeout (float): REST socket read timeout in seconds (default: 10).
+            sse_limit (int): Maximum number of simultaneous SSE connections (default: 2).
+            sse_conn_timeout (float): SSE connection timeout in seconds (default: 10).
+            sse_read_timeout (Optional[float]): SSE socket read timeout in seconds (default: None).
+            sse_idle_timeout (Optional[float]): SSE idle watchdog in seconds (default: None, disabled).
+            sse_keepalive (bool): Enable TCP keepalive on the SSE sockets (default: True).
+            sse_keepalive_idle (int): Idle seconds before the first keepalive probe (default: 5).
+            sse_keepalive_interval (int): Seconds between two keepalive probes (default: 2).
+            sse_keepalive_count (int): Unanswered probes before the connection is reset (default: 3).
+
+        Raises:
+            ValueError: If a connection limit is not a positive integer.
+        """
+        if not isinstance(limit, int) or limit < 1:
+            raise ValueError("Connection limit must be a positive integer.")
+        if not isinstance(sse_limit, int) or sse_limit < 1:
+            raise ValueError("SSE connection limit must be a positive integer.")
+
+        self.limit = limit
+        self.keepalive_timeout = keepalive_timeout
+        self.use_dns_cache = use_dns_cache
+        self.ttl_dns_cache = ttl_dns_cache
+        self.conn_timeout = conn_timeout
+        self.read_timeout = read_timeout
+        self.sse_limit = sse_limit
+        self.sse_conn_timeout = sse_conn_timeout
+        self.sse_read_timeout = sse_read_timeout
+        self.sse_idle_timeout = sse_idle_timeout
+        self.sse_keepalive = sse_keepalive
+        self.sse_keepalive_idle = sse_keepalive_idle
+        self.sse_keepalive_interval = sse_keepalive_interval
+        self.sse_keepalive_count = sse_keepalive_count
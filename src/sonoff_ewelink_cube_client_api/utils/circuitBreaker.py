@@ -0,0 +1,296 @@
+"""
+Module: circuitBreaker
+
+This module provides the circuit breaker shedding the requests of an unhealthy gateway.
+
+Classes:
+    CircuitBreaker: Fails the requests fast while the gateway is down, and probes it to recover.
+"""
+#pylint: disable-msg=too-many-instance-attributes
+
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple, Type, Union
+
+import asyncio
+import logging
+import time
+
+from ..errors import CircuitOpenError
+from ..ts.enum.ECircuitState import ECircuitState
+from .concurrencyLimiter import DEFAULT_FAILURE_EXCEPTIONS
+from .deadline import Deadline
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class CircuitBreaker:
+    """
+    Fails the requests fast while the gateway is down, and probes it to recover.
+
+    After 'failure_threshold' consecutive failures (timeouts and connection errors) the circuit
+    opens: requests raise CircuitOpenError at once instead of waiting for their timeouts.
+    Every 'recovery_timeout' seconds the circuit goes half-open and calls 'probe'; it closes
+    when the probe succeeds and opens again otherwise. Without probe, the first request after
+    'recovery_timeout' is let through as the probe. A request timing out at the deadline of its
+    caller is not a failure, only the connection errors and the expiries of the endpoint budget are.
+
+    Attributes:
+        name (str): Name of the circuit breaker, the address of the gateway.
+        failure_threshold (int): Consecutive failures opening the circuit.
+        recovery_timeout (float): Seconds between two probes of an open circuit.
+        probe (Optional[Callable[[], Awaitable[Any]]]): Checks the gateway, healthy when it returns a true value.
+        failure_exceptions (Tuple[Type[BaseException], ...]): Exceptions counted as failures.
+        failures (int): Number of consecutive failures.
+        trips (int): Number of times the circuit opened.
+        rejected (int): Number of requests failed fast.
+
+    Methods:
+        guard(deadline: Optional[Deadline] = None) -> AsyncIterator[None]: Runs a request through the circuit.
+        check(): Fails fast if the circuit is not closed.
+        record_success(): Records a successful request.
+        record_failure(): Records a failed request.
+        add_listener(listener: Callable[[ECircuitState, ECircuitState], Any]): Adds a state change callback.
+        remove_listener(listener: Callable[[ECircuitState, ECircuitState], Any]): Removes a state change callback.
+        close(): Stops probing the gateway.
+        stats() -> Dict[str, Union[str, int]]: Gets the state and the counters of the circuit breaker.
+    """
+
+    def __init__(
+        self,
+        name: str = '',
+        failure_threshold: int = 5,
+        recovery_timeout: float = 10.0,
+        probe: Optional[Callable[[], Awaitable[Any]]] = None,
+        failure_exceptions: Tuple[Type[BaseException], ...] = DEFAULT_FAILURE_EXCEPTIONS,
+    ):
+        """
+        Initializes the CircuitBreaker object.
+
+        Parameters:
+            name (str): Name of the circuit breaker, the address of the gateway (default: '').
+            failure_threshold (int): Consecutive failures opening the circuit (default: 5).
+            recovery_timeout (float): Seconds between two probes of an open circuit (default: 10.0).
+            probe (Optional[Callable[[], Awaitable[Any]]]): Checks the gateway (default: None, the first
+                request after recovery_timeout is the probe).
+            failure_exceptions (Tuple[Type[BaseException], ...]): Exceptions counted as failures
+                (default: timeouts and connection errors).
+
+        Raises:
+            ValueError: If failure_threshold is not a positive integer.
+        """
+        if not isinstance(failure_threshold, int) or failure_threshold < 1:
+            raise ValueError("failure_threshold must be a positive integer.")
+
+        self.name: str = name
+        self.failure_threshold: int = failure_threshold
+        self.recovery_timeout: float = recovery_timeout
+        self.probe: Optional[Callable[[], Awaitable[Any]]] = probe
+        self.failure_exceptions: Tuple[Type[BaseException], ...] = failure_exceptions
+        self.failures: int = 0
+        self.trips: int = 0
+        self.rejected: int = 0
+        self._state: ECircuitState = ECircuitState.CLOSED
+        self._opened_at: float = 0
+        self._listeners: List[Callable[[ECircuitState, ECircuitState], Any]] = []
+        self._probe_task: Optional[asyncio.Task] = None
+
+    @property
+    def state(self) -> ECircuitState:
+        """
+        Current state of the circuit.
+
+        Returns:
+            ECircuitState: The state.
+        """
+        return self._state
+
+    @property
+    def retry_after(self) -> float:
+        """
+        Seconds until the next probe of the gateway.
+
+        Returns:
+            float: The delay, 0 when the circuit is closed or being probed.
+        """
+        if self._state != ECircuitState.OPEN:
+            return 0
+        return max(0.0, self._opened_at + self.recovery_timeout - time.monotonic())
+
+    @asynccontextmanager
+    async def guard(self, deadline: Optional[Deadline] = None) -> AsyncIterator[None]:
+        """
+        Runs a request through the circuit, recording its success or failure.
+
+        Args:
+            deadline (Optional[Deadline]): Deadline of the request: a failure exception raised once the
+                deadline of the caller has passed is not recorded (default: None).
+
+        Raises:
+            CircuitOpenError: If the circuit is not closed.
+            Exception: The error of the request, re-raised once recorded, a failure for the failure exceptions.
+            CancelledError: If the request is cancelled.
+        """
+        self.check()
+        try:
+            yield
+        except self.failure_exceptions:
+            if deadline is not None and deadline.expired_by_caller:
+                # Cut short by its caller, which tells nothing about the gateway
+                self._abandon()
+            else:
+                self.record_failure()
+            raise
+        except Exception:
+            # The gateway answered
+            self.record_success()
+            raise
+        except asyncio.CancelledError:
+            self._abandon()
+            raise
+        self.record_success()
+
+    def check(self) -> None:
+        """
+        Fails fast if the circuit is not closed.
+
+        Raises:
+            CircuitOpenError: If the circuit is open or being probed.
+        """
+        if self._state == ECircuitState.CLOSED:
+            return
+
+        if self._state == ECircuitState.OPEN and self.probe is None and not self.retry_after:
+            # This request is the probe
+            self._setState(ECircuitState.HALF_OPEN)
+            return
+
+        self.rejected += 1
+        raise CircuitOpenError(self.name, self.retry_after)
+
+    def record_success(self) -> None:
+        """
+        Records a successful request.
+        """
+        if self._state == ECircuitState.CLOSED:
+            self.failures = 0
+        elif self._state == ECircuitState.HALF_OPEN and self.probe is None:
+            self._close()
+
+    def record_failure(self) -> None:
+        """
+        Records a failed request.
+        """
+        if self._state == ECircuitState.CLOSED:
+            self.failures += 1
+            if self.failures >= self.failure_threshold:
+                self._open()
+        elif self._state == ECircuitState.HALF_OPEN and self.probe is None:
+            self._open()
+
+    def _abandon(self) -> None:
+        """
+        Records nothing for a request given up before the gateway answered, letting the next request probe.
+        """
+        if self._state == ECircuitState.HALF_OPEN and self.probe is None:
+            self._setState(ECircuitState.OPEN)
+
+    def add_listener(self, listener: Callable[[ECircuitState, ECircuitState], Any]) -> None:
+        """
+        Adds a state change callback, called with the previous and the new state.
+
+        Args:
+            listener (Callable[[ECircuitState, ECircuitState], Any]): The callback.
+        """
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[ECircuitState, ECircuitState], Any]) -> None:
+        """
+        Removes a state change callback.
+
+        Args:
+            listener (Callable[[ECircuitState, ECircuitState], Any]): The callback.
+        """
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    async def close(self) -> None:
+        """
+        Stops probing the gateway.
+        """
+        if self._probe_task is not None and not self._probe_task.done():
+            self._probe_task.cancel()
+            try:
+                await self._probe_task
+            except asyncio.CancelledError:
+                pass
+        self._probe_task = None
+
+    def _open(self) -> None:
+        """
+        Opens the circuit, and starts probing the gateway.
+        """
+        self._opened_at = time.monotonic()
+        self.trips += 1
+        self._setState(ECircuitState.OPEN)
+
+        if self.probe is not None and (self._probe_task is None or self._probe_task.done()):
+            self._probe_task = asyncio.ensure_future(self._probeLoop())
+
+    def _close(self) -> None:
+        """
+        Closes the circuit.
+        """
+        self.failures = 0
+        self._setState(ECircuitState.CLOSED)
+
+    async def _probeLoop(self) -> None:
+        """
+        Probes the gateway every recovery_timeout seconds until it answers.
+        """
+        while self._state != ECircuitState.CLOSED:
+            await asyncio.sleep(self.retry_after)
+
+            self._setState(ECircuitState.HALF_OPEN)
+            try:
+                healthy = bool(await self.probe())
+            except Exception as err:  # pylint: disable=broad-except
+                _LOGGER.debug(f'Circuit breaker {self.name}: probe failed: {err!r}')
+                healthy = False
+
+            if healthy:
+                self._close()
+            else:
+                self._opened_at = time.monotonic()
+                self._setState(ECircuitState.OPEN)
+
+    def _setState(self, state: ECircuitState) -> None:
+        """
+        Changes the state of the circuit and calls the listeners.
+
+        Args:
+            state (ECircuitState): The new state.
+        """
+        previous, self._state = self._state, state
+        if previous == state:
+            return
+
+        _LOGGER.info(f'Circuit breaker {self.name}: {previous} -> {state}')
+        for listener in list(self._listeners):
+            try:
+                listener(previous, state)
+            except Exception as err:  # pylint: disable=broad-except
+                _LOGGER.error(f'Circuit breaker {self.name}: listener failed: {err!r}')
+
+    def stats(self) -> Dict[str, Union[str, int]]:
+        """
+        Gets the state and the counters of the circuit breaker.
+
+        Returns:
+            Dict[str, Union[str, int]]: The 'state', 'failures', 'trips' and 'rejected' values.
+        """
+        return {
+            'state': self._state.value,
+            'failures': self.failures,
+            'trips': self.trips,
+            'rejected': self.rejected,
+        }
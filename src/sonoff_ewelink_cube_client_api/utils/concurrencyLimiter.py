@@ -0,0 +1,298 @@
+"""
+Module: concurrencyLimiter
+
+This module provides an adaptive limit of the concurrent requests sent to a gateway.
+
+Classes:
+    ConcurrencySlot: A slot of the limiter held by one request.
+    AdaptiveConcurrencyLimiter: Limits the concurrent requests with an AIMD window and a fair queue.
+"""
+#pylint: disable-msg=too-many-instance-attributes
+#pylint: disable-msg=too-few-public-methods
+
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Deque, Dict, Optional, Tuple, Type, Union
+
+import asyncio
+import logging
+import time
+
+import aiohttp
+
+from .deadline import Deadline
+
+_LOGGER = logging.getLogger(__name__)
+
+# Errors showing an overloaded or unreachable gateway
+DEFAULT_FAILURE_EXCEPTIONS = (asyncio.TimeoutError, aiohttp.ClientConnectionError, OSError)
+
+
+class ConcurrencySlot:
+    """
+    A slot of the limiter held by one request.
+
+    Attributes:
+        started_at (float): Monotonic time the request got the slot.
+        failed (bool): Set by the request when its response shows an overloaded gateway.
+        latency (Optional[float]): Set by a streamed request to the seconds until its response headers,
+            None measures the time the slot is held.
+        deadline (Optional[Deadline]): Deadline of the request, once passed by its caller the window is kept.
+        budget (Optional[float]): Default time budget in seconds of the endpoint, scaling its latency target.
+    """
+
+    __slots__ = ('started_at', 'failed', 'latency', 'deadline', 'budget')
+
+    def __init__(self, started_at: float):
+        """
+        Initializes the ConcurrencySlot object.
+
+        Parameters:
+            started_at (float): Monotonic time the request got the slot.
+        """
+        self.started_at: float = started_at
+        self.failed: bool = False
+        self.latency: Optional[float] = None
+        self.deadline: Optional[Deadline] = None
+        self.budget: Optional[float] = None
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    Limits the concurrent requests with an AIMD window and a fair queue.
+
+    The window grows by 'increase' requests per window of successful requests (additive increase),
+    and is multiplied by 'decrease' when a request fails or is slower than its latency target
+    (multiplicative decrease). Only requests started after the last decrease can decrease
+    the window again, so one burst of slow responses halves it once instead of collapsing it.
+    Requests over the window wait in FIFO order.
+
+    The latency target of a request is 'latency_target', or 'latency_fraction' of the default
+    budget of its endpoint if longer, so the slow endpoints (adding a device, rebooting) are
+    not congestion each time they are called. A request cut short by the deadline of its
+    caller leaves the window as is: its latency and its timeout tell nothing about the gateway.
+
+    Attributes:
+        min_window (int): Lowest window.
+        max_window (int): Highest window.
+        latency_target (float): Seconds above which a response counts as congestion, at least.
+        latency_fraction (float): Fraction of the default budget of an endpoint above which its response
+            counts as congestion.
+        increase (float): Requests added to the window per window of successful requests.
+        decrease (float): Factor applied to the window on congestion.
+        failure_exceptions (Tuple[Type[BaseException], ...]): Exceptions counted as congestion.
+        acquired (int): Number of slots given.
+        queued (int): Number of requests which waited for a slot.
+        increases (int): Number of window increases.
+        decreases (int): Number of window decreases.
+
+    Methods:
+        slot(deadline: Optional[Deadline] = None, budget: Optional[float] = None) -> AsyncIterator[ConcurrencySlot]:
+            Holds a slot for the duration of a request.
+        acquire() -> ConcurrencySlot: Waits for a slot.
+        release(slot: ConcurrencySlot, failed: bool = False): Gives back a slot and adapts the window.
+        stats() -> Dict[str, Union[int, float]]: Gets the window and the counters of the limiter.
+    """
+
+    def __init__(
+        self,
+        initial_window: int = 4,
+        min_window: int = 1,
+        max_window: int = 10,
+        latency_target: float = 1.0,
+        latency_fraction: float = 0.2,
+        increase: float = 1.0,
+        decrease: float = 0.5,
+        failure_exceptions: Tuple[Type[BaseException], ...] = DEFAULT_FAILURE_EXCEPTIONS,
+    ):
+        """
+        Initializes the AdaptiveConcurrencyLimiter object.
+
+        Parameters:
+            initial_window (int): Window before any response (default: 4).
+            min_window (int): Lowest window (default: 1).
+            max_window (int): Highest window, at most the connection limit of the transport (default: 10).
+            latency_target (float): Seconds above which a response counts as congestion, at least (default: 1.0).
+            latency_fraction (float): Fraction of the default budget of an endpoint above which its response
+                counts as congestion (default: 0.2).
+            increase (float): Requests added per window of successful requests (default: 1.0).
+            decrease (float): Factor applied to the window on congestion, between 0 and 1 (default: 0.5).
+            failure_exceptions (Tuple[Type[BaseException], ...]): Exceptions counted as congestion
+                (default: timeouts and connection errors).
+
+        Raises:
+            ValueError: If the window bounds or the factors are not valid.
+        """
+        if not 1 <= min_window <= max_window:
+            raise ValueError("Window bounds must satisfy 1 <= min_window <= max_window.")
+        if not 0 < decrease < 1 or increase <= 0:
+            raise ValueError("increase must be positive and decrease between 0 and 1.")
+
+        self.min_window: int = min_window
+        self.max_window: int = max_window
+        self.latency_target: float = latency_target
+        self.latency_fraction: float = latency_fraction
+        self.increase: float = increase
+        self.decrease: float = decrease
+        self.failure_exceptions: Tuple[Type[BaseException], ...] = failure_exceptions
+        self.acquired: int = 0
+        self.queued: int = 0
+        self.increases: int = 0
+        self.decreases: int = 0
+        self._window: float = float(min(max(initial_window, min_window), max_window))
+        self._in_flight: int = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._decreased_at: float = float('-inf')
+
+    @property
+    def window(self) -> int:
+        """
+        Current number of requests allowed at once.
+
+        Returns:
+            int: The window.
+        """
+        return int(self._window)
+
+    @property
+    def in_flight(self) -> int:
+        """
+        Number of requests holding a slot.
+
+        Returns:
+            int: The number of requests in flight.
+        """
+        return self._in_flight
+
+    @property
+    def queue_depth(self) -> int:
+        """
+        Number of requests waiting for a slot.
+
+        Returns:
+            int: The number of waiting requests.
+        """
+        return len(self._waiters)
+
+    @asynccontextmanager
+    async def slot(self, deadline: Optional[Deadline] = None, budget: Optional[float] = None
+                   ) -> AsyncIterator[ConcurrencySlot]:
+        """
+        Holds a slot for the duration of a request.
+
+        The slot is released with its latency when the block ends, as failed when the block
+        raises one of the failure exceptions or sets 'failed' on the slot.
+
+        Args:
+            deadline (Optional[Deadline]): Deadline of the request (default: None).
+            budget (Optional[float]): Default time budget in seconds of the endpoint (default: None).
+
+        Yields:
+            ConcurrencySlot: The slot of the request.
+        """
+        slot = await self.acquire()
+        slot.deadline, slot.budget = deadline, budget
+        failed = False
+        try:
+            yield slot
+        except self.failure_exceptions:
+            failed = True
+            raise
+        finally:
+            self.release(slot, failed)
+
+    async def acquire(self) -> ConcurrencySlot:
+        """
+        Waits for a slot, in arrival order.
+
+        Returns:
+            ConcurrencySlot: The slot, to be given back with release.
+        """
+        if self._in_flight < self.window and not self._waiters:
+            self._in_flight += 1
+        else:
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            self.queued += 1
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter.done() and not waiter.cancelled():
+                    # Granted while being cancelled: hand the slot over
+                    self._in_flight -= 1
+                    self._wake()
+                else:
+                    self._waiters.remove(waiter)
+                raise
+
+        self.acquired += 1
+        return ConcurrencySlot(time.monotonic())
+
+    def release(self, slot: ConcurrencySlot, failed: bool = False) -> None:
+        """
+        Gives back a slot and adapts the window.
+
+        Args:
+            slot (ConcurrencySlot): The slot from acquire.
+            failed (bool): The request failed (default: False).
+        """
+        self._in_flight -= 1
+        latency = slot.latency if slot.latency is not None else time.monotonic() - slot.started_at
+
+        if slot.deadline is not None and slot.deadline.expired_by_caller:
+            # Cut short by its caller, which tells nothing about the gateway
+            pass
+        elif failed or slot.failed or latency > self._latencyTarget(slot):
+            # Only react once to the requests sent before the last decrease
+            if slot.started_at >= self._decreased_at:
+                self._window = max(self.min_window, self._window * self.decrease)
+                self._decreased_at = time.monotonic()
+                self.decreases += 1
+                _LOGGER.debug(f'Concurrency window decreased: {self.window}, latency: {latency:.3f}s')
+        elif self._window < self.max_window:
+            self._window = min(self.max_window, self._window + self.increase / self._window)
+            self.increases += 1
+
+        self._wake()
+
+    def _latencyTarget(self, slot: ConcurrencySlot) -> float:
+        """
+        Gets the seconds above which the response of a request counts as congestion.
+
+        Args:
+            slot (ConcurrencySlot): The slot of the request.
+
+        Returns:
+            float: The latency target, scaled to the default budget of the endpoint.
+        """
+        if slot.budget is None:
+            return self.latency_target
+        return max(self.latency_target, slot.budget * self.latency_fraction)
+
+    def _wake(self) -> None:
+        """
+        Gives the free slots to the waiting requests, first come first served.
+        """
+        while self._waiters and self._in_flight < self.window:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self._in_flight += 1
+                waiter.set_result(None)
+
+    def stats(self) -> Dict[str, Union[int, float]]:
+        """
+        Gets the window and the counters of the limiter.
+
+        Returns:
+            Dict[str, Union[int, float]]: The 'window', 'in_flight', 'queue_depth', 'acquired', 'queued',
+                'increases' and 'decreases' values.
+        """
+        return {
+            'window': self.window,
+            'in_flight': self.in_flight,
+            'queue_depth': self.queue_depth,
+            'acquired': self.acquired,
+            'queued': self.queued,
+            'increases': self.increases,
+            'decreases': self.decreases,
+        }
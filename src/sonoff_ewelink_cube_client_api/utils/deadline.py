@@ -0,0 +1,174 @@
+"""
+Module: deadline
+
+This module provides the deadlines of the gateway requests and their per-endpoint defaults.
+
+Classes:
+    Deadline: The point in time a request must complete by.
+
+Functions:
+    default_timeout: Gets the default time budget of an endpoint.
+"""
+
+from typing import Any, Awaitable, Dict, Optional, Tuple, Union
+
+import asyncio
+import time
+
+from ..errors import DeadlineExceededError
+from ..ts.enum.EMethod import EMethod
+from ..ts.enum.EPath import EPath
+
+# Time budget of an endpoint without default
+DEFAULT_TIMEOUT = 10.0
+
+# Default time budget in seconds by method and path, a path ending with '/' matches the paths below it
+DEFAULT_TIMEOUTS: Dict[Tuple[EMethod, str], float] = {
+    (EMethod.GET, EPath.BRIDGE.value): 5.0,
+    (EMethod.GET, EPath.BRIDGE_RUNTIME.value): 5.0,
+    (EMethod.GET, EPath.BRIDGE_TOKEN.value): 5.0,
+    (EMethod.PUT, EPath.BRIDGE_CONFIG.value): 5.0,
+    (EMethod.POST, EPath.HARDWARE_SPEAKER.value): 3.0,
+    (EMethod.POST, EPath.HARDWARE_REBOOT.value): 30.0,
+    (EMethod.GET, EPath.DEVICE.value): 15.0,
+    (EMethod.POST, EPath.DEVICE.value): 30.0,
+    (EMethod.PUT, EPath.DEVICE.value): 5.0,
+    (EMethod.PUT, EPath.DEVICE_DISCOVERY.value): 10.0,
+    (EMethod.PUT, f'{EPath.DEVICE.value}/'): 5.0,
+    (EMethod.DELETE, f'{EPath.DEVICE.value}/'): 10.0,
+    (EMethod.GET, f'{EPath.DEBUG_LOG.value}/'): 60.0,
+}
+
+
+class Deadline:
+    """
+    The point in time a request must complete by.
+
+    A deadline is shared by everything a request waits for: the concurrency queue, each
+    attempt and the backoff between retries. It can also be shared by several requests.
+    A request cut short by the deadline of its caller tells nothing about the gateway,
+    unlike one outliving the default budget of its endpoint.
+
+    Attributes:
+        timeout (float): The time budget in seconds.
+        expires_at (float): Monotonic time of the deadline.
+        endpoint_default (bool): The time budget is the default of the endpoint, not one of the caller.
+
+    Methods:
+        remaining() -> float: Gets the seconds left before the deadline.
+        run(awaitable: Awaitable[Any]) -> Any: Awaits within the deadline.
+    """
+
+    __slots__ = ('timeout', 'expires_at', 'endpoint_default')
+
+    def __init__(self, timeout: float, endpoint_default: bool = False):
+        """
+        Initializes the Deadline object.
+
+        Parameters:
+            timeout (float): The time budget in seconds, from now.
+            endpoint_default (bool): The time budget is the default of the endpoint (default: False).
+
+        Raises:
+            ValueError: If the timeout is negative.
+        """
+        if timeout < 0:
+            raise ValueError("Timeout must not be negative.")
+
+        self.timeout: float = timeout
+        self.expires_at: float = time.monotonic() + timeout
+        self.endpoint_default: bool = endpoint_default
+
+    @classmethod
+    def resolve(cls, timeout: Union[None, float, 'Deadline'], default: float) -> 'Deadline':
+        """
+        Gets the deadline of a call.
+
+        Args:
+            timeout (Union[None, float, Deadline]): The timeout in seconds or the deadline of the call,
+                None for the default.
+            default (float): The default timeout in seconds.
+
+        Returns:
+            Deadline: The deadline.
+        """
+        if isinstance(timeout, Deadline):
+            return timeout
+        if timeout is None:
+            return cls(default, endpoint_default=True)
+        return cls(timeout)
+
+    @property
+    def expired(self) -> bool:
+        """
+        Whether the deadline has passed.
+
+        Returns:
+            bool: True if the deadline has passed.
+        """
+        return time.monotonic() >= self.expires_at
+
+    @property
+    def expired_by_caller(self) -> bool:
+        """
+        Whether the deadline set by the caller has passed, rather than the default of the endpoint.
+
+        Returns:
+            bool: True if a deadline of the caller has passed.
+        """
+        return not self.endpoint_default and self.expired
+
+    def remaining(self) -> float:
+        """
+        Gets the seconds left before the deadline.
+
+        Returns:
+            float: The seconds left, 0 once the deadline has passed.
+        """
+        return max(0.0, self.expires_at - time.monotonic())
+
+    async def run(self, awaitable: Awaitable[Any]) -> Any:
+        """
+        Awaits within the deadline, cancelling the awaitable when the deadline passes.
+
+        Args:
+            awaitable (Awaitable[Any]): The awaitable.
+
+        Returns:
+            Any: The result of the awaitable.
+
+        Raises:
+            DeadlineExceededError: If the deadline passes first.
+            TimeoutError: If the awaitable itself times out before the deadline.
+        """
+        try:
+            return await asyncio.wait_for(awaitable, self.remaining())
+        except asyncio.TimeoutError as err:
+            if self.expired:
+                raise DeadlineExceededError(self.timeout) from err
+            raise
+
+
+def default_timeout(method: EMethod, path: str, timeouts: Optional[Dict[Tuple[EMethod, str], float]] = None) -> float:
+    """
+    Gets the default time budget of an endpoint.
+
+    Args:
+        method (EMethod): HTTP method of the request.
+        path (str): API path of the request.
+        timeouts (Optional[Dict[Tuple[EMethod, str], float]]): Time budgets by method and path
+            (default: DEFAULT_TIMEOUTS).
+
+    Returns:
+        float: The time budget in seconds.
+    """
+    timeouts = DEFAULT_TIMEOUTS if timeouts is None else timeouts
+
+    timeout = timeouts.get((method, path))
+    if timeout is not None:
+        return timeout
+
+    for (endpoint_method, endpoint_path), endpoint_timeout in timeouts.items():
+        if endpoint_method == method and endpoint_path.endswith('/') and path.startswith(endpoint_path):
+            return endpoint_timeout
+    return DEFAULT_TIMEOUT
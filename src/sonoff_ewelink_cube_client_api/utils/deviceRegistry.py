@@ -0,0 +1,532 @@
+"""
+Module: deviceRegistry
+
+This module provides the in-memory mirror of the devices of a gateway.
+
+Classes:
+    DeviceRegistry: Mirrors the device list of a gateway, kept up to date by its SSE events.
+"""
+#pylint: disable-msg=too-many-instance-attributes
+
+from typing import Any, Dict, Hashable, Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+import logging
+
+from ..ts.enum.ECapability import ECapability
+from ..ts.enum.ECategory import ECategory
+from ..ts.enum.ESseEvent import ESseEvent
+from ..ts.interface.IDeviceEvent import IDeviceEvent
+from .deviceStore import DeviceStore
+from .sseUtils import merge_dicts
+
+_LOGGER = logging.getLogger(__name__)
+
+DEVICE_EVENTS = (
+    ESseEvent.ADD_DEVICE,
+    ESseEvent.UPDATE_DEVICE_STATE,
+    ESseEvent.UPDATE_DEVICE_INFO,
+    ESseEvent.UPDATE_DEVICE_ONLINE,
+    ESseEvent.DELETE_DEVICE,
+)
+
+
+def _changes(previous: Dict[str, Any], current: Dict[str, Any], ignored: Tuple[str, ...] = ()) -> Dict[str, Any]:
+    """
+    Gets the values of a dictionary which differ from a previous one, None for the keys removed.
+
+    Args:
+        previous (Dict[str, Any]): The previous dictionary.
+        current (Dict[str, Any]): The current dictionary.
+        ignored (Tuple[str, ...]): Keys left out (default: none).
+
+    Returns:
+        Dict[str, Any]: The changed values.
+    """
+    return {
+        key: current.get(key) for key in {**previous, **current}
+        if key not in ignored and previous.get(key) != current.get(key)
+    }
+
+
+def _replace(previous: Dict[str, Any], update: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Replaces values in a copy of a dictionary, removing the keys whose value is None.
+
+    Args:
+        previous (Dict[str, Any]): The dictionary, left unchanged.
+        update (Dict[str, Any]): The new values, None for the keys removed.
+
+    Returns:
+        Dict[str, Any]: The updated dictionary.
+    """
+    replaced = {**previous, **update}
+    for key, value in update.items():
+        if value is None:
+            del replaced[key]
+    return replaced
+
+
+def _add(index: Dict[Hashable, Set[str]], key: Hashable, serial_number: str) -> None:
+    """
+    Files a device under a key of an index.
+
+    Args:
+        index (Dict[Hashable, Set[str]]): The index.
+        key (Hashable): The key.
+        serial_number (str): The serial number of the device.
+    """
+    serial_numbers = index.get(key)
+    if serial_numbers is None:
+        index[key] = {serial_number}
+    else:
+        serial_numbers.add(serial_number)
+
+
+def _discard(index: Dict[Hashable, Set[str]], key: Hashable, serial_number: str) -> None:
+    """
+    Removes a device from a key of an index, dropping the key left empty.
+
+    Args:
+        index (Dict[Hashable, Set[str]]): The index.
+        key (Hashable): The key.
+        serial_number (str): The serial number of the device.
+    """
+    serial_numbers = index.get(key)
+    if serial_numbers is not None:
+        serial_numbers.discard(serial_number)
+        if not serial_numbers:
+            del index[key]
+
+
+def _tags(device: Dict[str, Any]) -> Tuple[str, ...]:
+    """
+    Gets the tags of a device: the keys of its 'tags' object, along with 'key=value' for its text
+    values, or the items of its 'tags' list.
+
+    Args:
+        device (Dict[str, Any]): The device.
+
+    Returns:
+        Tuple[str, ...]: The tags.
+    """
+    tags = device.get('tags')
+    if isinstance(tags, dict):
+        return tuple(str(key) for key in tags) + tuple(
+            f'{key}={value}' for key, value in tags.items() if isinstance(value, str)
+        )
+    if isinstance(tags, (list, tuple)):
+        return tuple(str(tag) for tag in tags if isinstance(tag, (str, int)))
+    return ()
+
+
+class DeviceRegistry:
+    """
+    Mirrors the device list of a gateway, kept up to date by its SSE events.
+
+    The registry is loaded once from the device list, then each device event is applied to it:
+    reading a device is a dictionary lookup, with no request to the gateway. A device is replaced,
+    never modified, when it changes, so a device read is a consistent snapshot; its version is
+    increased with each change, telling whether a snapshot is still current.
+
+    The state updates are merged capability by capability into the 'state' of the device, the
+    information updates into the device itself. The updates of unknown devices are ignored. The
+    events made by diff from a device list replace the changed capabilities and fields instead,
+    and remove the ones missing from the list, so the device ends up as listed.
+
+    The devices are indexed by category, online status and tag, and by capability set: each
+    capability is a bit, each device has the bitset of its capabilities, and the devices are
+    grouped by bitset. A query walks the smallest of its index entries, checking the others and
+    the capabilities of each device with a bit operation, so its cost follows the size of its
+    result rather than the number of devices. The indexes are updated with each
+    event changing the category, online status, tags or capabilities of a device.
+
+    With a store, the registry starts with the stored devices and versions, and each change is
+    staged in the store, which writes them in batches.
+
+    Attributes:
+        store (Optional[DeviceStore]): Persistent store of the devices, None keeps them in memory only.
+        applied (int): Number of events which changed the registry.
+        ignored (int): Number of events ignored, for an unknown device or without payload.
+        loaded (bool): Whether the registry holds a device list, loaded or restored from the store.
+
+    Methods:
+        load(devices: Iterable[Dict[str, Any]]): Replaces the devices of the registry.
+        apply(event: IDeviceEvent) -> bool: Applies a device event.
+        get(serial_number: str) -> Optional[Dict[str, Any]]: Gets a device.
+        version(serial_number: str) -> int: Gets the version of a device.
+        query(category=None, online=None, tag=None, capabilities=None) -> List[Dict[str, Any]]:
+            Finds the devices by category, online status, tag and capabilities.
+        capability_mask(capabilities: Iterable[Union[ECapability, str]]) -> Optional[int]:
+            Gets the bitset of capabilities.
+        has_capabilities(serial_number: str, capabilities: Iterable[Union[ECapability, str]]) -> bool:
+            Tells whether a device has capabilities.
+        diff(devices: Iterable[Dict[str, Any]]) -> List[IDeviceEvent]: Gets the events turning the registry
+            into a device list.
+    """
+
+    def __init__(self, store: Optional[DeviceStore] = None):
+        """
+        Initializes the DeviceRegistry object, with the devices of the store if any.
+
+        Parameters:
+            store (Optional[DeviceStore]): Persistent store of the devices (default: None).
+        """
+        self.store: Optional[DeviceStore] = store
+        self.applied: int = 0
+        self.ignored: int = 0
+        self.loaded: bool = False
+        self._devices: Dict[str, Dict[str, Any]] = {}
+        self._versions: Dict[str, int] = {}
+        self._bits: Dict[str, int] = {str(capability): 1 << bit for bit, capability in enumerate(ECapability)}
+        self._masks: Dict[str, int] = {}
+        self._by_category: Dict[Hashable, Set[str]] = {}
+        self._by_online: Dict[Hashable, Set[str]] = {}
+        self._by_tag: Dict[Hashable, Set[str]] = {}
+        self._by_mask: Dict[Hashable, Set[str]] = {}
+
+        if store is not None:
+            for device, version in store.load():
+                serial_number = device['serial_number']
+                self._devices[serial_number] = device
+                self._versions[serial_number] = version
+                self._index(serial_number, device)
+            self.loaded = bool(self._devices)
+            _LOGGER.debug(f'Device registry restored with {len(self._devices)} devices')
+
+    def __len__(self) -> int:
+        """
+        Gets the number of devices.
+
+        Returns:
+            int: The number of devices.
+        """
+        return len(self._devices)
+
+    def __contains__(self, serial_number: object) -> bool:
+        """
+        Tells whether a device is in the registry.
+
+        Args:
+            serial_number (object): The serial number of the device.
+
+        Returns:
+            bool: True if the device is in the registry.
+        """
+        return serial_number in self._devices
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        """
+        Iterates over the devices.
+
+        Returns:
+            Iterator[Dict[str, Any]]: The devices.
+        """
+        return iter(list(self._devices.values()))
+
+    def load(self, devices: Iterable[Dict[str, Any]]) -> None:
+        """
+        Replaces the devices of the registry, e.g. with the device list of the gateway.
+
+        The versions of the devices kept are increased, the versions of the devices removed are dropped.
+
+        Args:
+            devices (Iterable[Dict[str, Any]]): The devices.
+        """
+        loaded = {
+            device['serial_number']: device for device in devices
+            if isinstance(device, dict) and device.get('serial_number')
+        }
+        for serial_number in self._devices.keys() - loaded.keys():
+            self._versions.pop(serial_number, None)
+        self._devices = loaded
+        self.loaded = True
+        self._masks = {}
+        self._by_category, self._by_online, self._by_tag, self._by_mask = {}, {}, {}, {}
+        for serial_number, device in loaded.items():
+            self._versions[serial_number] = self._versions.get(serial_number, 0) + 1
+            self._index(serial_number, device)
+        if self.store is not None:
+            self.store.replace((device, self._versions[serial_number]) for serial_number, device in loaded.items())
+        _LOGGER.debug(f'Device registry loaded with {len(loaded)} devices')
+
+    def apply(self, event: IDeviceEvent) -> bool:
+        """
+        Applies a device event to the registry.
+
+        Args:
+            event (IDeviceEvent): The event.
+
+        Returns:
+            bool: True if the event changed the registry.
+
+        Raises:
+            ValueError: If the data of the event is not valid JSON.
+        """
+        event_name = str(event.type)
+        serial_number = event.serial_number
+        if serial_number is None:
+            self.ignored += 1
+            return False
+
+        if event_name == ESseEvent.DELETE_DEVICE.value:
+            return self._changed(self._delete(serial_number))
+
+        data = event.data
+        payload = data.get('payload') if isinstance(data, dict) else None
+        if not isinstance(payload, dict):
+            return self._changed(False)
+
+        previous = self._devices.get(serial_number)
+        if event_name == ESseEvent.ADD_DEVICE.value:
+            device = payload
+        elif previous is None:
+            return self._changed(False)
+        elif event_name == ESseEvent.UPDATE_DEVICE_STATE.value:
+            update = _replace if event.reconciled else merge_dicts
+            device = {**previous, 'state': update(previous.get('state') or {}, payload)}
+        elif event_name == ESseEvent.UPDATE_DEVICE_ONLINE.value:
+            device = {**previous, 'online': payload.get('online', previous.get('online'))}
+        elif event_name == ESseEvent.UPDATE_DEVICE_INFO.value:
+            device = _replace(previous, payload) if event.reconciled else {**previous, **payload}
+            device['serial_number'] = serial_number
+        else:
+            return self._changed(False)
+
+        self._devices[serial_number] = device
+        if event_name != ESseEvent.UPDATE_DEVICE_STATE.value:
+            if previous is not None:
+                self._unindex(serial_number, previous)
+            self._index(serial_number, device)
+        self._versions[serial_number] = self._versions.get(serial_number, 0) + 1
+        if self.store is not None:
+            self.store.put(device, self._versions[serial_number])
+        return self._changed(True)
+
+    def _delete(self, serial_number: str) -> bool:
+        """
+        Deletes a device.
+
+        Args:
+            serial_number (str): The serial number of the device.
+
+        Returns:
+            bool: True if the device was in the registry.
+        """
+        self._versions.pop(serial_number, None)
+        device = self._devices.pop(serial_number, None)
+        if device is None:
+            return False
+        self._unindex(serial_number, device)
+        if self.store is not None:
+            self.store.delete(serial_number)
+        return True
+
+    def get(self, serial_number: str) -> Optional[Dict[str, Any]]:
+        """
+        Gets a device.
+
+        Args:
+            serial_number (str): The serial number of the device.
+
+        Returns:
+            Optional[Dict[str, Any]]: The device, or None if unknown.
+        """
+        return self._devices.get(serial_number)
+
+    def version(self, serial_number: str) -> int:
+        """
+        Gets the version of a device, increased with each change of the device.
+
+        Args:
+            serial_number (str): The serial number of the device.
+
+        Returns:
+            int: The version, 0 if the device is unknown.
+        """
+        return self._versions.get(serial_number, 0)
+
+    def diff(self, devices: Iterable[Dict[str, Any]]) -> List[IDeviceEvent]:
+        """
+        Gets the device events turning the registry into a device list, e.g. a fresh one of the gateway.
+
+        Only what changed gets an event: the devices added and deleted, and for the others an
+        information update with the changed fields, an online update, and a state update with the
+        changed capabilities, None for the removed ones. The updates are marked as reconciled,
+        so applying them replaces the changed values: a capability losing a nested key loses it
+        in the registry too. The registry is left unchanged, applying the events updates it.
+
+        Args:
+            devices (Iterable[Dict[str, Any]]): The device list.
+
+        Returns:
+            List[IDeviceEvent]: The events, the deletions first, then device by device.
+        """
+        current = {
+            device['serial_number']: device for device in devices
+            if isinstance(device, dict) and device.get('serial_number')
+        }
+        events = [
+            IDeviceEvent(ESseEvent.DELETE_DEVICE, serial_number, {'endpoint': {'serial_number': serial_number}})
+            for serial_number in self._devices if serial_number not in current
+        ]
+
+        for serial_number, device in current.items():
+            previous = self._devices.get(serial_number)
+            if previous is None:
+                events.append(IDeviceEvent(ESseEvent.ADD_DEVICE, serial_number, {'payload': device}))
+                continue
+
+            endpoint = {'serial_number': serial_number}
+            info = _changes(previous, device, ('serial_number', 'state', 'online'))
+            if info:
+                events.append(IDeviceEvent(ESseEvent.UPDATE_DEVICE_INFO, serial_number,
+                                           {'endpoint': endpoint, 'payload': info}, reconciled=True))
+            if previous.get('online') != device.get('online'):
+                events.append(IDeviceEvent(ESseEvent.UPDATE_DEVICE_ONLINE, serial_number,
+                                           {'endpoint': endpoint, 'payload': {'online': device.get('online')}},
+                                           reconciled=True))
+            state = _changes(previous.get('state') or {}, device.get('state') or {})
+            if state:
+                events.append(IDeviceEvent(ESseEvent.UPDATE_DEVICE_STATE, serial_number,
+                                           {'endpoint': endpoint, 'payload': state}, reconciled=True))
+        return events
+
+    def query(
+        self,
+        category: Union[None, ECategory, str] = None,
+        online: Optional[bool] = None,
+        tag: Optional[str] = None,
+        capabilities: Optional[Iterable[Union[ECapability, str]]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Finds the devices matching all the given criteria, in no particular order.
+
+        Args:
+            category (Union[None, ECategory, str]): The display category of the devices (default: None, any).
+            online (Optional[bool]): The online status of the devices (default: None, any).
+            tag (Optional[str]): A tag of the devices, a key of their tags or 'key=value' (default: None, any).
+            capabilities (Optional[Iterable[Union[ECapability, str]]]): Capabilities the devices all have
+                (default: None, any).
+
+        Returns:
+            List[Dict[str, Any]]: The devices.
+        """
+        candidates: List[Set[str]] = []
+        if category is not None:
+            candidates.append(self._by_category.get(str(category), set()))
+        if online is not None:
+            candidates.append(self._by_online.get(bool(online), set()))
+        if tag is not None:
+            candidates.append(self._by_tag.get(str(tag), set()))
+        mask = 0
+        if capabilities is not None:
+            mask = self.capability_mask(capabilities)
+            if mask is None:
+                return []
+            if not candidates:
+                candidates.append(set().union(*(
+                    serial_numbers for device_mask, serial_numbers in self._by_mask.items()
+                    if device_mask & mask == mask
+                )))
+
+        if not candidates:
+            return list(self._devices.values())
+
+        candidates.sort(key=len)
+        smallest, others = candidates[0], candidates[1:]
+        masks = self._masks
+        return [
+            self._devices[serial_number] for serial_number in smallest
+            if masks[serial_number] & mask == mask and all(serial_number in serial_numbers for serial_numbers in others)
+        ]
+
+    def capability_mask(self, capabilities: Iterable[Union[ECapability, str]]) -> Optional[int]:
+        """
+        Gets the bitset of capabilities.
+
+        Args:
+            capabilities (Iterable[Union[ECapability, str]]): The capabilities.
+
+        Returns:
+            Optional[int]: The bitset, or None if no device ever had one of the capabilities.
+        """
+        mask = 0
+        for capability in capabilities:
+            bit = self._bits.get(str(capability))
+            if bit is None:
+                return None
+            mask |= bit
+        return mask
+
+    def has_capabilities(self, serial_number: str, capabilities: Iterable[Union[ECapability, str]]) -> bool:
+        """
+        Tells whether a device has capabilities.
+
+        Args:
+            serial_number (str): The serial number of the device.
+            capabilities (Iterable[Union[ECapability, str]]): The capabilities.
+
+        Returns:
+            bool: True if the device is known and has all the capabilities.
+        """
+        mask = self.capability_mask(capabilities)
+        device_mask = self._masks.get(serial_number)
+        return mask is not None and device_mask is not None and device_mask & mask == mask
+
+    def _index(self, serial_number: str, device: Dict[str, Any]) -> None:
+        """
+        Files a device in the indexes.
+
+        Args:
+            serial_number (str): The serial number of the device.
+            device (Dict[str, Any]): The device.
+        """
+        if device.get('display_category') is not None:
+            _add(self._by_category, str(device['display_category']), serial_number)
+        _add(self._by_online, bool(device.get('online')), serial_number)
+        for tag in _tags(device):
+            _add(self._by_tag, tag, serial_number)
+
+        mask = 0
+        for capability in device.get('capabilities') or ():
+            if isinstance(capability, dict) and capability.get('capability'):
+                name = str(capability['capability'])
+                bit = self._bits.get(name)
+                if bit is None:
+                    bit = self._bits[name] = 1 << len(self._bits)
+                mask |= bit
+        self._masks[serial_number] = mask
+        _add(self._by_mask, mask, serial_number)
+
+    def _unindex(self, serial_number: str, device: Dict[str, Any]) -> None:
+        """
+        Removes a device from the indexes.
+
+        Args:
+            serial_number (str): The serial number of the device.
+            device (Dict[str, Any]): The device, as it was indexed.
+        """
+        if device.get('display_category') is not None:
+            _discard(self._by_category, str(device['display_category']), serial_number)
+        _discard(self._by_online, bool(device.get('online')), serial_number)
+        for tag in _tags(device):
+            _discard(self._by_tag, tag, serial_number)
+        mask = self._masks.pop(serial_number, None)
+        if mask is not None:
+            _discard(self._by_mask, mask, serial_number)
+
+    def _changed(self, changed: bool) -> bool:
+        """
+        Counts an applied or ignored event.
+
+        Args:
+            changed (bool): Whether the event changed the registry.
+
+        Returns:
+            bool: The changed value.
+        """
+        if changed:
+            self.applied += 1
+        else:
+            self.ignored += 1
+        return changed
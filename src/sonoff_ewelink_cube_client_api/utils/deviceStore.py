@@ -0,0 +1,286 @@
+"""
+Module: deviceStore
+
+This module provides an opt-in persistent store of the device registry, for warm restarts.
+
+Classes:
+    DeviceStore: SQLite store of the devices, written in batches.
+"""
+#pylint: disable-msg=too-many-instance-attributes
+
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import asyncio
+import logging
+import sqlite3
+import threading
+
+from .jsonCodec import JsonCodec, get_codec
+
+_LOGGER = logging.getLogger(__name__)
+
+_SCHEMA = (
+    'CREATE TABLE IF NOT EXISTS devices ('
+    'serial_number TEXT PRIMARY KEY, category TEXT, online INTEGER, version INTEGER NOT NULL, data BLOB NOT NULL)',
+    'CREATE INDEX IF NOT EXISTS devices_category ON devices (category)',
+    'CREATE INDEX IF NOT EXISTS devices_online ON devices (online)',
+)
+
+
+class DeviceStore:
+    """
+    SQLite store of the devices, written in batches.
+
+    The database is in WAL mode, the devices indexed by serial number, category and online
+    status. The changes of the registry are only staged in memory, the latest one of a device
+    replacing the previous: they are written in a single transaction, in a worker thread, once
+    'batch_size' devices changed or 'flush_interval' seconds after the first change, so a burst
+    of state updates costs one write per device. A failed write puts its changes back, behind
+    the ones staged meanwhile, and is retried 'flush_interval' seconds later. The changes staged
+    when the process ends without closing the store are lost, the reconciliation with the
+    gateway at the next start catches up with them.
+
+    Attributes:
+        path (str): Path of the SQLite database file.
+        batch_size (int): Number of changed devices written at once.
+        flush_interval (float): Seconds a change is staged for at most.
+        codec (JsonCodec): JSON codec of the stored devices.
+        writes (int): Number of device rows written or deleted.
+        flushes (int): Number of write transactions.
+
+    Methods:
+        load() -> List[Tuple[Dict[str, Any], int]]: Reads the stored devices and their versions.
+        put(device: Dict[str, Any], version: int): Stages a new or changed device.
+        delete(serial_number: str): Stages the deletion of a device.
+        replace(devices: Iterable[Tuple[Dict[str, Any], int]]): Stages the replacement of every device.
+        flush() -> int: Writes the staged changes.
+        close(): Waits for the write in progress, writes the staged changes and closes the database.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        batch_size: int = 500,
+        flush_interval: float = 1.0,
+        codec: Optional[JsonCodec] = None,
+    ):
+        """
+        Initializes the DeviceStore object, creating the database if needed.
+
+        Parameters:
+            path (str): Path of the SQLite database file.
+            batch_size (int): Number of changed devices written at once (default: 500).
+            flush_interval (float): Seconds a change is staged for at most (default: 1.0).
+            codec (Optional[JsonCodec]): JSON codec of the stored devices (default: the configured codec).
+
+        Raises:
+            ValueError: If batch_size is not positive or flush_interval is negative.
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be positive.")
+        if flush_interval < 0:
+            raise ValueError("flush_interval must not be negative.")
+
+        self.path: str = path
+        self.batch_size: int = batch_size
+        self.flush_interval: float = flush_interval
+        self.codec: JsonCodec = codec if codec is not None else get_codec()
+        self.writes: int = 0
+        self.flushes: int = 0
+        self._pending: Dict[str, Optional[Tuple[Dict[str, Any], int]]] = {}
+        self._clear: bool = False
+        self._pending_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._flushing: Optional[asyncio.Future] = None
+        self._closed: bool = False
+
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute('PRAGMA journal_mode=WAL')
+        self._connection.execute('PRAGMA synchronous=NORMAL')
+        with self._connection:
+            for statement in _SCHEMA:
+                self._connection.execute(statement)
+
+    def load(self) -> List[Tuple[Dict[str, Any], int]]:
+        """
+        Reads the stored devices and their versions.
+
+        Returns:
+            List[Tuple[Dict[str, Any], int]]: The devices and their versions.
+        """
+        with self._write_lock:
+            rows = self._connection.execute('SELECT data, version FROM devices').fetchall()
+        return [(self.codec.loads(data), version) for data, version in rows]
+
+    def put(self, device: Dict[str, Any], version: int) -> None:
+        """
+        Stages a new or changed device.
+
+        Args:
+            device (Dict[str, Any]): The device.
+            version (int): The version of the device in the registry.
+        """
+        self._stage(device['serial_number'], (device, version))
+
+    def delete(self, serial_number: str) -> None:
+        """
+        Stages the deletion of a device.
+
+        Args:
+            serial_number (str): The serial number of the device.
+        """
+        self._stage(serial_number, None)
+
+    def replace(self, devices: Iterable[Tuple[Dict[str, Any], int]]) -> None:
+        """
+        Stages the replacement of every device, e.g. with a fresh device list.
+
+        Args:
+            devices (Iterable[Tuple[Dict[str, Any], int]]): The devices and their versions.
+        """
+        with self._pending_lock:
+            self._clear = True
+            self._pending = {device['serial_number']: (device, version) for device, version in devices}
+        self._schedule()
+
+    def flush(self) -> int:
+        """
+        Writes the staged changes in a single transaction, in the calling thread.
+
+        Returns:
+            int: The number of device rows written or deleted.
+
+        Raises:
+            Exception: If the write failed, e.g. a sqlite3.Error, its changes staged again.
+        """
+        with self._write_lock:
+            if self._closed:
+                return 0
+            with self._pending_lock:
+                pending, self._pending = self._pending, {}
+                clear, self._clear = self._clear, False
+            if not pending and not clear:
+                return 0
+
+            try:
+                rows = []
+                deleted = []
+                for serial_number, item in pending.items():
+                    if item is None:
+                        deleted.append((serial_number,))
+                        continue
+                    device, version = item
+                    category = device.get('display_category')
+                    online = device.get('online')
+                    rows.append((serial_number, None if category is None else str(category),
+                                 None if online is None else int(bool(online)), version, self.codec.dumps(device)))
+
+                with self._connection:
+                    if clear:
+                        self._connection.execute('DELETE FROM devices')
+                    self._connection.executemany('INSERT OR REPLACE INTO devices VALUES (?, ?, ?, ?, ?)', rows)
+                    self._connection.executemany('DELETE FROM devices WHERE serial_number = ?', deleted)
+            except Exception:
+                self._restage(pending, clear)
+                raise
+
+        self.writes += len(pending)
+        self.flushes += 1
+        _LOGGER.debug(f'Device store: {len(rows)} devices written, {len(deleted)} deleted')
+        return len(pending)
+
+    async def close(self) -> None:
+        """
+        Waits for the write in progress, then writes the staged changes and closes the database in a worker thread.
+
+        Raises:
+            Exception: If the last write failed, e.g. a sqlite3.Error, the database being closed anyway.
+        """
+        if self._flushing is not None:
+            await asyncio.wait([self._flushing])
+            self._flushing = None
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        await asyncio.get_running_loop().run_in_executor(None, self._close)
+
+    def _close(self) -> None:
+        """
+        Writes the staged changes and closes the database, in the calling thread.
+        """
+        try:
+            self.flush()
+        finally:
+            with self._write_lock:
+                self._closed = True
+                self._connection.close()
+
+    def _restage(self, pending: Dict[str, Optional[Tuple[Dict[str, Any], int]]], clear: bool) -> None:
+        """
+        Stages again the changes of a failed write, unless replaced by the changes staged meanwhile.
+
+        Args:
+            pending (Dict[str, Optional[Tuple[Dict[str, Any], int]]]): The changes of the write.
+            clear (bool): Whether the write replaced every device.
+        """
+        with self._pending_lock:
+            if self._clear:
+                # A replacement of every device was staged meanwhile
+                return
+            self._pending = {**pending, **self._pending}
+            self._clear = clear
+
+    def _stage(self, serial_number: str, item: Optional[Tuple[Dict[str, Any], int]]) -> None:
+        """
+        Stages the change of a device, replacing its previous staged change.
+
+        Args:
+            serial_number (str): The serial number of the device.
+            item (Optional[Tuple[Dict[str, Any], int]]): The device and its version, None for a deletion.
+        """
+        with self._pending_lock:
+            self._pending[serial_number] = item
+        self._schedule()
+
+    def _schedule(self) -> None:
+        """
+        Schedules the writing of the staged changes, at once when a batch is full.
+
+        Without running event loop, the changes stay staged until flush or close.
+        """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+
+        if len(self._pending) >= self.batch_size:
+            self._start_flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.flush_interval, self._start_flush)
+
+    def _start_flush(self) -> None:
+        """
+        Writes the staged changes in a worker thread, unless a write is in progress.
+        """
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._flushing is not None and not self._flushing.done():
+            # The changes staged meanwhile are written by the next timer
+            self._timer = asyncio.get_running_loop().call_later(self.flush_interval, self._start_flush)
+            return
+        self._flushing = asyncio.get_running_loop().run_in_executor(None, self.flush)
+        self._flushing.add_done_callback(self._flushed)
+
+    def _flushed(self, future: asyncio.Future) -> None:
+        """
+        Logs the failure of a write in a worker thread, and schedules the retry of its changes.
+
+        Args:
+            future (asyncio.Future): The write.
+        """
+        if not future.cancelled() and future.exception() is not None:
+            _LOGGER.error(f'Device store write failed: {future.exception()!r}')
+            if not self._closed and self._timer is None:
+                self._timer = asyncio.get_running_loop().call_later(self.flush_interval, self._start_flush)
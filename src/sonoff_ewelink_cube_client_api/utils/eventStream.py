@@ -0,0 +1,144 @@
+"""
+Module: eventStream
+
+This module provides the buffered streams of device events consumed by async iteration.
+
+Classes:
+    EventStream: Buffers the device events of one consumer, in a bounded queue.
+"""
+#pylint: disable-msg=too-many-instance-attributes
+
+from collections import deque
+from typing import Deque, Optional
+
+import asyncio
+
+from ..ts.enum.EOverflowPolicy import EOverflowPolicy
+from ..ts.interface.IDeviceEvent import IDeviceEvent
+from .sseDispatcher import CONFLATED_EVENTS
+from .sseUtils import merge_event_data
+
+
+class EventStream:
+    """
+    Buffers the device events of one consumer, in a bounded queue.
+
+    Each consumer has its own buffer, so a slow consumer only delays the others through the
+    overflow policy of its own stream: BLOCK makes the SSE reader wait for room (backpressure
+    up to the socket, nothing is lost), DROP_OLDEST drops the oldest buffered event, and
+    CONFLATE merges an update into the last buffered event when it is an update of the same
+    type and device, waiting for room otherwise. The events of a stream are chosen by its
+    subscription in the subscription registry.
+
+    Attributes:
+        max_buffer (int): Maximum number of buffered events.
+        overflow (EOverflowPolicy): What happens to an event when the buffer is full.
+        dropped (int): Number of events dropped by DROP_OLDEST.
+        conflated (int): Number of events merged by CONFLATE.
+        closed (bool): Whether the stream is closed.
+
+    Methods:
+        put(event: IDeviceEvent): Buffers an event, applying the overflow policy.
+        get() -> Optional[IDeviceEvent]: Waits for the next event.
+        close(): Ends the stream once its buffered events are consumed.
+    """
+
+    def __init__(
+        self,
+        max_buffer: int = 100,
+        overflow: EOverflowPolicy = EOverflowPolicy.BLOCK,
+    ):
+        """
+        Initializes the EventStream object. Must be called from a running event loop.
+
+        Parameters:
+            max_buffer (int): Maximum number of buffered events (default: 100).
+            overflow (EOverflowPolicy): What happens to an event when the buffer is full (default: BLOCK).
+
+        Raises:
+            ValueError: If max_buffer is not a positive integer.
+        """
+        if not isinstance(max_buffer, int) or max_buffer < 1:
+            raise ValueError("max_buffer must be a positive integer.")
+
+        self.max_buffer: int = max_buffer
+        self.overflow: EOverflowPolicy = EOverflowPolicy(overflow)
+        self.dropped: int = 0
+        self.conflated: int = 0
+        self.closed: bool = False
+        self._buffer: Deque[IDeviceEvent] = deque()
+        self._not_empty: asyncio.Event = asyncio.Event()
+        self._not_full: asyncio.Event = asyncio.Event()
+        self._not_full.set()
+
+    async def put(self, event: IDeviceEvent) -> None:
+        """
+        Buffers an event, applying the overflow policy. Events put into a closed stream are ignored.
+
+        Args:
+            event (IDeviceEvent): The event.
+        """
+        buffer = self._buffer
+        if self.overflow == EOverflowPolicy.CONFLATE and buffer and self._conflate(event):
+            return
+
+        if len(buffer) >= self.max_buffer:
+            if self.overflow == EOverflowPolicy.DROP_OLDEST:
+                buffer.popleft()
+                self.dropped += 1
+            else:
+                while len(buffer) >= self.max_buffer and not self.closed:
+                    self._not_full.clear()
+                    await self._not_full.wait()
+
+        if self.closed:
+            return
+        buffer.append(event)
+        self._not_empty.set()
+
+    async def get(self) -> Optional[IDeviceEvent]:
+        """
+        Waits for the next event.
+
+        Returns:
+            Optional[IDeviceEvent]: The oldest buffered event, None once the stream is closed and consumed.
+        """
+        buffer = self._buffer
+        while not buffer:
+            if self.closed:
+                return None
+            self._not_empty.clear()
+            await self._not_empty.wait()
+
+        event = buffer.popleft()
+        self._not_full.set()
+        return event
+
+    def close(self) -> None:
+        """
+        Ends the stream once its buffered events are consumed, releasing a waiting producer.
+        """
+        self.closed = True
+        self._not_empty.set()
+        self._not_full.set()
+
+    def _conflate(self, event: IDeviceEvent) -> bool:
+        """
+        Merges an update into the last buffered event, when it is an update of the same type and device.
+
+        The events are shared by the streams, the merged event replaces the buffered one.
+
+        Args:
+            event (IDeviceEvent): The new event.
+
+        Returns:
+            bool: True if the event was merged.
+        """
+        last = self._buffer[-1]
+        if (event.serial_number is None or last.serial_number != event.serial_number
+                or last.type != event.type or str(event.type) not in CONFLATED_EVENTS):
+            return False
+        self._buffer[-1] = IDeviceEvent(event.type, event.serial_number, merge_event_data(last.data, event.data),
+                                        event.id)
+        self.conflated += 1
+        return True
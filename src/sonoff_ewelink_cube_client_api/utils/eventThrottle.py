@@ -0,0 +1,222 @@
+"""
+Module: eventThrottle
+
+This module provides the conflation of the high-frequency device state updates of a subscriber.
+
+Classes:
+    EventThrottle: Merges the state updates of each device within a window, or down to a maximum rate.
+"""
+#pylint: disable-msg=too-many-instance-attributes
+
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Set, Union
+
+import asyncio
+import logging
+import time
+
+from ..ts.enum.ESseEvent import ESseEvent
+from ..ts.interface.IDeviceEvent import IDeviceEvent
+from .sseUtils import merge_event_data
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class EventThrottle:
+    """
+    Merges the state updates of each device within a window, or down to a maximum rate.
+
+    With 'window', the first state update of a device is held for the window and the updates
+    received meanwhile are merged into it, recursively, the latest value winning: a single
+    update with the final state is delivered at the end of the window, keeping every channel
+    of a capability changed meanwhile, e.g. of a multi-gang switch. With 'max_rate',
+    an update is delivered at once when the previous one of the device is old enough, otherwise
+    it is merged and delivered as soon as the rate allows. The delivered events count the events
+    merged into them in 'collapsed'.
+
+    The other events pass through, after the merged update of their device still held, so each
+    device keeps its order. A throttle belongs to one subscription, which sets 'deliver'.
+
+    Attributes:
+        window (Optional[float]): Seconds the state updates of a device are merged for.
+        max_rate (Optional[float]): Maximum state updates per second delivered per device.
+        types (Set[str]): Names of the conflated event types.
+        deliver (Optional[Callable[[IDeviceEvent], Awaitable[Any]]]): Delivers an event to the subscriber.
+        received (int): Number of events received.
+        delivered (int): Number of events delivered.
+        collapsed (int): Number of events merged into another.
+
+    Methods:
+        push(event: IDeviceEvent): Delivers an event, or merges it into the update held for its device.
+        flush(): Delivers the updates held.
+        close(): Drops the updates held.
+        stats() -> Dict[str, int]: Gets the counters of the throttle.
+    """
+
+    def __init__(
+        self,
+        window: Optional[float] = None,
+        max_rate: Optional[float] = None,
+        types: Iterable[Union[ESseEvent, str]] = (ESseEvent.UPDATE_DEVICE_STATE,),
+    ):
+        """
+        Initializes the EventThrottle object.
+
+        Parameters:
+            window (Optional[float]): Seconds the state updates of a device are merged for (default: None).
+            max_rate (Optional[float]): Maximum state updates per second delivered per device (default: None).
+            types (Iterable[Union[ESseEvent, str]]): Conflated event types (default: updateDeviceState).
+
+        Raises:
+            ValueError: If not exactly one of window and max_rate is a positive number.
+        """
+        if (window is None) == (max_rate is None):
+            raise ValueError("Either window or max_rate must be set.")
+        if (window is not None and window <= 0) or (max_rate is not None and max_rate <= 0):
+            raise ValueError("window and max_rate must be positive.")
+
+        self.window: Optional[float] = window
+        self.max_rate: Optional[float] = max_rate
+        self.types: Set[str] = {str(event_type) for event_type in types}
+        self.deliver: Optional[Callable[[IDeviceEvent], Awaitable[Any]]] = None
+        self.received: int = 0
+        self.delivered: int = 0
+        self.collapsed: int = 0
+        self._pending: Dict[str, IDeviceEvent] = {}
+        self._timers: Dict[str, asyncio.TimerHandle] = {}
+        self._last: Dict[str, float] = {}
+        self._tasks: Set[asyncio.Task] = set()
+        self._lock: Optional[asyncio.Lock] = None
+
+    async def push(self, event: IDeviceEvent) -> None:
+        """
+        Delivers an event, or merges it into the update held for its device.
+
+        Args:
+            event (IDeviceEvent): The event.
+        """
+        self.received += 1
+        serial_number = event.serial_number
+        if serial_number is None or str(event.type) not in self.types:
+            async with self._locked():
+                await self._flushDevice(serial_number)
+                await self._deliver(event)
+            return
+
+        pending = self._pending.get(serial_number)
+        if pending is not None:
+            self._pending[serial_number] = IDeviceEvent(
+                event.type, serial_number, merge_event_data(pending.data, event.data), event.id,
+                collapsed=pending.collapsed + event.collapsed + 1
+            )
+            self.collapsed += 1
+            return
+
+        loop = asyncio.get_running_loop()
+        if self.window is not None:
+            delay = self.window
+        else:
+            delay = self._last.get(serial_number, float('-inf')) + 1 / self.max_rate - time.monotonic()
+            if delay <= 0:
+                async with self._locked():
+                    self._last[serial_number] = time.monotonic()
+                    await self._deliver(event)
+                return
+
+        self._pending[serial_number] = event
+        self._timers[serial_number] = loop.call_later(delay, self._expire, serial_number)
+
+    async def flush(self) -> None:
+        """
+        Delivers the updates held.
+        """
+        async with self._locked():
+            for serial_number in list(self._pending):
+                await self._flushDevice(serial_number)
+
+    def close(self) -> None:
+        """
+        Drops the updates held.
+        """
+        for timer in self._timers.values():
+            timer.cancel()
+        for task in self._tasks:
+            task.cancel()
+        self._timers.clear()
+        self._pending.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Gets the counters of the throttle.
+
+        Returns:
+            Dict[str, int]: The 'received', 'delivered', 'collapsed' and 'pending' values.
+        """
+        return {
+            'received': self.received,
+            'delivered': self.delivered,
+            'collapsed': self.collapsed,
+            'pending': len(self._pending),
+        }
+
+    def _locked(self) -> asyncio.Lock:
+        """
+        Gets the lock keeping the deliveries in order, creating it in the running event loop.
+
+        Returns:
+            asyncio.Lock: The lock.
+        """
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        return self._lock
+
+    def _expire(self, serial_number: str) -> None:
+        """
+        Delivers the update held for a device at the end of its delay.
+
+        Args:
+            serial_number (str): The serial number of the device.
+        """
+        self._timers.pop(serial_number, None)
+        task = asyncio.ensure_future(self._flushExpired(serial_number))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _flushExpired(self, serial_number: str) -> None:
+        """
+        Delivers the update held for a device, if still held.
+
+        Args:
+            serial_number (str): The serial number of the device.
+        """
+        try:
+            async with self._locked():
+                await self._flushDevice(serial_number)
+        except Exception as error:  # pylint: disable=broad-except
+            _LOGGER.error(f'Throttled delivery failed: {error!r}')
+
+    async def _flushDevice(self, serial_number: Optional[str]) -> None:
+        """
+        Delivers the update held for a device, the lock being held.
+
+        Args:
+            serial_number (Optional[str]): The serial number of the device.
+        """
+        event = self._pending.pop(serial_number, None)
+        if event is None:
+            return
+        timer = self._timers.pop(serial_number, None)
+        if timer is not None:
+            timer.cancel()
+        self._last[serial_number] = time.monotonic()
+        await self._deliver(event)
+
+    async def _deliver(self, event: IDeviceEvent) -> None:
+        """
+        Delivers an event to the subscriber.
+
+        Args:
+            event (IDeviceEvent): The event.
+        """
+        self.delivered += 1
+        if self.deliver is not None:
+            await self.deliver(event)
@@ -0,0 +1,243 @@
+"""
+Module: httpTransport
+
+This module provides the long-lived HTTP transport of a gateway.
+
+Classes:
+    HttpTransport: Owns the pooled aiohttp sessions used for the REST calls and the SSE stream of a gateway.
+"""
+
+from typing import Any, Optional, Tuple
+
+import functools
+import inspect
+import logging
+import socket
+import aiohttp
+
+from ..ts.interface.ITransportConfig import ITransportConfig
+
+_LOGGER = logging.getLogger(__name__)
+
+# aiohttp accepts a socket factory since 3.12, older versions keep their own socket defaults.
+_SOCKET_FACTORY_SUPPORTED = 'socket_factory' in inspect.signature(aiohttp.TCPConnector.__init__).parameters
+
+
+class HttpTransport:
+    """
+    Owns the pooled aiohttp sessions used for the REST calls and the SSE stream of a gateway.
+
+    The sessions and their connectors are created on first use and reused by every request,
+    so consecutive calls share keep-alive connections instead of opening a new one each time.
+    The REST pool and the SSE pool have their own connector, limits and timeouts: the
+    permanently open SSE stream and its reconnects never wait for, or take, a REST slot.
+    The SSE sockets also enable TCP keepalive, so a half-open SSE connection (a Wi-Fi drop, a
+    gateway rebooting without closing it) fails within seconds instead of hanging forever.
+
+    Attributes:
+        config (ITransportConfig): Tuning options of the transport.
+
+    Methods:
+        get_session() -> aiohttp.ClientSession: Gets the pooled REST session, creating it when needed.
+        get_sse_session() -> aiohttp.ClientSession: Gets the SSE session, creating it when needed.
+        configure_sse_socket(response: aiohttp.ClientResponse): Applies the SSE socket options to a response.
+        close_sse(): Closes the SSE session and its connections.
+        close(): Closes both sessions and their connections.
+    """
+
+    def __init__(self, config: Optional[ITransportConfig] = None):
+        """
+        Initializes the HttpTransport object.
+
+        Parameters:
+            config (Optional[ITransportConfig]): Tuning options of the transport (default: ITransportConfig()).
+        """
+        self.config: ITransportConfig = config if config is not None else ITransportConfig()
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._sse_session: Optional[aiohttp.ClientSession] = None
+
+    @property
+    def closed(self) -> bool:
+        """
+        Whether the transport has no open session.
+
+        Returns:
+            bool: True if neither the REST nor the SSE session is open.
+        """
+        return self._is_closed(self._session) and self._is_closed(self._sse_session)
+
+    def get_session(self) -> aiohttp.ClientSession:
+        """
+        Gets the pooled REST session, creating it when needed.
+
+        Must be called from a running event loop.
+
+        Returns:
+            aiohttp.ClientSession: The pooled REST session.
+        """
+        if self._is_closed(self._session):
+            _LOGGER.debug('Create pooled REST session.')
+            self._session = aiohttp.ClientSession(
+                connector=self._create_connector(
+                    limit=self.config.limit,
+                    keepalive_timeout=self.config.keepalive_timeout
+                ),
+                timeout=aiohttp.ClientTimeout(
+                    total=None,
+                    connect=self.config.conn_timeout,
+                    sock_read=self.config.read_timeout
+                ),
+                headers={'Content-Type': 'application/json'}
+            )
+        return self._session
+
+    def get_sse_session(self) -> aiohttp.ClientSession:
+        """
+        Gets the SSE session, creating it when needed.
+
+        Must be called from a running event loop.
+
+        Returns:
+            aiohttp.ClientSession: The SSE session.
+        """
+        if self._is_closed(self._sse_session):
+            _LOGGER.debug('Create SSE session.')
+            self._sse_session = aiohttp.ClientSession(
+                connector=self._create_connector(
+                    limit=self.config.sse_limit,
+                    keepalive_timeout=None,
+                    sse=True
+                ),
+                timeout=aiohttp.ClientTimeout(
+                    total=None,
+                    sock_connect=self.config.sse_conn_timeout,
+                    sock_read=self.config.sse_read_timeout
+                )
+            )
+        return self._sse_session
+
+    def configure_sse_socket(self, response: aiohttp.ClientResponse) -> None:
+        """
+        Applies the SSE socket options to the connection of a response.
+
+        The sockets of the SSE session get their options when created; this only applies them
+        with the aiohttp versions without socket factory, once the stream is connected.
+
+        Args:
+            response (aiohttp.ClientResponse): The response of the SSE stream.
+        """
+        if _SOCKET_FACTORY_SUPPORTED or response.connection is None or response.connection.transport is None:
+            return
+        sock = response.connection.transport.get_extra_info('socket')
+        if sock is None:
+            return
+        for level, option, value in self._socket_options(sock.family, sse=True):
+            try:
+                sock.setsockopt(level, option, value)
+            except OSError as error:
+                _LOGGER.debug(f'SSE socket option {option} not applied: {error!r}')
+
+    @staticmethod
+    def _is_closed(session: Optional[aiohttp.ClientSession]) -> bool:
+        """
+        Whether a session is missing or closed.
+
+        Args:
+            session (Optional[aiohttp.ClientSession]): The session to check.
+
+        Returns:
+            bool: True if the session is missing or closed.
+        """
+        return session is None or session.closed
+
+    def _create_connector(self, limit: int, keepalive_timeout: Optional[float],
+                          sse: bool = False) -> aiohttp.TCPConnector:
+        """
+        Creates the TCP connector of a pool.
+
+        Args:
+            limit (int): Maximum number of connections of the pool.
+            keepalive_timeout (Optional[float]): Idle keep-alive time of a connection, None for the aiohttp default.
+            sse (bool): Whether the pool is the SSE pool (default: False).
+
+        Returns:
+            aiohttp.TCPConnector: The configured connector.
+        """
+        options = {
+            'limit': limit,
+            'limit_per_host': limit,
+            'use_dns_cache': self.config.use_dns_cache,
+            'ttl_dns_cache': self.config.ttl_dns_cache,
+        }
+        if keepalive_timeout is not None:
+            options['keepalive_timeout'] = keepalive_timeout
+        if _SOCKET_FACTORY_SUPPORTED:
+            options['socket_factory'] = functools.partial(self._socket_factory, sse=sse)
+
+        return aiohttp.TCPConnector(**options)
+
+    def _socket_factory(self, addr_info: Tuple[Any, ...], sse: bool = False) -> socket.socket:
+        """
+        Creates a gateway socket with the configured options.
+
+        Args:
+            addr_info (Tuple[Any, ...]): The address info (family, type, proto, canonname, sockaddr).
+            sse (bool): Whether the socket belongs to the SSE pool (default: False).
+
+        Returns:
+            socket.socket: The new socket.
+        """
+        family, sock_type, proto, _, _ = addr_info
+        sock = socket.socket(family=family, type=sock_type, proto=proto)
+        for level, option, value in self._socket_options(family, sse):
+            sock.setsockopt(level, option, value)
+        return sock
+
+    def _socket_options(self, family: int, sse: bool = False) -> Tuple[Tuple[int, int, int], ...]:
+        """
+        Gets the socket options of the transport.
+
+        aiohttp already disables Nagle's algorithm on every connection. The keepalive timings
+        are only set where the platform supports them (TCP_KEEPIDLE on Linux, TCP_KEEPALIVE on
+        macOS), the system defaults apply otherwise.
+
+        Args:
+            family (int): The address family of the socket.
+            sse (bool): Whether the socket belongs to the SSE pool (default: False).
+
+        Returns:
+            Tuple[Tuple[int, int, int], ...]: The (level, option, value) socket options.
+        """
+        if family not in (socket.AF_INET, socket.AF_INET6):
+            return ()
+        options = []
+        if sse and self.config.sse_keepalive:
+            options.append((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1))
+            keepidle = getattr(socket, 'TCP_KEEPIDLE', getattr(socket, 'TCP_KEEPALIVE', None))
+            for option, value in (
+                (keepidle, self.config.sse_keepalive_idle),
+                (getattr(socket, 'TCP_KEEPINTVL', None), self.config.sse_keepalive_interval),
+                (getattr(socket, 'TCP_KEEPCNT', None), self.config.sse_keepalive_count),
+            ):
+                if option is not None:
+                    options.append((socket.IPPROTO_TCP, option, value))
+        return tuple(options)
+
+    async def close_sse(self) -> None:
+        """
+        Closes the SSE session and its connections.
+        """
+        if not self._is_closed(self._sse_session):
+            _LOGGER.debug('Close SSE session.')
+            await self._sse_session.close()
+        self._sse_session = None
+
+    async def close(self) -> None:
+        """
+        Closes both sessions and their connections.
+        """
+        await self.close_sse()
+        if not self._is_closed(self._session):
+            _LOGGER.debug('Close pooled REST session.')
+            await self._session.close()
+        self._session = None
@@ -8,16 +8,32 @@ Classes:
 """
 #pylint: disable-msg=too-few-public-methods
 
-from typing import Dict, Any, Optional
+from contextlib import AsyncExitStack, asynccontextmanager
+from typing import Any, AsyncIterator, BinaryIO, Callable, Dict, Iterable, List, Optional, Tuple, Union
 
+import asyncio
 import logging
 import json
+import os
+import time
 import aiohttp
 
 from ..ts.enum.EMethod import EMethod
 from ..ts.enum.EPath import EPath
+from ..ts.enum.EResponse import EResponseErrorCode
+from ..errors import DeadlineExceededError, ResponseError
 from ..ts.interface.IConfig import IConfig
+from ..ts.interface.IDownloadStats import IDownloadStats
 from ..ts.interface.IResponse import IResponse
+from .circuitBreaker import CircuitBreaker
+from .concurrencyLimiter import AdaptiveConcurrencyLimiter
+from .deadline import DEFAULT_TIMEOUTS, Deadline, default_timeout
+from .httpTransport import HttpTransport
+from .jsonCodec import JsonCodec, StdlibJsonCodec
+from .jsonStream import JsonArrayStreamer, compile_fields, project_fields
+from .responseCache import ResponseCache
+from .retryPolicy import RetryPolicy
+from .singleFlight import SingleFlight
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -25,8 +41,22 @@ _LOGGER = logging.getLogger(__name__)
 class httpUtils(IConfig):
     """
     Contains functions for making HTTP requests.
+
+    Requests are sent through the pooled HttpTransport of the gateway, within the window of its
+    AdaptiveConcurrencyLimiter, and their transient failures are retried by its RetryPolicy.
+    While the gateway is down, its CircuitBreaker fails the requests fast.
+    Concurrent identical GET requests share one in-flight request through the SingleFlight layer,
+    and the read endpoints can be answered from an opt-in ResponseCache.
     """
     session = None
+    transport: HttpTransport = None
+    limiter: AdaptiveConcurrencyLimiter = None
+    retry_policy: RetryPolicy = None
+    circuit_breaker: CircuitBreaker = None
+    single_flight: SingleFlight = None
+    response_cache: ResponseCache = None
+    codec: JsonCodec = StdlibJsonCodec()
+    timeouts: Dict[Tuple[EMethod, str], float] = DEFAULT_TIMEOUTS
 
     async def httpRequest(
         self,
@@ -35,6 +65,7 @@ class httpUtils(IConfig):
         params: Optional[Dict[str, Any]] = None,
         isNeedAT: bool = True,
         headers: Optional[Dict[str, str]] = None,
+        timeout: Union[None, float, Deadline] = None,
     ) -> IResponse:
         """
         Makes an HTTP request.
@@ -45,74 +76,609 @@ class httpUtils(IConfig):
             params (Optional[Dict[str, Any]]): Request parameters (default: None).
             isNeedAT (bool): Flag to indicate if access token is required (default: True).
             headers (Optional[Dict[str, str]]): Additional headers to include in the request (default: None).
+                The pooled session always sends 'Content-Type: application/json'.
+            timeout (Union[None, float, Deadline]): Time budget in seconds or deadline of the request,
+                including the queueing and the retries (default: None, the default of the endpoint).
 
         Returns:
             IResponse: Dictionary containing the response data.
+
+        Raises:
+            DeadlineExceededError: If the request does not complete in time.
         """
-        url = f"http://{self.ip}{EPath.ROOT.value}{EPath.V1.value}{path}"
+        url, headers = self._buildRequest(path, isNeedAT, headers)
+        default = default_timeout(method, path, self.timeouts)
+        deadline = Deadline.resolve(timeout, default)
         _LOGGER.debug(f'httpRequest {method}: {url}')
+        _LOGGER.debug(f'httpRequest headers: {headers}')
+        _LOGGER.debug(f'httpRequest params: {params}')
+
+        if method != EMethod.GET:
+            return await deadline.run(self._retryRequest(url, method, params, headers, deadline, default))
+
+        cache_key = self.response_cache.key(path, params) if self.response_cache is not None else None
+        if cache_key is None:
+            return await deadline.run(self._getRequest(url, params, headers, deadline, default))
+
+        response = self.response_cache.get(cache_key)
+        if response is None:
+            generation = self.response_cache.begin(cache_key)
+            try:
+                response = await deadline.run(self._getRequest(url, params, headers, deadline, default))
+            finally:
+                self.response_cache.end(cache_key)
+            self.response_cache.set(cache_key, response, generation)
+        return response
+
+    async def _getRequest(
+        self,
+        url: str,
+        params: Optional[Dict[str, Any]],
+        headers: Dict[str, str],
+        deadline: Deadline,
+        default: float,
+    ) -> IResponse:
+        """
+        Sends a GET request, sharing it with the identical GET requests in flight.
+
+        The shared request runs under its own deadline, the default of the endpoint or the time
+        left to its first caller if longer: a caller joining it only bounds its own wait, and a
+        caller leaving at its deadline does not cancel the request shared with the others.
+
+        Args:
+            url (str): Request URL.
+            params (Optional[Dict[str, Any]]): Request parameters.
+            headers (Dict[str, str]): Request headers.
+            deadline (Deadline): Deadline of the caller.
+            default (float): Default time budget of the endpoint in seconds.
+
+        Returns:
+            IResponse: Dictionary containing the response data.
+        """
+        if self.single_flight is None:
+            return await self._retryRequest(url, EMethod.GET, params, headers, deadline, default)
+
+        key = self._requestKey(EMethod.GET, url, params, headers)
+        return await self.single_flight.do(
+            key, lambda: self._retryRequest(
+                url, EMethod.GET, params, headers, Deadline(max(default, deadline.remaining()), endpoint_default=True),
+                default
+            )
+        )
+
+    def _buildRequest(
+        self,
+        path: str,
+        isNeedAT: bool,
+        headers: Optional[Dict[str, str]],
+    ) -> Tuple[str, Dict[str, str]]:
+        """
+        Builds the URL and the headers of a request.
+
+        Args:
+            path (str): API path.
+            isNeedAT (bool): Flag to indicate if access token is required.
+            headers (Optional[Dict[str, str]]): Additional headers to include in the request.
 
-        headers = headers or {'Content-Type': 'application/json'}
+        Returns:
+            Tuple[str, Dict[str, str]]: The request URL and headers.
+        """
+        url = f"http://{self.ip}{EPath.ROOT.value}{EPath.V1.value}{path}"
+
+        headers = dict(headers) if headers else {}
         if isNeedAT and self.at:
             headers['Authorization'] = f'Bearer {self.at}'
-        _LOGGER.debug(f'httpRequest headers: {headers}')
-        _LOGGER.debug(f'httpRequest params: {params}')
 
-        response: str = None
-        async with aiohttp.ClientSession(headers=headers, conn_timeout=10, read_timeout=10) as session:
-            if method == EMethod.GET:
-                async with session.get(url, params=params) as resp:
-                    # FILE format
-                    if resp.headers.get("Content-Type") == "application/octet-stream":
-                        if resp.status == 200:
-                            # Successful response
-                            return await resp.read()
-
-                        if resp.status == 400:
-                            # Parameter error
-                            raise ValueError("Parameter error: " + await resp.text())
-
-                        if resp.status == 500:
-                            # Gateway service exception
-                            raise RuntimeError("Gateway service exception: " + await resp.text())
-
-                        # Other status codes
-                        raise RuntimeError(f"Unexpected response: {resp.status} {await resp.text()}")
-
-                    # JSON format
-                    response = await resp.text()
-            elif method == EMethod.POST:
-                params = {} if not params else params
-                async with session.post(url, data=json.dumps(params)) as resp:
-                    response = await resp.text()
-            elif method == EMethod.PUT:
-                async with session.put(url, data=json.dumps(params)) as resp:
-                    response = await resp.text()
-            elif method == EMethod.DELETE:
-                async with session.delete(url, params=params) as resp:
-                    response = await resp.text()
+        return url, headers
 
-        try:
-            _LOGGER.debug("Unhandled response, exceptions.")
-            _LOGGER.debug(f'httpRequest response: {response}')
-            if response is None:
-                return IResponse(
-                    error=-1,
-                    message='Empty response.',
-                    data={}
+    @staticmethod
+    def _requestKey(
+        method: EMethod,
+        url: str,
+        params: Optional[Dict[str, Any]],
+        headers: Dict[str, str],
+    ) -> Tuple[Any, ...]:
+        """
+        Builds the identity of a request, requests with equal keys have equal responses.
+
+        The access token is part of the key, a request is never shared between two tokens.
+
+        Args:
+            method (EMethod): HTTP method.
+            url (str): Request URL.
+            params (Optional[Dict[str, Any]]): Request parameters.
+            headers (Dict[str, str]): Request headers, including the access token.
+
+        Returns:
+            Tuple[Any, ...]: The request key.
+        """
+        return (
+            method,
+            url,
+            json.dumps(params, sort_keys=True, default=str) if params else None,
+            headers.get('Authorization'),
+            tuple(sorted((name, value) for name, value in headers.items() if name != 'Authorization')),
+        )
+
+    async def _retryRequest(
+        self,
+        url: str,
+        method: EMethod,
+        params: Optional[Dict[str, Any]],
+        headers: Dict[str, str],
+        deadline: Optional[Deadline] = None,
+        default: Optional[float] = None,
+    ) -> IResponse:
+        """
+        Sends an HTTP request, retrying its transient failures according to the retry policy.
+
+        Args:
+            url (str): Request URL.
+            method (EMethod): HTTP method.
+            params (Optional[Dict[str, Any]]): Request parameters.
+            headers (Dict[str, str]): Request headers.
+            deadline (Optional[Deadline]): Deadline of the request, no retry goes past it (default: None).
+            default (Optional[float]): Default time budget of the endpoint in seconds (default: None).
+
+        Returns:
+            IResponse: Dictionary containing the response data.
+        """
+        if self.retry_policy is None:
+            return await self._sendRequest(url, method, params, headers, deadline, default)
+        return await self.retry_policy.run(
+            method, lambda: self._sendRequest(url, method, params, headers, deadline, default), deadline
+        )
+
+    async def _sendRequest(
+        self,
+        url: str,
+        method: EMethod,
+        params: Optional[Dict[str, Any]],
+        headers: Dict[str, str],
+        deadline: Optional[Deadline] = None,
+        default: Optional[float] = None,
+    ) -> IResponse:
+        """
+        Sends an HTTP request through the circuit breaker of the gateway.
+
+        Args:
+            url (str): Request URL.
+            method (EMethod): HTTP method.
+            params (Optional[Dict[str, Any]]): Request parameters.
+            headers (Dict[str, str]): Request headers.
+            deadline (Optional[Deadline]): Deadline of the request (default: None).
+            default (Optional[float]): Default time budget of the endpoint in seconds (default: None).
+
+        Returns:
+            IResponse: Dictionary containing the response data.
+
+        Raises:
+            CircuitOpenError: If the gateway is down.
+        """
+        if self.circuit_breaker is None:
+            return await self._limitRequest(url, method, params, headers, deadline, default)
+
+        async with self.circuit_breaker.guard(deadline):
+            return await self._limitRequest(url, method, params, headers, deadline, default)
+
+    async def _limitRequest(
+        self,
+        url: str,
+        method: EMethod,
+        params: Optional[Dict[str, Any]],
+        headers: Dict[str, str],
+        deadline: Optional[Deadline] = None,
+        default: Optional[float] = None,
+    ) -> IResponse:
+        """
+        Sends an HTTP request within the concurrency window of the gateway.
+
+        Args:
+            url (str): Request URL.
+            method (EMethod): HTTP method.
+            params (Optional[Dict[str, Any]]): Request parameters.
+            headers (Dict[str, str]): Request headers.
+            deadline (Optional[Deadline]): Deadline of the request (default: None).
+            default (Optional[float]): Default time budget of the endpoint in seconds, scaling the latency
+                counted as congestion (default: None).
+
+        Returns:
+            IResponse: Dictionary containing the response data.
+        """
+        if self.limiter is None:
+            return await self._transmitRequest(url, method, params, headers, deadline)
+
+        async with self.limiter.slot(deadline, default) as slot:
+            response = await self._transmitRequest(url, method, params, headers, deadline)
+            if isinstance(response, IResponse) and response.error == EResponseErrorCode.ERROR_SERVER_EXCEPTION.value:
+                slot.failed = True
+            return response
+
+    async def _transmitRequest(
+        self,
+        url: str,
+        method: EMethod,
+        params: Optional[Dict[str, Any]],
+        headers: Dict[str, str],
+        deadline: Optional[Deadline] = None,
+    ) -> IResponse:
+        """
+        Sends an HTTP request through the pooled transport and parses its response.
+
+        Args:
+            url (str): Request URL.
+            method (EMethod): HTTP method.
+            params (Optional[Dict[str, Any]]): Request parameters.
+            headers (Dict[str, str]): Request headers.
+            deadline (Optional[Deadline]): Deadline of the request, bounding the whole exchange
+                instead of the connect and read timeouts of the transport (default: None).
+
+        Returns:
+            IResponse: Dictionary containing the response data.
+
+        Raises:
+            ValueError: If a file download fails with a parameter error.
+            RuntimeError: If a file download fails with a gateway error.
+        """
+        query, data = params, None
+        if method == EMethod.POST:
+            query, data = None, self.codec.dumps({} if not params else params)
+        elif method == EMethod.PUT:
+            query, data = None, self.codec.dumps(params)
+
+        options: Dict[str, Any] = {}
+        if deadline is not None:
+            options['timeout'] = self._clientTimeout(deadline)
+
+        session = self.transport.get_session()
+        async with session.request(method.value.upper(), url, params=query, data=data, headers=headers,
+                                   **options) as resp:
+            try:
+                # FILE format
+                if method == EMethod.GET and resp.headers.get("Content-Type") == "application/octet-stream":
+                    await self._checkFileResponse(resp)
+                    return await resp.read()
+
+                # JSON format
+                response = await resp.read()
+            except asyncio.CancelledError:
+                # Drop the connection at once instead of draining the response
+                resp.close()
+                raise
+
+        return self._parseResponse(response)
+
+    def _clientTimeout(self, deadline: Deadline) -> aiohttp.ClientTimeout:
+        """
+        Gets the aiohttp timeout of an exchange bounded by a deadline.
+
+        Args:
+            deadline (Deadline): Deadline of the exchange.
+
+        Returns:
+            aiohttp.ClientTimeout: The timeout, the whole exchange instead of the connect and read timeouts
+                of the transport.
+        """
+        config = self.transport.config
+        remaining = deadline.remaining()
+        return aiohttp.ClientTimeout(
+            total=remaining,
+            connect=min(config.conn_timeout, remaining),
+            sock_read=config.read_timeout
+        )
+
+    @asynccontextmanager
+    async def _streamRequest(
+        self,
+        url: str,
+        params: Optional[Dict[str, Any]],
+        headers: Dict[str, str],
+        timeout: Union[None, float, Deadline],
+        default: float,
+    ) -> AsyncIterator[aiohttp.ClientResponse]:
+        """
+        Sends a GET request whose body is streamed, as the other requests: through the circuit breaker,
+        within the concurrency window and the deadline.
+
+        The slot of the concurrency window is held until the body is read, its latency is the time to
+        the response headers, so a long transfer does not count as congestion.
+
+        Args:
+            url (str): Request URL.
+            params (Optional[Dict[str, Any]]): Request parameters.
+            headers (Dict[str, str]): Request headers.
+            timeout (Union[None, float, Deadline]): Time budget in seconds or deadline of the whole transfer,
+                None for the default of the endpoint.
+            default (float): Default time budget of the endpoint in seconds.
+
+        Yields:
+            aiohttp.ClientResponse: The response, its body not read yet.
+
+        Raises:
+            CircuitOpenError: If the gateway is down.
+            DeadlineExceededError: If the transfer does not complete in time.
+        """
+        deadline = Deadline.resolve(timeout, default)
+        async with AsyncExitStack() as stack:
+            if self.circuit_breaker is not None:
+                await stack.enter_async_context(self.circuit_breaker.guard(deadline))
+            slot = None
+            if self.limiter is not None:
+                slot = await deadline.run(stack.enter_async_context(self.limiter.slot(deadline, default)))
+
+            try:
+                session = self.transport.get_session()
+                resp = await stack.enter_async_context(
+                    session.get(url, params=params, headers=headers, timeout=self._clientTimeout(deadline))
                 )
+                if slot is not None:
+                    slot.latency = time.monotonic() - slot.started_at
+                yield resp
+            except asyncio.TimeoutError as err:
+                if deadline.expired:
+                    raise DeadlineExceededError(deadline.timeout) from err
+                raise
+
+    def _parseResponse(self, response: Optional[bytes]) -> IResponse:
+        """
+        Parses the JSON body of a response.
 
-            response_data = json.loads(response)
+        Args:
+            response (Optional[bytes]): The response body.
+
+        Returns:
+            IResponse: Dictionary containing the response data.
+        """
+        _LOGGER.debug("Unhandled response, exceptions.")
+        _LOGGER.debug(f'httpRequest response: {response}')
+        if response is None:
             return IResponse(
-                error=response_data["error"],
-                message=response_data["message"] if "message" in response_data else None,
-                data=response_data["data"] if "data" in response_data else None
+                error=-1,
+                message='Empty response.',
+                data={}
             )
 
-        except json.JSONDecodeError:
+        try:
+            # Decoded straight from the bytes, without an intermediate str
+            response_data = self.codec.loads(response)
+        except ValueError:
             _LOGGER.error(f'httpRequest response: {response}')
             return IResponse(
                 error=-1,
                 message='Invalid JSON response.',
                 data={}
             )
+
+        return IResponse(
+            error=response_data["error"],
+            message=response_data["message"] if "message" in response_data else None,
+            data=response_data["data"] if "data" in response_data else None
+        )
+
+    @staticmethod
+    async def _checkFileResponse(resp: aiohttp.ClientResponse) -> None:
+        """
+        Checks the status of a file (application/octet-stream) response.
+
+        Args:
+            resp (aiohttp.ClientResponse): The response.
+
+        Raises:
+            ValueError: If the request has a parameter error.
+            RuntimeError: If the gateway failed to serve the file.
+        """
+        if resp.status == 200:
+            # Successful response
+            return
+
+        if resp.status == 400:
+            # Parameter error
+            raise ValueError("Parameter error: " + await resp.text())
+
+        if resp.status == 500:
+            # Gateway service exception
+            raise RuntimeError("Gateway service exception: " + await resp.text())
+
+        # Other status codes
+        raise RuntimeError(f"Unexpected response: {resp.status} {await resp.text()}")
+
+    async def httpStream(
+        self,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        isNeedAT: bool = True,
+        headers: Optional[Dict[str, str]] = None,
+        chunk_size: int = 65536,
+        stats: Optional[IDownloadStats] = None,
+        timeout: Union[None, float, Deadline] = None,
+    ) -> AsyncIterator[bytes]:
+        """
+        Streams the body of a file (application/octet-stream) GET request chunk by chunk.
+
+        Only one chunk is held in memory at a time, the body is never buffered as a whole.
+        The transfer holds a slot of the concurrency window and is bounded by its deadline.
+
+        Args:
+            path (str): API path.
+            params (Optional[Dict[str, Any]]): Request parameters (default: None).
+            isNeedAT (bool): Flag to indicate if access token is required (default: True).
+            headers (Optional[Dict[str, str]]): Additional headers to include in the request (default: None).
+            chunk_size (int): Maximum size of a chunk in bytes (default: 65536).
+            stats (Optional[IDownloadStats]): Updated with the received bytes and throughput (default: None).
+            timeout (Union[None, float, Deadline]): Time budget in seconds or deadline of the whole transfer
+                (default: None, the default of the endpoint).
+
+        Yields:
+            bytes: The next chunk of the body.
+
+        Raises:
+            ValueError: If the request has a parameter error.
+            RuntimeError: If the gateway failed to serve the file.
+            ResponseError: If the gateway answered with a JSON error response instead of the file.
+            CircuitOpenError: If the gateway is down.
+            DeadlineExceededError: If the transfer does not complete in time.
+        """
+        url, headers = self._buildRequest(path, isNeedAT, headers)
+        default = default_timeout(EMethod.GET, path, self.timeouts)
+        _LOGGER.debug(f'httpStream: {url}')
+
+        async with self._streamRequest(url, params, headers, timeout, default) as resp:
+            if resp.headers.get("Content-Type") != "application/octet-stream":
+                raise ResponseError(self._parseResponse(await resp.read()))
+            await self._checkFileResponse(resp)
+
+            async for chunk in resp.content.iter_chunked(chunk_size):
+                if stats is not None:
+                    stats.add(len(chunk))
+                yield chunk
+
+        if stats is not None:
+            stats.finish()
+
+    async def httpStreamArray(
+        self,
+        path: str,
+        key: str,
+        params: Optional[Dict[str, Any]] = None,
+        isNeedAT: bool = True,
+        headers: Optional[Dict[str, str]] = None,
+        fields: Optional[Iterable[str]] = None,
+        timeout: Union[None, float, Deadline] = None,
+    ) -> AsyncIterator[Any]:
+        """
+        Streams the items of an array of a JSON GET response, decoding them one by one while the body arrives.
+
+        Only the current item is buffered, the response is never buffered or decoded as a whole.
+        Items are decoded by the json module, the only decoder able to resume inside a document.
+        The error code of the response is checked once the body is complete.
+
+        Args:
+            path (str): API path.
+            key (str): Key of the array in the response, e.g. 'device_list'.
+            params (Optional[Dict[str, Any]]): Request parameters (default: None).
+            isNeedAT (bool): Flag to indicate if access token is required (default: True).
+            headers (Optional[Dict[str, str]]): Additional headers to include in the request (default: None).
+            fields (Optional[Iterable[str]]): Fields kept in each item, nested fields are separated by dots
+                (default: None, every field).
+            timeout (Union[None, float, Deadline]): Time budget in seconds or deadline of the whole transfer
+                (default: None, the default of the endpoint).
+
+        Yields:
+            Any: The next decoded item.
+
+        Raises:
+            ResponseError: If the response is not valid JSON or has an error code.
+            CircuitOpenError: If the gateway is down.
+            DeadlineExceededError: If the transfer does not complete in time.
+        """
+        url, headers = self._buildRequest(path, isNeedAT, headers)
+        default = default_timeout(EMethod.GET, path, self.timeouts)
+        _LOGGER.debug(f'httpStreamArray: {url}')
+
+        projection = compile_fields(fields) if fields is not None else None
+        streamer = JsonArrayStreamer(key)
+
+        async with self._streamRequest(url, params, headers, timeout, default) as resp:
+            async for chunk in resp.content.iter_any():
+                for item in self._feedArray(streamer, chunk):
+                    yield item if projection is None else project_fields(item, projection)
+            self._checkArrayResponse(streamer)
+
+        _LOGGER.debug(f'httpStreamArray: {streamer.items} items')
+
+    @staticmethod
+    def _feedArray(streamer: JsonArrayStreamer, chunk: bytes) -> List[Any]:
+        """
+        Decodes the items completed by the next chunk of a response streamed by httpStreamArray.
+
+        Args:
+            streamer (JsonArrayStreamer): The streamer of the response.
+            chunk (bytes): The next chunk of the response.
+
+        Returns:
+            List[Any]: The decoded items.
+
+        Raises:
+            ResponseError: If the response is not valid UTF-8.
+        """
+        try:
+            return streamer.feed(chunk)
+        except ValueError as err:
+            raise ResponseError(IResponse(-1, 'Invalid JSON response.', {})) from err
+
+    def _checkArrayResponse(self, streamer: JsonArrayStreamer) -> None:
+        """
+        Checks the error code of a response streamed by httpStreamArray, once it is complete.
+
+        Args:
+            streamer (JsonArrayStreamer): The streamer of the response.
+
+        Raises:
+            ResponseError: If the response is truncated, not valid JSON or has an error code.
+        """
+        try:
+            skeleton = streamer.finish()
+        except ValueError as err:
+            raise ResponseError(IResponse(-1, 'Invalid JSON response.', {})) from err
+
+        response = self._parseResponse(skeleton)
+        if response.error != EResponseErrorCode.ERROR_SUCCESS.value:
+            raise ResponseError(response)
+
+    async def httpDownload(
+        self,
+        path: str,
+        destination: Union[str, os.PathLike, int, BinaryIO],
+        params: Optional[Dict[str, Any]] = None,
+        isNeedAT: bool = True,
+        headers: Optional[Dict[str, str]] = None,
+        chunk_size: int = 65536,
+        progress: Optional[Callable[[IDownloadStats], None]] = None,
+        timeout: Union[None, float, Deadline] = None,
+    ) -> IDownloadStats:
+        """
+        Downloads the body of a file (application/octet-stream) GET request with bounded memory.
+
+        Every chunk is written as soon as it is received, in the default executor,
+        so disk writes never block the event loop.
+
+        Args:
+            path (str): API path.
+            destination (Union[str, os.PathLike, int, BinaryIO]): File path, file descriptor or binary file object.
+                A file descriptor or file object is left open.
+            params (Optional[Dict[str, Any]]): Request parameters (default: None).
+            isNeedAT (bool): Flag to indicate if access token is required (default: True).
+            headers (Optional[Dict[str, str]]): Additional headers to include in the request (default: None).
+            chunk_size (int): Maximum size of a chunk in bytes (default: 65536).
+            progress (Optional[Callable[[IDownloadStats], None]]): Called after each written chunk (default: None).
+            timeout (Union[None, float, Deadline]): Time budget in seconds or deadline of the whole transfer
+                (default: None, the default of the endpoint).
+
+        Returns:
+            IDownloadStats: The received bytes and throughput of the download.
+        """
+        stats = IDownloadStats()
+        loop = asyncio.get_running_loop()
+
+        if isinstance(destination, (str, os.PathLike)):
+            file = await loop.run_in_executor(None, open, destination, 'wb')
+        elif isinstance(destination, int):
+            file = os.fdopen(destination, 'wb', closefd=False)
+        else:
+            file = destination
+
+        stream = self.httpStream(path, params, isNeedAT, headers, chunk_size, stats, timeout)
+        try:
+            async for chunk in stream:
+                await loop.run_in_executor(None, file.write, chunk)
+                if progress is not None:
+                    progress(stats)
+            await loop.run_in_executor(None, file.flush)
+        finally:
+            # Gives the connection and the concurrency slot back at once when the write fails
+            await stream.aclose()
+            if file is not destination:
+                await loop.run_in_executor(None, file.close)
+
+        _LOGGER.debug(f'httpDownload {path}: {stats}')
+        return stats
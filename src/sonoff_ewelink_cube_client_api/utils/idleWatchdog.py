@@ -0,0 +1,101 @@
+"""
+Module: idleWatchdog
+
+This module provides the idle watchdog of a long-lived stream.
+
+Classes:
+    IdleWatchdog: Calls back when a stream has received nothing for a given time.
+"""
+
+from typing import Callable, Optional
+
+import asyncio
+
+
+class IdleWatchdog:
+    """
+    Calls back when a stream has received nothing for a given time.
+
+    The reader only records its activity with 'touch', a plain timestamp store: a single timer
+    checks it once per timeout and is rescheduled from the last activity, instead of arming a
+    timer for every read. While the reader is busy elsewhere (e.g. waiting for a full queue of
+    handlers), it 'suspend's the watchdog, so a slow consumer is not taken for a dead link.
+
+    Attributes:
+        timeout (float): Seconds without activity before the stream is considered dead.
+        expired (bool): Whether the watchdog fired.
+
+    Methods:
+        start(): Starts watching, the stream is active now.
+        touch(): Records an activity of the stream.
+        suspend(): Stops counting the idle time until the next activity.
+        stop(): Stops watching.
+    """
+
+    def __init__(self, timeout: float, on_idle: Callable[[], None]):
+        """
+        Initializes the IdleWatchdog object.
+
+        Parameters:
+            timeout (float): Seconds without activity before the stream is considered dead.
+            on_idle (Callable[[], None]): Called once when the timeout elapses, e.g. to close the stream.
+        """
+        self.timeout: float = timeout
+        self.expired: bool = False
+        self._on_idle: Callable[[], None] = on_idle
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._handle: Optional[asyncio.TimerHandle] = None
+        self._last: Optional[float] = None
+
+    def start(self) -> None:
+        """
+        Starts watching, the stream is active now. Must be called from a running event loop.
+        """
+        self._loop = asyncio.get_running_loop()
+        self.expired = False
+        self.touch()
+        self._schedule(self._last + self.timeout)
+
+    def touch(self) -> None:
+        """
+        Records an activity of the stream.
+        """
+        self._last = self._loop.time()
+
+    def suspend(self) -> None:
+        """
+        Stops counting the idle time until the next activity.
+        """
+        self._last = None
+
+    def stop(self) -> None:
+        """
+        Stops watching.
+        """
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+
+    def _schedule(self, when: float) -> None:
+        """
+        Schedules the next check.
+
+        Args:
+            when (float): The loop time of the check.
+        """
+        self._handle = self._loop.call_at(when, self._check)
+
+    def _check(self) -> None:
+        """
+        Fires if the stream stayed idle for the timeout, or checks again at the end of the new timeout.
+        """
+        if self._last is None:
+            self._schedule(self._loop.time() + self.timeout)
+            return
+        deadline = self._last + self.timeout
+        if self._loop.time() < deadline:
+            self._schedule(deadline)
+            return
+        self._handle = None
+        self.expired = True
+        self._on_idle()
@@ -0,0 +1,227 @@
+"""
+Module: jsonCodec
+
+This module provides the JSON codecs used for request bodies, responses and SSE payloads.
+
+The stdlib codec is the default, orjson and ujson are optional faster backends. The backend is
+chosen at runtime by name, or by the 'JSON_CODEC' environment variable ('json', 'orjson',
+'ujson' or 'auto' for the fastest installed one).
+
+Classes:
+    JsonCodec: Base class of the JSON codecs.
+    StdlibJsonCodec: JSON codec of the standard library.
+    OrjsonCodec: JSON codec backed by orjson.
+    UjsonCodec: JSON codec backed by ujson.
+
+Functions:
+    get_codec: Gets a JSON codec by name.
+"""
+
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional, Type, Union
+
+import json
+import logging
+import os
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+try:
+    import ujson
+except ImportError:  # pragma: no cover - optional dependency
+    ujson = None
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class JsonCodec(ABC):
+    """
+    Base class of the JSON codecs.
+
+    Attributes:
+        name (str): Name of the codec backend.
+
+    Methods:
+        dumps(obj: Any) -> bytes: Encodes an object to JSON bytes.
+        loads(data: Union[bytes, str]) -> Any: Decodes JSON bytes or text.
+    """
+
+    name = None
+
+    @abstractmethod
+    def dumps(self, obj: Any) -> bytes:
+        """
+        Encodes an object to JSON bytes.
+
+        Args:
+            obj (Any): The object to encode.
+
+        Returns:
+            bytes: The UTF-8 encoded JSON document.
+        """
+
+    @abstractmethod
+    def loads(self, data: Union[bytes, str]) -> Any:
+        """
+        Decodes JSON bytes or text.
+
+        Args:
+            data (Union[bytes, str]): The JSON document.
+
+        Returns:
+            Any: The decoded object.
+
+        Raises:
+            ValueError: If the document is not valid JSON.
+        """
+
+    def __repr__(self) -> str:
+        """
+        Returns the representation of the codec.
+
+        Returns:
+            str: The representation of the codec.
+        """
+        return f'{self.__class__.__name__}({self.name})'
+
+
+class StdlibJsonCodec(JsonCodec):
+    """
+    JSON codec of the standard library.
+    """
+
+    name = 'json'
+
+    def dumps(self, obj: Any) -> bytes:
+        """
+        Encodes an object to compact JSON bytes.
+
+        Args:
+            obj (Any): The object to encode.
+
+        Returns:
+            bytes: The UTF-8 encoded JSON document.
+        """
+        return json.dumps(obj, separators=(',', ':')).encode()
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        """
+        Decodes JSON bytes or text, bytes are decoded without an intermediate str.
+
+        Args:
+            data (Union[bytes, str]): The JSON document.
+
+        Returns:
+            Any: The decoded object.
+
+        Raises:
+            ValueError: If the document is not valid JSON.
+        """
+        return json.loads(data)
+
+
+class OrjsonCodec(JsonCodec):
+    """
+    JSON codec backed by orjson.
+    """
+
+    name = 'orjson'
+
+    def dumps(self, obj: Any) -> bytes:
+        """
+        Encodes an object to JSON bytes.
+
+        Args:
+            obj (Any): The object to encode.
+
+        Returns:
+            bytes: The UTF-8 encoded JSON document.
+        """
+        return orjson.dumps(obj)  # pylint: disable=no-member
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        """
+        Decodes JSON bytes or text.
+
+        Args:
+            data (Union[bytes, str]): The JSON document.
+
+        Returns:
+            Any: The decoded object.
+
+        Raises:
+            ValueError: If the document is not valid JSON.
+        """
+        return orjson.loads(data)  # pylint: disable=no-member
+
+
+class UjsonCodec(JsonCodec):
+    """
+    JSON codec backed by ujson.
+    """
+
+    name = 'ujson'
+
+    def dumps(self, obj: Any) -> bytes:
+        """
+        Encodes an object to JSON bytes.
+
+        Args:
+            obj (Any): The object to encode.
+
+        Returns:
+            bytes: The UTF-8 encoded JSON document.
+        """
+        return ujson.dumps(obj).encode()
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        """
+        Decodes JSON bytes or text.
+
+        Args:
+            data (Union[bytes, str]): The JSON document.
+
+        Returns:
+            Any: The decoded object.
+
+        Raises:
+            ValueError: If the document is not valid JSON.
+        """
+        return ujson.loads(data)
+
+
+# Installed backends, fastest first
+CODECS: Dict[str, Type[JsonCodec]] = {
+    codec.name: codec
+    for codec, module in ((OrjsonCodec, orjson), (UjsonCodec, ujson), (StdlibJsonCodec, json))
+    if module is not None
+}
+
+
+def get_codec(name: Optional[str] = None) -> JsonCodec:
+    """
+    Gets a JSON codec by name.
+
+    Args:
+        name (Optional[str]): 'json', 'orjson', 'ujson' or 'auto' for the fastest installed backend
+            (default: the 'JSON_CODEC' environment variable, else 'json').
+
+    Returns:
+        JsonCodec: The codec.
+
+    Raises:
+        ValueError: If the codec is unknown or its backend is not installed.
+    """
+    name = (name or os.environ.get('JSON_CODEC') or StdlibJsonCodec.name).strip().lower()
+
+    if name == 'auto':
+        name = next(iter(CODECS))
+
+    if name not in CODECS:
+        raise ValueError(f"Unknown or not installed JSON codec: {name}")
+
+    _LOGGER.debug(f'JSON codec: {name}')
+    return CODECS[name]()
@@ -0,0 +1,245 @@
+"""
+Module: jsonStream
+
+This module provides incremental decoding of the items of a JSON array while the document arrives.
+
+Classes:
+    JsonArrayStreamer: Decodes the items of one array of a JSON document out of its chunks.
+
+Functions:
+    compile_fields: Prepares field paths for project_fields.
+    project_fields: Keeps only the requested fields of a decoded item.
+"""
+#pylint: disable-msg=too-many-instance-attributes
+
+from typing import Any, Dict, Iterable, List, Tuple
+
+import codecs
+import json
+import re
+
+# Separators between the items of an array
+_SEPARATORS = re.compile(r'[\s,]*')
+
+
+class JsonArrayStreamer:
+    """
+    Decodes the items of one array of a JSON document out of its chunks.
+
+    The array is found by its key (e.g. 'device_list'), each item is decoded as soon as it is
+    complete by the C decoder of the json module. Only the current partial item and the
+    document outside the array (the skeleton) are buffered.
+
+    Usage:
+        streamer = JsonArrayStreamer('device_list')
+        for chunk in chunks:
+            for device in streamer.feed(chunk):
+                ...
+        document = json.loads(streamer.finish())  # the array is left empty
+
+    Attributes:
+        items (int): Number of items decoded so far.
+
+    Methods:
+        feed(chunk: bytes) -> List[Any]: Decodes the items completed by the next chunk of the document.
+        finish() -> bytes: Ends the document and gets its skeleton.
+    """
+
+    def __init__(self, key: str):
+        """
+        Initializes the JsonArrayStreamer object.
+
+        Parameters:
+            key (str): Key of the array to decode, the first array with this key is used.
+        """
+        self.items: int = 0
+        self._key_pattern = re.compile('"' + re.escape(key) + r'"\s*:\s*\Z')
+        self._text_decoder = codecs.getincrementaldecoder('utf-8')()
+        self._json_decoder = json.JSONDecoder()
+        # 'before', 'array' or 'after' the array
+        self._state: str = 'before'
+        self._in_string: bool = False
+        self._pending: str = ''
+        self._skeleton: List[str] = []
+
+    def feed(self, chunk: bytes) -> List[Any]:
+        """
+        Decodes the items completed by the next chunk of the document.
+
+        Args:
+            chunk (bytes): The next bytes of the document.
+
+        Returns:
+            List[Any]: The decoded items.
+
+        Raises:
+            UnicodeDecodeError: If the document is not valid UTF-8.
+        """
+        text = self._pending + self._text_decoder.decode(chunk)
+        self._pending = ''
+        items: List[Any] = []
+        pos = 0
+
+        if self._state == 'before':
+            pos = self._find_array(text)
+        if self._state == 'array':
+            pos = self._decode_items(text, pos, items)
+        if self._state == 'after':
+            self._skeleton.append(text[pos:])
+
+        self.items += len(items)
+        return items
+
+    def finish(self) -> bytes:
+        """
+        Ends the document and gets its skeleton, the document with an empty array.
+
+        Returns:
+            bytes: The skeleton of the document.
+
+        Raises:
+            ValueError: If the document is truncated inside the array.
+        """
+        self.feed(b'')
+        if self._state == 'array':
+            raise ValueError("Truncated JSON document.")
+        self._skeleton.append(self._pending + self._text_decoder.decode(b'', final=True))
+        return ''.join(self._skeleton).encode()
+
+    def _find_array(self, text: str) -> int:
+        """
+        Scans the text before the array, up to its opening bracket.
+
+        Args:
+            text (str): The text to scan.
+
+        Returns:
+            int: The position after the opening bracket, or the length of the text if not found yet.
+        """
+        size = len(text)
+        pos = 0
+        start = 0
+        while pos < size:
+            if self._in_string:
+                end = text.find('"', pos)
+                while end != -1 and _escaped(text, pos, end):
+                    end = text.find('"', end + 1)
+                if end == -1:
+                    if _escaped(text, pos, size):
+                        # Keep the trailing backslash with the character it escapes
+                        self._pending = text[size - 1:]
+                        size -= 1
+                    break
+                self._in_string = False
+                pos = end + 1
+                continue
+
+            quote = text.find('"', pos)
+            bracket = text.find('[', pos)
+            if bracket != -1 and (quote == -1 or bracket < quote):
+                prefix = ''.join(self._skeleton) + text[start:bracket]
+                self._skeleton = [prefix + '[']
+                pos = start = bracket + 1
+                if self._key_pattern.search(prefix):
+                    self._state = 'array'
+                    return pos
+            elif quote != -1:
+                self._in_string = True
+                pos = quote + 1
+            else:
+                break
+
+        self._skeleton.append(text[start:size])
+        return len(text)
+
+    def _decode_items(self, text: str, pos: int, items: List[Any]) -> int:
+        """
+        Decodes the complete items of the array.
+
+        Args:
+            text (str): The text of the array.
+            pos (int): The position of the next item.
+            items (List[Any]): Receives the decoded items.
+
+        Returns:
+            int: The position of the closing bracket, or the length of the text if the array goes on.
+        """
+        size = len(text)
+        while True:
+            pos = _SEPARATORS.match(text, pos).end()
+            if pos == size:
+                return size
+            if text[pos] == ']':
+                self._state = 'after'
+                return pos
+            try:
+                item, end = self._json_decoder.raw_decode(text, pos)
+            except json.JSONDecodeError:
+                # The item goes on in the next chunk
+                self._pending = text[pos:]
+                return size
+            if end == size and not isinstance(item, (dict, list)):
+                # A number may go on in the next chunk
+                self._pending = text[pos:]
+                return size
+            items.append(item)
+            pos = end
+
+
+def _escaped(text: str, start: int, pos: int) -> bool:
+    """
+    Checks if the character at pos of a string is escaped by the odd run of backslashes before it.
+
+    Args:
+        text (str): The text.
+        start (int): The position where the scan of the string started.
+        pos (int): The position of the character.
+
+    Returns:
+        bool: True if the character is escaped.
+    """
+    backslashes = 0
+    while pos - backslashes > start and text[pos - backslashes - 1] == '\\':
+        backslashes += 1
+    return backslashes % 2 == 1
+
+
+def compile_fields(fields: Iterable[str]) -> Tuple[Tuple[str, ...], ...]:
+    """
+    Prepares field paths for project_fields.
+
+    Args:
+        fields (Iterable[str]): Field names, nested fields are separated by dots (e.g. 'state.power').
+
+    Returns:
+        Tuple[Tuple[str, ...], ...]: The split field paths.
+    """
+    return tuple(tuple(field.split('.')) for field in fields)
+
+
+def project_fields(item: Any, fields: Tuple[Tuple[str, ...], ...]) -> Dict[str, Any]:
+    """
+    Keeps only the requested fields of a decoded item.
+
+    Missing fields are left out of the result.
+
+    Args:
+        item (Any): The decoded item.
+        fields (Tuple[Tuple[str, ...], ...]): The field paths from compile_fields.
+
+    Returns:
+        Dict[str, Any]: The projected item, nested fields keep their nesting.
+    """
+    result: Dict[str, Any] = {}
+    for path in fields:
+        value = item
+        for part in path:
+            if not isinstance(value, dict) or part not in value:
+                break
+            value = value[part]
+        else:
+            target = result
+            for part in path[:-1]:
+                target = target.setdefault(part, {})
+            target[path[-1]] = value
+    return result
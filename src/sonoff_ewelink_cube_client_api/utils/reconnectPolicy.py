@@ -0,0 +1,139 @@
+"""
+Module: reconnectPolicy
+
+This module provides the reconnection delays and statistics of the SSE stream.
+
+Classes:
+    ReconnectPolicy: Spaces out the reconnections of the SSE stream with full-jitter backoff.
+"""
+#pylint: disable-msg=too-many-instance-attributes
+
+from typing import Dict, Optional, Union
+
+import random
+import time
+
+
+class ReconnectPolicy:
+    """
+    Spaces out the reconnections of the SSE stream with full-jitter backoff.
+
+    The delay before a reconnection is the reconnection time sent by the server in its 'retry'
+    field, at least 'min_delay', plus a random delay drawn between 0 and an exponential backoff,
+    starting from 'base_delay' and capped by 'max_delay'. The backoff starts over once a connection
+    stayed up for 'stable_after' seconds, so a flapping gateway is retried less and less often
+    instead of in a tight loop, even when the server asks for an immediate reconnection.
+
+    Attributes:
+        base_delay (float): Backoff of the first reconnection in seconds.
+        max_delay (float): Maximum backoff in seconds.
+        min_delay (float): Minimum delay before a reconnection in seconds, whatever the server hint.
+        stable_after (float): Seconds a connection must stay up for the backoff to start over.
+        attempts (int): Number of failed connections since the last stable one.
+        reconnects (int): Number of connections established after a disconnection.
+        disconnected_seconds (float): Total time spent disconnected after a first connection.
+
+    Methods:
+        delay(retry: Optional[int] = None) -> float: Gets the delay before the next connection attempt.
+        connected() -> Optional[float]: Records an established connection.
+        disconnected(): Records a lost connection or a failed attempt.
+        stats() -> Dict[str, Union[int, float, bool]]: Gets the reconnection statistics.
+    """
+
+    def __init__(
+        self,
+        base_delay: float = 1.0,
+        max_delay: float = 60.0,
+        stable_after: float = 30.0,
+        min_delay: float = 0.1,
+    ):
+        """
+        Initializes the ReconnectPolicy object.
+
+        Parameters:
+            base_delay (float): Backoff of the first reconnection in seconds (default: 1.0).
+            max_delay (float): Maximum backoff in seconds (default: 60.0).
+            stable_after (float): Seconds a connection must stay up for the backoff to start over (default: 30.0).
+            min_delay (float): Minimum delay before a reconnection in seconds, whatever the server hint (default: 0.1).
+        """
+        self.base_delay: float = base_delay
+        self.max_delay: float = max_delay
+        self.min_delay: float = min_delay
+        self.stable_after: float = stable_after
+        self.attempts: int = 0
+        self.reconnects: int = 0
+        self.disconnected_seconds: float = 0.0
+        self._connected_at: Optional[float] = None
+        self._disconnected_at: Optional[float] = None
+
+    @property
+    def is_connected(self) -> bool:
+        """
+        Whether the stream is connected.
+
+        Returns:
+            bool: True while connected.
+        """
+        return self._connected_at is not None
+
+    def delay(self, retry: Optional[int] = None) -> float:
+        """
+        Gets the delay before the next connection attempt.
+
+        Args:
+            retry (Optional[int]): The reconnection time sent by the server, in milliseconds (default: None).
+
+        Returns:
+            float: The server hint, at least the minimum delay, plus a random delay between 0 and
+                the exponential backoff, in seconds.
+        """
+        hint = max(self.min_delay, retry / 1000 if retry is not None else 0)
+        return hint + random.uniform(0, min(self.max_delay, self.base_delay * 2 ** max(0, self.attempts - 1)))
+
+    def connected(self) -> Optional[float]:
+        """
+        Records an established connection.
+
+        Returns:
+            Optional[float]: Seconds spent disconnected for a reconnection, None for the first connection.
+        """
+        now = time.monotonic()
+        self._connected_at = now
+        if self._disconnected_at is None:
+            return None
+
+        downtime = now - self._disconnected_at
+        self._disconnected_at = None
+        self.reconnects += 1
+        self.disconnected_seconds += downtime
+        return downtime
+
+    def disconnected(self) -> None:
+        """
+        Records a lost connection or a failed attempt.
+        """
+        now = time.monotonic()
+        if self._connected_at is not None:
+            if now - self._connected_at >= self.stable_after:
+                self.attempts = 0
+            self._connected_at = None
+            self._disconnected_at = now
+        self.attempts += 1
+
+    def stats(self) -> Dict[str, Union[int, float, bool]]:
+        """
+        Gets the reconnection statistics.
+
+        Returns:
+            Dict[str, Union[int, float, bool]]: The 'connected', 'attempts', 'reconnects' and
+                'disconnected_seconds' values, the latter including the current disconnection.
+        """
+        disconnected_seconds = self.disconnected_seconds
+        if self._disconnected_at is not None:
+            disconnected_seconds += time.monotonic() - self._disconnected_at
+        return {
+            'connected': self.is_connected,
+            'attempts': self.attempts,
+            'reconnects': self.reconnects,
+            'disconnected_seconds': disconnected_seconds,
+        }
@@ -0,0 +1,401 @@
+"""
+Module: responseCache
+
+This module provides an opt-in TTL cache for the responses of the read endpoints.
+
+Classes:
+    ResponseCache: Size-bounded TTL cache of GET responses, invalidated by the SSE device events.
+"""
+#pylint: disable-msg=too-many-instance-attributes
+
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+import json
+import logging
+import time
+
+from ..ts.enum.EPath import EPath
+from ..ts.enum.ESseEvent import ESseEvent
+from ..ts.enum.EResponse import EResponseErrorCode
+from ..ts.interface.IDeviceEvent import IDeviceEvent
+from ..ts.interface.IResponse import IResponse
+from .sseUtils import get_serial_number, merge_dicts
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _copy(value: Any) -> Any:
+    """
+    Copies the dictionaries and lists of decoded JSON data, recursively.
+
+    Args:
+        value (Any): The decoded JSON data.
+
+    Returns:
+        Any: The copy.
+    """
+    if isinstance(value, dict):
+        return {key: _copy(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_copy(item) for item in value]
+    return value
+
+
+def _index_devices(response: IResponse) -> Dict[str, Dict[str, Any]]:
+    """
+    Indexes the devices of a device list response by serial number.
+
+    Args:
+        response (IResponse): The response.
+
+    Returns:
+        Dict[str, Dict[str, Any]]: The devices of the response.
+    """
+    device_list = response.data.get('device_list') if isinstance(response.data, dict) else None
+    if not isinstance(device_list, list):
+        return {}
+    return {
+        device['serial_number']: device for device in device_list
+        if isinstance(device, dict) and device.get('serial_number')
+    }
+
+
+class ResponseCache:
+    """
+    Size-bounded TTL cache of GET responses, invalidated by the SSE device events.
+
+    Responses are keyed by API path and parameters. Only the paths having a TTL are cached,
+    and only successful responses are stored. When the cache is full the least recently
+    used entry is evicted. The cache keeps its own copy of a response and answers each hit
+    with a new copy, so a caller modifying its response never alters the cache.
+
+    Each path has a generation, increased when its entries are invalidated: a response
+    fetched before an invalidation of its path is not stored, the other paths are unaffected.
+    The state and online updates of a device do not invalidate the device list, they are
+    applied to the cached device lists instead, where they only change one device. They still
+    increase the generation of the device list while one is fetched, as the response may
+    predate them: a device list fetched while such an update arrives is not stored.
+
+    Attributes:
+        DEFAULT_TTLS (Dict[str, float]): Default TTL in seconds of the cached API paths.
+        EVENT_INVALIDATIONS (Dict[str, Tuple[str, ...]]): API paths invalidated by each SSE event.
+        EVENT_PATCHES (Tuple[str, ...]): SSE events applied to the cached device lists.
+        max_entries (int): Maximum number of cached responses.
+        ttls (Dict[str, float]): TTL in seconds of the cached API paths.
+        hits (int): Number of requests answered from the cache.
+        misses (int): Number of cacheable requests sent to the gateway.
+        evictions (int): Number of entries evicted to respect max_entries.
+        invalidations (int): Number of entries removed by invalidation.
+        patches (int): Number of cached devices updated by an SSE event.
+
+    Methods:
+        key(path: str, params: Optional[Dict[str, Any]]) -> Optional[Tuple[str, Optional[str]]]:
+            Gets the cache key of a request, None if its path is not cached.
+        generation(key: Tuple[str, Optional[str]]) -> int: Gets the generation of the path of a key.
+        begin(key: Tuple[str, Optional[str]]) -> int: Marks a request of a key in flight and gets its generation.
+        end(key: Tuple[str, Optional[str]]): Marks a request of a key done.
+        get(key: Tuple[str, Optional[str]]) -> Optional[IResponse]: Gets a copy of a fresh cached response.
+        set(key: Tuple[str, Optional[str]], response: IResponse, generation: int): Stores a response.
+        invalidate(path: str, serial_number: Optional[str] = None): Removes the entries of a path.
+        invalidate_event(event_name: str, event_data: Any): Removes or updates the entries changed by an SSE event.
+        invalidate_device_event(event_name: str, serial_number: Optional[str]): Removes the entries changed by
+            an SSE event of a device.
+        wants(event_name: str) -> bool: Tells whether an SSE event changes the cache.
+        patch_device_event(event: IDeviceEvent): Applies an SSE event to the cached device lists.
+        clear(): Removes every entry.
+        stats() -> Dict[str, int]: Gets the counters of the cache.
+    """
+
+    DEFAULT_TTLS = {
+        EPath.DEVICE.value: 30,
+        EPath.BRIDGE.value: 60,
+        EPath.BRIDGE_RUNTIME.value: 5,
+    }
+
+    # Every device event changes the content of the device list, the frequent ones are applied to it.
+    EVENT_INVALIDATIONS = {
+        ESseEvent.ADD_DEVICE.value: (EPath.DEVICE.value,),
+        ESseEvent.DELETE_DEVICE.value: (EPath.DEVICE.value,),
+        ESseEvent.UPDATE_DEVICE_INFO.value: (EPath.DEVICE.value,),
+    }
+    EVENT_PATCHES = (
+        ESseEvent.UPDATE_DEVICE_STATE.value,
+        ESseEvent.UPDATE_DEVICE_ONLINE.value,
+    )
+
+    def __init__(self, max_entries: int = 128, ttls: Optional[Dict[str, float]] = None):
+        """
+        Initializes the ResponseCache object.
+
+        Parameters:
+            max_entries (int): Maximum number of cached responses (default: 128).
+            ttls (Optional[Dict[str, float]]): TTL in seconds by API path (default: DEFAULT_TTLS).
+
+        Raises:
+            ValueError: If max_entries is not a positive integer.
+        """
+        if not isinstance(max_entries, int) or max_entries < 1:
+            raise ValueError("max_entries must be a positive integer.")
+
+        self.max_entries: int = max_entries
+        self.ttls: Dict[str, float] = dict(self.DEFAULT_TTLS if ttls is None else ttls)
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+        self.invalidations: int = 0
+        self.patches: int = 0
+        self._generations: Dict[str, int] = {}
+        self._fetching: Dict[str, int] = {}
+        # Each entry is its expiry time, its response, and the devices of a device list response
+        self._entries: 'OrderedDict[Tuple[str, Optional[str]], Tuple[float, IResponse, Dict[str, Dict[str, Any]]]]' \
+            = OrderedDict()
+
+    def key(self, path: str, params: Optional[Dict[str, Any]]) -> Optional[Tuple[str, Optional[str]]]:
+        """
+        Gets the cache key of a request.
+
+        Args:
+            path (str): API path.
+            params (Optional[Dict[str, Any]]): Request parameters.
+
+        Returns:
+            Optional[Tuple[str, Optional[str]]]: The cache key, None if the path is not cached.
+        """
+        if not self.ttls.get(path):
+            return None
+        return path, json.dumps(params, sort_keys=True, default=str) if params else None
+
+    def generation(self, key: Tuple[str, Optional[str]]) -> int:
+        """
+        Gets the generation of the path of a key, to read before sending its request.
+
+        Args:
+            key (Tuple[str, Optional[str]]): The cache key.
+
+        Returns:
+            int: The generation.
+        """
+        return self._generations.get(key[0], 0)
+
+    def begin(self, key: Tuple[str, Optional[str]]) -> int:
+        """
+        Marks a request of a key in flight, until end is called, and gets its generation.
+
+        The device list is only invalidated by its patched events while a request of it is in flight.
+
+        Args:
+            key (Tuple[str, Optional[str]]): The cache key.
+
+        Returns:
+            int: The generation, to store the response with.
+        """
+        self._fetching[key[0]] = self._fetching.get(key[0], 0) + 1
+        return self.generation(key)
+
+    def end(self, key: Tuple[str, Optional[str]]) -> None:
+        """
+        Marks a request of a key done, whether it succeeded or not.
+
+        Args:
+            key (Tuple[str, Optional[str]]): The cache key.
+        """
+        fetching = self._fetching.get(key[0], 0) - 1
+        if fetching > 0:
+            self._fetching[key[0]] = fetching
+        else:
+            self._fetching.pop(key[0], None)
+
+    def get(self, key: Tuple[str, Optional[str]]) -> Optional[IResponse]:
+        """
+        Gets a copy of a fresh cached response.
+
+        Args:
+            key (Tuple[str, Optional[str]]): The cache key.
+
+        Returns:
+            Optional[IResponse]: The cached response, None if missing or expired.
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, response, _ = entry
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return IResponse(response.error, response.message, _copy(response.data))
+            del self._entries[key]
+
+        self.misses += 1
+        return None
+
+    def set(self, key: Tuple[str, Optional[str]], response: IResponse, generation: int) -> None:
+        """
+        Stores a successful response.
+
+        The response is dropped when its path was invalidated since the request was sent,
+        so a response fetched before a device event never outlives the event. A copy of the
+        response is stored, the caller keeps the original.
+
+        Args:
+            key (Tuple[str, Optional[str]]): The cache key.
+            response (IResponse): The response to store.
+            generation (int): The generation of the key read before sending the request.
+        """
+        if generation != self.generation(key):
+            return
+        if not isinstance(response, IResponse) or response.error != EResponseErrorCode.ERROR_SUCCESS.value:
+            return
+
+        response = IResponse(response.error, response.message, _copy(response.data))
+        devices = _index_devices(response) if key[0] == EPath.DEVICE.value else {}
+        self._entries[key] = (time.monotonic() + self.ttls[key[0]], response, devices)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, path: str, serial_number: Optional[str] = None) -> None:
+        """
+        Removes the entries of an API path.
+
+        Args:
+            path (str): The API path, e.g. '/devices'.
+            serial_number (Optional[str]): Also removes the entries of this device (e.g. '/devices/<serial>'),
+                None removes the entries of every device below the path.
+        """
+        device_path = f'{path}/{serial_number}' if serial_number else None
+
+        def invalidated(entry_path: str) -> bool:
+            return entry_path in (path, device_path) or (serial_number is None and entry_path.startswith(f'{path}/'))
+
+        for cached_path in self.ttls:
+            if invalidated(cached_path):
+                self._generations[cached_path] = self._generations.get(cached_path, 0) + 1
+        for key in list(self._entries):
+            if invalidated(key[0]):
+                del self._entries[key]
+                self.invalidations += 1
+
+    def invalidate_event(self, event_name: str, event_data: Any) -> None:
+        """
+        Removes or updates the entries changed by an SSE event.
+
+        Args:
+            event_name (str): The name of the SSE event.
+            event_data (Any): The decoded data of the SSE event.
+        """
+        if event_name in self.EVENT_INVALIDATIONS:
+            self.invalidate_device_event(event_name, get_serial_number(event_data))
+        elif event_name in self.EVENT_PATCHES:
+            self._patch(event_name, get_serial_number(event_data), event_data)
+
+    def invalidate_device_event(self, event_name: str, serial_number: Optional[str]) -> None:
+        """
+        Removes the entries changed by an SSE event of a device, without its decoded data.
+
+        Args:
+            event_name (str): The name of the SSE event.
+            serial_number (Optional[str]): The serial number of the device of the event.
+        """
+        paths = self.EVENT_INVALIDATIONS.get(event_name)
+        if not paths:
+            return
+
+        _LOGGER.debug(f'Invalidate cached responses: {paths}, serial number: {serial_number}')
+        for path in paths:
+            self.invalidate(path, serial_number)
+
+    def wants(self, event_name: str) -> bool:
+        """
+        Tells whether an SSE event changes the cache: it invalidates entries, updates a cached device list,
+        or arrives while a device list is fetched.
+
+        Args:
+            event_name (str): The name of the SSE event.
+
+        Returns:
+            bool: True if the event changes the cache.
+        """
+        if event_name in self.EVENT_INVALIDATIONS:
+            return True
+        if event_name not in self.EVENT_PATCHES:
+            return False
+        return EPath.DEVICE.value in self._fetching or any(devices for _, _, devices in self._entries.values())
+
+    def patch_device_event(self, event: IDeviceEvent) -> None:
+        """
+        Applies a state or online update of a device to the cached device lists.
+
+        The data of the event is only decoded when a cached device list has the device. A device list
+        fetched meanwhile is not stored.
+
+        Args:
+            event (IDeviceEvent): The event, with its serial number.
+
+        Raises:
+            ValueError: If the data of the event is needed and is not valid JSON.
+        """
+        event_name = str(event.type)
+        if event_name not in self.EVENT_PATCHES:
+            return
+        self._outdate_fetches()
+        if event.serial_number is not None \
+                and any(event.serial_number in devices for _, _, devices in self._entries.values()):
+            self._patch(event_name, event.serial_number, event.data)
+
+    def _patch(self, event_name: str, serial_number: Optional[str], event_data: Any) -> None:
+        """
+        Applies a state or online update of a device to the cached device lists.
+
+        Args:
+            event_name (str): The name of the SSE event.
+            serial_number (Optional[str]): The serial number of the device of the event.
+            event_data (Any): The decoded data of the SSE event.
+        """
+        self._outdate_fetches()
+        payload = event_data.get('payload') if isinstance(event_data, dict) else None
+        if serial_number is None or not isinstance(payload, dict):
+            return
+
+        for _, _, devices in self._entries.values():
+            device = devices.get(serial_number)
+            if device is None:
+                continue
+            if event_name == ESseEvent.UPDATE_DEVICE_STATE.value:
+                state = device.get('state')
+                device['state'] = merge_dicts(state, _copy(payload)) if isinstance(state, dict) else _copy(payload)
+            elif 'online' in payload:
+                device['online'] = payload['online']
+            self.patches += 1
+
+    def _outdate_fetches(self) -> None:
+        """
+        Increases the generation of the device list while it is fetched, so the response is not stored.
+        """
+        path = EPath.DEVICE.value
+        if path in self._fetching:
+            self._generations[path] = self._generations.get(path, 0) + 1
+
+    def clear(self) -> None:
+        """
+        Removes every entry.
+        """
+        for path in self.ttls:
+            self._generations[path] = self._generations.get(path, 0) + 1
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Gets the counters of the cache.
+
+        Returns:
+            Dict[str, int]: The 'entries', 'hits', 'misses', 'evictions', 'invalidations' and 'patches' counters.
+        """
+        return {
+            'entries': len(self._entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'invalidations': self.invalidations,
+            'patches': self.patches,
+        }
@@ -0,0 +1,232 @@
+"""
+Module: retryPolicy
+
+This module provides the retries of the transient failures of the gateway requests.
+
+Classes:
+    RetryPolicy: Retries transient failures with full-jitter backoff within a per-call and a global budget.
+"""
+#pylint: disable-msg=too-many-instance-attributes
+
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import asyncio
+import logging
+import random
+import time
+
+import aiohttp
+
+from ..ts.enum.EMethod import EMethod
+from ..ts.enum.EResponse import EResponseErrorCode
+from ..ts.error.EDiscoveryDevice import EDiscoveryDeviceError
+from ..ts.interface.IResponse import IResponse
+from .deadline import Deadline
+
+_LOGGER = logging.getLogger(__name__)
+
+# The request never reached the gateway, retrying cannot apply a change twice
+_NOT_SENT_ERRORS = (aiohttp.ClientConnectorError,) + (
+    (aiohttp.ConnectionTimeoutError,) if hasattr(aiohttp, 'ConnectionTimeoutError') else ()
+)
+# The request may have reached the gateway, only idempotent requests are retried
+_TRANSIENT_ERRORS = (asyncio.TimeoutError, aiohttp.ClientConnectionError, aiohttp.ClientPayloadError)
+
+
+class RetryPolicy:
+    """
+    Retries transient failures with full-jitter backoff within a per-call and a global budget.
+
+    GET requests are idempotent: they are retried on timeouts, connection errors, invalid
+    responses (-1) and gateway exceptions (500). PUT/POST/DELETE requests change the gateway:
+    they are only retried when the request could not be sent (connection not established).
+    Every request is retried after 'discovering_delay' when the gateway answers that it is
+    discovering Zigbee devices (110001). Any other response, including 400 and 401, is returned at once.
+
+    Each call makes at most 'max_attempts' attempts within 'max_elapsed' seconds and its deadline. Retries also
+    spend tokens of a budget shared by all the calls of the gateway (each success earns back
+    'token_ratio'), so a failing gateway gets no more than a few retries instead of a retry storm.
+
+    Attributes:
+        max_attempts (int): Maximum number of attempts of a call.
+        base_delay (float): Backoff of the first retry in seconds.
+        max_delay (float): Maximum backoff in seconds.
+        max_elapsed (float): Seconds after which a call is not retried anymore.
+        discovering_delay (float): Seconds to wait before retrying a request refused during a Zigbee discovery.
+        max_tokens (float): Size of the shared retry budget.
+        token_ratio (float): Tokens earned back by a successful call.
+        retries (int): Number of retries made.
+        throttled (int): Number of retries refused by the shared budget.
+
+    Methods:
+        run(method: EMethod, func: Callable[[], Awaitable[Any]], deadline: Optional[Deadline] = None) -> Any:
+            Runs a call with retries.
+        backoff(attempt: int) -> float: Gets the full-jitter backoff before a retry.
+        stats() -> Dict[str, float]: Gets the counters of the policy.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        base_delay: float = 0.2,
+        max_delay: float = 2.0,
+        max_elapsed: float = 15.0,
+        discovering_delay: float = 2.0,
+        max_tokens: float = 10.0,
+        token_ratio: float = 0.1,
+    ):
+        """
+        Initializes the RetryPolicy object.
+
+        Parameters:
+            max_attempts (int): Maximum number of attempts of a call, 1 disables retries (default: 3).
+            base_delay (float): Backoff of the first retry in seconds (default: 0.2).
+            max_delay (float): Maximum backoff in seconds (default: 2.0).
+            max_elapsed (float): Seconds after which a call is not retried anymore (default: 15.0).
+            discovering_delay (float): Seconds before retrying a request refused during a Zigbee discovery
+                (default: 2.0).
+            max_tokens (float): Size of the retry budget shared by the calls (default: 10.0).
+            token_ratio (float): Tokens earned back by a successful call (default: 0.1).
+
+        Raises:
+            ValueError: If max_attempts is not a positive integer.
+        """
+        if not isinstance(max_attempts, int) or max_attempts < 1:
+            raise ValueError("max_attempts must be a positive integer.")
+
+        self.max_attempts: int = max_attempts
+        self.base_delay: float = base_delay
+        self.max_delay: float = max_delay
+        self.max_elapsed: float = max_elapsed
+        self.discovering_delay: float = discovering_delay
+        self.max_tokens: float = max_tokens
+        self.token_ratio: float = token_ratio
+        self.retries: int = 0
+        self.throttled: int = 0
+        self._tokens: float = max_tokens
+
+    async def run(
+        self,
+        method: EMethod,
+        func: Callable[[], Awaitable[Any]],
+        deadline: Optional[Deadline] = None,
+    ) -> Any:
+        """
+        Runs a call with retries.
+
+        Args:
+            method (EMethod): HTTP method of the request.
+            func (Callable[[], Awaitable[Any]]): Makes one attempt of the request.
+            deadline (Optional[Deadline]): Deadline of the call, no retry is made past it (default: None).
+
+        Returns:
+            Any: The response of the last attempt.
+
+        Raises:
+            Exception: The error of the last attempt, when it is not retried.
+        """
+        started = time.monotonic()
+        attempt = 1
+        while True:
+            error: Optional[Exception] = None
+            response: Any = None
+            try:
+                response = await func()
+            except Exception as err:  # pylint: disable=broad-except
+                delay = self._exceptionDelay(method, err)
+                error = err
+            else:
+                delay = self._responseDelay(method, response)
+
+            if delay is None:
+                if error is None:
+                    self._tokens = min(self.max_tokens, self._tokens + self.token_ratio)
+                    return response
+                raise error
+
+            delay = max(delay, self.backoff(attempt))
+            if attempt >= self.max_attempts or time.monotonic() - started + delay > self.max_elapsed \
+                    or (deadline is not None and delay >= deadline.remaining()) or not self._withdraw():
+                if error is not None:
+                    raise error
+                return response
+
+            _LOGGER.debug(f'Retry {method} in {delay:.2f}s (attempt {attempt}): {error or response}')
+            self.retries += 1
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    def backoff(self, attempt: int) -> float:
+        """
+        Gets the full-jitter backoff before a retry.
+
+        Args:
+            attempt (int): Number of attempts made so far.
+
+        Returns:
+            float: A random delay between 0 and the exponential backoff, in seconds.
+        """
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+    def _exceptionDelay(self, method: EMethod, error: Exception) -> Optional[float]:
+        """
+        Classifies a failed attempt.
+
+        Args:
+            method (EMethod): HTTP method of the request.
+            error (Exception): The error of the attempt.
+
+        Returns:
+            Optional[float]: The minimal delay before a retry, None if the error is not retried.
+        """
+        if isinstance(error, _NOT_SENT_ERRORS):
+            return 0
+        if method == EMethod.GET and isinstance(error, _TRANSIENT_ERRORS):
+            return 0
+        return None
+
+    def _responseDelay(self, method: EMethod, response: Any) -> Optional[float]:
+        """
+        Classifies the response of an attempt.
+
+        Args:
+            method (EMethod): HTTP method of the request.
+            response (Any): The response of the attempt.
+
+        Returns:
+            Optional[float]: The minimal delay before a retry, None if the response is returned.
+        """
+        if not isinstance(response, IResponse):
+            return None
+        if response.error == EDiscoveryDeviceError.GATEWAY_DISCOVERING_ZIGBEE_DEVICES.value:
+            return self.discovering_delay
+        if method == EMethod.GET and response.error in (EResponseErrorCode.ERROR_SERVER_EXCEPTION.value,
+                                                         EResponseErrorCode.ERROR_CUSTOM.value):
+            return 0
+        return None
+
+    def _withdraw(self) -> bool:
+        """
+        Spends a token of the shared budget for a retry.
+
+        Returns:
+            bool: True if the retry is allowed, False if the budget is exhausted.
+        """
+        if self._tokens < 1:
+            self.throttled += 1
+            return False
+        self._tokens -= 1
+        return True
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Gets the counters of the policy.
+
+        Returns:
+            Dict[str, float]: The 'retries', 'throttled' and 'tokens' values.
+        """
+        return {
+            'retries': self.retries,
+            'throttled': self.throttled,
+            'tokens': self._tokens,
+        }
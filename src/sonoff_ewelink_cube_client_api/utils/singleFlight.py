@@ -0,0 +1,117 @@
+"""
+Module: singleFlight
+
+This module provides request coalescing for identical in-flight calls.
+
+Classes:
+    SingleFlight: Shares one in-flight call between concurrent callers using the same key.
+"""
+
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+import asyncio
+
+
+class SingleFlight:
+    """
+    Shares one in-flight call between concurrent callers using the same key.
+
+    The first caller of a key starts the call, callers arriving while it is still running
+    wait for the same result (or exception) instead of starting their own call.
+    Cancelling a waiting caller does not cancel the shared call of the others, the call is
+    only cancelled once every caller waiting for it has left.
+
+    Attributes:
+        calls (int): Number of calls made through the single-flight layer.
+        coalesced (int): Number of calls which joined an in-flight call.
+
+    Methods:
+        do(key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any: Runs or joins the call of the key.
+        stats() -> Dict[str, int]: Gets the counters of the single-flight layer.
+    """
+
+    def __init__(self):
+        """
+        Initializes the SingleFlight object.
+        """
+        self.calls: int = 0
+        self.coalesced: int = 0
+        self._in_flight: Dict[Hashable, asyncio.Future] = {}
+        self._waiters: Dict[asyncio.Future, int] = {}
+
+    @property
+    def in_flight(self) -> int:
+        """
+        Number of calls currently in flight.
+
+        Returns:
+            int: The number of distinct in-flight keys.
+        """
+        return len(self._in_flight)
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Runs the call of the key, or joins it when it is already in flight.
+
+        Args:
+            key (Hashable): Identity of the call.
+            func (Callable[[], Awaitable[Any]]): Starts the call, only invoked by the first caller.
+
+        Returns:
+            Any: The result of the shared call.
+        """
+        self.calls += 1
+        future = self._in_flight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(func())
+            self._in_flight[key] = future
+            future.add_done_callback(lambda done: self._forget(key, done))
+        else:
+            self.coalesced += 1
+
+        self._waiters[future] = self._waiters.get(future, 0) + 1
+        try:
+            return await asyncio.shield(future)
+        finally:
+            self._leave(future)
+
+    def _leave(self, future: asyncio.Future) -> None:
+        """
+        Removes a caller of a call, cancelling the call when nobody waits for it any more.
+
+        Args:
+            future (asyncio.Future): The call.
+        """
+        waiters = self._waiters.pop(future) - 1
+        if waiters:
+            self._waiters[future] = waiters
+        elif not future.done():
+            future.cancel()
+
+    def _forget(self, key: Hashable, future: asyncio.Future) -> None:
+        """
+        Removes a finished call, so the next caller of the key starts a new one.
+
+        Args:
+            key (Hashable): Identity of the call.
+            future (asyncio.Future): The finished call.
+        """
+        if self._in_flight.get(key) is future:
+            del self._in_flight[key]
+
+        # Every waiter may have been cancelled: mark the exception as retrieved.
+        if not future.cancelled():
+            future.exception()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Gets the counters of the single-flight layer.
+
+        Returns:
+            Dict[str, int]: The 'calls', 'coalesced' and 'in_flight' counters.
+        """
+        return {
+            'calls': self.calls,
+            'coalesced': self.coalesced,
+            'in_flight': self.in_flight,
+        }
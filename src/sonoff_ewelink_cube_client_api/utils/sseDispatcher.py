@@ -0,0 +1,368 @@
+"""
+Module: sseDispatcher
+
+This module provides the dispatch of the SSE events to their handlers, apart from the reading of the stream.
+
+Classes:
+    SseDispatcher: Runs the handlers of the SSE events in a pool of workers fed by bounded per-device queues.
+"""
+#pylint: disable-msg=too-many-instance-attributes
+#pylint: disable-msg=too-few-public-methods
+
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Set, Union
+
+import asyncio
+import logging
+import time
+
+from ..ts.enum.EOverflowPolicy import EOverflowPolicy
+from ..ts.enum.ESseEvent import ESseEvent
+from .sseUtils import get_serial_number, merge_event_data
+
+_LOGGER = logging.getLogger(__name__)
+
+# Events carrying a part of the device, merged by the CONFLATE policy
+CONFLATED_EVENTS = (
+    ESseEvent.UPDATE_DEVICE_STATE.value,
+    ESseEvent.UPDATE_DEVICE_INFO.value,
+    ESseEvent.UPDATE_DEVICE_ONLINE.value,
+)
+
+
+class _QueuedEvent:
+    """
+    An event waiting for a worker.
+    """
+
+    __slots__ = ('event_name', 'data', 'handler', 'serial_number', 'enqueued_at', 'queued')
+
+    def __init__(self, event_name: str, data: Any, handler: Callable[[Any], Awaitable[Any]],
+                 serial_number: Optional[str]):
+        self.event_name = event_name
+        self.data = data
+        self.handler = handler
+        self.serial_number = serial_number
+        self.enqueued_at = time.monotonic()
+        self.queued = True
+
+
+class SseDispatcher:
+    """
+    Runs the handlers of the SSE events in a pool of workers fed by bounded per-device queues.
+
+    The SSE reader only enqueues the events, so a slow handler no longer stops the reading of
+    the stream. The events are sharded by the serial number of their device: the events of a
+    device are handled one at a time, in order, while the workers handle different devices
+    concurrently, one event per device in turn. Events without device share a shard of their own.
+
+    When 'max_queue' events are queued, the overflow policy applies: BLOCK makes the reader
+    wait (the stream is slowed down, nothing is lost) and DROP_OLDEST drops the oldest queued
+    event. CONFLATE merges an update of a device into the last queued event of the device when
+    it is an update of the same type, full queue or not, and makes the reader wait otherwise.
+    Each handler call is bounded by 'handler_timeout'. The queued events are also kept in arrival
+    order across the shards, so the oldest one is found in constant time for DROP_OLDEST and the lag.
+
+    Attributes:
+        workers (int): Number of devices handled concurrently.
+        max_queue (int): Maximum number of queued events.
+        overflow (EOverflowPolicy): What happens to an event when the queue is full.
+        handler_timeout (Optional[float]): Seconds a handler may run, None for no limit.
+        on_error (Optional[Callable[[BaseException], Awaitable[Any]]]): Called with the errors and timeouts of
+            the handlers.
+        dispatched (int): Number of handler calls made.
+        dropped (int): Number of events dropped by DROP_OLDEST.
+        conflated (int): Number of events merged by CONFLATE.
+        timeouts (int): Number of handler calls cancelled by handler_timeout.
+        errors (int): Number of handler calls which raised an error.
+        max_lag (float): Longest time an event waited in the queue, in seconds.
+
+    Methods:
+        put(event_name: str, data: Any, handler: Callable[[Any], Awaitable[Any]]): Queues an event.
+        join(): Waits until the queued events are handled.
+        close(): Stops the workers and drops the queued events.
+        stats() -> Dict[str, Union[int, float]]: Gets the queue depth, lag and counters of the dispatcher.
+    """
+
+    def __init__(
+        self,
+        workers: int = 4,
+        max_queue: int = 1000,
+        overflow: EOverflowPolicy = EOverflowPolicy.BLOCK,
+        handler_timeout: Optional[float] = None,
+        on_error: Optional[Callable[[BaseException], Awaitable[Any]]] = None,
+    ):
+        """
+        Initializes the SseDispatcher object.
+
+        Parameters:
+            workers (int): Number of devices handled concurrently (default: 4, 1 handles every event in order).
+            max_queue (int): Maximum number of queued events (default: 1000).
+            overflow (EOverflowPolicy): What happens to an event when the queue is full (default: BLOCK).
+            handler_timeout (Optional[float]): Seconds a handler may run (default: None, no limit).
+            on_error (Optional[Callable[[BaseException], Awaitable[Any]]]): Called with the errors and timeouts
+                of the handlers (default: None, they are logged).
+
+        Raises:
+            ValueError: If workers or max_queue is not a positive integer.
+        """
+        if not isinstance(workers, int) or workers < 1:
+            raise ValueError("workers must be a positive integer.")
+        if not isinstance(max_queue, int) or max_queue < 1:
+            raise ValueError("max_queue must be a positive integer.")
+
+        self.workers: int = workers
+        self.max_queue: int = max_queue
+        self.overflow: EOverflowPolicy = EOverflowPolicy(overflow)
+        self.handler_timeout: Optional[float] = handler_timeout
+        self.on_error: Optional[Callable[[BaseException], Awaitable[Any]]] = on_error
+        self.dispatched: int = 0
+        self.dropped: int = 0
+        self.conflated: int = 0
+        self.timeouts: int = 0
+        self.errors: int = 0
+        self.max_lag: float = 0.0
+        self._shards: Dict[Optional[str], Deque[_QueuedEvent]] = {}
+        # Events in arrival order, the handled and dropped ones are skipped when reaching the front
+        self._arrivals: Deque[_QueuedEvent] = deque()
+        self._active: Set[Optional[str]] = set()
+        self._ready: Optional[asyncio.Queue] = None
+        self._not_full: Optional[asyncio.Event] = None
+        self._idle: Optional[asyncio.Event] = None
+        self._size: int = 0
+        self._unfinished: int = 0
+        self._tasks: List[asyncio.Task] = []
+
+    @property
+    def queue_depth(self) -> int:
+        """
+        Number of events waiting for a worker.
+
+        Returns:
+            int: The queue depth.
+        """
+        return self._size
+
+    @property
+    def lag(self) -> float:
+        """
+        Time the oldest queued event has been waiting.
+
+        Returns:
+            float: The lag in seconds, 0 when the queue is empty.
+        """
+        oldest = self._oldest()
+        return time.monotonic() - oldest.enqueued_at if oldest is not None else 0.0
+
+    async def put(self, event_name: str, data: Any, handler: Callable[[Any], Awaitable[Any]]) -> None:
+        """
+        Queues an event in the shard of its device, applying the overflow policy.
+
+        Args:
+            event_name (str): The name of the event.
+            data (Any): The decoded data of the event.
+            handler (Callable[[Any], Awaitable[Any]]): The handler of the event, called with its data.
+        """
+        self._start()
+
+        serial_number = get_serial_number(data)
+        shard = self._shards.get(serial_number)
+        if self.overflow == EOverflowPolicy.CONFLATE and serial_number is not None and shard:
+            last = shard[-1]
+            if last.event_name == event_name and event_name in CONFLATED_EVENTS and last.handler == handler:
+                last.data = merge_event_data(last.data, data)
+                self.conflated += 1
+                return
+
+        if self._size >= self.max_queue:
+            if self.overflow == EOverflowPolicy.DROP_OLDEST:
+                self._dropOldest()
+            else:
+                while self._size >= self.max_queue:
+                    self._not_full.clear()
+                    await self._not_full.wait()
+
+        shard = self._shards.get(serial_number)
+        if shard is None:
+            shard = self._shards[serial_number] = deque()
+        event = _QueuedEvent(event_name, data, handler, serial_number)
+        shard.append(event)
+        self._arrive(event)
+        self._size += 1
+        self._unfinished += 1
+        self._idle.clear()
+        if len(shard) == 1 and serial_number not in self._active:
+            self._ready.put_nowait(serial_number)
+
+    async def join(self) -> None:
+        """
+        Waits until the queued events are handled.
+        """
+        if self._idle is not None:
+            await self._idle.wait()
+
+    async def close(self) -> None:
+        """
+        Stops the workers and drops the queued events.
+        """
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        for task in tasks:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._shards.clear()
+        self._arrivals.clear()
+        self._active.clear()
+        self._ready = self._not_full = self._idle = None
+        self._size = self._unfinished = 0
+
+    def _start(self) -> None:
+        """
+        Creates the queue of the ready shards and starts the workers, on the first event.
+        """
+        if self._tasks:
+            return
+        self._ready = asyncio.Queue()
+        self._not_full = asyncio.Event()
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._tasks = [asyncio.ensure_future(self._work()) for _ in range(self.workers)]
+
+    def _arrive(self, event: _QueuedEvent) -> None:
+        """
+        Records the arrival of a queued event.
+
+        The handled and dropped events are only removed at the front, so the arrivals are
+        compacted when they outnumber the queued events, keeping them proportional to the queue.
+
+        Args:
+            event (_QueuedEvent): The event.
+        """
+        arrivals = self._arrivals
+        arrivals.append(event)
+        if len(arrivals) > 2 * (self._size + 1) + 64:
+            self._arrivals = deque(arrival for arrival in arrivals if arrival.queued)
+
+    def _oldest(self) -> Optional[_QueuedEvent]:
+        """
+        Finds the oldest queued event, the first of its shard.
+
+        Returns:
+            Optional[_QueuedEvent]: The event, None when the queue is empty.
+        """
+        arrivals = self._arrivals
+        while arrivals and not arrivals[0].queued:
+            arrivals.popleft()
+        return arrivals[0] if arrivals else None
+
+    def _dropOldest(self) -> None:
+        """
+        Drops the oldest queued event to make room.
+        """
+        oldest = self._oldest()
+        if oldest is None:
+            return
+        shard = self._shards[oldest.serial_number]
+        dropped = shard.popleft()
+        dropped.queued = False
+        if not shard and dropped.serial_number not in self._active:
+            del self._shards[dropped.serial_number]
+        self._size -= 1
+        self._finish()
+        self.dropped += 1
+        _LOGGER.debug(f'SSE queue full, event dropped: {dropped.event_name}')
+
+    def _finish(self) -> None:
+        """
+        Records a queued event as handled or dropped.
+        """
+        self._unfinished -= 1
+        if not self._unfinished:
+            self._idle.set()
+
+    async def _work(self) -> None:
+        """
+        Handles the ready shards, one event of a shard at a time.
+        """
+        ready = self._ready
+        while True:
+            key = await ready.get()
+            shard = self._shards.get(key)
+            if not shard or key in self._active:
+                # Its events were dropped, or it is already being handled
+                continue
+
+            event = shard.popleft()
+            event.queued = False
+            self._size -= 1
+            self._not_full.set()
+            self._active.add(key)
+            try:
+                self.max_lag = max(self.max_lag, time.monotonic() - event.enqueued_at)
+                await self._call(event)
+            finally:
+                self._active.discard(key)
+                if shard:
+                    # The other devices get their turn first
+                    ready.put_nowait(key)
+                elif self._shards.get(key) is shard:
+                    del self._shards[key]
+                self._finish()
+
+    async def _call(self, event: _QueuedEvent) -> None:
+        """
+        Calls the handler of an event within the handler timeout.
+
+        Args:
+            event (_QueuedEvent): The event.
+        """
+        self.dispatched += 1
+        try:
+            if self.handler_timeout is None:
+                await event.handler(event.data)
+            else:
+                await asyncio.wait_for(event.handler(event.data), self.handler_timeout)
+        except asyncio.TimeoutError as error:
+            self.timeouts += 1
+            _LOGGER.warning(f'SSE handler of {event.event_name} timed out after {self.handler_timeout}s')
+            await self._error(error)
+        except Exception as error:  # pylint: disable=broad-except
+            self.errors += 1
+            _LOGGER.error(f'SSE handler of {event.event_name} failed: {error!r}')
+            await self._error(error)
+
+    async def _error(self, error: BaseException) -> None:
+        """
+        Reports an error of a handler to on_error.
+
+        Args:
+            error (BaseException): The error.
+        """
+        if self.on_error is None:
+            return
+        try:
+            await self.on_error(error)
+        except Exception as err:  # pylint: disable=broad-except
+            _LOGGER.error(f'SSE error handler failed: {err!r}')
+
+    def stats(self) -> Dict[str, Union[int, float]]:
+        """
+        Gets the queue depth, lag and counters of the dispatcher.
+
+        Returns:
+            Dict[str, Union[int, float]]: The 'queue_depth', 'lag', 'max_lag', 'dispatched', 'dropped',
+                'conflated', 'timeouts' and 'errors' values.
+        """
+        return {
+            'queue_depth': self.queue_depth,
+            'lag': self.lag,
+            'max_lag': self.max_lag,
+            'dispatched': self.dispatched,
+            'dropped': self.dropped,
+            'conflated': self.conflated,
+            'timeouts': self.timeouts,
+            'errors': self.errors,
+        }
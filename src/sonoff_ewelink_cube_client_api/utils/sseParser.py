@@ -0,0 +1,246 @@
+"""
+Module: sseParser
+
+This module provides the incremental parser of the gateway Server-Sent Events (SSE) stream.
+
+Classes:
+    SseParser: Parses the raw bytes of an SSE stream into messages.
+"""
+#pylint: disable-msg=too-many-instance-attributes
+
+from typing import Dict, List, Optional
+
+import re
+
+from ..ts.interface.ISseMessage import ISseMessage
+
+_BOM = b'\xef\xbb\xbf'
+_LF = 0x0A
+_CR = 0x0D
+_COLON = 0x3A
+_SIMPLE_EVENT = re.compile(rb'(?:event: ?([^\n]*)\n)?(?:id: ?([^\n\0]*)\n)?data: ?([^\n]*)')
+
+
+class SseParser:
+    """
+    Parses the raw bytes of an SSE stream into messages, following the HTML event stream format.
+
+    Chunks may split lines, line endings and UTF-8 sequences anywhere. Lines end with LF, CRLF
+    or CR. Fields are parsed as bytes: the data of an event is never decoded here, it goes to
+    the JSON codec as is, and only the event names and IDs are decoded, once per event. Complete
+    events are split at their blank line, and the usual ones (an optional name and ID, one data
+    line) are parsed by a single regular expression match instead of line by line.
+
+    Supported fields: 'event', 'data' (multiple lines are joined by LF), 'id' (kept across events
+    as the last event ID, ignored if it contains NUL, an empty one resets it) and 'retry' (the
+    reconnection time in ms).
+    Lines starting with ':' are comments, used by servers as heartbeats. Unknown fields are ignored.
+
+    Attributes:
+        last_event_id (Optional[str]): The last event ID of the stream, to resume it with Last-Event-ID,
+            None when there is none or the server reset it.
+        retry (Optional[int]): The reconnection time in milliseconds sent by the server.
+        events (int): Number of dispatched messages.
+        comments (int): Number of received comments (heartbeats).
+
+    Methods:
+        feed(chunk: bytes) -> List[ISseMessage]: Parses a chunk of the stream.
+        reset(): Discards the incomplete event, e.g. when the connection is lost.
+    """
+
+    def __init__(self, last_event_id: Optional[str] = None):
+        """
+        Initializes the SseParser object.
+
+        Parameters:
+            last_event_id (Optional[str]): The last event ID of a previous connection (default: None).
+        """
+        self.last_event_id: Optional[str] = last_event_id or None
+        self.retry: Optional[int] = None
+        self.events: int = 0
+        self.comments: int = 0
+        self._id: Optional[bytes] = None if last_event_id is None else last_event_id.encode()
+        self._last_id: Optional[bytes] = self._id
+        self._pending: List[bytes] = []
+        self._skip_lf: bool = False
+        self._started: bool = False
+        self._names: Dict[bytes, str] = {}
+
+    def feed(self, chunk: bytes) -> List[ISseMessage]:
+        """
+        Parses a chunk of the stream.
+
+        Args:
+            chunk (bytes): The next bytes of the stream.
+
+        Returns:
+            List[ISseMessage]: The messages completed by the chunk, in order.
+        """
+        if self._skip_lf:
+            # The previous chunk ended with CR, the line ending may go on with LF
+            self._skip_lf = False
+            if chunk[:1] == b'\n':
+                chunk = chunk[1:]
+        if not chunk:
+            return []
+
+        if not self._started:
+            chunk = self._start(chunk)
+            if not chunk:
+                return []
+
+        if b'\r' in chunk:
+            self._skip_lf = chunk[-1] == _CR
+            chunk = chunk.replace(b'\r\n', b'\n').replace(b'\r', b'\n')
+
+        # Events end with a blank line, nothing to parse until one is received
+        pending = self._pending
+        if b'\n\n' not in chunk and not (chunk[0] == _LF and pending and pending[-1][-1] == _LF):
+            pending.append(chunk)
+            return []
+        if pending:
+            pending.append(chunk)
+            chunk = b''.join(pending)
+            pending.clear()
+
+        blocks = chunk.split(b'\n\n')
+        rest = blocks.pop()
+        if rest:
+            pending.append(rest)
+        return self._parseBlocks(blocks)
+
+    def reset(self) -> None:
+        """
+        Discards the incomplete event, e.g. when the connection is lost.
+
+        The last event ID and the reconnection time are kept for the next connection.
+        """
+        self._pending.clear()
+        self._skip_lf = False
+        self._started = False
+
+    def _parseBlocks(self, blocks: List[bytes]) -> List[ISseMessage]:
+        """
+        Parses complete events.
+
+        Args:
+            blocks (List[bytes]): The lines of each event, without the final blank line.
+
+        Returns:
+            List[ISseMessage]: The messages of the events, in order.
+        """
+        messages: List[ISseMessage] = []
+        for block in blocks:
+            # Most events are a single data line, after an optional event name and ID
+            match = _SIMPLE_EVENT.fullmatch(block)
+            if match is not None:
+                event, event_id, data = match.groups()
+                if event_id is not None:
+                    self._id = event_id
+                messages.append(self._message(event or b'', data))
+            else:
+                self._parseBlock(block, messages)
+        return messages
+
+    def _start(self, chunk: bytes) -> bytes:
+        """
+        Skips the UTF-8 byte order mark the stream may start with, even split across chunks.
+
+        Args:
+            chunk (bytes): The first bytes of the stream.
+
+        Returns:
+            bytes: The bytes to parse, empty while the start of the stream may still be a byte order mark.
+        """
+        chunk = b''.join(self._pending) + chunk
+        self._pending.clear()
+        if len(chunk) < len(_BOM) and _BOM.startswith(chunk):
+            self._pending.append(chunk)
+            return b''
+
+        self._started = True
+        return chunk[len(_BOM):] if chunk.startswith(_BOM) else chunk
+
+    def _parseBlock(self, block: bytes, messages: List[ISseMessage]) -> None:
+        """
+        Parses the lines of an event, line by line.
+
+        Args:
+            block (bytes): The lines of the event, without the final blank line.
+            messages (List[ISseMessage]): The messages, the message of the event is appended to.
+        """
+        event = b''
+        data: List[bytes] = []
+        for line in block.split(b'\n'):
+            if not line:
+                # A blank line left by consecutive blank lines
+                self._dispatch(event, data, messages)
+                event, data = b'', []
+                continue
+            if line[0] == _COLON:
+                self.comments += 1
+                continue
+
+            colon = line.find(b':')
+            if colon < 0:
+                name, value = line, b''
+            else:
+                name, value = line[:colon], line[colon + 1:]
+                if value[:1] == b' ':
+                    value = value[1:]
+
+            if name == b'data':
+                data.append(value)
+            elif name == b'event':
+                event = value
+            elif name == b'id':
+                if b'\0' not in value:
+                    self._id = value
+            elif name == b'retry':
+                if value.isdigit():
+                    self.retry = int(value)
+        self._dispatch(event, data, messages)
+
+    def _dispatch(self, event: bytes, data: List[bytes], messages: List[ISseMessage]) -> None:
+        """
+        Completes an event at a blank line.
+
+        Args:
+            event (bytes): The event name, empty for the default name.
+            data (List[bytes]): The data lines of the event, the event is not dispatched without data.
+            messages (List[ISseMessage]): The messages, the message of the event is appended to.
+        """
+        if data:
+            messages.append(self._message(event, data[0] if len(data) == 1 else b'\n'.join(data)))
+        elif self._id is not self._last_id:
+            self._updateLastEventId()
+
+    def _updateLastEventId(self) -> None:
+        """
+        Sets the last event ID to the ID of the current event, None for an empty ID.
+        """
+        self._last_id = self._id
+        self.last_event_id = self._id.decode('utf-8', 'replace') if self._id else None
+
+    def _message(self, event: bytes, data: bytes) -> ISseMessage:
+        """
+        Makes the message of an event.
+
+        Args:
+            event (bytes): The event name, empty for the default name.
+            data (bytes): The data of the event.
+
+        Returns:
+            ISseMessage: The message.
+        """
+        if self._id is not self._last_id:
+            self._updateLastEventId()
+
+        name = self._names.get(event)
+        if name is None:
+            name = event.decode('utf-8', 'replace') if event else 'message'
+            if len(self._names) < 64:
+                self._names[event] = name
+
+        self.events += 1
+        return ISseMessage(name, data, self.last_event_id)
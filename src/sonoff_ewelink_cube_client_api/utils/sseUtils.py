@@ -0,0 +1,111 @@
+"""
+Module: sseUtils
+
+This module provides helper functions for the payloads of the gateway SSE events.
+
+Functions:
+    get_serial_number: Gets the serial number of the device an SSE event refers to.
+    merge_dicts: Merges an update into a copy of a dictionary, recursively for the nested dictionaries.
+    merge_event_data: Merges a device update into the previous update of the device.
+    get_raw_serial_numbers: Finds the serial numbers in the raw data of an SSE event, without decoding it.
+"""
+
+from typing import Any, Dict, List, Optional
+
+import re
+
+_SERIAL_NUMBER = re.compile(rb'"serial_number"\s*:\s*"([^"\\]*)(["\\])')
+
+
+def get_serial_number(event_data: Any) -> Optional[str]:
+    """
+    Gets the serial number of the device an SSE event refers to.
+
+    Device events carry it in 'endpoint', the addDevice event in its device 'payload'.
+
+    Args:
+        event_data (Any): The decoded data of the SSE event.
+
+    Returns:
+        Optional[str]: The serial number, or None if the event does not refer to a device.
+    """
+    if not isinstance(event_data, dict):
+        return None
+
+    for section in ('endpoint', 'payload'):
+        value = event_data.get(section)
+        if isinstance(value, dict) and value.get('serial_number'):
+            return value['serial_number']
+
+    return None
+
+
+def merge_dicts(previous: Dict[str, Any], update: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Merges an update into a copy of a dictionary, recursively for the nested dictionaries.
+
+    Args:
+        previous (Dict[str, Any]): The dictionary, left unchanged.
+        update (Dict[str, Any]): The changed values.
+
+    Returns:
+        Dict[str, Any]: The merged dictionary.
+    """
+    merged = dict(previous)
+    for key, value in update.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = merge_dicts(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
+def merge_event_data(previous: Any, event_data: Any) -> Any:
+    """
+    Merges a device update into the previous update of the device, as if both were applied in turn.
+
+    Updates only carry what changed: the capabilities of a state update, the fields of an
+    information update. Their 'payload' objects are merged recursively, the latest value of a
+    key winning: the updates of two channels of a capability, e.g. 'toggle', are both kept.
+
+    Args:
+        previous (Any): The decoded data of the previous update.
+        event_data (Any): The decoded data of the next update.
+
+    Returns:
+        Any: The decoded data of the merged update.
+    """
+    if not isinstance(previous, dict) or not isinstance(event_data, dict):
+        return event_data
+
+    previous_payload = previous.get('payload')
+    payload = event_data.get('payload')
+    if not isinstance(previous_payload, dict) or not isinstance(payload, dict):
+        return event_data
+
+    merged = dict(event_data)
+    merged['payload'] = merge_dicts(previous_payload, payload)
+    return merged
+
+
+def get_raw_serial_numbers(raw: bytes) -> Optional[List[str]]:
+    """
+    Finds the serial numbers in the raw data of an SSE event, without decoding it.
+
+    The serial number of the device of the event is one of them: a byte search is enough to
+    tell that an event is not about some devices, and to get its device when it has only one.
+
+    Args:
+        raw (bytes): The JSON data of the SSE event.
+
+    Returns:
+        Optional[List[str]]: The distinct non-empty serial numbers in order, None if one of them is
+            escaped and cannot be read from the bytes.
+    """
+    serial_numbers = {}
+    for value, end in _SERIAL_NUMBER.findall(raw):
+        if end != b'"':
+            return None
+        if value:
+            serial_numbers[value.decode('utf-8', 'replace')] = None
+    return list(serial_numbers)
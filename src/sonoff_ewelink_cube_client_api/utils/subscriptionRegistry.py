@@ -0,0 +1,442 @@
+"""
+Module: subscriptionRegistry
+
+This module provides the registry of the subscriptions to the SSE events, indexed for routing.
+
+Classes:
+    Subscription: A handler subscribed to some SSE events.
+    SubscriptionRegistry: Routes the SSE events to the matching subscriptions through precomputed indexes.
+"""
+#pylint: disable-msg=too-few-public-methods
+#pylint: disable-msg=too-many-arguments
+#pylint: disable-msg=too-many-instance-attributes
+
+from typing import Any, Awaitable, Callable, Dict, FrozenSet, Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+import itertools
+
+from ..ts.enum.ECapability import ECapability
+from ..ts.enum.ECategory import ECategory
+from ..ts.enum.ESseEvent import ESseEvent
+from ..ts.interface.IDeviceEvent import IDeviceEvent
+from .eventThrottle import EventThrottle
+
+# Display category and capabilities of a device
+_DeviceInfo = Tuple[Optional[str], FrozenSet[str]]
+_UNKNOWN_DEVICE: _DeviceInfo = (None, frozenset())
+
+# Events the categories and capabilities of the devices are learnt from
+_DEVICE_EVENTS = (ESseEvent.ADD_DEVICE.value, ESseEvent.UPDATE_DEVICE_INFO.value, ESseEvent.DELETE_DEVICE.value)
+
+
+def _names(values: Optional[Iterable[Any]]) -> Optional[FrozenSet[str]]:
+    """
+    Gets the names of enumeration members or strings, None standing for no filter.
+
+    Args:
+        values (Optional[Iterable[Any]]): The enumeration members or strings.
+
+    Returns:
+        Optional[FrozenSet[str]]: Their names, None if values is None.
+    """
+    if values is None:
+        return None
+    if isinstance(values, (str, ECapability, ECategory, ESseEvent)):
+        values = (values,)
+    return frozenset(str(value) for value in values)
+
+
+class Subscription:
+    """
+    A handler subscribed to some SSE events.
+
+    A filter left to None accepts every value; the filters of a subscription must all accept an event.
+
+    Attributes:
+        handler (Callable[[Any], Awaitable[Any]]): Called with the decoded data of the events, or with
+            their IDeviceEvent when typed.
+        types (Optional[FrozenSet[str]]): Names of the accepted event types.
+        devices (Optional[FrozenSet[str]]): Serial numbers of the accepted devices.
+        categories (Optional[FrozenSet[str]]): Accepted display categories of the devices.
+        capabilities (Optional[FrozenSet[str]]): Accepted capabilities, those changed by a state update or
+            those of the device for the other events.
+        typed (bool): Whether the handler takes IDeviceEvent objects and is awaited by the SSE reader in
+            the order of the stream, apart from the SSE dispatcher.
+        throttle (Optional[EventThrottle]): Conflates the state updates delivered to the handler.
+        active (bool): Whether the subscription is registered.
+        order (int): Rank of the subscription in its registry.
+    """
+
+    __slots__ = ('handler', 'types', 'devices', 'categories', 'capabilities', 'typed', 'throttle', 'active', 'order')
+
+    def __init__(
+        self,
+        handler: Callable[[Any], Awaitable[Any]],
+        types: Optional[FrozenSet[str]] = None,
+        devices: Optional[FrozenSet[str]] = None,
+        categories: Optional[FrozenSet[str]] = None,
+        capabilities: Optional[FrozenSet[str]] = None,
+        typed: bool = False,
+        throttle: Optional[EventThrottle] = None,
+    ):
+        """
+        Initialize a new Subscription instance.
+
+        Args:
+            handler (Callable[[Any], Awaitable[Any]]): The handler of the events.
+            types (Optional[FrozenSet[str]]): Accepted event types (default: None, all).
+            devices (Optional[FrozenSet[str]]): Accepted serial numbers (default: None, all).
+            categories (Optional[FrozenSet[str]]): Accepted display categories (default: None, all).
+            capabilities (Optional[FrozenSet[str]]): Accepted capabilities (default: None, all).
+            typed (bool): Whether the handler takes IDeviceEvent objects (default: False).
+            throttle (Optional[EventThrottle]): Conflates the state updates of the handler (default: None).
+        """
+        self.handler = handler
+        self.types = types
+        self.devices = devices
+        self.categories = categories
+        self.capabilities = capabilities
+        self.typed = typed
+        self.throttle = throttle
+        self.active = False
+        self.order = 0
+
+    def accepts(self, serial_number: Optional[str], category: Optional[str], capabilities: FrozenSet[str]) -> bool:
+        """
+        Whether the device filters of the subscription accept an event. Its type is matched by the index.
+
+        Args:
+            serial_number (Optional[str]): The serial number of the device of the event.
+            category (Optional[str]): The display category of the device, None if unknown.
+            capabilities (FrozenSet[str]): The capabilities of the event.
+
+        Returns:
+            bool: True if every filter accepts the event.
+        """
+        return (
+            (self.devices is None or serial_number in self.devices)
+            and (self.categories is None or category in self.categories)
+            and (self.capabilities is None or not self.capabilities.isdisjoint(capabilities))
+        )
+
+    def __repr__(self) -> str:
+        """
+        Returns a string representation of the subscription.
+
+        Returns:
+            str: The handler and filters of the subscription.
+        """
+        return (f'Subscription({self.handler!r}, types={self.types}, devices={self.devices}, '
+                f'categories={self.categories}, capabilities={self.capabilities})')
+
+
+class _Index:
+    """
+    The subscriptions to an event type, each filed under the most selective of its filters.
+    """
+
+    __slots__ = ('by_device', 'by_category', 'by_capability', 'unfiltered')
+
+    def __init__(self):
+        self.by_device: Dict[str, List[Subscription]] = {}
+        self.by_category: Dict[str, List[Subscription]] = {}
+        self.by_capability: Dict[str, List[Subscription]] = {}
+        self.unfiltered: List[Subscription] = []
+
+    def buckets(self, subscription: Subscription) -> List[List[Subscription]]:
+        """
+        Gets the lists a subscription is filed in, creating them when needed.
+
+        Args:
+            subscription (Subscription): The subscription.
+
+        Returns:
+            List[List[Subscription]]: The lists.
+        """
+        for keys, index in ((subscription.devices, self.by_device), (subscription.categories, self.by_category),
+                            (subscription.capabilities, self.by_capability)):
+            if keys is not None:
+                return [index.setdefault(key, []) for key in keys]
+        return [self.unfiltered]
+
+    def prune(self) -> None:
+        """
+        Drops the empty lists.
+        """
+        for index in (self.by_device, self.by_category, self.by_capability):
+            for key in [key for key, bucket in index.items() if not bucket]:
+                del index[key]
+
+    def __bool__(self) -> bool:
+        return bool(self.unfiltered or self.by_device or self.by_category or self.by_capability)
+
+
+class SubscriptionRegistry:
+    """
+    Routes the SSE events to the matching subscriptions through precomputed indexes.
+
+    Each event type has an index, and an index gathers the subscriptions to any type. In an
+    index, a subscription is filed under its serial numbers, else its categories, else its
+    capabilities, or among the unfiltered ones. Routing an event only looks up the serial
+    number, category and capabilities of the event, then checks the other filters of the
+    few subscriptions found: its cost depends on the matching subscriptions, not on how many
+    subscriptions exist. The matches keep the order of subscription.
+
+    The categories and capabilities of the devices are learnt from the events adding or
+    updating a device, or from a device list given to 'learn_devices'.
+
+    Before an event is decoded, 'wants' tells from its name and the serial numbers in its raw
+    data whether a subscription may match it, so the others are discarded undecoded. The data of
+    an event is only read to learn the devices, or to match capability filters on state updates.
+
+    Attributes:
+        skipped (int): Number of events 'wants' discarded.
+
+    Methods:
+        subscribe(handler, types=None, devices=None, categories=None, capabilities=None, typed=False,
+                  throttle=None) -> Subscription: Subscribes a handler to some events.
+        unsubscribe(subscription: Subscription) -> bool: Removes a subscription.
+        remove(event_type: str, handler: Optional[Callable] = None) -> int: Removes the subscriptions to an event
+            type.
+        wants(event_name: str, serial_numbers: Optional[List[str]]) -> bool: Whether an event may have
+            subscriptions, before it is decoded.
+        observe(event: IDeviceEvent): Learns the devices from an event.
+        learn_devices(devices: Iterable[Dict[str, Any]]): Learns the categories and capabilities of devices.
+        match(event: IDeviceEvent) -> List[Subscription]: Finds the subscriptions of an event.
+    """
+
+    def __init__(self):
+        """
+        Initializes the SubscriptionRegistry object.
+        """
+        self._indexes: Dict[Optional[str], _Index] = {}
+        self._subscriptions: Set[Subscription] = set()
+        self._devices: Dict[str, _DeviceInfo] = {}
+        self._counter = itertools.count()
+        self._capability_filters: int = 0
+        self._device_filters: int = 0
+        self.skipped: int = 0
+
+    def __len__(self) -> int:
+        """
+        Number of registered subscriptions.
+
+        Returns:
+            int: The number of subscriptions.
+        """
+        return len(self._subscriptions)
+
+    def __iter__(self) -> Iterator[Subscription]:
+        """
+        Iterates over the registered subscriptions, in the order of subscription.
+
+        Returns:
+            Iterator[Subscription]: The subscriptions.
+        """
+        return iter(sorted(self._subscriptions, key=lambda subscription: subscription.order))
+
+    def subscribe(
+        self,
+        handler: Callable[[Any], Awaitable[Any]],
+        types: Optional[Iterable[Union[ESseEvent, str]]] = None,
+        devices: Optional[Iterable[str]] = None,
+        categories: Optional[Iterable[Union[ECategory, str]]] = None,
+        capabilities: Optional[Iterable[Union[ECapability, str]]] = None,
+        typed: bool = False,
+        throttle: Optional[EventThrottle] = None,
+    ) -> Subscription:
+        """
+        Subscribes a handler to some events.
+
+        Args:
+            handler (Callable[[Any], Awaitable[Any]]): The handler of the events.
+            types (Optional[Iterable[Union[ESseEvent, str]]]): Accepted event types (default: None, all).
+            devices (Optional[Iterable[str]]): Accepted serial numbers (default: None, all).
+            categories (Optional[Iterable[Union[ECategory, str]]]): Accepted display categories (default: None, all).
+            capabilities (Optional[Iterable[Union[ECapability, str]]]): Accepted capabilities (default: None, all).
+            typed (bool): Whether the handler takes IDeviceEvent objects (default: False).
+            throttle (Optional[EventThrottle]): Conflates the state updates of the handler (default: None).
+
+        Returns:
+            Subscription: The subscription, to unsubscribe it.
+        """
+        subscription = Subscription(handler, _names(types), _names(devices), _names(categories),
+                                    _names(capabilities), typed, throttle)
+        subscription.order = next(self._counter)
+        for event_type in subscription.types if subscription.types is not None else (None,):
+            index = self._indexes.get(event_type)
+            if index is None:
+                index = self._indexes[event_type] = _Index()
+            for bucket in index.buckets(subscription):
+                bucket.append(subscription)
+        subscription.active = True
+        self._subscriptions.add(subscription)
+        if subscription.capabilities is not None:
+            self._capability_filters += 1
+        if subscription.categories is not None or subscription.capabilities is not None:
+            self._device_filters += 1
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> bool:
+        """
+        Removes a subscription.
+
+        Args:
+            subscription (Subscription): The subscription.
+
+        Returns:
+            bool: True if the subscription was registered.
+        """
+        if subscription not in self._subscriptions:
+            return False
+        self._subscriptions.discard(subscription)
+        subscription.active = False
+        if subscription.capabilities is not None:
+            self._capability_filters -= 1
+        if subscription.categories is not None or subscription.capabilities is not None:
+            self._device_filters -= 1
+        for event_type in subscription.types if subscription.types is not None else (None,):
+            index = self._indexes[event_type]
+            for bucket in index.buckets(subscription):
+                bucket.remove(subscription)
+            index.prune()
+            if not index:
+                del self._indexes[event_type]
+        return True
+
+    def remove(self, event_type: str, handler: Optional[Callable[[Any], Awaitable[Any]]] = None) -> int:
+        """
+        Removes the subscriptions to exactly one event type, those of a handler or all of them.
+
+        Args:
+            event_type (str): The event type.
+            handler (Optional[Callable[[Any], Awaitable[Any]]]): The handler (default: None, every handler).
+
+        Returns:
+            int: The number of removed subscriptions.
+        """
+        names = _names(event_type)
+        removed = [
+            subscription for subscription in self._subscriptions
+            if subscription.types == names and (handler is None or subscription.handler == handler)
+        ]
+        for subscription in removed:
+            self.unsubscribe(subscription)
+        return len(removed)
+
+    def wants(self, event_name: str, serial_numbers: Optional[List[str]]) -> bool:
+        """
+        Whether an event may have subscriptions, before it is decoded.
+
+        Args:
+            event_name (str): The name of the event.
+            serial_numbers (Optional[List[str]]): The serial numbers in the raw data of the event, None if
+                they could not be read from it.
+
+        Returns:
+            bool: False if no subscription can match the event, nor learn from it.
+        """
+        if self._device_filters and event_name in _DEVICE_EVENTS:
+            return True
+
+        for index in (self._indexes.get(event_name), self._indexes.get(None)):
+            if not index:
+                continue
+            if index.unfiltered or index.by_category or index.by_capability or serial_numbers is None:
+                return True
+            for serial_number in serial_numbers:
+                if serial_number in index.by_device:
+                    return True
+
+        self.skipped += 1
+        return False
+
+    def observe(self, event: IDeviceEvent) -> None:
+        """
+        Learns the category and capabilities of the devices from the events adding, updating or deleting them.
+
+        The data of the event is only read while a subscription filters by category or capability.
+
+        Args:
+            event (IDeviceEvent): The event.
+        """
+        event_name = str(event.type)
+        if event.serial_number is None or event_name not in _DEVICE_EVENTS:
+            return
+        if event_name == ESseEvent.DELETE_DEVICE.value:
+            self._devices.pop(event.serial_number, None)
+        elif self._device_filters:
+            data = event.data
+            payload = data.get('payload') if isinstance(data, dict) else None
+            if isinstance(payload, dict):
+                self._learn(event.serial_number, payload)
+
+    def learn_devices(self, devices: Iterable[Dict[str, Any]]) -> None:
+        """
+        Learns the categories and capabilities of devices, e.g. those of the device list.
+
+        Args:
+            devices (Iterable[Dict[str, Any]]): The devices.
+        """
+        for device in devices:
+            if isinstance(device, dict) and device.get('serial_number'):
+                self._learn(device['serial_number'], device)
+
+    def match(self, event: IDeviceEvent) -> List[Subscription]:
+        """
+        Finds the subscriptions of an event.
+
+        Args:
+            event (IDeviceEvent): The event.
+
+        Returns:
+            List[Subscription]: The matching subscriptions, in the order of subscription.
+        """
+        event_name = str(event.type)
+        serial_number = event.serial_number
+        indexes = [index for index in (self._indexes.get(event_name), self._indexes.get(None)) if index]
+        if not indexes:
+            return []
+
+        category, capabilities = self._devices.get(serial_number, _UNKNOWN_DEVICE)
+        if self._capability_filters and event_name == ESseEvent.UPDATE_DEVICE_STATE.value:
+            data = event.data
+            payload = data.get('payload') if isinstance(data, dict) else None
+            capabilities = frozenset(payload) if isinstance(payload, dict) else frozenset()
+
+        matches: List[Subscription] = []
+        for index in indexes:
+            candidates = index.unfiltered
+            if serial_number is not None and index.by_device:
+                candidates = candidates + index.by_device.get(serial_number, [])
+            if category is not None and index.by_category:
+                candidates = candidates + index.by_category.get(category, [])
+            if index.by_capability:
+                for capability in capabilities:
+                    candidates = candidates + index.by_capability.get(capability, [])
+            for subscription in candidates:
+                if subscription.accepts(serial_number, category, capabilities):
+                    matches.append(subscription)
+
+        if len(matches) > 1:
+            # A subscription filed under several capabilities may be found more than once
+            matches = sorted(set(matches), key=lambda subscription: subscription.order)
+        return matches
+
+    def _learn(self, serial_number: str, device: Dict[str, Any]) -> None:
+        """
+        Records the category and capabilities of a device, keeping the known ones missing from the update.
+
+        Args:
+            serial_number (str): The serial number of the device.
+            device (Dict[str, Any]): The device, or the changed part of it.
+        """
+        category, capabilities = self._devices.get(serial_number, _UNKNOWN_DEVICE)
+        if device.get('display_category'):
+            category = str(device['display_category'])
+        if isinstance(device.get('capabilities'), list):
+            capabilities = frozenset(
+                str(capability['capability']) for capability in device['capabilities']
+                if isinstance(capability, dict) and capability.get('capability')
+            )
+        self._devices[serial_number] = (category, capabilities)
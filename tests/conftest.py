@@ -0,0 +1,53 @@
+"""
+Shared helpers of the test modules.
+"""
+
+import unittest
+from typing import Any, Iterable
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from src.sonoff_ewelink_cube_client_api.api.ihostClass import IHostClass
+
+SSE_PATH = '/open-api/v1/sse/bridge'
+DEVICES_PATH = '/open-api/v1/rest/devices'
+
+
+class GatewayTestCase(unittest.IsolatedAsyncioTestCase):
+    """
+    Test case talking to a fake gateway, stopped with its clients at the end of each test.
+    """
+
+    server: TestServer = None
+
+    async def start_gateway(self, routes: Iterable[web.RouteDef]) -> TestServer:
+        """
+        Starts a fake gateway serving the routes.
+
+        Args:
+            routes (Iterable[web.RouteDef]): The routes, e.g. web.get(SSE_PATH, handler).
+
+        Returns:
+            TestServer: The fake gateway.
+        """
+        app = web.Application()
+        app.add_routes(routes)
+        self.server = TestServer(app)
+        await self.server.start_server()
+        self.addAsyncCleanup(self.server.close)
+        return self.server
+
+    def client(self, **options: Any) -> IHostClass:
+        """
+        Creates a client of the fake gateway, closed before the gateway stops.
+
+        Args:
+            **options: The options of the client.
+
+        Returns:
+            IHostClass: The client.
+        """
+        api = IHostClass(ip=f'{self.server.host}:{self.server.port}', at='token', **options)
+        self.addAsyncCleanup(api.close)
+        return api
@@ -0,0 +1,44 @@
+"""
+Test module for ESseEvent enumeration.
+"""
+
+import unittest
+
+from src.sonoff_ewelink_cube_client_api.ts.enum.ESseEvent import ESseEvent
+
+
+class TestESseEvent(unittest.TestCase):
+    """
+    Unit tests for the ESseEvent enumeration.
+    """
+
+    # Define expected values as a list of (expected_value, enum_value) tuples
+    expected_values = [
+        ("device#v1#addDevice", ESseEvent.ADD_DEVICE),  # Device added
+        ("device#v1#updateDeviceState", ESseEvent.UPDATE_DEVICE_STATE),  # Device state changed
+        ("device#v1#updateDeviceInfo", ESseEvent.UPDATE_DEVICE_INFO),  # Device information changed
+        ("device#v1#updateDeviceOnline", ESseEvent.UPDATE_DEVICE_ONLINE),  # Device online status changed
+        ("device#v1#deleteDevice", ESseEvent.DELETE_DEVICE)  # Device deleted
+    ]
+
+    def test_enum_values(self):
+        """
+        Test that the enumeration values have the expected string representation.
+        """
+        self.assertEqual(len(self.expected_values), len(ESseEvent))
+
+        for expected_value in self.expected_values:
+            expected_str, enum_value = expected_value
+            self.assertEqual(str(enum_value), expected_str)
+
+    def test_enum_parameters(self):
+        """
+        Test that all expected parameters exist in the enumeration.
+        """
+        self.assertEqual(len(self.expected_values), len(ESseEvent))
+
+        for parameter in ESseEvent:
+            self.assertIn(parameter, [enum_value for _, enum_value in self.expected_values])
+
+if __name__ == "__main__":
+    unittest.main()
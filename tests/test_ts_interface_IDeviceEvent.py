@@ -0,0 +1,42 @@
+"""
+Test module for IDeviceEvent interface.
+"""
+
+import json
+import unittest
+from unittest import mock
+
+from src.sonoff_ewelink_cube_client_api.ts.enum.ESseEvent import ESseEvent
+from src.sonoff_ewelink_cube_client_api.ts.interface.IDeviceEvent import IDeviceEvent
+
+class TestIDeviceEvent(unittest.TestCase):
+    """
+    Test cases for IDeviceEvent class.
+    """
+
+    def test_lazy_data(self):
+        """
+        Test case for raw data decoded once, on first access.
+        """
+        loads = mock.Mock(side_effect=json.loads)
+        event = IDeviceEvent(ESseEvent.UPDATE_DEVICE_STATE, 'abc', raw=b'{"payload": {"power": {}}}', loads=loads)
+        self.assertFalse(event.decoded)
+        loads.assert_not_called()
+
+        self.assertEqual(event.payload, {'power': {}})
+        self.assertEqual(event.data, {'payload': {'power': {}}})
+        self.assertTrue(event.decoded)
+        loads.assert_called_once()
+
+    def test_invalid_data(self):
+        """
+        Test case for invalid raw data raising ValueError when read.
+        """
+        event = IDeviceEvent('custom', None, raw=b'{', loads=json.loads)
+        with self.assertRaises(ValueError):
+            _ = event.data
+        self.assertEqual(repr(event), 'IDeviceEvent(custom, None)')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,153 @@
+"""
+Test module for CircuitBreaker.
+"""
+
+import asyncio
+import socket
+import unittest
+
+from aiohttp import web
+
+from conftest import DEVICES_PATH, GatewayTestCase
+from src.sonoff_ewelink_cube_client_api.api.ihostClass import IHostClass
+from src.sonoff_ewelink_cube_client_api.errors import CircuitOpenError
+from src.sonoff_ewelink_cube_client_api.ts.enum.ECircuitState import ECircuitState
+from src.sonoff_ewelink_cube_client_api.utils.circuitBreaker import CircuitBreaker
+from src.sonoff_ewelink_cube_client_api.utils.deadline import Deadline
+
+
+async def fail(breaker, deadline=None):
+    """Run a request failing with a timeout through the breaker."""
+    try:
+        async with breaker.guard(deadline):
+            raise asyncio.TimeoutError
+    except asyncio.TimeoutError:
+        pass
+
+
+class TestCircuitBreaker(unittest.IsolatedAsyncioTestCase):
+    """
+    Test cases for CircuitBreaker class.
+    """
+
+    async def test_opens_after_consecutive_failures(self):
+        """
+        Test case for failing fast once the failure threshold is reached.
+        """
+        breaker = CircuitBreaker(name='ihost', failure_threshold=2, recovery_timeout=60)
+        await fail(breaker)
+        async with breaker.guard():
+            pass
+        await fail(breaker)
+        self.assertEqual(breaker.state, ECircuitState.CLOSED)
+
+        await fail(breaker)
+        self.assertEqual(breaker.state, ECircuitState.OPEN)
+        with self.assertRaises(CircuitOpenError) as context:
+            async with breaker.guard():
+                pass
+        self.assertGreater(context.exception.retry_after, 50)
+        self.assertEqual(breaker.stats(), {'state': 'open', 'failures': 2, 'trips': 1, 'rejected': 1})
+
+    async def test_probe_closes_the_circuit(self):
+        """
+        Test case for probing an open circuit until the gateway answers, with state change callbacks.
+        """
+        probes = [False, True]
+        changes = []
+
+        async def probe():
+            return probes.pop(0)
+
+        breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0.01, probe=probe)
+        breaker.add_listener(lambda previous, state: changes.append((previous, state)))
+        await fail(breaker)
+
+        for _ in range(100):
+            if breaker.state == ECircuitState.CLOSED:
+                break
+            await asyncio.sleep(0.01)
+
+        self.assertEqual(changes, [
+            (ECircuitState.CLOSED, ECircuitState.OPEN),
+            (ECircuitState.OPEN, ECircuitState.HALF_OPEN),
+            (ECircuitState.HALF_OPEN, ECircuitState.OPEN),
+            (ECircuitState.OPEN, ECircuitState.HALF_OPEN),
+            (ECircuitState.HALF_OPEN, ECircuitState.CLOSED),
+        ])
+        await breaker.close()
+
+    async def test_request_as_probe(self):
+        """
+        Test case for the first request after the recovery timeout probing the gateway when there is no probe.
+        """
+        breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0.01)
+        await fail(breaker)
+        await asyncio.sleep(0.02)
+
+        await fail(breaker)
+        self.assertEqual(breaker.state, ECircuitState.OPEN)
+
+        await asyncio.sleep(0.02)
+        async with breaker.guard():
+            pass
+        self.assertEqual(breaker.state, ECircuitState.CLOSED)
+
+    async def test_caller_deadline(self):
+        """
+        Test case for a timeout at the deadline of the caller not being a failure, unlike one at the endpoint default.
+        """
+        breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=60)
+        await fail(breaker, Deadline(0))
+        self.assertEqual((breaker.state, breaker.failures), (ECircuitState.CLOSED, 0))
+
+        await fail(breaker, Deadline.resolve(None, 0))
+        self.assertEqual(breaker.state, ECircuitState.OPEN)
+
+    async def test_gateway_down(self):
+        """
+        Test case for the requests of an unreachable gateway failing fast.
+        """
+        with socket.socket() as sock:
+            sock.bind(('127.0.0.1', 0))
+            port = sock.getsockname()[1]
+
+        api = IHostClass(ip=f'127.0.0.1:{port}', at='token')
+        api.retry_policy = None
+        api.circuit_breaker.recovery_timeout = 60
+        try:
+            for _ in range(api.circuit_breaker.failure_threshold):
+                with self.assertRaises(OSError):
+                    await api.getDeviceList()
+
+            with self.assertRaises(CircuitOpenError):
+                await api.getDeviceList()
+        finally:
+            await api.close()
+
+
+class TestCircuitBreakerGateway(GatewayTestCase):
+    """
+    Test cases for the circuit breaker of a slow gateway.
+    """
+
+    async def test_short_caller_deadlines(self):
+        """
+        Test case for the requests timing out at the deadlines of their callers leaving the circuit closed.
+        """
+        async def devices(_request):
+            await asyncio.sleep(1)
+            return web.json_response({'error': 0, 'message': 'success', 'data': {'device_list': []}})
+
+        await self.start_gateway([web.get(DEVICES_PATH, devices)])
+        api = self.client()
+        api.retry_policy = None
+        for _ in range(api.circuit_breaker.failure_threshold):
+            with self.assertRaises(asyncio.TimeoutError):
+                await api.getDeviceList(timeout=0.05)
+
+        self.assertEqual((api.circuit_breaker.state, api.circuit_breaker.failures), (ECircuitState.CLOSED, 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,148 @@
+"""
+Test module for AdaptiveConcurrencyLimiter.
+"""
+
+import asyncio
+import unittest
+
+from src.sonoff_ewelink_cube_client_api.utils.concurrencyLimiter import AdaptiveConcurrencyLimiter
+from src.sonoff_ewelink_cube_client_api.utils.deadline import Deadline
+
+
+class TestAdaptiveConcurrencyLimiter(unittest.IsolatedAsyncioTestCase):
+    """
+    Test cases for AdaptiveConcurrencyLimiter class.
+    """
+
+    async def test_window_respected_in_fifo_order(self):
+        """
+        Test case for queueing the requests over the window in arrival order.
+        """
+        limiter = AdaptiveConcurrencyLimiter(initial_window=2, max_window=2)
+        order = []
+        peak = 0
+
+        async def request(index):
+            nonlocal peak
+            async with limiter.slot():
+                peak = max(peak, limiter.in_flight)
+                order.append(index)
+                await asyncio.sleep(0.01)
+
+        tasks = [asyncio.create_task(request(index)) for index in range(6)]
+        await asyncio.sleep(0)
+        self.assertEqual(limiter.queue_depth, 4)
+
+        await asyncio.gather(*tasks)
+        self.assertEqual(peak, 2)
+        self.assertEqual(order, list(range(6)))
+        self.assertEqual(limiter.stats()['queued'], 4)
+
+    async def test_additive_increase(self):
+        """
+        Test case for growing the window by about one per window of successful requests, up to its maximum.
+        """
+        limiter = AdaptiveConcurrencyLimiter(initial_window=2, max_window=3)
+        for _ in range(2):
+            async with limiter.slot():
+                pass
+        self.assertEqual(limiter.window, 2)
+
+        for _ in range(3):
+            async with limiter.slot():
+                pass
+        self.assertEqual(limiter.window, 3)
+
+    async def test_multiplicative_decrease_once_per_burst(self):
+        """
+        Test case for halving the window once when concurrent requests fail together.
+        """
+        limiter = AdaptiveConcurrencyLimiter(initial_window=8, max_window=8)
+        slots = [await limiter.acquire() for _ in range(4)]
+        for slot in slots:
+            limiter.release(slot, failed=True)
+        self.assertEqual(limiter.window, 4)
+
+        with self.assertRaises(asyncio.TimeoutError):
+            async with limiter.slot():
+                raise asyncio.TimeoutError
+        self.assertEqual(limiter.window, 2)
+        self.assertEqual(limiter.decreases, 2)
+
+    async def test_slow_response_decreases(self):
+        """
+        Test case for a response slower than the latency target.
+        """
+        limiter = AdaptiveConcurrencyLimiter(initial_window=4, latency_target=0.01)
+        async with limiter.slot():
+            await asyncio.sleep(0.02)
+        self.assertEqual(limiter.window, 2)
+
+    async def test_latency_target_per_endpoint(self):
+        """
+        Test case for the latency target scaled to the default budget of a slow endpoint.
+        """
+        limiter = AdaptiveConcurrencyLimiter(initial_window=4, latency_target=0.01, latency_fraction=0.2)
+        async with limiter.slot(budget=0.5):
+            await asyncio.sleep(0.02)
+        self.assertEqual(limiter.decreases, 0)
+
+        async with limiter.slot(budget=0.05):
+            await asyncio.sleep(0.02)
+        self.assertEqual(limiter.decreases, 1)
+
+    async def test_caller_deadline_not_counted(self):
+        """
+        Test case for a request timing out at the deadline of its caller leaving the window as is,
+        unlike one timing out at the default of its endpoint.
+        """
+        limiter = AdaptiveConcurrencyLimiter(initial_window=4, latency_target=0.01)
+        with self.assertRaises(asyncio.TimeoutError):
+            async with limiter.slot(Deadline(0.02)):
+                await asyncio.sleep(0.03)
+                raise asyncio.TimeoutError
+        self.assertEqual((limiter.window, limiter.decreases), (4, 0))
+
+        with self.assertRaises(asyncio.TimeoutError):
+            async with limiter.slot(Deadline(0.02, endpoint_default=True)):
+                await asyncio.sleep(0.03)
+                raise asyncio.TimeoutError
+        self.assertEqual((limiter.window, limiter.decreases), (2, 1))
+
+    async def test_other_errors_not_counted(self):
+        """
+        Test case for an error not caused by the gateway load.
+        """
+        limiter = AdaptiveConcurrencyLimiter(initial_window=4)
+        with self.assertRaises(ValueError):
+            async with limiter.slot():
+                raise ValueError
+        self.assertEqual(limiter.decreases, 0)
+
+    async def test_cancelled_waiter(self):
+        """
+        Test case for a cancelled waiting request leaving the queue.
+        """
+        limiter = AdaptiveConcurrencyLimiter(initial_window=1, max_window=1)
+        slot = await limiter.acquire()
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+
+        waiter.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await waiter
+        self.assertEqual(limiter.queue_depth, 0)
+
+        limiter.release(slot)
+        self.assertEqual(limiter.in_flight, 0)
+
+    def test_invalid_bounds(self):
+        """
+        Test case for invalid window bounds.
+        """
+        with self.assertRaises(ValueError):
+            AdaptiveConcurrencyLimiter(min_window=4, max_window=2)
+
+
+if __name__ == '__main__':
+    unittest.main()
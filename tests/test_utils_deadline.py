@@ -0,0 +1,132 @@
+"""
+Test module for Deadline.
+"""
+
+import asyncio
+import time
+import unittest
+
+from aiohttp import web
+
+from conftest import DEVICES_PATH, GatewayTestCase
+from src.sonoff_ewelink_cube_client_api.errors import DeadlineExceededError
+from src.sonoff_ewelink_cube_client_api.ts.enum.EMethod import EMethod
+from src.sonoff_ewelink_cube_client_api.utils.deadline import DEFAULT_TIMEOUT, Deadline, default_timeout
+
+
+class TestDeadline(unittest.IsolatedAsyncioTestCase):
+    """
+    Test cases for Deadline class.
+    """
+
+    def test_default_timeout(self):
+        """
+        Test case for the default time budget of exact paths, path prefixes and unknown endpoints.
+        """
+        self.assertEqual(default_timeout(EMethod.POST, '/hardware/speaker'), 3.0)
+        self.assertEqual(default_timeout(EMethod.POST, '/hardware/reboot'), 30.0)
+        self.assertEqual(default_timeout(EMethod.PUT, '/devices/discovery'), 10.0)
+        self.assertEqual(default_timeout(EMethod.PUT, '/devices/abc'), 5.0)
+        self.assertEqual(default_timeout(EMethod.GET, '/thirdparty/debug-log/abc'), 60.0)
+        self.assertEqual(default_timeout(EMethod.GET, '/unknown'), DEFAULT_TIMEOUT)
+        self.assertEqual(default_timeout(EMethod.GET, '/unknown', {(EMethod.GET, '/unknown'): 1.0}), 1.0)
+
+    def test_resolve(self):
+        """
+        Test case for a call using the given deadline, a given timeout or the default, only the latter
+        being the default of the endpoint.
+        """
+        deadline = Deadline(1.0)
+        self.assertIs(Deadline.resolve(deadline, 5.0), deadline)
+        resolved = Deadline.resolve(2.0, 5.0)
+        self.assertEqual((resolved.timeout, resolved.endpoint_default), (2.0, False))
+        resolved = Deadline.resolve(None, 5.0)
+        self.assertEqual((resolved.timeout, resolved.endpoint_default), (5.0, True))
+        self.assertTrue(Deadline(0).expired_by_caller)
+        self.assertFalse(Deadline(0, endpoint_default=True).expired_by_caller)
+        with self.assertRaises(ValueError):
+            Deadline(-1)
+
+    async def test_run(self):
+        """
+        Test case for awaiting within the deadline.
+        """
+        deadline = Deadline(0.05)
+        self.assertEqual(await deadline.run(asyncio.sleep(0, 'done')), 'done')
+
+        with self.assertRaises(DeadlineExceededError) as context:
+            await deadline.run(asyncio.sleep(1))
+        self.assertIsInstance(context.exception, asyncio.TimeoutError)
+        self.assertTrue(deadline.expired)
+        self.assertEqual(deadline.remaining(), 0)
+
+
+class TestDeadlineRequests(GatewayTestCase):
+    """
+    Test cases for the deadlines of the API requests.
+    """
+
+    async def asyncSetUp(self):
+        """
+        Start a fake gateway answering slowly.
+        """
+        self.cancelled = asyncio.Event()
+
+        async def slow(_request):
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                self.cancelled.set()
+                raise
+            return web.json_response({'error': 0, 'data': {}, 'message': 'success'})
+
+        async def bridge(_request):
+            await asyncio.sleep(0.3)
+            return web.json_response({'error': 0, 'data': {'ip': '127.0.0.1'}, 'message': 'success'})
+
+        await self.start_gateway([
+            web.get(DEVICES_PATH, slow),
+            web.get('/open-api/v1/rest/bridge', bridge),
+            web.post('/open-api/v1/rest/hardware/speaker', slow),
+        ])
+        self.api = self.client()
+
+    async def test_call_timeout(self):
+        """
+        Test case for a call failing at its deadline, retries included, and dropping its connection.
+        """
+        started = time.monotonic()
+        with self.assertRaises(DeadlineExceededError):
+            await self.api.getDeviceList(timeout=0.2)
+
+        self.assertLess(time.monotonic() - started, 1)
+        await asyncio.wait_for(self.cancelled.wait(), 1)
+        self.assertEqual(self.api.limiter.in_flight, 0)
+
+    async def test_shared_deadline(self):
+        """
+        Test case for a deadline shared by consecutive calls.
+        """
+        deadline = Deadline(0.2)
+        with self.assertRaises(DeadlineExceededError):
+            await self.api.controlSpeaker('play_beep', beep={'name': 'bootComplete', 'volume': 50},
+                                          timeout=deadline)
+        with self.assertRaises(DeadlineExceededError):
+            await self.api.getDeviceList(timeout=deadline)
+
+    async def test_joined_request_deadline(self):
+        """
+        Test case for a caller joining a shared request, bounded by its own deadline only.
+        """
+        first = asyncio.ensure_future(self.api.getBridgeInfo(timeout=0.1))
+        second = asyncio.ensure_future(self.api.getBridgeInfo(timeout=2))
+        with self.assertRaises(DeadlineExceededError):
+            await first
+
+        response = await second
+        self.assertEqual(response.data, {'ip': '127.0.0.1'})
+        self.assertEqual(self.api.single_flight.coalesced, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,398 @@
+"""
+Test module for DeviceRegistry.
+"""
+
+import asyncio
+import json
+import unittest
+
+from aiohttp import web
+
+from conftest import DEVICES_PATH, SSE_PATH, GatewayTestCase
+from src.sonoff_ewelink_cube_client_api.errors import ResponseError
+from src.sonoff_ewelink_cube_client_api.ts.enum.ECapability import ECapability
+from src.sonoff_ewelink_cube_client_api.ts.enum.ECategory import ECategory
+from src.sonoff_ewelink_cube_client_api.ts.enum.ESseEvent import ESseEvent
+from src.sonoff_ewelink_cube_client_api.ts.interface.IDeviceEvent import IDeviceEvent
+from src.sonoff_ewelink_cube_client_api.utils.deviceRegistry import DeviceRegistry
+
+DEVICES = [
+    {
+        'serial_number': 'sn1', 'name': 'Lamp', 'display_category': 'light', 'online': True,
+        'capabilities': [{'capability': 'power', 'permission': 'readWrite'}],
+        'state': {'power': {'powerState': 'off'}, 'toggle': {'1': {'toggleState': 'off'}, '2': {'toggleState': 'on'}}},
+    },
+    {
+        'serial_number': 'sn2', 'name': 'Sensor', 'display_category': 'temperatureAndHumiditySensor', 'online': True,
+        'capabilities': [{'capability': 'temperature', 'permission': 'read'}],
+        'state': {'temperature': {'temperature': 20}},
+    },
+]
+
+
+def device_event(event_type, serial_number, payload=None):
+    """Make an event of a device."""
+    data = {'endpoint': {'serial_number': serial_number}}
+    if payload is not None:
+        data['payload'] = payload
+    return IDeviceEvent(event_type, serial_number, data)
+
+
+class TestDeviceRegistry(unittest.TestCase):
+    """
+    Test cases for DeviceRegistry class.
+    """
+
+    def setUp(self):
+        """
+        Load a registry with the devices.
+        """
+        self.registry = DeviceRegistry()
+        self.registry.load(DEVICES)
+
+    def test_load(self):
+        """
+        Test case for the lookups and versions of the loaded devices, and for reloading.
+        """
+        self.assertEqual(len(self.registry), 2)
+        self.assertIn('sn1', self.registry)
+        self.assertEqual(self.registry.get('sn2')['name'], 'Sensor')
+        self.assertIsNone(self.registry.get('sn3'))
+        self.assertEqual(self.registry.version('sn1'), 1)
+        self.assertEqual(self.registry.version('sn3'), 0)
+
+        self.registry.load(DEVICES[:1])
+        self.assertEqual([device['serial_number'] for device in self.registry], ['sn1'])
+        self.assertEqual(self.registry.version('sn1'), 2)
+        self.assertEqual(self.registry.version('sn2'), 0)
+
+    def test_update_state(self):
+        """
+        Test case for the state updates being merged capability by capability into a new device.
+        """
+        snapshot = self.registry.get('sn1')
+        self.assertTrue(self.registry.apply(
+            device_event(ESseEvent.UPDATE_DEVICE_STATE, 'sn1', {'toggle': {'1': {'toggleState': 'on'}}})
+        ))
+
+        self.assertEqual(self.registry.get('sn1')['state'], {
+            'power': {'powerState': 'off'},
+            'toggle': {'1': {'toggleState': 'on'}, '2': {'toggleState': 'on'}},
+        })
+        self.assertEqual(self.registry.version('sn1'), 2)
+        self.assertEqual(snapshot['state']['toggle']['1'], {'toggleState': 'off'})
+
+    def test_update_info_and_online(self):
+        """
+        Test case for the information and online updates.
+        """
+        self.registry.apply(device_event(ESseEvent.UPDATE_DEVICE_INFO, 'sn1', {'name': 'Desk lamp'}))
+        self.registry.apply(device_event(ESseEvent.UPDATE_DEVICE_ONLINE, 'sn1', {'online': False}))
+
+        device = self.registry.get('sn1')
+        self.assertEqual((device['name'], device['online'], device['display_category']), ('Desk lamp', False, 'light'))
+        self.assertEqual(self.registry.version('sn1'), 3)
+
+    def test_add_and_delete(self):
+        """
+        Test case for adding and deleting devices, and for ignoring the updates of unknown devices.
+        """
+        self.assertTrue(self.registry.apply(device_event(
+            ESseEvent.ADD_DEVICE, 'sn3', {'serial_number': 'sn3', 'name': 'Plug', 'online': True}
+        )))
+        self.assertEqual(self.registry.get('sn3')['name'], 'Plug')
+
+        self.assertTrue(self.registry.apply(device_event(ESseEvent.DELETE_DEVICE, 'sn2')))
+        self.assertNotIn('sn2', self.registry)
+        self.assertEqual(self.registry.version('sn2'), 0)
+
+        self.assertFalse(self.registry.apply(device_event(ESseEvent.UPDATE_DEVICE_STATE, 'sn2', {'power': {}})))
+        self.assertFalse(self.registry.apply(device_event(ESseEvent.DELETE_DEVICE, 'sn2')))
+        self.assertEqual((self.registry.applied, self.registry.ignored), (2, 2))
+
+    def test_diff(self):
+        """
+        Test case for the events turning the registry into a fresh device list, only for what changed.
+        """
+        devices = [
+            {**DEVICES[0], 'name': 'Desk lamp', 'online': False,
+             'state': {**DEVICES[0]['state'], 'power': {'powerState': 'on'}}},
+            {'serial_number': 'sn3', 'name': 'Plug', 'online': True},
+        ]
+        events = self.registry.diff(devices)
+
+        self.assertEqual([(event.type, event.serial_number, event.payload) for event in events], [
+            (ESseEvent.DELETE_DEVICE, 'sn2', {}),
+            (ESseEvent.UPDATE_DEVICE_INFO, 'sn1', {'name': 'Desk lamp'}),
+            (ESseEvent.UPDATE_DEVICE_ONLINE, 'sn1', {'online': False}),
+            (ESseEvent.UPDATE_DEVICE_STATE, 'sn1', {'power': {'powerState': 'on'}}),
+            (ESseEvent.ADD_DEVICE, 'sn3', devices[1]),
+        ])
+        self.assertEqual(self.registry.get('sn1'), DEVICES[0])
+
+        for event in events:
+            self.registry.apply(event)
+        self.assertEqual(list(self.registry), devices)
+        self.assertEqual(self.registry.diff(devices), [])
+
+    def test_diff_removed_keys(self):
+        """
+        Test case for a nested key and a capability missing from the device list, removed from the registry.
+        """
+        devices = [{**DEVICES[0], 'state': {'toggle': {'1': {'toggleState': 'off'}}}}, DEVICES[1]]
+        events = self.registry.diff(devices)
+        self.assertEqual([event.payload for event in events], [
+            {'power': None, 'toggle': {'1': {'toggleState': 'off'}}},
+        ])
+
+        for event in events:
+            self.registry.apply(event)
+        self.assertEqual(self.registry.get('sn1')['state'], devices[0]['state'])
+        self.assertEqual(self.registry.diff(devices), [])
+
+        toggle = {'toggle': {'2': {'toggleState': 'on'}}}
+        self.registry.apply(device_event(ESseEvent.UPDATE_DEVICE_STATE, 'sn1', toggle))
+        self.assertEqual(self.registry.get('sn1')['state']['toggle'], DEVICES[0]['state']['toggle'])
+
+
+class TestMirrorDevices(GatewayTestCase):
+    """
+    Test cases for mirroring the devices of the gateway.
+    """
+
+    async def asyncSetUp(self):
+        """
+        Start a fake gateway with the devices, whose device list misses an update sent while it is loading,
+        each request answered later than the previous one.
+        """
+        async def devices(_request):
+            self.requests += 1
+            delay = 0.05 * self.requests
+            self.listed.set()
+            await self.updated.wait()
+            await asyncio.sleep(delay)
+            return web.json_response({'error': 0, 'data': {'device_list': DEVICES}, 'message': 'success'})
+
+        async def sse(request):
+            response = web.StreamResponse(headers={'Content-Type': 'text/event-stream'})
+            await response.prepare(request)
+            await self.listed.wait()
+            for serial_number, payload in (('sn2', {'temperature': {'temperature': 21}}),
+                                           ('sn1', {'power': {'powerState': 'on'}})):
+                data = json.dumps({'endpoint': {'serial_number': serial_number}, 'payload': payload})
+                await response.write(f'event: {ESseEvent.UPDATE_DEVICE_STATE.value}\ndata: {data}\n\n'.encode())
+                self.updated.set()
+                await asyncio.sleep(0.1)
+            await asyncio.sleep(10)
+            return response
+
+        self.requests = 0
+        self.listed = asyncio.Event()
+        self.updated = asyncio.Event()
+        await self.start_gateway([web.get(DEVICES_PATH, devices), web.get(SSE_PATH, sse)])
+        self.api = self.client()
+
+    async def test_mirror_devices(self):
+        """
+        Test case for a cold start replaying the update received while loading, then following the events.
+        """
+        registry = await self.api.mirrorDevices()
+        self.assertIs(registry, self.api.device_registry)
+        self.assertEqual(len(registry), 2)
+        self.assertEqual(registry.get('sn2')['state'], {'temperature': {'temperature': 21}})
+        self.assertEqual(registry.version('sn2'), 2)
+
+        for _ in range(100):
+            if registry.version('sn1') == 2:
+                break
+            await asyncio.sleep(0.01)
+        self.assertEqual(registry.get('sn1')['state']['power'], {'powerState': 'on'})
+
+    async def test_snapshot_not_shared(self):
+        """
+        Test case for the device list requested anew, not joining a request sent before the stream connected.
+        """
+        pending = asyncio.ensure_future(self.api.getDeviceList())
+        await self.listed.wait()
+        registry = await self.api.mirrorDevices()
+        await pending
+        self.assertEqual(self.requests, 2)
+        self.assertEqual(registry.get('sn2')['state'], {'temperature': {'temperature': 21}})
+
+    async def test_overlapping_calls(self):
+        """
+        Test case for overlapping calls each replaying the update received while their device list was loading.
+        """
+        first = asyncio.ensure_future(self.api.mirrorDevices())
+        second = asyncio.ensure_future(self.api.mirrorDevices())
+
+        registry = await first
+        self.assertEqual(registry.get('sn2')['state'], {'temperature': {'temperature': 21}})
+        await second
+        self.assertEqual(registry.get('sn2')['state'], {'temperature': {'temperature': 21}})
+        self.assertEqual(self.requests, 2)
+
+    async def test_without_access_token(self):
+        """
+        Test case for the SSE stream not started without access token.
+        """
+        self.api.setAT('')
+        with self.assertRaises(ValueError):
+            await self.api.mirrorDevices()
+
+
+class TestDeviceRegistryIndexes(unittest.TestCase):
+    """
+    Test cases for the queries of the DeviceRegistry indexes.
+    """
+
+    def setUp(self):
+        """
+        Load a registry with lights, plugs and sensors in several rooms.
+        """
+        self.registry = DeviceRegistry()
+        devices = []
+        for index in range(12):
+            kind = ('light', 'plug', 'temperatureAndHumiditySensor')[index % 3]
+            capabilities = {
+                'light': ['power', 'brightness', 'color-temperature'],
+                'plug': ['power'],
+                'temperatureAndHumiditySensor': ['temperature', 'humidity'],
+            }[kind]
+            devices.append({
+                'serial_number': f'sn{index}', 'display_category': kind, 'online': index % 2 == 0,
+                'capabilities': [{'capability': capability, 'permission': 'read'} for capability in capabilities],
+                'tags': {'room': 'garage' if index < 6 else 'kitchen'},
+            })
+        self.registry.load(devices)
+
+    def serial_numbers(self, **criteria):
+        """Query the registry, returning the sorted serial numbers."""
+        return sorted(device['serial_number'] for device in self.registry.query(**criteria))
+
+    def test_query(self):
+        """
+        Test case for the compound queries.
+        """
+        self.assertEqual(self.serial_numbers(category=ECategory.LIGHT, online=True), ['sn0', 'sn6'])
+        self.assertEqual(self.serial_numbers(capabilities=[ECapability.POWER, 'color-temperature'], tag='room=garage'),
+                         ['sn0', 'sn3'])
+        self.assertEqual(self.serial_numbers(tag='room', online=False, capabilities=['humidity']), ['sn11', 'sn5'])
+        self.assertEqual(self.serial_numbers(capabilities=['unknown']), [])
+        self.assertEqual(len(self.registry.query()), 12)
+        self.assertTrue(self.registry.has_capabilities('sn1', ['power']))
+        self.assertFalse(self.registry.has_capabilities('sn1', ['power', 'brightness']))
+
+    def test_incremental(self):
+        """
+        Test case for the indexes following the events.
+        """
+        self.registry.apply(device_event(ESseEvent.UPDATE_DEVICE_ONLINE, 'sn6', {'online': False}))
+        self.registry.apply(device_event(ESseEvent.UPDATE_DEVICE_INFO, 'sn9', {'tags': {'room': 'garage'}}))
+        self.registry.apply(device_event(ESseEvent.DELETE_DEVICE, 'sn0'))
+        self.registry.apply(device_event(ESseEvent.ADD_DEVICE, 'sn12', {
+            'serial_number': 'sn12', 'display_category': 'light', 'online': True,
+            'capabilities': [{'capability': 'power', 'permission': 'readWrite'},
+                             {'capability': 'new-capability', 'permission': 'read'}],
+        }))
+
+        self.assertEqual(self.serial_numbers(category='light', online=True), ['sn12'])
+        self.assertEqual(self.serial_numbers(tag='room=garage', category='temperatureAndHumiditySensor'),
+                         ['sn2', 'sn5'])
+        self.assertEqual(self.serial_numbers(tag='room=garage', category='light'), ['sn3', 'sn9'])
+        self.assertEqual(self.serial_numbers(capabilities=['new-capability']), ['sn12'])
+
+
+class TestReconcileDevices(GatewayTestCase):
+    """
+    Test cases for reconciling the device mirror after a reconnection.
+    """
+
+    async def asyncSetUp(self):
+        """
+        Start a fake gateway dropping the first SSE connection, a device going offline while disconnected.
+        """
+        async def devices(_request):
+            if self.failures:
+                self.failures -= 1
+                return web.json_response({'error': 400, 'data': {}, 'message': 'invalid'})
+            device_list = DEVICES if self.connections < 2 else [{**DEVICES[0], 'online': False}, DEVICES[1]]
+            return web.json_response({'error': 0, 'data': {'device_list': device_list}, 'message': 'success'})
+
+        async def sse(request):
+            self.connections += 1
+            response = web.StreamResponse(headers={'Content-Type': 'text/event-stream'})
+            await response.prepare(request)
+            if self.connections == 1:
+                await self.mirrored.wait()
+                await response.write(b'retry: 10\n\n')
+                return response
+            data = json.dumps({'endpoint': {'serial_number': 'sn1'}, 'payload': {'online': True}})
+            await response.write(f'event: {ESseEvent.UPDATE_DEVICE_ONLINE.value}\ndata: {data}\n\n'.encode())
+            await asyncio.sleep(10)
+            return response
+
+        self.connections = 0
+        self.failures = 0
+        self.mirrored = asyncio.Event()
+        await self.start_gateway([web.get(DEVICES_PATH, devices), web.get(SSE_PATH, sse)])
+        self.api = self.client()
+
+    async def test_reconcile_on_reconnect(self):
+        """
+        Test case for the missed change being published before the events of the new connection.
+        """
+        received = []
+        done = asyncio.Event()
+
+        async def handler(data):
+            received.append(data)
+            if len(received) == 2:
+                done.set()
+
+        registry = await self.api.mirrorDevices()
+        self.api.subscribe(handler)
+        self.mirrored.set()
+        await asyncio.wait_for(done.wait(), 2)
+
+        self.assertEqual(received, [
+            {'endpoint': {'serial_number': 'sn1'}, 'payload': {'online': False}},
+            {'endpoint': {'serial_number': 'sn1'}, 'payload': {'online': True}},
+        ])
+        self.assertTrue(registry.get('sn1')['online'])
+        self.assertEqual(registry.version('sn1'), 3)
+        self.assertEqual(registry.version('sn2'), 1)
+
+    async def test_reconcile_without_reconnect_policy(self):
+        """
+        Test case for the registry reconciled after a reconnection without reconnect policy.
+        """
+        self.api.sse_reconnect = None
+        registry = await self.api.mirrorDevices()
+        self.mirrored.set()
+
+        for _ in range(300):
+            if registry.version('sn1') == 3:
+                break
+            await asyncio.sleep(0.01)
+        self.assertEqual(registry.version('sn1'), 3)
+        self.assertTrue(registry.get('sn1')['online'])
+
+    async def test_reconcile_without_device_list(self):
+        """
+        Test case for a registry whose first device list failed, loaded instead of publishing every device as added.
+        """
+        received = []
+
+        async def handler(data):
+            received.append(data)
+
+        self.failures = 1
+        self.api.subscribe(handler)
+        with self.assertRaises(ResponseError):
+            await self.api.mirrorDevices()
+        self.assertFalse(self.api.device_registry.loaded)
+
+        self.assertEqual(await self.api.reconcileDevices(), [])
+        self.assertEqual(sorted(device['serial_number'] for device in self.api.device_registry), ['sn1', 'sn2'])
+        self.assertEqual(received, [])
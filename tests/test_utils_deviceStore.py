@@ -0,0 +1,194 @@
+"""
+Test module for DeviceStore.
+"""
+
+import asyncio
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+
+from aiohttp import web
+
+from conftest import DEVICES_PATH, SSE_PATH, GatewayTestCase
+from src.sonoff_ewelink_cube_client_api.ts.enum.ESseEvent import ESseEvent
+from src.sonoff_ewelink_cube_client_api.ts.interface.IDeviceEvent import IDeviceEvent
+from src.sonoff_ewelink_cube_client_api.utils.deviceRegistry import DeviceRegistry
+from src.sonoff_ewelink_cube_client_api.utils.deviceStore import DeviceStore
+
+
+def make_device(index, online=True, power='off'):
+    """Make a device of the device list."""
+    return {
+        'serial_number': f'sn{index}', 'name': f'Plug {index}', 'display_category': 'plug', 'online': online,
+        'capabilities': [{'capability': 'power', 'permission': 'readWrite'}],
+        'state': {'power': {'powerState': power}},
+    }
+
+
+def state_event(serial_number, power):
+    """Make a state update of a device."""
+    data = {'endpoint': {'serial_number': serial_number}, 'payload': {'power': {'powerState': power}}}
+    return IDeviceEvent(ESseEvent.UPDATE_DEVICE_STATE, serial_number, data)
+
+
+def database_path(test_case):
+    """Make the path of a database in a directory removed at the end of the test."""
+    directory = tempfile.mkdtemp()
+    test_case.addCleanup(shutil.rmtree, directory)
+    return os.path.join(directory, 'devices.db')
+
+
+class TestDeviceStore(unittest.IsolatedAsyncioTestCase):
+    """
+    Test cases for DeviceStore class.
+    """
+
+    def setUp(self):
+        """
+        Make a directory for the database.
+        """
+        self.path = database_path(self)
+
+    async def test_schema(self):
+        """
+        Test case for the WAL mode and the indexes of the database.
+        """
+        await DeviceStore(self.path).close()
+        with sqlite3.connect(self.path) as connection:
+            self.assertEqual(connection.execute('PRAGMA journal_mode').fetchone()[0], 'wal')
+            indexes = {name for (name,) in connection.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        self.assertTrue({'devices_category', 'devices_online'} <= indexes)
+
+    async def test_restore(self):
+        """
+        Test case for a registry restored with the devices and versions it stored.
+        """
+        store = DeviceStore(self.path)
+        registry = DeviceRegistry(store)
+        registry.load([make_device(index) for index in range(3)])
+        registry.apply(state_event('sn1', 'on'))
+        registry.apply(IDeviceEvent(ESseEvent.DELETE_DEVICE, 'sn2', {'endpoint': {'serial_number': 'sn2'}}))
+        await store.close()
+
+        store = DeviceStore(self.path)
+        restored = DeviceRegistry(store)
+        self.assertEqual(sorted(device['serial_number'] for device in restored), ['sn0', 'sn1'])
+        self.assertEqual(restored.get('sn1')['state'], {'power': {'powerState': 'on'}})
+        self.assertEqual((restored.version('sn0'), restored.version('sn1')), (1, 2))
+        self.assertEqual([device['serial_number'] for device in restored.query(category='plug', online=True)
+                          if device['serial_number'] == 'sn1'], ['sn1'])
+        await store.close()
+
+    async def test_batched_writes(self):
+        """
+        Test case for a burst of updates written in one transaction, one row per device.
+        """
+        store = DeviceStore(self.path, flush_interval=0.05)
+        registry = DeviceRegistry(store)
+        registry.load([make_device(index) for index in range(10)])
+        for index in range(100):
+            registry.apply(state_event(f'sn{index % 10}', 'on' if index % 2 else 'off'))
+        self.assertEqual(store.flushes, 0)
+
+        await asyncio.sleep(0.2)
+        self.assertEqual((store.flushes, store.writes), (1, 10))
+        await store.close()
+
+        with sqlite3.connect(self.path) as connection:
+            rows = connection.execute('SELECT serial_number, version FROM devices ORDER BY serial_number').fetchall()
+        self.assertEqual(rows, [(f'sn{index}', 11) for index in range(10)])
+
+    async def test_full_batch(self):
+        """
+        Test case for a full batch written at once.
+        """
+        store = DeviceStore(self.path, batch_size=5, flush_interval=10)
+        registry = DeviceRegistry(store)
+        registry.load([make_device(index) for index in range(5)])
+        await asyncio.sleep(0.05)
+        self.assertEqual(store.flushes, 1)
+        await store.close()
+
+    async def test_close_waits_for_write(self):
+        """
+        Test case for closing the store while a full batch is being written.
+        """
+        store = DeviceStore(self.path, batch_size=5, flush_interval=10)
+        DeviceRegistry(store).load([make_device(index) for index in range(5)])
+        await store.close()
+        self.assertEqual((store.flushes, store.writes), (1, 5))
+
+    async def test_failed_write_restaged(self):
+        """
+        Test case for the changes of a failed write staged again, behind the changes staged meanwhile.
+        """
+        store = DeviceStore(self.path, flush_interval=10)
+        registry = DeviceRegistry(store)
+        registry.load([make_device(index) for index in range(3)])
+        connection = store._connection  # pylint: disable=protected-access
+        connection.execute('PRAGMA query_only = ON')
+        with self.assertRaises(sqlite3.OperationalError):
+            store.flush()
+
+        registry.apply(state_event('sn1', 'on'))
+        connection.execute('PRAGMA query_only = OFF')
+        await store.close()
+        self.assertEqual((store.flushes, store.writes), (1, 3))
+
+        with sqlite3.connect(self.path) as connection:
+            rows = connection.execute('SELECT serial_number, version FROM devices ORDER BY serial_number').fetchall()
+        self.assertEqual(rows, [('sn0', 1), ('sn1', 2), ('sn2', 1)])
+
+    def test_arguments(self):
+        """
+        Test case for the invalid batch size and flush interval.
+        """
+        with self.assertRaises(ValueError):
+            DeviceStore(self.path, batch_size=0)
+        with self.assertRaises(ValueError):
+            DeviceStore(self.path, flush_interval=-1)
+
+
+class TestWarmRestart(GatewayTestCase):
+    """
+    Test cases for mirroring the devices of the gateway from a device store.
+    """
+
+    async def asyncSetUp(self):
+        """
+        Store the devices of a previous run, and start a fake gateway where one of them changed since.
+        """
+        self.path = database_path(self)
+        store = DeviceStore(self.path)
+        DeviceRegistry(store).load([make_device(index) for index in range(3)])
+        await store.close()
+
+        async def devices(_request):
+            device_list = [make_device(0), make_device(1, power='on'), make_device(2)]
+            return web.json_response({'error': 0, 'data': {'device_list': device_list}, 'message': 'success'})
+
+        async def sse(request):
+            response = web.StreamResponse(headers={'Content-Type': 'text/event-stream'})
+            await response.prepare(request)
+            await asyncio.sleep(10)
+            return response
+
+        await self.start_gateway([web.get(DEVICES_PATH, devices), web.get(SSE_PATH, sse)])
+
+    async def test_warm_restart(self):
+        """
+        Test case for the stored devices being usable at once, then reconciled with the gateway.
+        """
+        store = DeviceStore(self.path)
+        api = self.client(device_store=store)
+        self.assertEqual(len(api.device_registry), 3)
+        self.assertEqual(api.device_registry.get('sn1')['state'], {'power': {'powerState': 'off'}})
+
+        registry = await api.mirrorDevices()
+        self.assertEqual(registry.get('sn1')['state'], {'power': {'powerState': 'on'}})
+        self.assertEqual([registry.version(f'sn{index}') for index in range(3)], [1, 2, 1])
+
+        await api.close()
+        self.assertEqual(store.writes, 1)
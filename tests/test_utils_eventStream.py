@@ -0,0 +1,159 @@
+"""
+Test module for EventStream.
+"""
+
+import asyncio
+import json
+import unittest
+
+from aiohttp import web
+
+from conftest import SSE_PATH, GatewayTestCase
+from src.sonoff_ewelink_cube_client_api.ts.enum.EOverflowPolicy import EOverflowPolicy
+from src.sonoff_ewelink_cube_client_api.ts.enum.ESseEvent import ESseEvent
+from src.sonoff_ewelink_cube_client_api.ts.interface.IDeviceEvent import IDeviceEvent
+from src.sonoff_ewelink_cube_client_api.ts.interface.ISseEvent import ISseEvent
+from src.sonoff_ewelink_cube_client_api.utils.eventStream import EventStream
+
+
+def state_event(serial_number, payload):
+    """Make a state update event of a device."""
+    data = {'endpoint': {'serial_number': serial_number}, 'payload': payload}
+    return IDeviceEvent(ESseEvent.UPDATE_DEVICE_STATE, serial_number, data)
+
+
+class TestEventStream(unittest.IsolatedAsyncioTestCase):
+    """
+    Test cases for EventStream class.
+    """
+
+    async def test_block(self):
+        """
+        Test case for a full buffer making the producer wait for the consumer, and for closing.
+        """
+        stream = EventStream(max_buffer=1)
+        await stream.put(state_event('a', {'n': 1}))
+        producer = asyncio.ensure_future(stream.put(state_event('a', {'n': 2})))
+        await asyncio.sleep(0.01)
+        self.assertFalse(producer.done())
+
+        self.assertEqual((await stream.get()).payload, {'n': 1})
+        await asyncio.wait_for(producer, 1)
+        stream.close()
+        self.assertEqual((await stream.get()).payload, {'n': 2})
+        self.assertIsNone(await stream.get())
+
+    async def test_drop_oldest_and_conflate(self):
+        """
+        Test case for the DROP_OLDEST and CONFLATE overflow policies.
+        """
+        stream = EventStream(max_buffer=2, overflow=EOverflowPolicy.DROP_OLDEST)
+        for index in range(3):
+            await stream.put(state_event('a', {'n': index}))
+        self.assertEqual(stream.dropped, 1)
+        self.assertEqual((await stream.get()).payload, {'n': 1})
+
+        stream = EventStream(max_buffer=2, overflow=EOverflowPolicy.CONFLATE)
+        shared = state_event('a', {'power': 'on'})
+        await stream.put(shared)
+        await stream.put(state_event('a', {'brightness': 10}))
+        await stream.put(state_event('b', {'power': 'off'}))
+        self.assertEqual(stream.conflated, 1)
+        self.assertEqual((await stream.get()).payload, {'power': 'on', 'brightness': 10})
+        self.assertEqual(shared.payload, {'power': 'on'})
+        self.assertEqual((await stream.get()).serial_number, 'b')
+
+
+class TestEvents(GatewayTestCase):
+    """
+    Test cases for iterating over the events of the gateway.
+    """
+
+    async def asyncSetUp(self):
+        """
+        Start a fake gateway sending the updates of two devices.
+        """
+        async def sse(request):
+            response = web.StreamResponse(headers={'Content-Type': 'text/event-stream'})
+            await response.prepare(request)
+            await self.subscribed.wait()
+            for index in range(6):
+                data = json.dumps({'endpoint': {'serial_number': f'sn{index % 2}'}, 'payload': {'n': index}})
+                event = ESseEvent.UPDATE_DEVICE_STATE if index < 5 else ESseEvent.UPDATE_DEVICE_INFO
+                await response.write(f'id: {index}\nevent: {event.value}\ndata: {data}\n\n'.encode())
+            await asyncio.sleep(10)
+            return response
+
+        self.subscribed = asyncio.Event()
+        await self.start_gateway([web.get(SSE_PATH, sse)])
+        self.api = self.client()
+
+    async def test_events(self):
+        """
+        Test case for the typed events of a device reaching a consumer, which unsubscribes when it stops.
+        """
+        await self.api.init_sse()
+        events = self.api.events(types=[ESseEvent.UPDATE_DEVICE_STATE], devices=['sn1'], max_buffer=1)
+        received = []
+
+        async def consume():
+            async for event in events:
+                received.append(event)
+                if len(received) == 2:
+                    break
+
+        consumer = asyncio.ensure_future(consume())
+        await asyncio.sleep(0.01)
+        self.assertEqual(len(self.api.event_streams), 1)
+        self.subscribed.set()
+        await asyncio.wait_for(consumer, 2)
+        await events.aclose()
+
+        self.assertEqual([(event.type, event.serial_number, event.payload, event.id) for event in received], [
+            (ESseEvent.UPDATE_DEVICE_STATE, 'sn1', {'n': 1}, '1'),
+            (ESseEvent.UPDATE_DEVICE_STATE, 'sn1', {'n': 3}, '3'),
+        ])
+        self.assertEqual(self.api.event_streams, [])
+
+    async def test_close_ends_iteration(self):
+        """
+        Test case for the iteration ending when the API is closed.
+        """
+        await self.api.init_sse()
+        self.subscribed.set()
+
+        async def consume():
+            return [event.id async for event in self.api.events()]
+
+        consumer = asyncio.ensure_future(consume())
+        await asyncio.sleep(0.2)
+        await self.api.close()
+        self.assertEqual(await asyncio.wait_for(consumer, 1), ['0', '1', '2', '3', '4', '5'])
+
+    async def test_mount_sse_func(self):
+        """
+        Test case for the handlers of a handler object being registered under their event names,
+        and unmounted along with the SSE connection only, the REST session staying open.
+        """
+        rest_session = self.api.transport.get_session()
+        opened = asyncio.Event()
+        infos = asyncio.Queue()
+
+        async def onopen():
+            opened.set()
+
+        await self.api.init_sse()
+        self.api.mount_sse_func(ISseEvent(onopen=onopen, onUpdateDeviceInfo=infos.put))
+        self.subscribed.set()
+        await asyncio.wait_for(opened.wait(), 1)
+        self.assertEqual((await asyncio.wait_for(infos.get(), 1))['payload'], {'n': 5})
+
+        await self.api.unmount_sse_func()
+        self.assertEqual(self.api.event_listeners, {})
+        self.assertIsNone(self.api.sse_task)
+        self.assertFalse(rest_session.closed)
+        self.assertIs(self.api.transport.get_session(), rest_session)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,170 @@
+"""
+Test module for EventThrottle.
+"""
+
+import asyncio
+import json
+import unittest
+
+from aiohttp import web
+
+from conftest import SSE_PATH, GatewayTestCase
+from src.sonoff_ewelink_cube_client_api.ts.enum.ESseEvent import ESseEvent
+from src.sonoff_ewelink_cube_client_api.ts.interface.IDeviceEvent import IDeviceEvent
+from src.sonoff_ewelink_cube_client_api.utils.eventThrottle import EventThrottle
+
+
+def device_event(event_type, serial_number, payload):
+    """Make an event of a device."""
+    data = {'endpoint': {'serial_number': serial_number}, 'payload': payload}
+    return IDeviceEvent(event_type, serial_number, data)
+
+
+def throttle_into(throttle, received):
+    """Make a throttle deliver its events into a list."""
+    async def deliver(event):
+        received.append(event)
+    throttle.deliver = deliver
+    return throttle
+
+
+class TestEventThrottle(unittest.IsolatedAsyncioTestCase):
+    """
+    Test cases for EventThrottle class.
+    """
+
+    def test_arguments(self):
+        """
+        Test case for exactly one of window and max_rate being required, and positive.
+        """
+        with self.assertRaises(ValueError):
+            EventThrottle()
+        with self.assertRaises(ValueError):
+            EventThrottle(window=1, max_rate=1)
+        with self.assertRaises(ValueError):
+            EventThrottle(window=0)
+        with self.assertRaises(ValueError):
+            EventThrottle(max_rate=-1)
+
+    async def test_window(self):
+        """
+        Test case for the state updates of a device being merged into its final state at the end of the window.
+        """
+        received = []
+        throttle = throttle_into(EventThrottle(window=0.05), received)
+        await throttle.push(device_event(ESseEvent.UPDATE_DEVICE_STATE, 'a', {'power': 'on', 'brightness': 1}))
+        await throttle.push(device_event(ESseEvent.UPDATE_DEVICE_STATE, 'b', {'power': 'off'}))
+        for brightness in range(2, 6):
+            await throttle.push(device_event(ESseEvent.UPDATE_DEVICE_STATE, 'a', {'brightness': brightness}))
+        self.assertEqual(received, [])
+
+        await asyncio.sleep(0.1)
+        self.assertEqual([(event.serial_number, event.payload, event.collapsed) for event in received], [
+            ('a', {'power': 'on', 'brightness': 5}, 4),
+            ('b', {'power': 'off'}, 0),
+        ])
+        self.assertEqual(throttle.stats(), {'received': 6, 'delivered': 2, 'collapsed': 4, 'pending': 0})
+
+    async def test_window_channels(self):
+        """
+        Test case for two channels of a switch changed in the same window, both in the merged update.
+        """
+        received = []
+        throttle = throttle_into(EventThrottle(window=0.05), received)
+        await throttle.push(device_event(ESseEvent.UPDATE_DEVICE_STATE, 'a', {'toggle': {'1': {'toggleState': 'on'}}}))
+        await throttle.push(device_event(ESseEvent.UPDATE_DEVICE_STATE, 'a', {'toggle': {'2': {'toggleState': 'on'}}}))
+
+        await asyncio.sleep(0.1)
+        self.assertEqual([event.payload for event in received], [
+            {'toggle': {'1': {'toggleState': 'on'}, '2': {'toggleState': 'on'}}},
+        ])
+
+    async def test_max_rate(self):
+        """
+        Test case for the first state update being delivered at once, and the next ones merged until the rate allows.
+        """
+        received = []
+        throttle = throttle_into(EventThrottle(max_rate=20), received)
+        for brightness in range(1, 4):
+            await throttle.push(device_event(ESseEvent.UPDATE_DEVICE_STATE, 'a', {'brightness': brightness}))
+        self.assertEqual([event.payload for event in received], [{'brightness': 1}])
+
+        await asyncio.sleep(0.1)
+        self.assertEqual([(event.payload, event.collapsed) for event in received], [
+            ({'brightness': 1}, 0),
+            ({'brightness': 3}, 1),
+        ])
+
+    async def test_passthrough_keeps_order(self):
+        """
+        Test case for the other events flushing the merged update of their device before them.
+        """
+        received = []
+        throttle = throttle_into(EventThrottle(window=10), received)
+        await throttle.push(device_event(ESseEvent.UPDATE_DEVICE_STATE, 'a', {'n': 1}))
+        await throttle.push(device_event(ESseEvent.UPDATE_DEVICE_STATE, 'a', {'n': 2}))
+        await throttle.push(device_event(ESseEvent.UPDATE_DEVICE_STATE, 'b', {'n': 3}))
+        await throttle.push(device_event(ESseEvent.DELETE_DEVICE, 'a', {}))
+
+        self.assertEqual([(event.type, event.serial_number) for event in received], [
+            (ESseEvent.UPDATE_DEVICE_STATE, 'a'),
+            (ESseEvent.DELETE_DEVICE, 'a'),
+        ])
+        await throttle.flush()
+        self.assertEqual(received[-1].payload, {'n': 3})
+        throttle.close()
+
+    async def test_close(self):
+        """
+        Test case for closing dropping the updates held.
+        """
+        received = []
+        throttle = throttle_into(EventThrottle(window=0.01), received)
+        await throttle.push(device_event(ESseEvent.UPDATE_DEVICE_STATE, 'a', {'n': 1}))
+        throttle.close()
+        await asyncio.sleep(0.05)
+        self.assertEqual(received, [])
+        self.assertEqual(throttle.stats()['pending'], 0)
+
+
+class TestThrottledSubscription(GatewayTestCase):
+    """
+    Test cases for a throttled subscription to the events of the gateway.
+    """
+
+    async def asyncSetUp(self):
+        """
+        Start a fake gateway sending a burst of updates of a device.
+        """
+        async def sse(request):
+            response = web.StreamResponse(headers={'Content-Type': 'text/event-stream'})
+            await response.prepare(request)
+            for index in range(20):
+                data = json.dumps({'endpoint': {'serial_number': 'sn1'}, 'payload': {'n': index}})
+                await response.write(f'id: {index}\nevent: {ESseEvent.UPDATE_DEVICE_STATE.value}\n'
+                                     f'data: {data}\n\n'.encode())
+            await asyncio.sleep(10)
+            return response
+
+        await self.start_gateway([web.get(SSE_PATH, sse)])
+        self.api = self.client()
+
+    async def test_subscribe(self):
+        """
+        Test case for a burst of updates reaching a throttled handler as a single update with the final state.
+        """
+        received = []
+        done = asyncio.Event()
+
+        async def handler(data):
+            received.append(data)
+            done.set()
+
+        throttle = EventThrottle(window=0.1)
+        subscription = self.api.subscribe(handler, types=[ESseEvent.UPDATE_DEVICE_STATE], throttle=throttle)
+        await self.api.init_sse()
+        await asyncio.wait_for(done.wait(), 2)
+
+        self.assertEqual(received, [{'endpoint': {'serial_number': 'sn1'}, 'payload': {'n': 19}}])
+        self.assertEqual(throttle.stats(), {'received': 20, 'delivered': 1, 'collapsed': 19, 'pending': 0})
+        self.assertTrue(self.api.unsubscribe(subscription))
@@ -0,0 +1,100 @@
+"""
+Test module for HttpTransport.
+"""
+
+import asyncio
+import unittest
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from src.sonoff_ewelink_cube_client_api.api.ihostClass import IHostClass
+from src.sonoff_ewelink_cube_client_api.ts.interface.ITransportConfig import ITransportConfig
+from src.sonoff_ewelink_cube_client_api.utils.httpTransport import HttpTransport
+
+
+class TestHttpTransport(unittest.IsolatedAsyncioTestCase):
+    """
+    Test cases for HttpTransport class.
+    """
+
+    async def asyncSetUp(self):
+        """
+        Start a fake gateway recording the client ports of the requests.
+        """
+        self.client_ports = []
+
+        async def bridge(request):
+            self.client_ports.append(request.transport.get_extra_info('peername')[1])
+            return web.json_response({'error': 0, 'data': {'ip': '127.0.0.1'}, 'message': 'success'})
+
+        async def sse(request):
+            response = web.StreamResponse(headers={'Content-Type': 'text/event-stream'})
+            await response.prepare(request)
+            self.sse_connected.set()
+            await asyncio.sleep(10)
+            return response
+
+        self.sse_connected = asyncio.Event()
+        app = web.Application()
+        app.router.add_get('/open-api/v1/rest/bridge', bridge)
+        app.router.add_get('/open-api/v1/sse/bridge', sse)
+        self.server = TestServer(app)
+        await self.server.start_server()
+
+    async def asyncTearDown(self):
+        """
+        Stop the fake gateway.
+        """
+        await self.server.close()
+
+    def test_invalid_limit(self):
+        """
+        Test case for an invalid connection limit.
+        """
+        with self.assertRaises(ValueError):
+            ITransportConfig(limit=0)
+
+    async def test_session_reused(self):
+        """
+        Test case for reusing the pooled session and its keep-alive connection.
+        """
+        async with IHostClass(ip=f'{self.server.host}:{self.server.port}') as api:
+            session = api.transport.get_session()
+            for _ in range(3):
+                response = await api.getBridgeInfo()
+                self.assertEqual(response.error, 0)
+
+            self.assertIs(api.transport.get_session(), session)
+            self.assertEqual(len(set(self.client_ports)), 1)
+
+        self.assertTrue(api.transport.closed)
+
+    async def test_sse_pool_separated(self):
+        """
+        Test case for REST calls not waiting behind the open SSE stream.
+        """
+        config = ITransportConfig(limit=1, conn_timeout=1)
+        async with IHostClass(ip=f'{self.server.host}:{self.server.port}', at='token', transport_config=config) as api:
+            self.assertTrue(await api.init_sse())
+            await asyncio.wait_for(self.sse_connected.wait(), 1)
+
+            self.assertIsNot(api.session, api.transport.get_session())
+            for _ in range(2):
+                response = await api.getBridgeInfo()
+                self.assertEqual(response.error, 0)
+
+        self.assertIsNone(api.sse_task)
+        self.assertTrue(api.transport.closed)
+
+    async def test_close_without_session(self):
+        """
+        Test case for closing a transport that was never used.
+        """
+        transport = HttpTransport()
+        await transport.close()
+        self.assertTrue(transport.closed)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,169 @@
+"""
+Test module for httpUtils.
+"""
+
+import asyncio
+import io
+import json
+import os
+import tempfile
+import unittest
+
+from aiohttp import web
+
+from conftest import DEVICES_PATH, GatewayTestCase
+from src.sonoff_ewelink_cube_client_api.errors import DeadlineExceededError, ResponseError
+from src.sonoff_ewelink_cube_client_api.ts.enum.EMethod import EMethod
+from src.sonoff_ewelink_cube_client_api.ts.enum.EPath import EPath
+from src.sonoff_ewelink_cube_client_api.ts.interface.IDownloadStats import IDownloadStats
+
+DEBUG_LOG = b''.join(f'{line:06d} directive log line\n'.encode() for line in range(20000))
+DEVICES = [{'serial_number': f'sn{index}', 'online': True, 'name': f'Device {index}'} for index in range(300)]
+
+
+class TestHttpUtils(GatewayTestCase):
+    """
+    Test cases for httpUtils class.
+    """
+
+    async def asyncSetUp(self):
+        """
+        Start a fake gateway serving a debug log file.
+        """
+        async def debug_log(request):
+            if request.match_info['serial_number'] not in ('abc', 'slow'):
+                return web.json_response({'error': 110000, 'data': {}, 'message': 'device not found'})
+
+            response = web.StreamResponse(headers={'Content-Type': 'application/octet-stream'})
+            await response.prepare(request)
+            if request.match_info['serial_number'] == 'slow':
+                await response.write(DEBUG_LOG[:1000])
+                await asyncio.sleep(5)
+            for start in range(0, len(DEBUG_LOG), 32768):
+                await response.write(DEBUG_LOG[start:start + 32768])
+            await response.write_eof()
+            return response
+
+        async def devices(request):
+            if request.headers.get('Authorization') != 'Bearer token':
+                return web.json_response({'error': 401, 'data': {}, 'message': 'invalid access token'})
+
+            response = web.StreamResponse(headers={'Content-Type': 'application/json'})
+            await response.prepare(request)
+            body = json.dumps({'error': 0, 'data': {'device_list': DEVICES}, 'message': 'success'}).encode()
+            for start in range(0, len(body), 1000):
+                await response.write(body[start:start + 1000])
+            await response.write_eof()
+            return response
+
+        await self.start_gateway([
+            web.get('/open-api/v1/rest/thirdparty/debug-log/{serial_number}', debug_log),
+            web.get(DEVICES_PATH, devices),
+        ])
+        self.api = self.client()
+
+    async def test_stream_debug_log(self):
+        """
+        Test case for streaming a file in bounded chunks.
+        """
+        stats = IDownloadStats()
+        chunks = [chunk async for chunk in self.api.streamDebugLog('abc', {}, chunk_size=4096, stats=stats)]
+
+        self.assertEqual(b''.join(chunks), DEBUG_LOG)
+        self.assertTrue(all(len(chunk) <= 4096 for chunk in chunks))
+        self.assertEqual(stats.bytes, len(DEBUG_LOG))
+        self.assertGreater(stats.bytes_per_second, 0)
+
+    async def test_download_debug_log_to_path(self):
+        """
+        Test case for downloading a file to a file path.
+        """
+        progress = []
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'debug.log')
+            stats = await self.api.downloadDebugLog('abc', path, {}, progress=progress.append)
+
+            with open(path, 'rb') as file:
+                self.assertEqual(file.read(), DEBUG_LOG)
+
+        self.assertEqual(stats.bytes, len(DEBUG_LOG))
+        self.assertIsNotNone(stats.finished_at)
+        self.assertTrue(progress)
+
+    async def test_download_debug_log_to_file_object_and_descriptor(self):
+        """
+        Test case for downloading a file to a file object and a file descriptor, leaving them open.
+        """
+        buffer = io.BytesIO()
+        await self.api.downloadDebugLog('abc', buffer, {})
+        self.assertEqual(buffer.getvalue(), DEBUG_LOG)
+
+        with tempfile.TemporaryFile() as file:
+            await self.api.downloadDebugLog('abc', file.fileno(), {})
+            file.seek(0)
+            self.assertEqual(file.read(), DEBUG_LOG)
+
+    async def test_stream_error_response(self):
+        """
+        Test case for a JSON error response instead of the file.
+        """
+        with self.assertRaises(ResponseError) as context:
+            async for _ in self.api.streamDebugLog('unknown', {}):
+                pass
+
+        self.assertEqual(context.exception.response.error, 110000)
+
+    async def test_iter_device_list(self):
+        """
+        Test case for streaming the device list with a field projection.
+        """
+        devices = [device async for device in self.api.iterDeviceList(fields=('serial_number', 'online'))]
+        self.assertEqual(devices, [{'serial_number': device['serial_number'], 'online': True} for device in DEVICES])
+
+        self.assertEqual([device async for device in self.api.iterDeviceList()], DEVICES)
+
+    async def test_iter_device_list_error_response(self):
+        """
+        Test case for an error code raised once the device list response is complete.
+        """
+        self.api.at = 'expired'
+        with self.assertRaises(ResponseError) as context:
+            async for _ in self.api.iterDeviceList():
+                pass
+
+        self.assertEqual(context.exception.response.error, 401)
+
+    async def test_stream_through_limiter_and_breaker(self):
+        """
+        Test case for the streamed requests holding a slot of the concurrency window and recording their outcome.
+        """
+        self.assertEqual(len([device async for device in self.api.iterDeviceList()]), len(DEVICES))
+        self.assertEqual([chunk async for chunk in self.api.streamDebugLog('abc', {})][0][:6], b'000000')
+        with self.assertRaises(ResponseError):
+            async for _ in self.api.streamDebugLog('unknown', {}):
+                pass
+
+        self.assertEqual((self.api.limiter.acquired, self.api.limiter.in_flight), (3, 0))
+        self.assertEqual(self.api.circuit_breaker.failures, 0)
+
+    async def test_download_deadline(self):
+        """
+        Test case for a download failing at its deadline and giving its slot back, counted as a failure
+        at the default of the endpoint only.
+        """
+        buffer = io.BytesIO()
+        with self.assertRaises(DeadlineExceededError):
+            await self.api.downloadDebugLog('slow', buffer, {}, timeout=0.3)
+
+        self.assertEqual(buffer.getvalue(), DEBUG_LOG[:1000])
+        self.assertEqual(self.api.limiter.in_flight, 0)
+        self.assertEqual(self.api.circuit_breaker.failures, 0)
+
+        self.api.timeouts = {(EMethod.GET, f'{EPath.DEBUG_LOG.value}/'): 0.3}
+        with self.assertRaises(DeadlineExceededError):
+            await self.api.downloadDebugLog('slow', io.BytesIO(), {})
+        self.assertEqual(self.api.circuit_breaker.failures, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
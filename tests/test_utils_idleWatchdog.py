@@ -0,0 +1,122 @@
+"""
+Test module for IdleWatchdog.
+"""
+
+import asyncio
+import socket
+import unittest
+
+from aiohttp import web
+
+from conftest import SSE_PATH, GatewayTestCase
+from src.sonoff_ewelink_cube_client_api.errors import SseIdleTimeoutError
+from src.sonoff_ewelink_cube_client_api.ts.enum.ESseEvent import ESseEvent
+from src.sonoff_ewelink_cube_client_api.ts.interface.ITransportConfig import ITransportConfig
+from src.sonoff_ewelink_cube_client_api.utils.httpTransport import HttpTransport
+from src.sonoff_ewelink_cube_client_api.utils.idleWatchdog import IdleWatchdog
+
+
+class TestIdleWatchdog(unittest.IsolatedAsyncioTestCase):
+    """
+    Test cases for IdleWatchdog class.
+    """
+
+    async def test_fires_when_idle(self):
+        """
+        Test case for the watchdog firing once the stream stays idle, not while it is active or suspended.
+        """
+        fired = asyncio.Event()
+        watchdog = IdleWatchdog(0.1, fired.set)
+        watchdog.start()
+        for _ in range(4):
+            await asyncio.sleep(0.05)
+            watchdog.touch()
+        self.assertFalse(watchdog.expired)
+
+        watchdog.suspend()
+        await asyncio.sleep(0.25)
+        self.assertFalse(watchdog.expired)
+
+        watchdog.touch()
+        await asyncio.wait_for(fired.wait(), 1)
+        self.assertTrue(watchdog.expired)
+
+    async def test_stop(self):
+        """
+        Test case for a stopped watchdog never firing.
+        """
+        watchdog = IdleWatchdog(0.05, self.fail)
+        watchdog.start()
+        watchdog.stop()
+        await asyncio.sleep(0.1)
+        self.assertFalse(watchdog.expired)
+
+
+class TestSseDeadLink(GatewayTestCase):
+    """
+    Test cases for the detection of a dead SSE stream.
+    """
+
+    def test_keepalive_options(self):
+        """
+        Test case for TCP keepalive enabled on the SSE sockets only.
+        """
+        transport = HttpTransport(ITransportConfig(sse_keepalive_idle=7))
+        options = transport._socket_options(socket.AF_INET, sse=True)  # pylint: disable=protected-access
+        self.assertIn((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1), options)
+        if hasattr(socket, 'TCP_KEEPIDLE'):
+            self.assertIn((socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, 7), options)
+
+        rest_options = transport._socket_options(socket.AF_INET)  # pylint: disable=protected-access
+        self.assertEqual(rest_options, ())
+        transport = HttpTransport(ITransportConfig(sse_keepalive=False))
+        options = transport._socket_options(socket.AF_INET, sse=True)  # pylint: disable=protected-access
+        self.assertEqual(options, rest_options)
+
+    async def test_idle_stream_reconnected(self):
+        """
+        Test case for a silent stream dropped by the watchdog and reconnected, with keepalive on its socket.
+        """
+        connections = []
+
+        async def sse(request):
+            connections.append(request)
+            response = web.StreamResponse(headers={'Content-Type': 'text/event-stream'})
+            await response.prepare(request)
+            data = f'{{"endpoint": {{"serial_number": "sn{len(connections)}"}}}}'
+            await response.write(f'retry: 10\nevent: {ESseEvent.DELETE_DEVICE.value}\ndata: {data}\n\n'.encode())
+            # The link dies: nothing more is sent, the connection is never closed
+            await asyncio.sleep(10)
+            return response
+
+        await self.start_gateway([web.get(SSE_PATH, sse)])
+        config = ITransportConfig(sse_idle_timeout=0.2)
+        api = self.client(transport_config=config)
+
+        received = asyncio.Queue()
+        errors = []
+
+        async def on_error(error):
+            errors.append(error)
+
+        await api.init_sse()
+        api.register_event_listener('onerror', on_error)
+        api.register_event_listener(ESseEvent.DELETE_DEVICE.value, received.put)
+
+        self.assertEqual(await asyncio.wait_for(received.get(), 2), {'endpoint': {'serial_number': 'sn1'}})
+        self.assertEqual(await asyncio.wait_for(received.get(), 2), {'endpoint': {'serial_number': 'sn2'}})
+        self.assertIsInstance(errors[0], SseIdleTimeoutError)
+        self.assertEqual(api.sse_reconnect.reconnects, 1)
+
+        client_sockets = [
+            protocol.transport.get_extra_info('socket')
+            for protocol in api.session.connector._acquired  # pylint: disable=protected-access
+        ]
+        self.assertTrue(client_sockets)
+        self.assertTrue(all(
+            client.getsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE) for client in client_sockets
+        ))
+
+
+if __name__ == '__main__':
+    unittest.main()
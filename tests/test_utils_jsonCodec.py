@@ -0,0 +1,71 @@
+"""
+Test module for the JSON codecs.
+"""
+
+import os
+import unittest
+from unittest import mock
+
+from src.sonoff_ewelink_cube_client_api.utils.jsonCodec import CODECS, JsonCodec, StdlibJsonCodec, get_codec
+
+
+class TestJsonCodec(unittest.TestCase):
+    """
+    Test cases for the JSON codecs.
+    """
+
+    document = {"error": 0, "data": {"device_list": [{"name": "Lámpa", "online": True}]}, "message": "success"}
+
+    def test_round_trip(self):
+        """
+        Test case for encoding and decoding with every installed codec.
+        """
+        for name, codec_class in CODECS.items():
+            with self.subTest(codec=name):
+                codec = codec_class()
+                body = codec.dumps(self.document)
+
+                self.assertIsInstance(body, bytes)
+                self.assertEqual(codec.loads(body), self.document)
+                self.assertEqual(codec.loads(body.decode()), self.document)
+
+    def test_invalid_document(self):
+        """
+        Test case for every codec raising ValueError on invalid JSON.
+        """
+        for name, codec_class in CODECS.items():
+            with self.subTest(codec=name):
+                with self.assertRaises(ValueError):
+                    codec_class().loads(b'{"error": ')
+
+    def test_default_codec(self):
+        """
+        Test case for the stdlib codec being the default.
+        """
+        with mock.patch.dict(os.environ, {}, clear=True):
+            self.assertIsInstance(get_codec(), StdlibJsonCodec)
+
+    def test_codec_from_environment(self):
+        """
+        Test case for choosing the codec with the JSON_CODEC environment variable.
+        """
+        with mock.patch.dict(os.environ, {'JSON_CODEC': 'auto'}):
+            self.assertEqual(get_codec().name, next(iter(CODECS)))
+
+    def test_unknown_codec(self):
+        """
+        Test case for an unknown codec name.
+        """
+        with self.assertRaises(ValueError):
+            get_codec('simplejson')
+
+    def test_abstract_codec(self):
+        """
+        Test case for the base class, only usable through a codec implementing it.
+        """
+        with self.assertRaises(TypeError):
+            JsonCodec()  # pylint: disable=abstract-class-instantiated
+
+
+if __name__ == '__main__':
+    unittest.main()
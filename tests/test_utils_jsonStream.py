@@ -0,0 +1,77 @@
+"""
+Test module for jsonStream.
+"""
+
+import json
+import unittest
+
+from src.sonoff_ewelink_cube_client_api.utils.jsonStream import JsonArrayStreamer, compile_fields, project_fields
+
+DEVICES = [
+    {'serial_number': f'sn{index}', 'name': f'Lamp "{index}" \\ [x]{{y}}', 'online': index % 2 == 0,
+     'state': {'power': {'powerState': 'on'}}, 'tags': [['a'], {'b': 'é]'}]}
+    for index in range(5)
+]
+DOCUMENT = json.dumps({'error': 0, 'data': {'tags': ['device_list'], 'device_list': DEVICES}, 'message': 'success'})
+
+
+def stream(document, size):
+    """Feed a document to a streamer in chunks of the given size."""
+    streamer = JsonArrayStreamer('device_list')
+    items = []
+    for start in range(0, len(document), size):
+        items.extend(streamer.feed(document[start:start + size]))
+    return items, streamer.finish()
+
+
+class TestJsonStream(unittest.TestCase):
+    """
+    Test cases for jsonStream module.
+    """
+
+    def test_items_whatever_the_chunks(self):
+        """
+        Test case for extracting the items and the skeleton for every chunk size.
+        """
+        document = DOCUMENT.encode()
+        for size in (1, 2, 3, 7, 64, len(document)):
+            items, skeleton = stream(document, size)
+            self.assertEqual(items, DEVICES, size)
+            self.assertEqual(json.loads(skeleton),
+                             {'error': 0, 'data': {'tags': ['device_list'], 'device_list': []}, 'message': 'success'})
+
+    def test_error_document(self):
+        """
+        Test case for a document without the array.
+        """
+        items, skeleton = stream(b'{"error": 401, "data": {}, "message": "invalid access token"}', 5)
+        self.assertEqual(items, [])
+        self.assertEqual(json.loads(skeleton)['error'], 401)
+
+    def test_scalar_items(self):
+        """
+        Test case for numbers split across chunks.
+        """
+        items, _ = stream(b'{"device_list": [12345, 678, "a,b"]}', 3)
+        self.assertEqual(items, [12345, 678, 'a,b'])
+
+    def test_truncated_document(self):
+        """
+        Test case for a document ending inside an item.
+        """
+        streamer = JsonArrayStreamer('device_list')
+        streamer.feed(DOCUMENT.encode()[:100])
+        with self.assertRaises(ValueError):
+            streamer.finish()
+
+    def test_project_fields(self):
+        """
+        Test case for keeping top-level and nested fields only.
+        """
+        fields = compile_fields(('serial_number', 'state.power.powerState', 'missing', 'name.missing'))
+        self.assertEqual(project_fields(DEVICES[0], fields),
+                         {'serial_number': 'sn0', 'state': {'power': {'powerState': 'on'}}})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,127 @@
+"""
+Test module for ReconnectPolicy.
+"""
+
+import asyncio
+import unittest
+from unittest import mock
+
+from aiohttp import web
+
+from conftest import SSE_PATH, GatewayTestCase
+from src.sonoff_ewelink_cube_client_api.ts.enum.ESseEvent import ESseEvent
+from src.sonoff_ewelink_cube_client_api.utils.reconnectPolicy import ReconnectPolicy
+
+
+class TestReconnectPolicy(unittest.TestCase):
+    """
+    Test cases for ReconnectPolicy class.
+    """
+
+    def test_backoff(self):
+        """
+        Test case for the full-jitter backoff growing with the failed attempts, on top of the server hint.
+        """
+        policy = ReconnectPolicy(base_delay=1, max_delay=5, min_delay=0.5)
+        delays = []
+        with mock.patch('random.uniform', side_effect=lambda low, high: high):
+            for _ in range(5):
+                policy.disconnected()
+                delays.append(policy.delay())
+            self.assertEqual(delays, [1.5, 2.5, 4.5, 5.5, 5.5])
+            self.assertEqual(policy.delay(retry=2000), 7)
+
+    def test_minimum_delay(self):
+        """
+        Test case for a server asking for an immediate reconnection.
+        """
+        policy = ReconnectPolicy(min_delay=0.1)
+        policy.disconnected()
+        with mock.patch('random.uniform', side_effect=lambda low, high: low):
+            self.assertEqual(policy.delay(retry=0), 0.1)
+            self.assertEqual(policy.delay(), 0.1)
+
+    def test_stable_connection_resets_backoff(self):
+        """
+        Test case for the backoff starting over after a stable connection, not after a flapping one.
+        """
+        policy = ReconnectPolicy(stable_after=10)
+        with mock.patch('time.monotonic', side_effect=[0, 1, 2, 3, 100, 200]):
+            policy.disconnected()
+            self.assertIsNone(policy.connected())
+            policy.disconnected()
+            self.assertEqual(policy.attempts, 2)
+
+            self.assertEqual(policy.connected(), 1)
+            policy.disconnected()
+            self.assertEqual(policy.attempts, 1)
+
+            self.assertEqual(policy.connected(), 100)
+
+        self.assertEqual(policy.reconnects, 2)
+        self.assertEqual(policy.disconnected_seconds, 101)
+        self.assertTrue(policy.stats()['connected'])
+
+
+class TestSseReconnect(GatewayTestCase):
+    """
+    Test cases for the reconnections of the SSE stream.
+    """
+
+    async def test_resume_after_disconnection(self):
+        """
+        Test case for a lost stream reconnected by a single task, resumed from the last event ID.
+        """
+        last_event_ids = []
+
+        async def sse(request):
+            last_event_ids.append(request.headers.get('Last-Event-ID'))
+            if len(last_event_ids) == 2:
+                return web.Response(status=503)
+
+            response = web.StreamResponse(headers={'Content-Type': 'text/event-stream'})
+            await response.prepare(request)
+            index = len(last_event_ids)
+            data = f'{{"endpoint": {{"serial_number": "sn{index}"}}}}'
+            event = f'retry: 10\nid: {index}\nevent: {ESseEvent.DELETE_DEVICE.value}\ndata: {data}\n\n'
+            await response.write(event.encode())
+            if index == 1:
+                return response
+            await asyncio.sleep(5)
+            return response
+
+        await self.start_gateway([web.get(SSE_PATH, sse)])
+        api = self.client()
+        api.sse_reconnect = ReconnectPolicy(base_delay=0.05, min_delay=0)
+
+        received = asyncio.Queue()
+        downtimes = []
+        errors = []
+
+        async def on_reconnect(downtime):
+            downtimes.append(downtime)
+
+        async def on_error(error):
+            errors.append(error)
+
+        await api.init_sse()
+        api.register_event_listener('onreconnect', on_reconnect)
+        api.register_event_listener('onerror', on_error)
+        api.register_event_listener(ESseEvent.DELETE_DEVICE.value, received.put)
+
+        self.assertEqual(await asyncio.wait_for(received.get(), 2), {'endpoint': {'serial_number': 'sn1'}})
+        self.assertEqual(await asyncio.wait_for(received.get(), 2), {'endpoint': {'serial_number': 'sn3'}})
+
+        self.assertEqual(last_event_ids, [None, '1', '1'])
+        self.assertEqual(len(downtimes), 1)
+        self.assertEqual(len(errors), 1)
+        self.assertEqual(api.sse_reconnect.stats()['reconnects'], 1)
+        sse_tasks = [task for task in asyncio.all_tasks() if 'handle_sse' in repr(task.get_coro())]
+        self.assertEqual(len(sse_tasks), 1)
+
+        await api.close()
+        self.assertTrue(sse_tasks[0].cancelled())
+
+
+if __name__ == '__main__':
+    unittest.main()
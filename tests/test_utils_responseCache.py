@@ -0,0 +1,247 @@
+"""
+Test module for ResponseCache.
+"""
+
+import json
+import unittest
+from unittest import mock
+
+from src.sonoff_ewelink_cube_client_api.ts.enum.EPath import EPath
+from src.sonoff_ewelink_cube_client_api.ts.enum.ESseEvent import ESseEvent
+from src.sonoff_ewelink_cube_client_api.ts.interface.IDeviceEvent import IDeviceEvent
+from src.sonoff_ewelink_cube_client_api.ts.interface.IResponse import IResponse
+from src.sonoff_ewelink_cube_client_api.utils.responseCache import ResponseCache
+
+
+def success(data):
+    """Create a successful response."""
+    return IResponse(0, 'success', data)
+
+
+class TestResponseCache(unittest.TestCase):
+    """
+    Test cases for ResponseCache class.
+    """
+
+    def test_hit_and_miss(self):
+        """
+        Test case for reading a stored response.
+        """
+        cache = ResponseCache()
+        key = cache.key(EPath.DEVICE.value, None)
+        self.assertIsNone(cache.get(key))
+
+        response = success({'device_list': []})
+        cache.set(key, response, cache.generation(key))
+
+        self.assertEqual(cache.get(key).data, {'device_list': []})
+        self.assertEqual(cache.stats()['hits'], 1)
+        self.assertEqual(cache.stats()['misses'], 1)
+
+    def test_copies(self):
+        """
+        Test case for the stored and returned responses being copies, changed without altering the cache.
+        """
+        cache = ResponseCache()
+        key = cache.key(EPath.DEVICE.value, None)
+        response = success({'device_list': [{'serial_number': 'abc', 'online': True}]})
+        cache.set(key, response, cache.generation(key))
+        response.data['device_list'].clear()
+
+        cached = cache.get(key)
+        self.assertIsNot(cached, cache.get(key))
+        cached.data['device_list'][0]['online'] = False
+        self.assertEqual(cache.get(key).data, {'device_list': [{'serial_number': 'abc', 'online': True}]})
+
+    def test_uncached_path(self):
+        """
+        Test case for a path without TTL.
+        """
+        cache = ResponseCache()
+        self.assertIsNone(cache.key(EPath.BRIDGE_CONFIG.value, None))
+
+    def test_params_in_key(self):
+        """
+        Test case for parameters being part of the key, whatever their order.
+        """
+        cache = ResponseCache(ttls={'/path': 10})
+        self.assertEqual(cache.key('/path', {'a': 1, 'b': 2}), cache.key('/path', {'b': 2, 'a': 1}))
+        self.assertNotEqual(cache.key('/path', {'a': 1}), cache.key('/path', {'a': 2}))
+
+    def test_expired(self):
+        """
+        Test case for an expired response.
+        """
+        cache = ResponseCache(ttls={EPath.BRIDGE.value: 10})
+        key = cache.key(EPath.BRIDGE.value, None)
+
+        with mock.patch('time.monotonic', return_value=100):
+            cache.set(key, success({}), cache.generation(key))
+        with mock.patch('time.monotonic', return_value=111):
+            self.assertIsNone(cache.get(key))
+
+    def test_error_not_cached(self):
+        """
+        Test case for an error response not being stored.
+        """
+        cache = ResponseCache()
+        key = cache.key(EPath.DEVICE.value, None)
+        cache.set(key, IResponse(401, 'invalid access token', {}), cache.generation(key))
+        self.assertIsNone(cache.get(key))
+
+    def test_size_bound(self):
+        """
+        Test case for evicting the least recently used response.
+        """
+        cache = ResponseCache(max_entries=2, ttls={'/path': 10})
+        keys = [cache.key('/path', {'page': page}) for page in range(3)]
+        for key in keys[:2]:
+            cache.set(key, success({}), cache.generation(key))
+        cache.get(keys[0])
+        cache.set(keys[2], success({}), cache.generation(keys[2]))
+
+        self.assertIsNotNone(cache.get(keys[0]))
+        self.assertIsNone(cache.get(keys[1]))
+        self.assertEqual(cache.evictions, 1)
+
+    def test_event_invalidation(self):
+        """
+        Test case for a device event removing the device list only.
+        """
+        cache = ResponseCache()
+        devices_key = cache.key(EPath.DEVICE.value, None)
+        bridge_key = cache.key(EPath.BRIDGE.value, None)
+        cache.set(devices_key, success({'device_list': []}), cache.generation(devices_key))
+        cache.set(bridge_key, success({}), cache.generation(bridge_key))
+
+        cache.invalidate_event(ESseEvent.DELETE_DEVICE.value, {'endpoint': {'serial_number': 'abc'}})
+
+        self.assertIsNone(cache.get(devices_key))
+        self.assertIsNotNone(cache.get(bridge_key))
+
+    def test_device_path_invalidation(self):
+        """
+        Test case for invalidating the entries of one device only.
+        """
+        cache = ResponseCache(ttls={EPath.DEVICE.value: 10, f'{EPath.DEVICE.value}/abc': 10,
+                                    f'{EPath.DEVICE.value}/def': 10})
+        keys = [cache.key(path, None) for path in cache.ttls]
+        for key in keys:
+            cache.set(key, success({}), cache.generation(key))
+
+        cache.invalidate(EPath.DEVICE.value, 'abc')
+
+        self.assertEqual([cache.get(key) is not None for key in keys], [False, False, True])
+
+    def test_invalidated_while_in_flight(self):
+        """
+        Test case for a response fetched before an invalidation not being stored.
+        """
+        cache = ResponseCache()
+        key = cache.key(EPath.DEVICE.value, None)
+        generation = cache.generation(key)
+
+        cache.invalidate_event(ESseEvent.ADD_DEVICE.value, {'payload': {'serial_number': 'abc'}})
+        cache.set(key, success({'device_list': []}), generation)
+
+        self.assertIsNone(cache.get(key))
+
+    def test_generation_per_path(self):
+        """
+        Test case for an invalidation of the device list not dropping the responses of other paths in flight.
+        """
+        cache = ResponseCache()
+        devices_key = cache.key(EPath.DEVICE.value, None)
+        bridge_key = cache.key(EPath.BRIDGE.value, None)
+        generations = cache.generation(devices_key), cache.generation(bridge_key)
+
+        cache.invalidate_event(ESseEvent.DELETE_DEVICE.value, {'endpoint': {'serial_number': 'abc'}})
+        cache.set(devices_key, success({'device_list': []}), generations[0])
+        cache.set(bridge_key, success({}), generations[1])
+
+        self.assertIsNone(cache.get(devices_key))
+        self.assertIsNotNone(cache.get(bridge_key))
+
+    def test_device_list_patched(self):
+        """
+        Test case for the state and online updates applied to the cached device list instead of removing it.
+        """
+        cache = ResponseCache()
+        key = cache.key(EPath.DEVICE.value, None)
+        self.assertFalse(cache.wants(ESseEvent.UPDATE_DEVICE_STATE.value))
+        device_list = [
+            {'serial_number': 'abc', 'online': True, 'state': {'power': {'powerState': 'off'}, 'brightness': 10}},
+            {'serial_number': 'def', 'online': True, 'state': {}},
+        ]
+        cache.set(key, success({'device_list': device_list}), cache.generation(key))
+        generation = cache.generation(key)
+        self.assertTrue(cache.wants(ESseEvent.UPDATE_DEVICE_STATE.value))
+
+        endpoint = {'serial_number': 'abc'}
+        cache.patch_device_event(IDeviceEvent(ESseEvent.UPDATE_DEVICE_STATE, 'abc', {
+            'endpoint': endpoint, 'payload': {'power': {'powerState': 'on'}}
+        }))
+        online = {'endpoint': endpoint, 'payload': {'online': False}}
+        cache.invalidate_event(ESseEvent.UPDATE_DEVICE_ONLINE.value, online)
+
+        self.assertEqual(cache.get(key).data['device_list'], [
+            {'serial_number': 'abc', 'online': False, 'state': {'power': {'powerState': 'on'}, 'brightness': 10}},
+            {'serial_number': 'def', 'online': True, 'state': {}},
+        ])
+        self.assertEqual((cache.generation(key), cache.invalidations, cache.patches), (generation, 0, 2))
+
+    def test_channels_patched(self):
+        """
+        Test case for a state update of one channel keeping the other channels of the capability.
+        """
+        cache = ResponseCache()
+        key = cache.key(EPath.DEVICE.value, None)
+        state = {'toggle': {'1': {'toggleState': 'off'}, '2': {'toggleState': 'off'}}}
+        cache.set(key, success({'device_list': [{'serial_number': 'abc', 'state': state}]}), cache.generation(key))
+
+        cache.patch_device_event(IDeviceEvent(ESseEvent.UPDATE_DEVICE_STATE, 'abc', {
+            'endpoint': {'serial_number': 'abc'}, 'payload': {'toggle': {'1': {'toggleState': 'on'}}}
+        }))
+
+        self.assertEqual(cache.get(key).data['device_list'][0]['state'], {
+            'toggle': {'1': {'toggleState': 'on'}, '2': {'toggleState': 'off'}}
+        })
+
+    def test_patched_while_in_flight(self):
+        """
+        Test case for a device list fetched while a state update arrives not being stored.
+        """
+        cache = ResponseCache()
+        key = cache.key(EPath.DEVICE.value, None)
+        self.assertFalse(cache.wants(ESseEvent.UPDATE_DEVICE_STATE.value))
+        generation = cache.begin(key)
+        self.assertTrue(cache.wants(ESseEvent.UPDATE_DEVICE_STATE.value))
+
+        cache.patch_device_event(IDeviceEvent(ESseEvent.UPDATE_DEVICE_STATE, 'abc', {
+            'endpoint': {'serial_number': 'abc'}, 'payload': {'power': {'powerState': 'on'}}
+        }))
+        cache.end(key)
+        cache.set(key, success({'device_list': [{'serial_number': 'abc', 'state': {}}]}), generation)
+        self.assertIsNone(cache.get(key))
+        self.assertFalse(cache.wants(ESseEvent.UPDATE_DEVICE_STATE.value))
+
+        generation = cache.begin(key)
+        cache.end(key)
+        cache.set(key, success({'device_list': []}), generation)
+        self.assertIsNotNone(cache.get(key))
+
+    def test_unknown_device_not_decoded(self):
+        """
+        Test case for the update of a device missing from the cached lists being left undecoded.
+        """
+        cache = ResponseCache()
+        key = cache.key(EPath.DEVICE.value, None)
+        cache.set(key, success({'device_list': [{'serial_number': 'abc'}]}), cache.generation(key))
+
+        event = IDeviceEvent(ESseEvent.UPDATE_DEVICE_STATE, 'def', None, raw=b'not json', loads=json.loads)
+        cache.patch_device_event(event)
+        self.assertEqual(cache.patches, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
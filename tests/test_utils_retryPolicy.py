@@ -0,0 +1,136 @@
+"""
+Test module for RetryPolicy.
+"""
+
+import asyncio
+import unittest
+from unittest import mock
+
+import aiohttp
+
+from src.sonoff_ewelink_cube_client_api.ts.enum.EMethod import EMethod
+from src.sonoff_ewelink_cube_client_api.ts.interface.IResponse import IResponse
+from src.sonoff_ewelink_cube_client_api.utils.retryPolicy import RetryPolicy
+
+SUCCESS = IResponse(0, 'success', {})
+
+
+def attempts(*outcomes):
+    """Make a call returning or raising the given outcomes in turn, and the list of its attempts."""
+    calls = []
+
+    async def call():
+        outcome = outcomes[len(calls)]
+        calls.append(outcome)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    return call, calls
+
+
+def not_sent_error():
+    """Make an error of a connection which could not be established."""
+    return aiohttp.ClientConnectorError(mock.Mock(), OSError('connection refused'))
+
+
+class TestRetryPolicy(unittest.IsolatedAsyncioTestCase):
+    """
+    Test cases for RetryPolicy class.
+    """
+
+    def setUp(self):
+        """
+        Create a policy without delays.
+        """
+        self.policy = RetryPolicy(base_delay=0, discovering_delay=0)
+
+    async def test_get_retried_on_server_exception_and_timeout(self):
+        """
+        Test case for retrying an idempotent request.
+        """
+        call, calls = attempts(IResponse(500, 'error', {}), asyncio.TimeoutError(), SUCCESS)
+        self.assertIs(await self.policy.run(EMethod.GET, call), SUCCESS)
+        self.assertEqual(len(calls), 3)
+        self.assertEqual(self.policy.retries, 2)
+
+    async def test_mutating_not_retried_when_maybe_applied(self):
+        """
+        Test case for a mutating request which may have reached the gateway.
+        """
+        call, calls = attempts(asyncio.TimeoutError(), SUCCESS)
+        with self.assertRaises(asyncio.TimeoutError):
+            await self.policy.run(EMethod.PUT, call)
+
+        call, calls = attempts(IResponse(500, 'error', {}), SUCCESS)
+        self.assertEqual((await self.policy.run(EMethod.POST, call)).error, 500)
+        self.assertEqual(len(calls), 1)
+
+    async def test_mutating_retried_when_not_sent(self):
+        """
+        Test case for a mutating request which could not be sent.
+        """
+        call, calls = attempts(not_sent_error(), SUCCESS)
+        self.assertIs(await self.policy.run(EMethod.DELETE, call), SUCCESS)
+        self.assertEqual(len(calls), 2)
+
+    async def test_discovering_zigbee_devices(self):
+        """
+        Test case for retrying a request refused during a Zigbee discovery after its delay.
+        """
+        self.policy.discovering_delay = 0.05
+        call, _ = attempts(IResponse(110001, 'discovering', {}), SUCCESS)
+        with mock.patch('asyncio.sleep', wraps=asyncio.sleep) as sleep:
+            self.assertIs(await self.policy.run(EMethod.PUT, call), SUCCESS)
+        sleep.assert_called_once_with(0.05)
+
+    async def test_fail_fast(self):
+        """
+        Test case for parameter and authentication errors returned at once.
+        """
+        for error in (400, 401):
+            call, calls = attempts(IResponse(error, 'error', {}), SUCCESS)
+            self.assertEqual((await self.policy.run(EMethod.GET, call)).error, error)
+            self.assertEqual(len(calls), 1)
+
+    async def test_max_attempts(self):
+        """
+        Test case for the last error being raised once the attempts are spent.
+        """
+        call, calls = attempts(*[asyncio.TimeoutError() for _ in range(5)])
+        with self.assertRaises(asyncio.TimeoutError):
+            await self.policy.run(EMethod.GET, call)
+        self.assertEqual(len(calls), 3)
+
+    async def test_max_elapsed(self):
+        """
+        Test case for no retry when the delay would overrun the call budget.
+        """
+        policy = RetryPolicy(discovering_delay=10, max_elapsed=5)
+        call, calls = attempts(IResponse(110001, 'discovering', {}), SUCCESS)
+        self.assertEqual((await policy.run(EMethod.GET, call)).error, 110001)
+        self.assertEqual(len(calls), 1)
+
+    async def test_shared_budget(self):
+        """
+        Test case for retries being throttled once the shared budget is spent.
+        """
+        policy = RetryPolicy(base_delay=0, max_tokens=2)
+        call, calls = attempts(*[IResponse(500, 'error', {}) for _ in range(6)])
+        await policy.run(EMethod.GET, call)
+        await policy.run(EMethod.GET, call)
+
+        self.assertEqual(len(calls), 4)
+        self.assertEqual(policy.stats()['throttled'], 1)
+
+    def test_full_jitter_backoff(self):
+        """
+        Test case for the backoff being drawn between 0 and the capped exponential delay.
+        """
+        policy = RetryPolicy(base_delay=0.1, max_delay=0.3)
+        with mock.patch('random.uniform', side_effect=lambda low, high: high):
+            self.assertEqual([policy.backoff(attempt) for attempt in (1, 2, 3, 4)], [0.1, 0.2, 0.3, 0.3])
+
+
+if __name__ == '__main__':
+    unittest.main()
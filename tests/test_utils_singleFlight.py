@@ -0,0 +1,123 @@
+"""
+Test module for SingleFlight.
+"""
+
+import asyncio
+import unittest
+
+from src.sonoff_ewelink_cube_client_api.utils.singleFlight import SingleFlight
+
+
+class TestSingleFlight(unittest.IsolatedAsyncioTestCase):
+    """
+    Test cases for SingleFlight class.
+    """
+
+    async def test_concurrent_calls_coalesced(self):
+        """
+        Test case for concurrent calls of the same key sharing one call.
+        """
+        single_flight = SingleFlight()
+        started = []
+
+        async def call():
+            started.append(True)
+            await asyncio.sleep(0.01)
+            return object()
+
+        results = await asyncio.gather(*[single_flight.do('devices', call) for _ in range(5)])
+
+        self.assertEqual(len(started), 1)
+        self.assertTrue(all(result is results[0] for result in results))
+        self.assertEqual(single_flight.stats(), {'calls': 5, 'coalesced': 4, 'in_flight': 0})
+
+    async def test_distinct_keys_not_coalesced(self):
+        """
+        Test case for calls of different keys running separately.
+        """
+        single_flight = SingleFlight()
+
+        async def call():
+            await asyncio.sleep(0)
+            return 'result'
+
+        await asyncio.gather(single_flight.do('devices', call), single_flight.do('bridge', call))
+
+        self.assertEqual(single_flight.coalesced, 0)
+
+    async def test_sequential_calls_not_coalesced(self):
+        """
+        Test case for a finished call not being reused.
+        """
+        single_flight = SingleFlight()
+        started = []
+
+        async def call():
+            started.append(True)
+            return len(started)
+
+        self.assertEqual(await single_flight.do('devices', call), 1)
+        self.assertEqual(await single_flight.do('devices', call), 2)
+
+    async def test_exception_shared(self):
+        """
+        Test case for every waiter receiving the exception of the shared call.
+        """
+        single_flight = SingleFlight()
+
+        async def call():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("Gateway service exception")
+
+        results = await asyncio.gather(
+            single_flight.do('devices', call), single_flight.do('devices', call), return_exceptions=True
+        )
+
+        self.assertTrue(all(isinstance(result, RuntimeError) for result in results))
+        self.assertEqual(single_flight.in_flight, 0)
+
+    async def test_cancelled_waiter(self):
+        """
+        Test case for a cancelled waiter not cancelling the shared call.
+        """
+        single_flight = SingleFlight()
+
+        async def call():
+            await asyncio.sleep(0.01)
+            return 'result'
+
+        first = asyncio.ensure_future(single_flight.do('devices', call))
+        second = asyncio.ensure_future(single_flight.do('devices', call))
+        await asyncio.sleep(0)
+        first.cancel()
+
+        self.assertEqual(await second, 'result')
+
+    async def test_every_waiter_cancelled(self):
+        """
+        Test case for the shared call cancelled once its last waiter is cancelled.
+        """
+        single_flight = SingleFlight()
+        cancelled = asyncio.Event()
+
+        async def call():
+            try:
+                await asyncio.sleep(1)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        waiters = [asyncio.ensure_future(single_flight.do('devices', call)) for _ in range(2)]
+        await asyncio.sleep(0)
+        waiters[0].cancel()
+        await asyncio.sleep(0)
+        self.assertFalse(cancelled.is_set())
+
+        waiters[1].cancel()
+        await asyncio.wait_for(cancelled.wait(), 1)
+        await asyncio.sleep(0)
+        self.assertEqual(single_flight.in_flight, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,203 @@
+"""
+Test module for SseDispatcher.
+"""
+
+import asyncio
+import unittest
+
+from src.sonoff_ewelink_cube_client_api.ts.enum.EOverflowPolicy import EOverflowPolicy
+from src.sonoff_ewelink_cube_client_api.ts.enum.ESseEvent import ESseEvent
+from src.sonoff_ewelink_cube_client_api.utils.sseDispatcher import SseDispatcher
+
+STATE = ESseEvent.UPDATE_DEVICE_STATE.value
+
+
+def state(serial_number, **payload):
+    """Make the data of a state update."""
+    return {'endpoint': {'serial_number': serial_number}, 'payload': payload}
+
+
+class TestSseDispatcher(unittest.IsolatedAsyncioTestCase):
+    """
+    Test cases for SseDispatcher class.
+    """
+
+    async def asyncSetUp(self):
+        """
+        Create a handler recording the events, blocked until released.
+        """
+        self.received = []
+        self.release = asyncio.Event()
+
+        async def handler(data):
+            await self.release.wait()
+            self.received.append(data)
+
+        self.handler = handler
+
+    async def test_slow_handler_does_not_block_reader(self):
+        """
+        Test case for queuing the events while a handler runs.
+        """
+        dispatcher = SseDispatcher(max_queue=10)
+        for index in range(5):
+            await asyncio.wait_for(dispatcher.put(STATE, index, self.handler), 1)
+
+        await asyncio.sleep(0)
+        self.assertEqual(dispatcher.queue_depth, 4)
+        self.assertGreaterEqual(dispatcher.lag, 0)
+
+        self.release.set()
+        await dispatcher.join()
+        self.assertEqual(self.received, [0, 1, 2, 3, 4])
+        self.assertEqual(dispatcher.stats()['dispatched'], 5)
+        await dispatcher.close()
+
+    async def test_block(self):
+        """
+        Test case for the reader waiting for room in a full queue.
+        """
+        dispatcher = SseDispatcher(max_queue=1)
+        await dispatcher.put(STATE, 0, self.handler)
+        await asyncio.sleep(0)
+        await dispatcher.put(STATE, 1, self.handler)
+
+        blocked = asyncio.ensure_future(dispatcher.put(STATE, 2, self.handler))
+        await asyncio.sleep(0.01)
+        self.assertFalse(blocked.done())
+
+        self.release.set()
+        await blocked
+        await dispatcher.join()
+        self.assertEqual(self.received, [0, 1, 2])
+        await dispatcher.close()
+
+    async def test_drop_oldest(self):
+        """
+        Test case for dropping the oldest queued event when the queue is full.
+        """
+        dispatcher = SseDispatcher(max_queue=2, overflow=EOverflowPolicy.DROP_OLDEST)
+        await dispatcher.put(STATE, 0, self.handler)
+        await asyncio.sleep(0)
+        for index in range(1, 5):
+            await asyncio.wait_for(dispatcher.put(STATE, index, self.handler), 1)
+
+        self.release.set()
+        await dispatcher.join()
+        self.assertEqual(self.received, [0, 3, 4])
+        self.assertEqual(dispatcher.dropped, 2)
+        await dispatcher.close()
+
+    async def test_drop_oldest_across_devices(self):
+        """
+        Test case for dropping the oldest queued event of every device, in arrival order.
+        """
+        dispatcher = SseDispatcher(max_queue=3, overflow=EOverflowPolicy.DROP_OLDEST)
+        await dispatcher.put(STATE, state('busy', index=0), self.handler)
+        await asyncio.sleep(0)
+        for index in range(1, 1001):
+            await dispatcher.put(STATE, state(f'sn{index % 7}', index=index), self.handler)
+        self.assertLessEqual(len(dispatcher._arrivals), 2 * 4 + 64)  # pylint: disable=protected-access
+
+        self.release.set()
+        await dispatcher.join()
+        self.assertEqual(sorted(data['payload']['index'] for data in self.received), [0, 998, 999, 1000])
+        self.assertEqual(dispatcher.dropped, 997)
+        self.assertEqual(dispatcher.lag, 0)
+        await dispatcher.close()
+
+    async def test_conflate(self):
+        """
+        Test case for merging the queued updates of a device, keeping the order of the other events.
+        """
+        dispatcher = SseDispatcher(overflow=EOverflowPolicy.CONFLATE)
+        await dispatcher.put(STATE, state('busy'), self.handler)
+        await asyncio.sleep(0)
+
+        await dispatcher.put(STATE, state('a', power='on', brightness=10), self.handler)
+        await dispatcher.put(STATE, state('b', power='on'), self.handler)
+        await dispatcher.put(STATE, state('a', brightness=20), self.handler)
+        await dispatcher.put(ESseEvent.DELETE_DEVICE.value, state('b'), self.handler)
+        await dispatcher.put(STATE, state('b', power='off'), self.handler)
+
+        self.release.set()
+        await dispatcher.join()
+        self.assertEqual([data for data in self.received if data['endpoint']['serial_number'] == 'a'], [
+            state('a', power='on', brightness=20),
+        ])
+        self.assertEqual([data for data in self.received if data['endpoint']['serial_number'] == 'b'], [
+            state('b', power='on'),
+            state('b'),
+            state('b', power='off'),
+        ])
+        self.assertEqual(dispatcher.conflated, 1)
+        await dispatcher.close()
+
+    async def test_conflate_channels(self):
+        """
+        Test case for the updates of two channels of a device merged into one update keeping both.
+        """
+        dispatcher = SseDispatcher(overflow=EOverflowPolicy.CONFLATE)
+        await dispatcher.put(STATE, state('busy'), self.handler)
+        await asyncio.sleep(0)
+
+        await dispatcher.put(STATE, state('a', toggle={'1': {'toggleState': 'on'}}), self.handler)
+        await dispatcher.put(STATE, state('a', toggle={'2': {'toggleState': 'off'}}), self.handler)
+
+        self.release.set()
+        await dispatcher.join()
+        self.assertEqual([data for data in self.received if data['endpoint']['serial_number'] == 'a'], [
+            state('a', toggle={'1': {'toggleState': 'on'}, '2': {'toggleState': 'off'}}),
+        ])
+        self.assertEqual(dispatcher.conflated, 1)
+        await dispatcher.close()
+
+    async def test_handler_timeout_and_workers(self):
+        """
+        Test case for handlers cancelled at their timeout, run concurrently by the workers.
+        """
+        errors = []
+
+        async def on_error(error):
+            errors.append(error)
+
+        dispatcher = SseDispatcher(workers=3, handler_timeout=0.2, on_error=on_error)
+        for serial_number in ('a', 'b', 'c'):
+            await dispatcher.put(STATE, state(serial_number), self.handler)
+
+        await asyncio.wait_for(dispatcher.join(), 0.5)
+        self.assertEqual(dispatcher.timeouts, 3)
+        self.assertEqual(len(errors), 3)
+        self.assertTrue(all(isinstance(error, asyncio.TimeoutError) for error in errors))
+        await dispatcher.close()
+
+    async def test_ordered_per_device_parallel_across_devices(self):
+        """
+        Test case for the events of a device handled in order, and the devices handled concurrently.
+        """
+        running = set()
+        overlaps = []
+        received = {}
+
+        async def handler(data):
+            serial_number = data['endpoint']['serial_number']
+            self.assertNotIn(serial_number, running)
+            running.add(serial_number)
+            overlaps.append(len(running))
+            await asyncio.sleep(0.001 * (data['payload']['index'] % 3))
+            received.setdefault(serial_number, []).append(data['payload']['index'])
+            running.discard(serial_number)
+
+        dispatcher = SseDispatcher(workers=4)
+        for index in range(40):
+            await dispatcher.put(STATE, state(f'sn{index % 4}', index=index), handler)
+        await dispatcher.join()
+
+        self.assertEqual(received, {f'sn{shard}': list(range(shard, 40, 4)) for shard in range(4)})
+        self.assertEqual(max(overlaps), 4)
+        self.assertEqual(dispatcher.queue_depth, 0)
+        await dispatcher.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
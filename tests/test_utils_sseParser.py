@@ -0,0 +1,151 @@
+"""
+Test module for SseParser.
+"""
+
+import asyncio
+import json
+import unittest
+
+from aiohttp import web
+
+from conftest import SSE_PATH, GatewayTestCase
+from src.sonoff_ewelink_cube_client_api.ts.enum.ESseEvent import ESseEvent
+from src.sonoff_ewelink_cube_client_api.utils.sseParser import SseParser
+
+STREAM = (
+    b'\xef\xbb\xbf: heartbeat\r\n'
+    b'retry: 3000\r\n'
+    b'\r\n'
+    b'event: device#v1#updateDeviceState\r\n'
+    b'id: 1\r\n'
+    b'data: {"endpoint":\r\n'
+    b'data: {"serial_number": "abc"}}\r\n'
+    b'\r\n'
+    b'data:plain\n'
+    b'\n'
+    b'event: ignored\r'
+    b'\r'
+    b'id: 2\n'
+    b'data\n'
+    b'unknown: field\n'
+    b'\n'
+)
+
+
+def parse(chunks):
+    """Parse the chunks of a stream, and get the parser and the event, data and id of its messages."""
+    parser = SseParser()
+    messages = [message for chunk in chunks for message in parser.feed(chunk)]
+    return parser, [(message.event, message.data, message.id) for message in messages]
+
+
+class TestSseParser(unittest.TestCase):
+    """
+    Test cases for SseParser class.
+    """
+
+    expected = [
+        ('device#v1#updateDeviceState', b'{"endpoint":\n{"serial_number": "abc"}}', '1'),
+        ('message', b'plain', '1'),
+        ('message', b'', '2'),
+    ]
+
+    def test_whole_stream(self):
+        """
+        Test case for multi-line data, comments, line endings, id and retry fields.
+        """
+        parser, messages = parse([STREAM])
+        self.assertEqual(messages, self.expected)
+        self.assertEqual(parser.last_event_id, '2')
+        self.assertEqual(parser.retry, 3000)
+        self.assertEqual(parser.comments, 1)
+        self.assertEqual(parser.events, 3)
+
+    def test_chunk_boundaries(self):
+        """
+        Test case for chunks splitting the stream anywhere, including the BOM and CRLF line endings.
+        """
+        for size in (1, 2, 3, 5, 7, 64):
+            with self.subTest(size=size):
+                _, messages = parse([STREAM[start:start + size] for start in range(0, len(STREAM), size)])
+                self.assertEqual(messages, self.expected)
+
+    def test_reset(self):
+        """
+        Test case for an incomplete event being discarded on reconnection, the last event ID being kept.
+        """
+        parser = SseParser(last_event_id='7')
+        self.assertEqual(parser.feed(b'event: a\ndata: lost\n'), [])
+        parser.reset()
+
+        messages = parser.feed(b'data: kept\n\n')
+        self.assertEqual([(message.event, message.data, message.id) for message in messages],
+                         [('message', b'kept', '7')])
+
+    def test_empty_id(self):
+        """
+        Test case for an empty id field resetting the last event ID.
+        """
+        parser = SseParser(last_event_id='7')
+        messages = parser.feed(b'id\ndata: a\n\nid: 8\ndata: b\n\nid:\n\n')
+        self.assertEqual([message.id for message in messages], [None, '8'])
+        self.assertIsNone(parser.last_event_id)
+
+
+class TestSseStream(GatewayTestCase):
+    """
+    Test cases for parsing the SSE stream of the gateway.
+    """
+
+    async def test_handle_sse(self):
+        """
+        Test case for the events of the stream reaching their listeners.
+        """
+        payload = json.dumps({'endpoint': {'serial_number': 'abc'}, 'payload': {'power': {'powerState': 'on'}}})
+
+        async def sse(request):
+            response = web.StreamResponse(headers={'Content-Type': 'text/event-stream'})
+            await response.prepare(request)
+            body = f': hello\n\nevent: {ESseEvent.UPDATE_DEVICE_STATE.value}\ndata: {payload}\n\n'.encode()
+            for start in range(0, len(body), 10):
+                await response.write(body[start:start + 10])
+            await asyncio.sleep(5)
+            return response
+
+        await self.start_gateway([web.get(SSE_PATH, sse)])
+        api = self.client()
+
+        received = asyncio.Queue()
+        await api.init_sse()
+        api.register_event_listener(ESseEvent.UPDATE_DEVICE_STATE.value, received.put)
+        event = await asyncio.wait_for(received.get(), 2)
+        self.assertEqual(event, json.loads(payload))
+
+    async def test_empty_id_not_resumed(self):
+        """
+        Test case for a stream whose last event ID was reset, reconnected without Last-Event-ID header.
+        """
+        headers = []
+        reconnected = asyncio.Event()
+
+        async def sse(request):
+            headers.append(request.headers.get('Last-Event-ID'))
+            response = web.StreamResponse(headers={'Content-Type': 'text/event-stream'})
+            await response.prepare(request)
+            if len(headers) == 1:
+                await response.write(b'retry: 10\nid: 5\ndata: {}\n\nid:\n\n')
+                return response
+            reconnected.set()
+            await asyncio.sleep(5)
+            return response
+
+        await self.start_gateway([web.get(SSE_PATH, sse)])
+        api = self.client()
+
+        await api.init_sse()
+        await asyncio.wait_for(reconnected.wait(), 2)
+        self.assertEqual(headers, [None, None])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,184 @@
+"""
+Test module for SubscriptionRegistry.
+"""
+
+import asyncio
+import json
+import unittest
+from unittest import mock
+
+from aiohttp import web
+
+from conftest import SSE_PATH, GatewayTestCase
+from src.sonoff_ewelink_cube_client_api.api.ihostClass import IHostClass
+from src.sonoff_ewelink_cube_client_api.ts.enum.ECapability import ECapability
+from src.sonoff_ewelink_cube_client_api.ts.enum.ECategory import ECategory
+from src.sonoff_ewelink_cube_client_api.ts.enum.ESseEvent import ESseEvent
+from src.sonoff_ewelink_cube_client_api.ts.interface.IDeviceEvent import IDeviceEvent
+from src.sonoff_ewelink_cube_client_api.utils.sseUtils import get_raw_serial_numbers
+from src.sonoff_ewelink_cube_client_api.utils.subscriptionRegistry import SubscriptionRegistry
+
+STATE = ESseEvent.UPDATE_DEVICE_STATE.value
+ONLINE = ESseEvent.UPDATE_DEVICE_ONLINE.value
+
+
+def state(serial_number, **payload):
+    """Make the data of a state update."""
+    return {'endpoint': {'serial_number': serial_number}, 'payload': payload}
+
+
+async def handler(_data):
+    """Handle nothing."""
+
+
+class TestSubscriptionRegistry(unittest.TestCase):
+    """
+    Test cases for SubscriptionRegistry class.
+    """
+
+    def setUp(self):
+        """
+        Create a registry knowing a light and a plug.
+        """
+        self.registry = SubscriptionRegistry()
+        self.registry.learn_devices([
+            {'serial_number': 'light', 'display_category': 'light',
+             'capabilities': [{'capability': 'power'}, {'capability': 'brightness'}]},
+            {'serial_number': 'plug', 'display_category': 'plug', 'capabilities': [{'capability': 'power'}]},
+        ])
+
+    def match(self, event_name, data):
+        """Get the matching subscriptions of an event."""
+        return self.registry.match(IDeviceEvent(event_name, data['endpoint']['serial_number'], data))
+
+    def test_many_subscribers(self):
+        """
+        Test case for several subscribers of an event type, in the order of subscription.
+        """
+        first = self.registry.subscribe(handler, types=[STATE])
+        everything = self.registry.subscribe(handler)
+        second = self.registry.subscribe(handler, types=[ESseEvent.UPDATE_DEVICE_STATE])
+        self.assertEqual(self.match(STATE, state('plug', power={})), [first, everything, second])
+        self.assertEqual(self.match(ONLINE, state('plug')), [everything])
+
+        self.assertTrue(self.registry.unsubscribe(first))
+        self.assertFalse(self.registry.unsubscribe(first))
+        self.assertEqual(self.registry.remove(STATE), 1)
+        self.assertEqual(self.match(STATE, state('plug')), [everything])
+        self.assertEqual(len(self.registry), 1)
+
+    def test_filters(self):
+        """
+        Test case for the device, category and capability filters, and their combination.
+        """
+        by_device = self.registry.subscribe(handler, devices=['light'])
+        by_category = self.registry.subscribe(handler, categories=[ECategory.PLUG])
+        by_capability = self.registry.subscribe(handler, types=[STATE],
+                                                capabilities=[ECapability.BRIGHTNESS, ECapability.POWER])
+        combined = self.registry.subscribe(handler, devices=['light', 'plug'], capabilities=['brightness'])
+
+        self.assertEqual(self.match(STATE, state('light', brightness={})), [by_device, by_capability, combined])
+        self.assertEqual(self.match(STATE, state('light', colorTemperature={})), [by_device])
+        self.assertEqual(self.match(STATE, state('plug', power={})), [by_category, by_capability])
+        # The other events are about every capability of the device
+        self.assertEqual(self.match(ONLINE, state('light')), [by_device, combined])
+        self.assertEqual(self.match(STATE, state('unknown', power={})), [by_capability])
+
+    def test_observe(self):
+        """
+        Test case for the devices learnt from the events adding, updating and deleting them.
+        """
+        sensors = self.registry.subscribe(handler, categories=['temperatureAndHumiditySensor'])
+        added = {'payload': {'serial_number': 'sensor', 'display_category': 'temperatureAndHumiditySensor'}}
+        self.registry.observe(IDeviceEvent(ESseEvent.ADD_DEVICE, 'sensor', added))
+        self.assertEqual(self.match(ONLINE, state('sensor')), [sensors])
+
+        self.registry.observe(IDeviceEvent(ESseEvent.DELETE_DEVICE, 'sensor', state('sensor')))
+        self.assertEqual(self.match(ONLINE, state('sensor')), [])
+
+    def test_wants(self):
+        """
+        Test case for discarding the events nobody subscribed to, from their name and raw serial numbers.
+        """
+        raw = json.dumps(state('light', power={})).encode()
+        self.assertFalse(self.registry.wants(STATE, get_raw_serial_numbers(raw)))
+
+        self.registry.subscribe(handler, types=[STATE], devices=['plug'])
+        self.assertFalse(self.registry.wants(STATE, get_raw_serial_numbers(raw)))
+        self.assertTrue(self.registry.wants(STATE, ['plug']))
+        # Escaped serial numbers cannot be read without decoding
+        self.assertIsNone(get_raw_serial_numbers(b'{"endpoint": {"serial_number": "pl\\u0075g"}}'))
+        self.assertTrue(self.registry.wants(STATE, None))
+        self.assertFalse(self.registry.wants(ONLINE, ['plug']))
+        self.assertEqual(self.registry.skipped, 3)
+
+        self.registry.subscribe(handler, types=[STATE], categories=['light'])
+        self.assertTrue(self.registry.wants(STATE, ['light']))
+        # Devices are learnt from their updates while a category or capability is filtered
+        self.assertTrue(self.registry.wants(ESseEvent.UPDATE_DEVICE_INFO.value, ['light']))
+
+
+class TestSubscribe(GatewayTestCase):
+    """
+    Test cases for the subscribers of the gateway events.
+    """
+
+    async def test_listeners_not_replaced(self):
+        """
+        Test case for two listeners of an event type both receiving the events of their devices.
+        """
+        async def sse(request):
+            response = web.StreamResponse(headers={'Content-Type': 'text/event-stream'})
+            await response.prepare(request)
+            for serial_number in ('a', 'b'):
+                await response.write(f'event: {STATE}\ndata: {json.dumps(state(serial_number))}\n\n'.encode())
+            await asyncio.sleep(10)
+            return response
+
+        await self.start_gateway([web.get(SSE_PATH, sse)])
+        api = self.client()
+        first, second, device_b = asyncio.Queue(), asyncio.Queue(), asyncio.Queue()
+        await api.init_sse()
+        api.register_event_listener(STATE, first.put)
+        api.register_event_listener(STATE, second.put)
+        api.subscribe(device_b.put, types=[STATE], devices=['b'])
+
+        for queue in (first, second, first, second):
+            await asyncio.wait_for(queue.get(), 1)
+        self.assertEqual((await asyncio.wait_for(device_b.get(), 1))['endpoint'], {'serial_number': 'b'})
+        self.assertTrue(device_b.empty())
+
+        api.remove_event_listener(STATE, first.put)
+        self.assertEqual(len(api.sse_subscriptions), 2)
+
+    async def test_lazy_decoding(self):
+        """
+        Test case for the events of other devices never decoded, and typed events decoded on access only.
+        """
+        api = IHostClass(ip='127.0.0.1', at='token')
+        api.event_listeners = {}
+        api.sse_dispatcher = None
+        decoded, typed = [], []
+
+        async def on_data(data):
+            decoded.append(data)
+
+        async def on_event(event):
+            typed.append(event)
+
+        api.subscribe(on_data, types=[STATE], devices=['a'])
+        api.subscribe(on_event, types=[STATE], devices=['b'], typed=True)
+        with mock.patch.object(api.codec, 'loads', side_effect=json.loads) as loads:
+            for serial_number in ('a', 'b', 'c', 'c'):
+                await api.handle_event(STATE, json.dumps(state(serial_number, power={})).encode())
+            self.assertEqual(loads.call_count, 1)
+            self.assertEqual([data['endpoint']['serial_number'] for data in decoded], ['a'])
+            self.assertEqual([(event.serial_number, event.decoded) for event in typed], [('b', False)])
+            self.assertEqual(typed[0].payload, {'power': {}})
+            self.assertEqual(loads.call_count, 2)
+        self.assertEqual(api.sse_subscriptions.skipped, 2)
+        await api.close()
+
+
+if __name__ == '__main__':
+    unittest.main()